@@ -11,6 +11,7 @@ Usage:
 """
 
 import argparse
+import json
 import sys
 import time
 import tracemalloc
@@ -24,6 +25,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from benchmark.metrics_collector import AnalysisMetrics, MetricsCollector, save_results
 from pythonstan.world.pipeline import Pipeline
 from pythonstan.analysis.pointer.kcfa import PointerAnalysis, Config
+from pythonstan.analysis.pointer.kcfa.memory import measure_memory, tracemalloc_by_module
 
 
 # All 16 context sensitivity policies
@@ -82,17 +84,20 @@ PROJECT_CONFIGS = {
 class PolicyBenchmark:
     """Benchmark runner for pointer analysis policies."""
     
-    def __init__(self, project_name: str, policies: List[str]):
+    def __init__(self, project_name: str, policies: List[str], memory_report: bool = False):
         """Initialize benchmark.
         
         Args:
             project_name: Project name (flask, werkzeug)
             policies: List of policy strings to test
+            memory_report: Collect a per-structure memory breakdown for each policy
         """
         self.project_name = project_name
         self.policies = policies
         self.config = PROJECT_CONFIGS[project_name]
+        self.memory_report = memory_report
         self.results: List[AnalysisMetrics] = []
+        self.memory_reports: Dict[str, Dict] = {}
     
     def run_all(self) -> List[AnalysisMetrics]:
         """Run benchmark for all policies.
@@ -224,6 +229,8 @@ class PolicyBenchmark:
             
             # Get memory stats
             current_mem, peak_mem = tracemalloc.get_traced_memory()
+            if self.memory_report:
+                self.memory_reports[policy] = self.collect_memory_report(result)
             tracemalloc.stop()
             memory['peak'] = peak_mem
             memory['final'] = current_mem
@@ -271,6 +278,28 @@ class PolicyBenchmark:
             
             return metrics
     
+    def collect_memory_report(self, result) -> Dict:
+        """Break down retained memory by analysis structure and by kcfa module.
+        
+        Must be called while tracemalloc is still tracing.
+        
+        Args:
+            result: Analysis result of the finished run
+        
+        Returns:
+            Dictionary with per-structure and per-module byte counts
+        """
+        from pythonstan.world import World
+        
+        print("  Measuring memory breakdown...")
+        by_module = tracemalloc_by_module(tracemalloc.take_snapshot())
+        report = measure_memory(result.query()._state, World().scope_manager)
+        print(report.format())
+        print("  Traced allocations by module:")
+        for module, size in list(by_module.items())[:10]:
+            print(f"    {module:<32}{size / 2**20:>10.2f} MiB")
+        return {"structures": report.to_dict(), "modules": by_module}
+    
     def save_results(self, output_path: str) -> None:
         """Save results to JSON file.
         
@@ -279,6 +308,11 @@ class PolicyBenchmark:
         """
         save_results(self.results, output_path)
         print(f"Results saved to: {output_path}")
+        if self.memory_reports:
+            memory_path = str(Path(output_path).with_suffix("")) + "_memory.json"
+            with open(memory_path, "w") as f:
+                json.dump(self.memory_reports, f, indent=2)
+            print(f"Memory breakdown saved to: {memory_path}")
 
 
 def main():
@@ -297,6 +331,11 @@ def main():
         default=ALL_POLICIES,
         help="Specific policies to test (default: all)"
     )
+    parser.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="Report memory by analysis structure and by kcfa module"
+    )
     parser.add_argument(
         "--output-dir",
         type=str,
@@ -323,7 +362,7 @@ def main():
     
     for project in projects:
         try:
-            benchmark = PolicyBenchmark(project, policies)
+            benchmark = PolicyBenchmark(project, policies, memory_report=args.memory_report)
             results = benchmark.run_all()
             
             # Save results
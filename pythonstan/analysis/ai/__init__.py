@@ -5,7 +5,7 @@ from pythonstan.analysis.ai.value import (
     FunctionObject, ClassObject, InstanceObject,
     ExternalFunctionObject, ExternalClassObject, ExternalInstanceObject,
     UnknownObject,
-    NumericProperty, StringProperty, ContainerProperty,
+    NumericProperty, StringProperty, ContainerProperty, WideningThresholds,
     create_int_value, create_float_value, create_str_value, create_bool_value,
     create_none_value, create_list_value, create_dict_value,
     create_set_value, create_tuple_value,
@@ -15,8 +15,8 @@ from pythonstan.analysis.ai.value import (
 )
 
 from pythonstan.analysis.ai.state import (
-    AbstractState, Context, ContextType, FlowSensitivity,
-    Scope, MemoryModel, ClassHierarchy, CallGraph, ControlFlowState,
+    AbstractState, Context, ContextType, FlowSensitivity, WorklistOrder,
+    Scope, MemoryModel, ClassHierarchy, CallGraph, ControlFlowState, FunctionSummary,
     create_abstract_state
 )
 
@@ -25,6 +25,7 @@ from pythonstan.analysis.ai.solver import AbstractInterpretationSolver, create_s
 from pythonstan.analysis.ai.pointer_adapter import (
     PointerResults, FunctionSymbol, CallSite, AbstractObject, FieldKey,
     AttrFieldKey, ElemFieldKey, ValueFieldKey, UnknownFieldKey,
+    KCFAPointerResults, PointerFunction, PointerObject,
     MockPointerResults, MockFunctionSymbol, MockCallSite, MockAbstractObject
 )
 
@@ -35,19 +36,20 @@ __all__ = [
     'FunctionObject', 'ClassObject', 'InstanceObject',
     'ExternalFunctionObject', 'ExternalClassObject', 'ExternalInstanceObject',
     'UnknownObject',
-    'NumericProperty', 'StringProperty', 'ContainerProperty',
+    'NumericProperty', 'StringProperty', 'ContainerProperty', 'WideningThresholds',
     'create_int_value', 'create_float_value', 'create_str_value', 'create_bool_value', 
     'create_none_value', 'create_list_value', 'create_dict_value',
     'create_set_value', 'create_tuple_value',
     'create_function_value', 'create_class_value', 'create_instance_value',
     'create_external_function_value', 'create_external_class_value', 'create_external_instance_value',
     'create_unknown_value',
-    'AbstractState', 'Context', 'ContextType', 'FlowSensitivity',
-    'Scope', 'MemoryModel', 'ClassHierarchy', 'CallGraph', 'ControlFlowState',
+    'AbstractState', 'Context', 'ContextType', 'FlowSensitivity', 'WorklistOrder',
+    'Scope', 'MemoryModel', 'ClassHierarchy', 'CallGraph', 'ControlFlowState', 'FunctionSummary',
     'create_abstract_state',
     'AbstractInterpreter',
     'AbstractInterpretationSolver', 'create_solver',
     'PointerResults', 'FunctionSymbol', 'CallSite', 'AbstractObject', 'FieldKey',
     'AttrFieldKey', 'ElemFieldKey', 'ValueFieldKey', 'UnknownFieldKey',
+    'KCFAPointerResults', 'PointerFunction', 'PointerObject',
     'MockPointerResults', 'MockFunctionSymbol', 'MockCallSite', 'MockAbstractObject'
 ]
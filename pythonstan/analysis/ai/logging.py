@@ -7,9 +7,14 @@ with support for JSON and CSV output formats for easy post-processing.
 
 import json
 import csv
+import gzip
+import atexit
+import weakref
 import time
 import logging
-from typing import Dict, Any, List, Optional, Union, TextIO
+import threading
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional, Union, TextIO
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from datetime import datetime
@@ -65,6 +70,12 @@ class AILogger:
     
     Provides methods for logging events, state changes, and performance metrics
     with support for JSON and CSV output.
+    
+    File output is batched: events are buffered and written to handles that stay
+    open, when a batch is full, on ``flush()``/``close()``, or periodically from a
+    background thread if ``flush_interval`` is set. Only the most recent
+    ``max_events`` events are kept in memory. Errors and ``analysis_end`` events
+    are written immediately, and loggers still open at interpreter exit are closed.
     """
     
     def __init__(self, 
@@ -74,7 +85,11 @@ class AILogger:
                  enable_json: bool = False,
                  enable_csv: bool = False,
                  json_file: Optional[Union[str, Path]] = None,
-                 csv_file: Optional[Union[str, Path]] = None):
+                 csv_file: Optional[Union[str, Path]] = None,
+                 max_events: Optional[int] = 10000,
+                 batch_size: int = 256,
+                 flush_interval: Optional[float] = None,
+                 compress_json: bool = False):
         """
         Initialize AI logger.
         
@@ -86,6 +101,10 @@ class AILogger:
             enable_csv: Whether to enable CSV logging
             json_file: Path to JSON log file
             csv_file: Path to CSV log file
+            max_events: Number of recent events kept in memory (None keeps all)
+            batch_size: Number of buffered events that triggers a write to the files
+            flush_interval: Seconds between writes by a background thread (None writes in the caller)
+            compress_json: Whether to gzip the JSON-lines file
         """
         self.name = name
         self.min_level = min_level
@@ -93,7 +112,9 @@ class AILogger:
         self.enable_json = enable_json
         self.enable_csv = enable_csv
         
-        self.events: List[LogEvent] = []
+        # Ring buffer of the most recent events; total_events counts every event ever logged
+        self.events: Deque[LogEvent] = deque(maxlen=max_events)
+        self.total_events = 0
         self.start_time = time.time()
         
         # Set up console logger
@@ -117,9 +138,29 @@ class AILogger:
         self.csv_writer = None
         self.csv_file_handle = None
         
+        # JSON-lines file, opened on the first write
+        self.compress_json = compress_json
+        self.json_file_handle: Optional[TextIO] = None
+        
+        # Events waiting to be written to the files
+        self.batch_size = batch_size
+        self.pending: List[LogEvent] = []
+        self._lock = threading.Lock()
+        
         # Initialize CSV file with headers if needed
         if self.enable_csv and self.csv_file:
             self._init_csv_file()
+        
+        # Background writer
+        self.flush_interval = flush_interval
+        self._writer_thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._stopped = False
+        if flush_interval is not None and self._has_file_output():
+            self._writer_thread = threading.Thread(target=self._run_writer, name=f"{name}_writer", daemon=True)
+            self._writer_thread.start()
+        
+        _open_loggers.add(self)
     
     def _init_csv_file(self):
         """Initialize CSV file with headers."""
@@ -133,6 +174,16 @@ class AILogger:
             )
             self.csv_writer.writeheader()
     
+    def _has_file_output(self) -> bool:
+        return bool((self.enable_json and self.json_file) or (self.enable_csv and self.csv_writer))
+    
+    def _run_writer(self):
+        """Write the buffered events every ``flush_interval`` seconds, or as soon as a batch is full."""
+        while not self._stopped:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+    
     def _should_log(self, level: LogLevel) -> bool:
         """Check if event should be logged based on minimum level."""
         level_order = {
@@ -150,6 +201,7 @@ class AILogger:
         
         # Store event
         self.events.append(event)
+        self.total_events += 1
         
         # Console output
         if self.enable_console:
@@ -163,32 +215,52 @@ class AILogger:
             
             log_func(message)
         
-        # JSON output
-        if self.enable_json and self.json_file:
-            self._write_json_event(event)
-        
-        # CSV output
-        if self.enable_csv and self.csv_writer:
-            self._write_csv_event(event)
+        # File output is buffered and written in batches
+        if self._has_file_output():
+            with self._lock:
+                self.pending.append(event)
+                batch_full = len(self.pending) >= self.batch_size
+            if event.level == LogLevel.ERROR or event.event_type == EventType.ANALYSIS_END:
+                self.flush()
+            elif batch_full:
+                if self._writer_thread is not None:
+                    self._wakeup.set()
+                else:
+                    self.flush()
     
-    def _write_json_event(self, event: LogEvent):
-        """Write event to JSON file."""
-        self.json_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Append to JSON file (one JSON object per line)
-        with open(self.json_file, 'a') as f:
-            json.dump(event.to_dict(), f, default=str)
-            f.write('\n')
-    
-    def _write_csv_event(self, event: LogEvent):
-        """Write event to CSV file."""
-        if self.csv_writer:
+    def flush(self):
+        """Write the buffered events to the JSON and CSV files."""
+        with self._lock:
+            events, self.pending = self.pending, []
+            if not events:
+                return
+            if self.enable_json and self.json_file:
+                self._write_json_events(events)
+            if self.enable_csv and self.csv_writer:
+                self._write_csv_events(events)
+    
+    def _write_json_events(self, events: List[LogEvent]):
+        """Write events to the JSON file, one JSON object per line."""
+        if self.json_file_handle is None:
+            self.json_file.parent.mkdir(parents=True, exist_ok=True)
+            if self.compress_json:
+                self.json_file_handle = gzip.open(self.json_file, 'at', encoding='utf-8')
+            else:
+                self.json_file_handle = open(self.json_file, 'a')
+        self.json_file_handle.writelines(json.dumps(event.to_dict(), default=str) + '\n' for event in events)
+        self.json_file_handle.flush()
+    
+    def _write_csv_events(self, events: List[LogEvent]):
+        """Write events to the CSV file."""
+        rows = []
+        for event in events:
             event_dict = event.to_dict()
             # Convert data dict to JSON string for CSV
             if event_dict['data']:
                 event_dict['data'] = json.dumps(event_dict['data'], default=str)
-            self.csv_writer.writerow(event_dict)
-            self.csv_file_handle.flush()
+            rows.append(event_dict)
+        self.csv_writer.writerows(rows)
+        self.csv_file_handle.flush()
     
     def log(self, 
             event_type: EventType,
@@ -308,7 +380,7 @@ class AILogger:
         Returns:
             List of matching events
         """
-        filtered = self.events
+        filtered = list(self.events)
         
         if event_type:
             filtered = [e for e in filtered if e.event_type == event_type]
@@ -322,7 +394,7 @@ class AILogger:
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics of logged events."""
         if not self.events:
-            return {"total_events": 0}
+            return {"total_events": self.total_events}
         
         total_time = max(e.timestamp for e in self.events) - min(e.timestamp for e in self.events)
         
@@ -346,7 +418,9 @@ class AILogger:
                 max_iterations[event.scope] = max(current_max, event.iteration)
         
         return {
-            "total_events": len(self.events),
+            "total_events": self.total_events,
+            "retained_events": len(self.events),
+            "dropped_events": self.total_events - len(self.events),
             "total_time": total_time,
             "event_counts": event_counts,
             "scope_counts": scope_counts,
@@ -389,11 +463,21 @@ class AILogger:
                 writer.writerow(event_dict)
     
     def close(self):
-        """Close file handles and clean up."""
+        """Write the buffered events, stop the background writer and close file handles."""
+        if self._writer_thread is not None:
+            self._stopped = True
+            self._wakeup.set()
+            self._writer_thread.join()
+            self._writer_thread = None
+        self.flush()
+        if self.json_file_handle:
+            self.json_file_handle.close()
+            self.json_file_handle = None
         if self.csv_file_handle:
             self.csv_file_handle.close()
             self.csv_file_handle = None
             self.csv_writer = None
+        _open_loggers.discard(self)
     
     def __enter__(self):
         """Context manager entry."""
@@ -404,6 +488,17 @@ class AILogger:
         self.close()
 
 
+# Loggers with file output that may still hold buffered events
+_open_loggers: 'weakref.WeakSet[AILogger]' = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_loggers():
+    """Write out the events still buffered when the interpreter exits."""
+    for logger in list(_open_loggers):
+        logger.close()
+
+
 # Global logger instance (can be configured by applications)
 _global_logger: Optional[AILogger] = None
 
@@ -414,8 +509,10 @@ def get_logger() -> Optional[AILogger]:
 
 
 def set_logger(logger: AILogger):
-    """Set the global AI logger instance."""
+    """Set the global AI logger instance, closing the one it replaces."""
     global _global_logger
+    if _global_logger is not None and _global_logger is not logger:
+        _global_logger.close()
     _global_logger = logger
 
 
@@ -425,7 +522,11 @@ def configure_logging(
     enable_csv: bool = False,
     json_file: Optional[Union[str, Path]] = None,
     csv_file: Optional[Union[str, Path]] = None,
-    min_level: LogLevel = LogLevel.INFO
+    min_level: LogLevel = LogLevel.INFO,
+    max_events: Optional[int] = 10000,
+    batch_size: int = 256,
+    flush_interval: Optional[float] = None,
+    compress_json: bool = False
 ) -> AILogger:
     """
     Configure global AI logging.
@@ -437,6 +538,10 @@ def configure_logging(
         json_file: Path to JSON log file
         csv_file: Path to CSV log file
         min_level: Minimum log level
+        max_events: Number of recent events kept in memory (None keeps all)
+        batch_size: Number of buffered events that triggers a write to the files
+        flush_interval: Seconds between writes by a background thread (None writes in the caller)
+        compress_json: Whether to gzip the JSON-lines file
         
     Returns:
         Configured AILogger instance
@@ -447,7 +552,11 @@ def configure_logging(
         enable_csv=enable_csv,
         json_file=json_file,
         csv_file=csv_file,
-        min_level=min_level
+        min_level=min_level,
+        max_events=max_events,
+        batch_size=batch_size,
+        flush_interval=flush_interval,
+        compress_json=compress_json
     )
     set_logger(logger)
     return logger
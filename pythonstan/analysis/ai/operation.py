@@ -9,6 +9,7 @@ from pythonstan.ir.ir_statements import (
     Goto, IRCatchException, IRPhi
 )
 from pythonstan.ir.ir_visitor import IRVisitor
+from pythonstan.utils.persistent_rb_tree import PersistentMap
 from pythonstan.analysis.ai.value import (
     Value, Object, ObjectType, 
     ConstantObject, BuiltinObject, ClassObject, FunctionObject, InstanceObject,
@@ -65,7 +66,7 @@ class AbstractInterpreter(IRVisitor):
             if fn_name:
                 # Add next statement to worklist (sequential flow)
                 next_stmt_idx = self.current_stmt_idx + 1
-                self.state.control_flow.add_to_worklist(fn_name, next_stmt_idx)
+                self._propagate(fn_name, next_stmt_idx)
         return None
     
     def visit_IRAssign(self, ir: IRAssign):
@@ -508,6 +509,13 @@ class AbstractInterpreter(IRVisitor):
             
             # Create new context for function call
             new_context = self.state.create_context(self.current_stmt_idx)
+            summary_key, attributes = self.solver.summary_key(func_qualname, args, new_context)
+            summary = self.solver.lookup_summary(summary_key)
+            if summary is not None:
+                # The function was executed for these inputs already
+                summary.apply(self.state.memory)
+                return summary.return_value
+            global_bindings = self.solver.global_bindings()
             self.state.set_current_context(new_context)
             
             # Set up function context for the called function
@@ -535,6 +543,7 @@ class AbstractInterpreter(IRVisitor):
             
             # Get return value
             result = self.current_return_value if self.current_return_value is not None else create_none_value()
+            self.solver.record_summary(summary_key, attributes, args, result, global_bindings)
             
             # Restore state
             self.state.set_current_context(old_context)
@@ -756,18 +765,15 @@ class AbstractInterpreter(IRVisitor):
         # In a flow-sensitive analysis:
         fn_name = self.state.control_flow.current_function
         if fn_name:
-            # Save current state before branching
-            self._save_current_state(fn_name, self.current_stmt_idx)
-            
             # Add both branches to worklist (we don't know which will be taken)
             
             # Add target of jump (taken branch)
             label_idx = self.state.control_flow.get_label_idx(fn_name, label.idx)
             if label_idx is not None:
-                self.state.control_flow.add_to_worklist(fn_name, label_idx)
+                self._propagate(fn_name, label_idx)
             
             # Add next statement (not taken branch)
-            self.state.control_flow.add_to_worklist(fn_name, self.current_stmt_idx + 1)
+            self._propagate(fn_name, self.current_stmt_idx + 1)
         
         # No return value needed
         return None
@@ -801,25 +807,22 @@ class AbstractInterpreter(IRVisitor):
             if test_result is True:
                 # Test is definitely True, so JumpIfFalse will NOT jump
                 # Continue to next statement only
-                self.state.control_flow.add_to_worklist(fn_name, self.current_stmt_idx + 1)
+                self._propagate(fn_name, self.current_stmt_idx + 1)
             elif test_result is False:
                 # Test is definitely False, so JumpIfFalse WILL jump
                 # Jump to target label only
                 label_idx = self.state.control_flow.get_label_idx(fn_name, label.idx)
                 if label_idx is not None:
-                    self.state.control_flow.add_to_worklist(fn_name, label_idx)
+                    self._propagate(fn_name, label_idx)
             else:
                 # Test result is unknown, must consider both branches
-                # Save current state before branching - this will be used at merge points
-                self._save_state_for_branch(fn_name, self.current_stmt_idx)
-                
                 # Add target of jump (taken branch)
                 label_idx = self.state.control_flow.get_label_idx(fn_name, label.idx)
                 if label_idx is not None:
-                    self.state.control_flow.add_to_worklist(fn_name, label_idx)
+                    self._propagate(fn_name, label_idx)
                 
                 # Add next statement (not taken branch)
-                self.state.control_flow.add_to_worklist(fn_name, self.current_stmt_idx + 1)
+                self._propagate(fn_name, self.current_stmt_idx + 1)
         
         # No return value needed
         return None
@@ -837,7 +840,7 @@ class AbstractInterpreter(IRVisitor):
             # Add target of jump to worklist
             label_idx = self.state.control_flow.get_label_idx(fn_name, label.idx)
             if label_idx is not None:
-                self.state.control_flow.add_to_worklist(fn_name, label_idx)
+                self._propagate(fn_name, label_idx)
         
         # No return value needed
         return None
@@ -1171,7 +1174,8 @@ class AbstractInterpreter(IRVisitor):
             # Use pointer analysis to check if variable is singleton
             try:
                 context = self._get_current_context_for_pointer()
-                return self.pointer.is_singleton(var_name, context)
+                scope = self.state.memory.current_scope
+                return self.pointer.is_singleton(var_name, context, scope.get_qualname() if scope else None)
             except Exception:
                 # If pointer analysis fails, fall back to conservative choice
                 pass
@@ -1275,14 +1279,13 @@ class AbstractInterpreter(IRVisitor):
         Returns:
             CallSite object for pointer analysis queries
         """
-        # TODO: Extract actual source location from IR
-        # For now, create a mock call site
-        site_id = f"call_{self.current_stmt_idx}_{id(ir)}"
-        filename = "unknown.py"
-        line = self.current_stmt_idx or 0
-        col = 0
-        
-        return MockCallSite(site_id, filename, line, col)
+        span = ir.get_span()
+        if span is None:
+            # Without a source position the call cannot be matched to a k-CFA call site
+            return MockCallSite(f"call_{self.current_stmt_idx}_{id(ir)}", "unknown.py", self.current_stmt_idx or 0, 0)
+        # The call_site_key of the k-CFA ID of this call
+        site_id = f"{span.lineno}:{span.col_offset}:{ir}"
+        return MockCallSite(site_id, "unknown.py", span.lineno, span.col_offset)
     
     # Helper methods for pointer analysis integration
     
@@ -1492,110 +1495,35 @@ class AbstractInterpreter(IRVisitor):
             # If analysis fails, don't prune (conservative)
             return False
     
-    def _save_current_state(self, function_qualname: str, stmt_idx: int):
-        """Save current variable state as a snapshot"""
-        # Get all variables in current scope
-        current_vars = {}
-        scope = self.state.memory.current_scope
-        if scope:
-            # Save all local variables
-            for var_name in scope.get_all_variable_names():
-                value = self.state.get_variable(var_name)
-                if value:
-                    current_vars[var_name] = value
-        
-        self.state.control_flow.save_state_snapshot(function_qualname, stmt_idx, current_vars)
-    
-    def _handle_merge_point(self, function_qualname: str, stmt_idx: int):
-        """Handle state merging at a control flow merge point"""
-        # Get all state snapshots for this merge point
-        snapshots = self.state.control_flow.get_state_snapshots(function_qualname, stmt_idx)
-        
-        if not snapshots:
-            # First time reaching this merge point, save current state
-            self._save_current_state(function_qualname, stmt_idx)
-            return
-        
-        # Get current state
-        current_vars = {}
-        scope = self.state.memory.current_scope
-        if scope:
-            for var_name in scope.get_all_variable_names():
-                value = self.state.get_variable(var_name)
-                if value:
-                    current_vars[var_name] = value
-        
-        # Merge current state with all previous snapshots
-        merged_vars = {}
-        all_snapshots = snapshots + [current_vars]
-        
-        # Collect all variable names from all snapshots
-        all_var_names = set()
-        for snapshot in all_snapshots:
-            all_var_names.update(snapshot.keys())
-        
-        # Merge each variable across all snapshots
-        for var_name in all_var_names:
-            values_to_merge = []
-            for snapshot in all_snapshots:
-                if var_name in snapshot:
-                    values_to_merge.append(snapshot[var_name])
-            
-            if values_to_merge:
-                # Start with first value
-                merged_value = values_to_merge[0]
-                # Merge with remaining values
-                for value in values_to_merge[1:]:
-                    merged_value = merged_value.merge(value)
-                merged_vars[var_name] = merged_value
-        
-        # Update current state with merged values
-        for var_name, merged_value in merged_vars.items():
-            self.state.set_variable(var_name, merged_value)
-        
-        # Save this merged state as a new snapshot
-        self._save_current_state(function_qualname, stmt_idx)
-    
-    def _save_state_for_branch(self, function_qualname: str, stmt_idx: int):
-        """Save state at branch point for all reachable merge points"""
-        # Find all merge points reachable from this branch point
-        merge_points = self._find_reachable_merge_points(function_qualname, stmt_idx)
-        
-        # Save current state for each merge point
-        current_vars = {}
-        scope = self.state.memory.current_scope
-        if scope:
-            for var_name in scope.get_all_variable_names():
-                value = self.state.get_variable(var_name)
-                if value:
-                    current_vars[var_name] = value
-        
-        for merge_point in merge_points:
-            self.state.control_flow.save_state_snapshot(function_qualname, merge_point, current_vars)
-    
-    def _find_reachable_merge_points(self, function_qualname: str, from_stmt: int) -> Set[int]:
-        """Find all merge points (statements with multiple predecessors) reachable from given statement"""
-        merge_points = set()
-        visited = set()
+    def _propagate(self, function_qualname: str, stmt_idx: int):
+        """
+        Schedule a successor statement.
         
-        def dfs(stmt_idx):
-            if stmt_idx in visited:
+        The current state is joined into the state of a merge point right away;
+        the merge point is only rescheduled if that changed its state.
+        """
+        control_flow = self.state.control_flow
+        # While narrowing, loop heads are always rescheduled; the solver bounds those revisits
+        narrowing_head = (getattr(self, '_narrowing', False) and
+                          stmt_idx in control_flow.get_loop_heads(function_qualname))
+        if not narrowing_head and control_flow.is_merge_point(function_qualname, stmt_idx):
+            if not control_flow.join_merge_state(function_qualname, stmt_idx, self.state.snapshot_variables()):
                 return
-            visited.add(stmt_idx)
-            
-            # Check if this statement is a merge point
-            predecessors = self.state.control_flow.get_predecessors(function_qualname, stmt_idx)
-            if len(predecessors) > 1:
-                merge_points.add(stmt_idx)
-            
-            # Continue to successors
-            successors = self.state.control_flow.get_successors(function_qualname, stmt_idx)
-            for succ in successors:
-                dfs(succ)
-        
-        # Start DFS from the statement after the branch
-        successors = self.state.control_flow.get_successors(function_qualname, from_stmt)
-        for succ in successors:
-            dfs(succ)
-        
-        return merge_points 
\ No newline at end of file
+        control_flow.add_to_worklist(function_qualname, stmt_idx)
+    
+    def _handle_merge_point(self, function_qualname: str, stmt_idx: int):
+        """Continue from the joined state of a merge point"""
+        control_flow = self.state.control_flow
+        current_vars = self.state.snapshot_variables()
+        # States that arrived without being propagated (e.g. direct visits) are joined in here
+        control_flow.join_merge_state(function_qualname, stmt_idx, current_vars)
+        joined = control_flow.get_merge_state(function_qualname, stmt_idx)
+        
+        if isinstance(joined, PersistentMap) and isinstance(current_vars, PersistentMap):
+            names = joined.diff(current_vars)
+        else:
+            names = joined.keys()
+        for var_name in names:
+            value = joined.get(var_name)
+            if value is not None and value is not current_vars.get(var_name):
+                self.state.set_variable(var_name, value)
@@ -5,9 +5,16 @@ This module defines the interface that AI analysis uses to consume pointer analy
 The protocol is designed to provide sound abstractions and fallbacks for imprecise results.
 """
 
-from typing import Protocol, Optional, Iterable, Set, Dict, Tuple, Any
+import hashlib
+from dataclasses import dataclass, field as dataclass_field
+from typing import (Protocol, Optional, Iterable, Set, Dict, Tuple, Any, FrozenSet,
+                    Hashable, List, Union, TYPE_CHECKING)
 from abc import ABC, abstractmethod
 
+if TYPE_CHECKING:
+    from pythonstan.analysis.pointer.kcfa.solver import SolverQuery
+    from pythonstan.analysis.pointer.kcfa.state import PointerAnalysisState
+
 
 class FunctionSymbol(Protocol):
     """Represents a function in the program."""
@@ -71,13 +78,14 @@ class PointerResults(Protocol):
         """
         ...
     
-    def points_to(self, var: str, ctx: Optional[Context] = None) -> PointsToSet:
+    def points_to(self, var: str, ctx: Optional[Context] = None, scope: Optional[str] = None) -> PointsToSet:
         """
         Get the points-to set for a variable.
         
         Args:
             var: Variable name
             ctx: Optional context for context-sensitive analysis
+            scope: Optional qualified name of the variable's scope; all scopes if omitted
             
         Returns:
             Points-to set. Returns over-approximation if unsure.
@@ -97,7 +105,7 @@ class PointerResults(Protocol):
         """
         ...
     
-    def may_alias(self, a_var: str, b_var: str, ctx: Optional[Context] = None) -> bool:
+    def may_alias(self, a_var: str, b_var: str, ctx: Optional[Context] = None, scope: Optional[str] = None) -> bool:
         """
         Check if two variables may alias.
         
@@ -105,6 +113,7 @@ class PointerResults(Protocol):
             a_var: First variable
             b_var: Second variable
             ctx: Optional context for context-sensitive analysis
+            scope: Optional qualified name of the variables' scope; all scopes if omitted
             
         Returns:
             True if variables may alias, False if definitely not.
@@ -112,13 +121,14 @@ class PointerResults(Protocol):
         """
         ...
     
-    def is_singleton(self, target: Any, ctx: Optional[Context] = None) -> bool:
+    def is_singleton(self, target: Any, ctx: Optional[Context] = None, scope: Optional[str] = None) -> bool:
         """
         Check if a target (variable/object) points to exactly one abstract object.
         
         Args:
             target: The target to check (variable name or abstract object)
             ctx: Optional context for context-sensitive analysis
+            scope: Optional qualified name of the variable's scope; all scopes if omitted
             
         Returns:
             True if target is a singleton, False otherwise.
@@ -218,6 +228,226 @@ class UnknownFieldKey:
         return hash(("unknown", None))
 
 
+# Adapter over k-CFA pointer analysis results
+@dataclass(frozen=True)
+class PointerFunction:
+    """Function symbol for a callee scope of the k-CFA call graph."""
+    name: str
+    
+    def __str__(self) -> str:
+        return self.name
+
+
+@dataclass(frozen=True)
+class PointerObject:
+    """Abstract object of a k-CFA points-to set; ``alloc_id`` is the object's label."""
+    obj: Any
+    alloc_id: str = dataclass_field(compare=False)
+    
+    def __str__(self) -> str:
+        return self.alloc_id
+
+
+# Index key holding the union over all contexts
+_ALL_CONTEXTS = None
+
+# AI field kinds and the k-CFA field kinds they may read
+_FIELD_KINDS = {
+    "attr": ("attr",),
+    "elem": ("elem", "position"),
+    "value": ("value", "key"),
+}
+
+
+def _scope_name(scope: Any) -> str:
+    if scope is None:
+        return "-"
+    name = getattr(scope, "name", None)
+    return name if isinstance(name, str) else str(scope)
+
+
+def call_site_key(site_id: str) -> str:
+    """
+    Get the scope-independent key of a call site ID.
+    
+    k-CFA IDs have the form ``scope:line:col:call``, where the scope label of the
+    entry module is ``__main__``. The key drops that label, so it is
+    ``line:col:call`` and can be built from an ``IRCall`` alone. Other IDs are
+    their own key.
+    """
+    parts = site_id.split(":", 3)
+    if len(parts) == 4 and parts[1].isdigit() and parts[2].isdigit():
+        return ":".join(parts[1:])
+    return site_id
+
+
+def _context_key(ctx: Any) -> Hashable:
+    """Project a k-CFA context to the keys of its call string."""
+    call_sites = getattr(ctx, "call_sites", None)
+    if call_sites is not None:
+        return tuple(call_site_key(cs.site_id) for cs in call_sites)
+    return ctx.to_string() if ctx is not None else ()
+
+
+class KCFAPointerResults:
+    """
+    Indexed PointerResults view over a solved k-CFA pointer analysis.
+    
+    Points-to sets are grouped per scope and variable name and projected to
+    the call strings of their contexts; queries without a scope use their union
+    over all scopes. Call targets are grouped per ``call_site_key``, and
+    ``pointer_digest_version`` is a hash of the solved points-to sets and call
+    edges. The indexes are built on the first query and rebuilt only when the
+    underlying state has changed since, so every query is a dictionary lookup.
+    
+    Queries with no context, or with a call string the analysis never saw,
+    answer with the union over all contexts.
+    """
+    
+    def __init__(self, source: Union['SolverQuery', 'PointerAnalysisState']):
+        """
+        Initialize the adapter.
+        
+        Args:
+            source: k-CFA ``SolverQuery`` or ``PointerAnalysisState`` to index
+        """
+        self._state = getattr(source, "state", source)
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._objects: Dict[Any, PointerObject] = {}
+        self._points_to: Dict[Tuple[str, str], Dict[Hashable, FrozenSet[PointerObject]]] = {}
+        self._points_to_by_name: Dict[str, Dict[Hashable, FrozenSet[PointerObject]]] = {}
+        self._fields: Dict[str, Dict[Tuple[str, Optional[str]], FrozenSet[PointerObject]]] = {}
+        self._callees: Dict[str, Dict[Hashable, FrozenSet[PointerFunction]]] = {}
+        self._successors: Dict[str, FrozenSet[PointerFunction]] = {}
+        self._digest = ""
+    
+    def _ensure_index(self):
+        stamp = (self._state.version, len(self._state.call_graph.get_edges()))
+        if stamp != self._stamp:
+            self._build_index()
+            self._stamp = stamp
+    
+    def _object(self, obj: Any) -> PointerObject:
+        wrapped = self._objects.get(obj)
+        if wrapped is None:
+            wrapped = self._objects[obj] = PointerObject(obj, str(obj))
+        return wrapped
+    
+    def _build_index(self):
+        from pythonstan.analysis.pointer.kcfa.context import Ctx
+        from pythonstan.analysis.pointer.kcfa.variable import Variable, FieldAccess
+        
+        points_to: Dict[Tuple[str, str], Dict[Hashable, Set[PointerObject]]] = {}
+        points_to_by_name: Dict[str, Dict[Hashable, Set[PointerObject]]] = {}
+        fields: Dict[str, Dict[Tuple[str, Optional[str]], Set[PointerObject]]] = {}
+        callees: Dict[str, Dict[Hashable, Set[PointerFunction]]] = {}
+        successors: Dict[str, Set[PointerFunction]] = {}
+        records: List[str] = []
+        
+        for key, pts in self._state.points_to_items():
+            if not isinstance(key, Ctx) or pts.is_empty():
+                continue
+            objs = [self._object(obj) for obj in pts]
+            labels = ",".join(sorted(obj.alloc_id for obj in objs))
+            if isinstance(key.content, Variable):
+                context_key = _context_key(key.context)
+                for by_context in (points_to.setdefault((_scope_name(key.scope), key.content.name), {}),
+                                   points_to_by_name.setdefault(key.content.name, {})):
+                    by_context.setdefault(context_key, set()).update(objs)
+                    by_context.setdefault(_ALL_CONTEXTS, set()).update(objs)
+                records.append(f"var|{_scope_name(key.scope)}|{key.context}|{key.content}|{labels}")
+            elif isinstance(key.content, FieldAccess):
+                fld = key.content.field
+                name = fld.name if fld.name is not None else (None if fld.index is None else str(fld.index))
+                owner = self._object(key.content.obj).alloc_id
+                fields.setdefault(owner, {}).setdefault((fld.kind.value, name), set()).update(objs)
+                records.append(f"field|{owner}|{fld.kind.value}|{name}|{labels}")
+        
+        for edge in self._state.call_graph.get_edges():
+            callsite, callee = edge.get_callsite(), edge.get_callee()
+            site = call_site_key(str(getattr(callsite, "content", callsite)))
+            fn = PointerFunction(_scope_name(callee))
+            by_context = callees.setdefault(site, {})
+            by_context.setdefault(_context_key(getattr(callsite, "context", None)), set()).add(fn)
+            by_context.setdefault(_ALL_CONTEXTS, set()).add(fn)
+            successors.setdefault(_scope_name(getattr(callsite, "scope", None)), set()).add(fn)
+            records.append(f"edge|{_scope_name(getattr(callsite, 'scope', None))}|{getattr(callsite, 'context', None)}"
+                           f"|{site}|{fn.name}|{getattr(callee, 'context', None)}")
+        
+        self._points_to = {var: {ctx: frozenset(objs) for ctx, objs in by_context.items()}
+                           for var, by_context in points_to.items()}
+        self._points_to_by_name = {name: {ctx: frozenset(objs) for ctx, objs in by_context.items()}
+                                   for name, by_context in points_to_by_name.items()}
+        self._fields = {owner: {key: frozenset(objs) for key, objs in by_field.items()}
+                        for owner, by_field in fields.items()}
+        self._callees = {site: {ctx: frozenset(fns) for ctx, fns in by_context.items()}
+                         for site, by_context in callees.items()}
+        self._successors = {caller: frozenset(fns) for caller, fns in successors.items()}
+        
+        digest = hashlib.sha1()
+        for record in sorted(records):
+            digest.update(record.encode("utf-8", "surrogatepass"))
+            digest.update(b"\n")
+        self._digest = f"kcfa-{digest.hexdigest()[:16]}"
+    
+    @staticmethod
+    def _lookup(by_context: Optional[Dict[Hashable, FrozenSet]], ctx: Optional[Context]) -> FrozenSet:
+        if not by_context:
+            return frozenset()
+        call_string = getattr(ctx, "call_string", None)
+        if call_string:
+            key = tuple(call_site_key(getattr(cs, "site_id", str(cs))) for cs in call_string)
+            if key in by_context:
+                return by_context[key]
+        return by_context[_ALL_CONTEXTS]
+    
+    def possible_callees(self, call_site: CallSite, ctx: Optional[Context] = None) -> Set[FunctionSymbol]:
+        self._ensure_index()
+        return set(self._lookup(self._callees.get(call_site_key(call_site.site_id)), ctx))
+    
+    def _variable(self, var: str, scope: Optional[str]) -> Optional[Dict[Hashable, FrozenSet[PointerObject]]]:
+        if scope is None:
+            return self._points_to_by_name.get(var)
+        return self._points_to.get((scope, var))
+    
+    def points_to(self, var: str, ctx: Optional[Context] = None, scope: Optional[str] = None) -> PointsToSet:
+        self._ensure_index()
+        return self._lookup(self._variable(var, scope), ctx)
+    
+    def field_points_to(self, obj: AbstractObject, field: FieldKey) -> PointsToSet:
+        self._ensure_index()
+        by_field = self._fields.get(obj.alloc_id)
+        if not by_field:
+            return frozenset()
+        if field.kind == "attr" and field.name is not None:
+            return by_field.get(("attr", field.name), frozenset())
+        kinds = _FIELD_KINDS.get(field.kind)
+        result = set()
+        for (kind, name), objs in by_field.items():
+            if kinds is None or (kind in kinds and (field.name is None or name in (None, field.name))):
+                result.update(objs)
+        return frozenset(result)
+    
+    def may_alias(self, a_var: str, b_var: str, ctx: Optional[Context] = None, scope: Optional[str] = None) -> bool:
+        self._ensure_index()
+        if self._variable(a_var, scope) is None or self._variable(b_var, scope) is None:
+            return True  # Over-approximate for variables the analysis did not track
+        return not self.points_to(a_var, ctx, scope).isdisjoint(self.points_to(b_var, ctx, scope))
+    
+    def is_singleton(self, target: Any, ctx: Optional[Context] = None, scope: Optional[str] = None) -> bool:
+        if isinstance(target, str):
+            return len(self.points_to(target, ctx, scope)) == 1
+        return False  # Under-approximate: object multiplicity is not tracked
+    
+    def call_graph_successors(self, fn: FunctionSymbol) -> Set[FunctionSymbol]:
+        self._ensure_index()
+        return set(self._successors.get(fn.name, ()))
+    
+    def pointer_digest_version(self) -> str:
+        self._ensure_index()
+        return self._digest
+
+
 # Mock implementation for testing
 class MockPointerResults:
     """
@@ -254,19 +484,19 @@ class MockPointerResults:
         callees = self.callee_map.get(call_site.site_id, set())
         return {MockFunctionSymbol(name) for name in callees}
     
-    def points_to(self, var: str, ctx: Optional[Context] = None) -> PointsToSet:
+    def points_to(self, var: str, ctx: Optional[Context] = None, scope: Optional[str] = None) -> PointsToSet:
         return MockPointsToSet([MockAbstractObject(f"obj_{var}")])
     
     def field_points_to(self, obj: AbstractObject, field: FieldKey) -> PointsToSet:
         return MockPointsToSet([MockAbstractObject(f"field_{obj.alloc_id}_{field.kind}")])
     
-    def may_alias(self, a_var: str, b_var: str, ctx: Optional[Context] = None) -> bool:
+    def may_alias(self, a_var: str, b_var: str, ctx: Optional[Context] = None, scope: Optional[str] = None) -> bool:
         if not self.precise:
             return True  # Over-approximate
         
         return (a_var, b_var) in self.alias_pairs or (b_var, a_var) in self.alias_pairs
     
-    def is_singleton(self, target: Any, ctx: Optional[Context] = None) -> bool:
+    def is_singleton(self, target: Any, ctx: Optional[Context] = None, scope: Optional[str] = None) -> bool:
         if not self.precise:
             return False  # Under-approximate
         
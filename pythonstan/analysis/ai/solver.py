@@ -1,4 +1,4 @@
-from typing import Dict, Set, List, Optional, Tuple, Any, Union, DefaultDict
+from typing import Dict, Set, List, Optional, Tuple, Any, Union, DefaultDict, Iterable
 import ast
 from collections import deque, defaultdict
 
@@ -8,18 +8,20 @@ from pythonstan.ir.ir_statements import (
     IRReturn, IRYield, IRAwait, JumpIfTrue, JumpIfFalse, Goto
 )
 from pythonstan.analysis.ai.value import (
-    Value, Object, ObjectType,
+    Value, Object, ObjectType, WideningThresholds,
     ConstantObject, BuiltinObject, ClassObject, FunctionObject, InstanceObject,
     create_unknown_value, create_none_value, create_function_value
 )
 from pythonstan.analysis.ai.state import (
-    AbstractState, Context, ContextType, FlowSensitivity,
-    Scope, MemoryModel, ClassHierarchy, CallGraph, ControlFlowState,
-    create_abstract_state
+    AbstractState, Context, ContextType, FlowSensitivity, WorklistOrder,
+    Scope, MemoryModel, ClassHierarchy, CallGraph, ControlFlowState, FunctionSummary,
+    create_abstract_state, reachable_attributes
 )
 from pythonstan.analysis.ai.operation import AbstractInterpreter
 from pythonstan.analysis.ai.pointer_adapter import PointerResults
 from pythonstan.graph.call_graph.call_graph import AbstractCallGraph
+from pythonstan.utils.lru_cache import LRUCache
+from pythonstan.utils.parallel import fork_map
 
 
 class AbstractInterpretationSolver:
@@ -40,7 +42,14 @@ class AbstractInterpretationSolver:
                 max_iterations: int = 100,
                 max_recursion_depth: int = 3,
                 pointer: Optional[PointerResults] = None,
-                call_graph: Optional[AbstractCallGraph] = None):
+                call_graph: Optional[AbstractCallGraph] = None,
+                worklist_order: WorklistOrder = WorklistOrder.FIFO,
+                widening: bool = True,
+                widening_thresholds: Iterable[Any] = (),
+                narrowing_iterations: int = 1,
+                persistent_store: bool = False,
+                transfer_cache_size: int = 10000,
+                workers: int = 0):
         """
         Initialize the abstract interpretation solver.
         
@@ -52,13 +61,37 @@ class AbstractInterpretationSolver:
             max_recursion_depth: Maximum recursion depth for interprocedural analysis
             pointer: Optional pointer analysis results for precision
             call_graph: Optional call graph for interprocedural analysis
+            worklist_order: Order in which flow-sensitive analysis processes statements
+            widening: Whether to widen at loop heads. The statement visit cap is then raised to
+                max_iterations, as a backstop only
+            widening_thresholds: Extra constants for the widening thresholds, besides the program's own
+            narrowing_iterations: Number of narrowing steps per loop head after widening converges
+            persistent_store: Whether to keep variables in persistent maps, so state snapshots share structure
+            transfer_cache_size: Maximum number of transfer function results to cache
+            workers: Number of processes to summarize calls into independent call-graph SCCs on.
+                The summaries are reused by the worklist pass; calls nested in callee bodies get
+                deeper call-site contexts, so they reuse them only where the contexts coincide,
+                as under context-insensitive analysis
         """
-        self.state = create_abstract_state(context_type, flow_sensitivity, context_depth)
+        self.state = create_abstract_state(context_type, flow_sensitivity, context_depth, worklist_order,
+                                           persistent_store)
         self.interpreter = AbstractInterpreter(self.state, pointer, call_graph, solver=self)
         self.max_iterations = max_iterations
         self.max_recursion_depth = max_recursion_depth
         self.pointer = pointer
         self.external_call_graph = call_graph
+        self.widening = widening
+        self.widening_thresholds = list(widening_thresholds)
+        self.narrowing_iterations = narrowing_iterations
+        self.workers = workers
+        if widening:
+            # Widening bounds the visits to each loop head; the cap only stays as a backstop
+            self.state.control_flow.max_visits_per_stmt = max_iterations
+        
+        # Variable states at loop heads, as of their first visit and their last widening or narrowing step,
+        # keyed by (context, function_qualname, stmt_idx)
+        self.loop_entry_states: Dict[Tuple[Context, str, int], Dict[str, Value]] = {}
+        self.loop_head_states: Dict[Tuple[Context, str, int], Dict[str, Value]] = {}
         
         # Mapping from function qualname to its IR statements
         self.func_statements: Dict[str, List[IRStatement]] = {}
@@ -73,10 +106,11 @@ class AbstractInterpretationSolver:
         self.function_contexts: Dict[str, Set[Context]] = defaultdict(set)
         
         # Performance improvements
-        self._transfer_cache: Dict[Tuple[int, str, str], Value] = {}  # (stmt_id, state_fingerprint, pointer_digest) -> result
-        self._state_cache: Dict[Tuple[str, str], AbstractState] = {}  # (function, context) -> state
-        self._cache_hits = 0
-        self._cache_misses = 0
+        self._transfer_cache: LRUCache[Value] = LRUCache(transfer_cache_size)  # (stmt_id, state_fingerprint, pointer_digest) -> result
+        # (function, arguments, context, global variables read, reachable attributes) -> summary
+        self.function_summaries: Dict[Tuple[Any, ...], FunctionSummary] = {}
+        self._summary_hits = 0
+        self._free_names: Dict[str, Set[str]] = {}  # function -> names it loads but never stores
         self._total_iterations = 0
         self._max_state_size = 0
         
@@ -218,41 +252,31 @@ class AbstractInterpretationSolver:
             # Mark that we're in worklist-based analysis
             self.interpreter._in_worklist_analysis = True
             
-            # Initialize worklist with entry point (statement 0)
-            self.state.control_flow.add_to_worklist(scope_qualname, 0)
-            
-            # Process worklist until empty
-            iter_count = 0
-            while iter_count < self.max_iterations:
-                # Get next statement from worklist
-                next_item = self.state.control_flow.get_next_from_worklist()
-                if next_item is None:
-                    # Worklist is empty, analysis is complete
-                    break
-                
-                function_name, stmt_idx = next_item
-                
-                # Make sure we're still in the right scope
-                if function_name != scope_qualname:
-                    continue
-                
-                # Check if statement index is valid
-                if stmt_idx < 0 or stmt_idx >= len(statements):
-                    continue
-                
-                # Set current statement
-                self.state.control_flow.set_current_stmt(stmt_idx)
-                
-                # Update visit count for this statement
-                key = (function_name, stmt_idx)
-                current_count = self.state.control_flow.visit_count.get(key, 0)
-                self.state.control_flow.visit_count[key] = current_count + 1
-                
-                # Interpret statement
-                stmt = statements[stmt_idx]
-                self.interpreter.visit(stmt, stmt_idx)
-                
-                iter_count += 1
+            control_flow = self.state.control_flow
+            loop_heads = control_flow.get_loop_heads(scope_qualname) if self.widening else set()
+            # A new run of the scope (e.g. a call with other arguments) starts its loops afresh
+            for head in loop_heads:
+                key = self._loop_key(scope_qualname, head)
+                self.loop_entry_states.pop(key, None)
+                self.loop_head_states.pop(key, None)
+            thresholds = self._get_widening_thresholds(statements) if loop_heads else None
+            
+            # Ascending phase: initialize worklist with entry point (statement 0)
+            control_flow.add_to_worklist(scope_qualname, 0)
+            self._run_worklist(scope_qualname, statements, loop_heads, thresholds)
+            
+            # Descending phase: revisit the loops to narrow what widening over-approximated
+            if loop_heads and self.narrowing_iterations > 0:
+                # The loop bodies are recomputed from the widened head states
+                for key in [key for key in control_flow.visit_count if key[0] == scope_qualname]:
+                    del control_flow.visit_count[key]
+                for head in sorted(loop_heads):
+                    control_flow.add_to_worklist(scope_qualname, head)
+                # The widened head states include what comes around the loops, so the
+                # interpreter reschedules the heads regardless of their joined states
+                self.interpreter._narrowing = True
+                self._run_worklist(scope_qualname, statements, loop_heads, thresholds, narrowing=True)
+                self.interpreter._narrowing = False
             
             # Clear the worklist analysis flag
             self.interpreter._in_worklist_analysis = False
@@ -263,6 +287,144 @@ class AbstractInterpretationSolver:
             for i, stmt in enumerate(statements):
                 self.interpreter.visit(stmt, i)
     
+    def _run_worklist(self, scope_qualname: str, statements: List[IRStatement], loop_heads: Set[int],
+                      thresholds: Optional[WideningThresholds], narrowing: bool = False):
+        """
+        Process the worklist of a scope until it is empty or the iteration limit is reached.
+        
+        Args:
+            scope_qualname: Qualified name of the scope
+            statements: List of IR statements in the scope
+            loop_heads: Statements at which to widen (or narrow) the variable state
+            thresholds: Widening thresholds for the scope
+            narrowing: Whether this is the descending phase
+        """
+        narrowing_steps: Dict[int, int] = defaultdict(int)
+        iter_count = 0
+        while iter_count < self.max_iterations:
+            # Get next statement from worklist
+            next_item = self.state.control_flow.get_next_from_worklist()
+            if next_item is None:
+                # Worklist is empty, analysis is complete
+                break
+            
+            function_name, stmt_idx = next_item
+            
+            # Make sure we're still in the right scope
+            if function_name != scope_qualname:
+                continue
+            
+            # Check if statement index is valid
+            if stmt_idx < 0 or stmt_idx >= len(statements):
+                continue
+            
+            if stmt_idx in loop_heads:
+                if narrowing:
+                    # The first visit restarts the loop from its widened state; the
+                    # later ones come around the loop and narrow that state
+                    narrowing_steps[stmt_idx] += 1
+                    if narrowing_steps[stmt_idx] == 1:
+                        self._set_loop_head_state(scope_qualname, stmt_idx,
+                                                  self.loop_head_states.get(self._loop_key(scope_qualname, stmt_idx), {}))
+                    elif (narrowing_steps[stmt_idx] > self.narrowing_iterations + 1 or
+                            not self._narrow_at_loop_head(scope_qualname, stmt_idx)):
+                        continue
+                elif not self._widen_at_loop_head(scope_qualname, stmt_idx, thresholds):
+                    # The loop is stable; don't propagate around it again
+                    continue
+            
+            # Set current statement
+            self.state.control_flow.set_current_stmt(stmt_idx)
+            
+            # Update visit count for this statement. While narrowing, it is counted after
+            # the visit, so the first pass over a loop body recomputes it from the head
+            # state with strong updates instead of merging into the widened values
+            key = (function_name, stmt_idx)
+            current_count = self.state.control_flow.visit_count.get(key, 0)
+            if not narrowing:
+                self.state.control_flow.visit_count[key] = current_count + 1
+            
+            # Interpret statement
+            stmt = statements[stmt_idx]
+            self.interpreter.visit(stmt, stmt_idx)
+            
+            if narrowing:
+                self.state.control_flow.visit_count[key] = current_count + 1
+            iter_count += 1
+    
+    def _get_widening_thresholds(self, statements: List[IRStatement]) -> WideningThresholds:
+        """Collect the widening thresholds of a scope from its constants and the configured ones"""
+        constants = list(self.widening_thresholds)
+        for stmt in statements:
+            if isinstance(stmt, IRScope):
+                continue
+            stmt_ast = stmt.get_ast()
+            if isinstance(stmt_ast, ast.AST):
+                constants.extend(node.value for node in ast.walk(stmt_ast) if isinstance(node, ast.Constant))
+        return WideningThresholds.from_constants(constants)
+    
+    def _loop_key(self, scope_qualname: str, stmt_idx: int) -> Tuple[Context, str, int]:
+        """Key of a loop head in the loop head states, in the current context"""
+        return (self.state.current_context, scope_qualname, stmt_idx)
+    
+    def _widen_at_loop_head(self, scope_qualname: str, stmt_idx: int,
+                            thresholds: Optional[WideningThresholds]) -> bool:
+        """
+        Widen the variable state at a loop head with the state of its previous visit.
+        
+        Returns:
+            Whether the state grew, i.e. the loop head has to be interpreted again
+        """
+        key = self._loop_key(scope_qualname, stmt_idx)
+        current = self.state.snapshot_variables()
+        previous = self.loop_head_states.get(key)
+        if previous is None:
+            self.loop_entry_states[key] = current
+            self.loop_head_states[key] = current
+            return True
+        
+        widened = {name: previous[name].widen(value, thresholds) if name in previous else value
+                   for name, value in current.items()}
+        if all(previous.get(name) is value for name, value in widened.items()):
+            return False
+        self._set_loop_head_state(scope_qualname, stmt_idx, widened)
+        return True
+    
+    def _set_loop_head_state(self, scope_qualname: str, stmt_idx: int, variables: Dict[str, Value]):
+        """Set the variables to a new state of a loop head"""
+        key = self._loop_key(scope_qualname, stmt_idx)
+        # The head is a merge point; the new state replaces the states joined there so far
+        self.state.control_flow.set_merge_state(scope_qualname, stmt_idx, variables)
+        for name, value in variables.items():
+            self.state.set_variable(name, value)
+        self.loop_head_states[key] = variables
+    
+    def _narrow_at_loop_head(self, scope_qualname: str, stmt_idx: int) -> bool:
+        """
+        Narrow the widened variable state at a loop head with the state reaching it,
+        i.e. the state on loop entry joined with the current one.
+        
+        Returns:
+            Whether the state was refined, i.e. the loop head has to be interpreted again
+        """
+        key = self._loop_key(scope_qualname, stmt_idx)
+        previous = self.loop_head_states.get(key)
+        if previous is None:
+            return False
+        entry = self.loop_entry_states[key]
+        current = self.state.snapshot_variables()
+        narrowed = {}
+        for name, value in previous.items():
+            if name not in current:
+                narrowed[name] = value
+                continue
+            reaching = entry[name].merge(current[name]) if name in entry else current[name]
+            narrowed[name] = value.narrow(reaching)
+        if all(narrowed[name] is value for name, value in previous.items()):
+            return False
+        self._set_loop_head_state(scope_qualname, stmt_idx, narrowed)
+        return True
+    
     def _perform_interprocedural_analysis(self):
         """
         Perform interprocedural analysis on the program.
@@ -313,37 +475,19 @@ class AbstractInterpretationSolver:
             args = self._collect_arguments_for_call(call_site)
             
             # Get function object
-            func_value = self.state.get_variable(callee_qualname.split('.')[-1])
-            func_obj = None
-            if func_value:
-                for obj in func_value.objects:
-                    if isinstance(obj, FunctionObject) and obj.qualname == callee_qualname:
-                        func_obj = obj
-                        break
+            func_obj = self._find_function_object(callee_qualname)
             
             if func_obj:
-                # Enter function
-                self.state.enter_function(
-                    func_obj.ir_func, 
-                    args,
-                    call_site.stmt_index, 
-                    None  # No receiver for non-method calls
-                )
-                
-                # Reset the return value before analyzing the function
-                self.interpreter.current_return_value = None
-                
-                # Analyze function if not already analyzed
-                if callee_qualname not in self.analyzed_functions:
-                    self._perform_intraprocedural_analysis(callee_qualname)
+                summary_key, attributes = self.summary_key(callee_qualname, args, callee_context)
+                summary = self.lookup_summary(summary_key)
+                reused = summary is not None
+                if reused:
+                    # The callee was analysed for these inputs already
+                    summary.apply(self.state.memory)
+                    return_value = summary.return_value
                 else:
-                    # Just reanalyze with new context
-                    self._analyze_scope(callee_qualname, self.func_statements[callee_qualname])
-                
-                # Get return value
-                return_value = self.interpreter.current_return_value
-                if return_value is None:
-                    return_value = create_none_value()
+                    summary = self._summarize_call(call_site, func_obj, args, summary_key, attributes)
+                    return_value = summary.return_value
                 
                 # Set return value in caller
                 target = None
@@ -359,9 +503,10 @@ class AbstractInterpretationSolver:
                     # Set variable in caller context
                     self.state.set_variable(target, return_value)
                     
-                    # Check if value changed and if we need to reanalyze caller
-                    # This is a simplified check - a real implementation would be more sophisticated
-                    worklist.append((call_site, callee_qualname))
+                    # Revisit the call while it produces new summaries; once its
+                    # inputs match an existing summary, nothing changes any more
+                    if not reused:
+                        worklist.append((call_site, callee_qualname))
             
             # Pop call stack
             self.callstack.pop()
@@ -371,36 +516,187 @@ class AbstractInterpretationSolver:
             
             iter_count += 1
     
+    def _find_function_object(self, callee_qualname: str) -> Optional[FunctionObject]:
+        """Get the function object of a callee from the current state"""
+        func_value = self.state.get_variable(callee_qualname.split('.')[-1])
+        if func_value:
+            for obj in func_value.objects:
+                if isinstance(obj, FunctionObject) and obj.qualname == callee_qualname:
+                    return obj
+        return None
+    
+    def _summarize_call(self, call_site, func_obj: FunctionObject, args: List[Value],
+                        summary_key: Tuple[Any, ...], attributes: Dict[Tuple[Object, str], Value]) -> FunctionSummary:
+        """
+        Analyse the callee of a call and memoize its summary.
+        
+        Args:
+            call_site: CallSite object representing the call
+            func_obj: Function object of the callee
+            args: Argument values
+            summary_key: Key from ``summary_key``
+            attributes: Reachable attributes from ``summary_key``
+            
+        Returns:
+            The summary of the call
+        """
+        callee_qualname = func_obj.qualname
+        caller_function = self.state.control_flow.current_function
+        caller_scope = self.state.memory.current_scope
+        global_bindings = self.global_bindings()
+        
+        # Enter function
+        self.state.enter_function(
+            func_obj.ir_func, 
+            args,
+            call_site.stmt_index, 
+            None  # No receiver for non-method calls
+        )
+        
+        # Reset the return value before analyzing the function
+        self.interpreter.current_return_value = None
+        
+        # Analyze function if not already analyzed
+        if callee_qualname not in self.analyzed_functions:
+            self._perform_intraprocedural_analysis(callee_qualname)
+        else:
+            # Just reanalyze with new context
+            self._analyze_scope(callee_qualname, self.func_statements[callee_qualname])
+        
+        # Get return value
+        return_value = self.interpreter.current_return_value
+        if return_value is None:
+            return_value = create_none_value()
+        summary = self.record_summary(summary_key, attributes, args, return_value, global_bindings)
+        
+        # Return to the caller
+        self.state.control_flow.set_current_function(caller_function)
+        self.state.memory.current_scope = caller_scope
+        return summary
+    
     def _perform_interprocedural_analysis_with_scc(self):
         """
         Perform interprocedural analysis using SCC-based topological ordering.
         
-        Analyzes strongly connected components in bottom-up order for better
-        convergence and reuses summaries until they change.
+        With ``workers``, the calls are first summarized bottom-up over the SCCs of
+        the call graph (see ``_call_graph_levels``); the worklist pass then reuses
+        those summaries until their inputs change.
         """
-        if not self.external_call_graph:
-            # Fallback to regular interprocedural analysis
-            self._perform_interprocedural_analysis()
-            return
-        
-        # TODO: Implement SCC computation from call graph
-        # For now, use simple worklist algorithm with improved caching
+        if self.workers > 1:
+            self._summarize_calls_in_parallel()
         self._perform_interprocedural_analysis()
     
-    def _get_state_fingerprint(self, state: AbstractState) -> str:
+    def summary_key(self, callee_qualname: str, args: List[Value],
+                    context: Context) -> Tuple[Tuple[Any, ...], Dict[Tuple[Object, str], Value]]:
+        """
+        Get the key of the summary of a call.
+        
+        Besides the arguments and the context, a callee reads the global variables
+        in ``_global_reads`` and the attributes of the objects reachable from its
+        arguments and from those globals, so those are part of the key.
+        
+        Args:
+            callee_qualname: Qualified name of the callee
+            args: Abstract argument values
+            context: Context the callee is analysed in
+            
+        Returns:
+            The key, and the reachable attributes it was built from
+        """
+        global_scope = self.state.memory.global_scope
+        global_reads = self._global_reads(callee_qualname)
+        read_bindings = frozenset((name, global_scope.get_local(name)) for name in global_reads)
+        attributes = reachable_attributes(self._summary_inputs(callee_qualname, args))
+        key = (callee_qualname, tuple(arg.intern() for arg in args), context,
+               read_bindings, frozenset(attributes.items()))
+        return key, attributes
+    
+    def lookup_summary(self, key: Tuple[Any, ...]) -> Optional[FunctionSummary]:
+        """Get the memoized summary of a call, if any"""
+        summary = self.function_summaries.get(key)
+        if summary is not None:
+            self._summary_hits += 1
+        return summary
+    
+    def _global_reads(self, callee_qualname: str) -> Set[str]:
+        """
+        Get the global variables a callee may read.
+        
+        These are the names the callee loads without storing them, together with
+        those of the functions bound to such names, transitively. Globals the
+        callee never names cannot change its result, so writes to them (e.g. the
+        caller binding the result of the call) do not invalidate its summary.
+        """
+        global_scope = self.state.memory.global_scope
+        if not global_scope:
+            return set()
+        names: Set[str] = set()
+        visited: Set[str] = set()
+        todo = [callee_qualname]
+        while todo:
+            qualname = todo.pop()
+            if qualname in visited or qualname not in self.func_statements:
+                continue
+            visited.add(qualname)
+            if qualname not in self._free_names:
+                statements = self.func_statements[qualname]
+                loads = set().union(*(stmt.get_loads() for stmt in statements))
+                stores = set().union(*(stmt.get_stores() for stmt in statements))
+                self._free_names[qualname] = loads - stores
+            for name in self._free_names[qualname] - names:
+                value = global_scope.get_local(name)
+                if value is None:
+                    continue
+                names.add(name)
+                todo.extend(obj.qualname for obj in value.objects if isinstance(obj, FunctionObject))
+        return names
+    
+    def _summary_inputs(self, callee_qualname: str, args: List[Value]) -> List[Value]:
+        """Get the values a callee can reach objects from: its arguments and the globals it may read"""
+        global_scope = self.state.memory.global_scope
+        return list(args) + [global_scope.get_local(name) for name in self._global_reads(callee_qualname)]
+    
+    def global_bindings(self) -> Dict[Tuple[Optional[Context], str], Value]:
+        """Get the variables of the global scope, by context (None for the scope itself) and name"""
+        global_scope = self.state.memory.global_scope
+        return self._function_bindings(global_scope.get_qualname()) if global_scope else {}
+    
+    def record_summary(self, key: Tuple[Any, ...], attributes: Dict[Tuple[Object, str], Value],
+                       args: List[Value], return_value: Value,
+                       global_bindings: Dict[Tuple[Optional[Context], str], Value]) -> FunctionSummary:
+        """
+        Memoize the summary of a call once the callee has been analysed.
+        
+        Args:
+            key: Key from ``summary_key``
+            attributes: Reachable attributes from ``summary_key``, as of before the call
+            args: Abstract argument values
+            return_value: Return value of the callee
+            global_bindings: Global variables from ``global_bindings``, as of before the call
+            
+        Returns:
+            The new summary
+        """
+        callee_qualname = key[0]
+        side_effects = FunctionSummary.diff_attributes(
+            attributes, reachable_attributes(self._summary_inputs(callee_qualname, args)))
+        global_writes = {key: value for key, value in self.global_bindings().items()
+                         if global_bindings.get(key) is not value}
+        summary = FunctionSummary(return_value, side_effects, global_writes)
+        self.function_summaries[key] = summary
+        return summary
+    
+    def _get_state_fingerprint(self, state: AbstractState) -> int:
         """
-        Compute a fingerprint for an abstract state for caching.
+        Get the fingerprint of an abstract state for caching.
         
         Args:
             state: Abstract state to fingerprint
             
         Returns:
-            String fingerprint of the state
+            128-bit Zobrist fingerprint of the state's variables and current context
         """
-        # Simplified fingerprint - real implementation would be more sophisticated
-        var_count = len(state.variables) if hasattr(state, 'variables') else 0
-        context_str = str(state.current_context) if state.current_context else "none"
-        return f"vars:{var_count},ctx:{hash(context_str)}"
+        return state.fingerprint()
     
     def _should_use_cache(self, stmt_id: int, state: AbstractState) -> Optional[Value]:
         """
@@ -416,20 +712,12 @@ class AbstractInterpretationSolver:
         if not self.pointer:
             return None
         
-        state_fp = self._get_state_fingerprint(state)
-        pointer_digest = self.pointer.pointer_digest_version()
-        cache_key = (stmt_id, state_fp, pointer_digest)
-        
-        if cache_key in self._transfer_cache:
-            self._cache_hits += 1
-            return self._transfer_cache[cache_key]
-        
-        self._cache_misses += 1
-        return None
+        cache_key = (stmt_id, self._get_state_fingerprint(state), self.pointer.pointer_digest_version())
+        return self._transfer_cache.get(cache_key)
     
     def _cache_result(self, stmt_id: int, state: AbstractState, result: Value):
         """
-        Cache the result of a transfer function.
+        Cache the result of a transfer function; the least recently used result is evicted when full.
         
         Args:
             stmt_id: Statement identifier
@@ -439,32 +727,24 @@ class AbstractInterpretationSolver:
         if not self.pointer:
             return
         
-        state_fp = self._get_state_fingerprint(state)
-        pointer_digest = self.pointer.pointer_digest_version()
-        cache_key = (stmt_id, state_fp, pointer_digest)
-        
-        self._transfer_cache[cache_key] = result
-        
-        # Limit cache size to prevent memory explosion
-        if len(self._transfer_cache) > 10000:
-            # Remove oldest 20% of entries
-            keys_to_remove = list(self._transfer_cache.keys())[:2000]
-            for key in keys_to_remove:
-                del self._transfer_cache[key]
+        cache_key = (stmt_id, self._get_state_fingerprint(state), self.pointer.pointer_digest_version())
+        self._transfer_cache.put(cache_key, result)
     
     def _log_performance_stats(self):
         """
         Log performance statistics for this analysis run.
         """
-        cache_hit_ratio = self._cache_hits / max(1, self._cache_hits + self._cache_misses)
+        cache = self._transfer_cache
         
         print(f"AI Analysis Performance Stats:")
         print(f"  Total iterations: {self._total_iterations}")
         print(f"  Max state size: {self._max_state_size}")
-        print(f"  Cache hits: {self._cache_hits}")
-        print(f"  Cache misses: {self._cache_misses}")
-        print(f"  Cache hit ratio: {cache_hit_ratio:.2%}")
-        print(f"  Transfer cache size: {len(self._transfer_cache)}")
+        print(f"  Function summaries: {len(self.function_summaries)} ({self._summary_hits} reused)")
+        print(f"  Cache hits: {cache.hits}")
+        print(f"  Cache misses: {cache.misses}")
+        print(f"  Cache hit ratio: {cache.hit_ratio:.2%}")
+        print(f"  Cache evictions: {cache.evictions}")
+        print(f"  Transfer cache size: {len(cache)}/{cache.maxsize}")
     
     def _check_recursion_limit(self, function_qualname: str) -> bool:
         """
@@ -535,6 +815,168 @@ class AbstractInterpretationSolver:
         self.state.set_current_context(old_context)
         
         return args
+    
+    def _call_graph_levels(self) -> Dict[str, int]:
+        """
+        Get the level of each function in the condensation of the call graph.
+        
+        The functions of an SCC share its level: SCCs that call no other SCC are at
+        level 0, and every other SCC is one level above the highest SCC it calls.
+        """
+        callees = self.state.call_graph.callees
+        nodes = sorted(set(callees) | {callee for succs in callees.values() for callee in succs})
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        levels: Dict[str, int] = {}
+        # Tarjan's algorithm, iteratively; SCCs are completed callees first
+        for root in nodes:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            frames = [(root, iter(sorted(callees.get(root, ()))))]
+            while frames:
+                node, succs = frames[-1]
+                succ = next(succs, None)
+                if succ is not None:
+                    if succ not in index:
+                        index[succ] = lowlink[succ] = len(index)
+                        stack.append(succ)
+                        on_stack.add(succ)
+                        frames.append((succ, iter(sorted(callees.get(succ, ())))))
+                    elif succ in on_stack:
+                        lowlink[node] = min(lowlink[node], index[succ])
+                    continue
+                frames.pop()
+                if frames:
+                    lowlink[frames[-1][0]] = min(lowlink[frames[-1][0]], lowlink[node])
+                if lowlink[node] != index[node]:
+                    continue
+                scc = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    scc.add(member)
+                    if member == node:
+                        break
+                level = max((levels[callee] + 1 for member in scc for callee in callees.get(member, ())
+                             if callee not in scc), default=0)
+                for member in scc:
+                    levels[member] = level
+        return levels
+    
+    def _summarize_calls_in_parallel(self):
+        """
+        Summarize the registered calls on ``workers`` processes, bottom-up over the call-graph SCCs.
+        
+        Calls into SCCs at the same level are independent, so each level is mapped
+        over the pool. Workers send back the summaries and the variables the callees
+        bound, which are merged into the state in call order, so the result does not
+        depend on scheduling.
+        
+        Each call is keyed with the context the worklist pass gives it, one call site
+        deep, so that pass reuses the summaries. A call inside a callee's body is
+        analysed in a context extended by the call site of the callee, so with
+        call-site sensitivity it does not hit the summaries of lower levels; the
+        bottom-up order then only pays off in the worklist pass.
+        """
+        levels = self._call_graph_levels()
+        start_context = self.state.current_context
+        jobs_by_level: Dict[int, List[Tuple[Any, ...]]] = defaultdict(list)
+        keys = set(self.function_summaries)
+        for callee_qualname, call_sites in sorted(self.state.call_graph.callers.items()):
+            func_obj = self._find_function_object(callee_qualname)
+            if func_obj is None or callee_qualname not in self.func_statements:
+                continue
+            for call_site in call_sites:
+                # Same context, arguments and key as the worklist pass computes for the call
+                callee_context = self.state.create_context(call_site.stmt_index)
+                self.state.set_current_context(callee_context)
+                args = self._collect_arguments_for_call(call_site)
+                self.state.set_current_context(start_context)
+                summary_key, attributes = self.summary_key(callee_qualname, args, callee_context)
+                if summary_key in keys:
+                    continue
+                keys.add(summary_key)
+                jobs_by_level[levels.get(callee_qualname, 0)].append(
+                    (call_site, func_obj, callee_context, args, summary_key, attributes))
+        
+        shared = self._shared_objects()
+        for level in sorted(jobs_by_level):
+            jobs = jobs_by_level[level]
+            results = fork_map(self._summarize_job, jobs, self.workers, shared)
+            for (_, func_obj, _, _, summary_key, _), (summary, bindings) in zip(jobs, results):
+                self._merge_call_result(func_obj, summary_key, summary, bindings)
+    
+    def _summarize_job(self, job: Tuple[Any, ...]) -> Tuple[FunctionSummary, Dict[Tuple[Optional[Context], str], Value]]:
+        """Summarize one call; runs in a worker, so everything it computes is returned"""
+        call_site, func_obj, callee_context, args, summary_key, attributes = job
+        old_context = self.state.current_context
+        before = self._function_bindings(func_obj.qualname)
+        self.callstack.append(func_obj.qualname)
+        self.state.set_current_context(callee_context)
+        summary = self._summarize_call(call_site, func_obj, args, summary_key, attributes)
+        self.state.set_current_context(old_context)
+        self.callstack.pop()
+        bindings = {key: value for key, value in self._function_bindings(func_obj.qualname).items()
+                    if before.get(key) is not value}
+        return summary, bindings
+    
+    def _function_bindings(self, function_qualname: str) -> Dict[Tuple[Optional[Context], str], Value]:
+        """Get the variables of a function's scope, by context (None for the scope itself) and name"""
+        memory = self.state.memory
+        bindings: Dict[Tuple[Optional[Context], str], Value] = {}
+        scope = memory.get_scope(function_qualname)
+        if scope:
+            for name in sorted(scope.get_all_variable_names()):
+                bindings[(None, name)] = scope.get_local(name)
+        for (context, scope_qualname, name), value in memory.ctx_locals.items():
+            if scope_qualname == function_qualname:
+                bindings[(context, name)] = value
+        return bindings
+    
+    def _merge_call_result(self, func_obj: FunctionObject, summary_key: Tuple[Any, ...], summary: FunctionSummary,
+                           bindings: Dict[Tuple[Optional[Context], str], Value]):
+        """Merge the summary of a call and the variables its callee bound into the state"""
+        callee_qualname = func_obj.qualname
+        self.function_summaries.setdefault(summary_key, summary)
+        memory = self.state.memory
+        if memory.get_scope(callee_qualname) is None:
+            memory.create_function_scope(func_obj.ir_func)
+        for (context, name), value in bindings.items():
+            memory.merge_variable(name, value, context, callee_qualname)
+        for (obj, name), value in summary.side_effects.items():
+            existing = obj.get_attr(name)
+            obj.set_attr(name, existing.merge(value) if existing else value)
+        if memory.global_scope:
+            for (context, name), value in summary.global_writes.items():
+                memory.merge_variable(name, value, context, memory.global_scope.get_qualname())
+        if callee_qualname not in self.analyzed_functions:
+            current_function = self.state.control_flow.current_function
+            self._build_cfg(callee_qualname, self.func_statements[callee_qualname])
+            self.state.control_flow.set_current_function(current_function)
+            self.analyzed_functions.add(callee_qualname)
+    
+    def _shared_objects(self) -> List[Any]:
+        """Get the objects of the state that worker results may refer to"""
+        shared: List[Any] = [stmt for stmts in self.func_statements.values() for stmt in stmts]
+        memory = self.state.memory
+        values = [value for scope in memory.scopes.values()
+                  for value in (scope.get_local(name) for name in scope.get_all_variable_names())]
+        values.extend(memory.ctx_locals.values())
+        attributes = reachable_attributes(values)
+        values.extend(attributes.values())
+        shared.extend(values)
+        objects = {id(obj): obj for value in values for obj in value.objects}
+        for obj in objects.values():
+            shared.append(obj)
+            for name in ('ir_func', 'ir_class', 'class_obj'):
+                if hasattr(obj, name):
+                    shared.append(getattr(obj, name))
+        return shared
 
 
 # Helper function to create a solver with specified parameters
@@ -545,7 +987,14 @@ def create_solver(
     max_iterations: int = 100,
     max_recursion_depth: int = 3,
     pointer: Optional[PointerResults] = None,
-    call_graph: Optional[AbstractCallGraph] = None
+    call_graph: Optional[AbstractCallGraph] = None,
+    worklist_order: WorklistOrder = WorklistOrder.FIFO,
+    widening: bool = True,
+    widening_thresholds: Iterable[Any] = (),
+    narrowing_iterations: int = 1,
+    persistent_store: bool = False,
+    transfer_cache_size: int = 10000,
+    workers: int = 0
 ) -> AbstractInterpretationSolver:
     """Create a new abstract interpretation solver"""
     return AbstractInterpretationSolver(
@@ -555,5 +1004,12 @@ def create_solver(
         max_iterations,
         max_recursion_depth,
         pointer,
-        call_graph
-    ) 
\ No newline at end of file
+        call_graph,
+        worklist_order,
+        widening,
+        widening_thresholds,
+        narrowing_iterations,
+        persistent_store,
+        transfer_cache_size,
+        workers
+    ) 
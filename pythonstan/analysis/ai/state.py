@@ -3,9 +3,11 @@ from enum import Enum
 from typing import Dict, Set, List, Optional, Tuple, Any, DefaultDict, Union, FrozenSet
 from collections import defaultdict
 import ast
+import heapq
 import sys
 from dataclasses import dataclass, field
 
+from pythonstan.utils.persistent_rb_tree import PersistentMap
 from pythonstan.ir.ir_statements import (
     IRStatement, IRScope, IRFunc, IRClass, IRModule, Label, 
     AbstractIRAssign, IRAssign, IRStoreAttr, IRLoadAttr, IRCall
@@ -73,14 +75,40 @@ class FlowSensitivity(Enum):
     SENSITIVE = 1     # Full flow sensitivity
 
 
+class WorklistOrder(Enum):
+    """Order in which the flow-sensitive worklist hands out statements"""
+    FIFO = 0  # In the order they were added
+    RPO = 1   # By reverse-postorder index of the function's CFG, loop heads after their loop body
+
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(x: int) -> int:
+    """Spread the bits of a 64-bit integer (splitmix64 finalizer)"""
+    x &= _MASK64
+    x = ((x ^ (x >> 30)) * 0xbf58476d1ce4e5b9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94d049bb133111eb) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _zobrist_key(*parts: Any) -> int:
+    """Hash a variable binding to a 128-bit key, built from two differently salted hashes of its parts"""
+    return (_mix64(hash(parts)) << 64) | _mix64(hash((0x9e3779b97f4a7c15,) + parts))
+
+
 class Scope:
     """Represents a variable scope (function, class, or module)"""
     
-    def __init__(self, ir_scope: IRScope, parent_scope: Optional['Scope'] = None):
+    def __init__(self, ir_scope: IRScope, parent_scope: Optional['Scope'] = None, persistent: bool = False):
         self.ir_scope = ir_scope
         self.parent_scope = parent_scope
         self.qualname = ir_scope.get_qualname()
-        self.locals: Dict[str, Value] = {}
+        # A persistent map makes snapshots O(1) and lets them share structure
+        self.locals: Union[Dict[str, Value], PersistentMap] = PersistentMap() if persistent else {}
+        # Zobrist fingerprint of the locals: the XOR of the keys of their bindings
+        self.fingerprint = 0
+        self.binding_keys: Dict[str, int] = {}
         
     def get_local(self, name: str) -> Optional[Value]:
         """Get a local variable from this scope"""
@@ -89,6 +117,9 @@ class Scope:
     def set_local(self, name: str, value: Value):
         """Set a local variable in this scope"""
         self.locals[name] = value
+        key = _zobrist_key(self.qualname, name, value)
+        self.fingerprint ^= self.binding_keys.get(name, 0) ^ key
+        self.binding_keys[name] = key
     
     def has_local(self, name: str) -> bool:
         """Check if this scope has a local variable"""
@@ -114,37 +145,54 @@ class Scope:
     def get_all_variable_names(self) -> Set[str]:
         """Get all variable names in this scope (local only)"""
         return set(self.locals.keys())
+    
+    def snapshot(self) -> Union[Dict[str, Value], PersistentMap]:
+        """Get a copy of the local variables; shares structure with the scope if it is persistent"""
+        return self.locals.copy()
 
 
 class MemoryModel:
     """Manages variable storage for the abstract interpreter"""
     
-    def __init__(self):
+    def __init__(self, persistent: bool = False):
+        self.persistent = persistent  # Whether scopes store their variables in persistent maps
         self.global_scope: Optional[Scope] = None
         self.scopes: Dict[str, Scope] = {}  # qualname -> Scope
         self.current_scope: Optional[Scope] = None
         
         # Context-sensitive storage
         self.ctx_locals: Dict[Tuple[Context, str, str], Value] = {}  # (context, scope_qualname, var_name) -> Value
+        self.ctx_binding_keys: Dict[Tuple[Context, str, str], int] = {}
+        
+        # Zobrist fingerprint of all variables: the XOR of the scope fingerprints and the
+        # keys of the context-specific bindings, kept up to date as variables are set
+        self.fingerprint = 0
+        
+    def _add_scope(self, scope: Scope):
+        """Register a scope, replacing any earlier scope with the same qualname"""
+        old_scope = self.scopes.get(scope.get_qualname())
+        if old_scope is not None:
+            self.fingerprint ^= old_scope.fingerprint
+        self.scopes[scope.get_qualname()] = scope
         
     def create_global_scope(self, ir_module: IRModule):
         """Create and set the global scope"""
-        self.global_scope = Scope(ir_module)
-        self.scopes[ir_module.get_qualname()] = self.global_scope
+        self.global_scope = Scope(ir_module, persistent=self.persistent)
+        self._add_scope(self.global_scope)
         self.current_scope = self.global_scope
     
     def create_function_scope(self, ir_func: IRFunc, parent_scope_name: Optional[str] = None):
         """Create a function scope"""
         parent_scope = self.get_scope(parent_scope_name) if parent_scope_name else self.global_scope
-        scope = Scope(ir_func, parent_scope)
-        self.scopes[ir_func.get_qualname()] = scope
+        scope = Scope(ir_func, parent_scope, self.persistent)
+        self._add_scope(scope)
         return scope
     
     def create_class_scope(self, ir_class: IRClass, parent_scope_name: Optional[str] = None):
         """Create a class scope"""
         parent_scope = self.get_scope(parent_scope_name) if parent_scope_name else self.global_scope
-        scope = Scope(ir_class, parent_scope)
-        self.scopes[ir_class.get_qualname()] = scope
+        scope = Scope(ir_class, parent_scope, self.persistent)
+        self._add_scope(scope)
         return scope
     
     def get_scope(self, qualname: str) -> Optional[Scope]:
@@ -188,9 +236,15 @@ class MemoryModel:
         if context and context.context_id:
             ctx_key = (context, scope.get_qualname(), name)
             self.ctx_locals[ctx_key] = value
+            key = _zobrist_key(*ctx_key, value)
+            self.fingerprint ^= self.ctx_binding_keys.get(ctx_key, 0) ^ key
+            self.ctx_binding_keys[ctx_key] = key
         else:
             # Otherwise store in normal scope
+            old_fingerprint = scope.fingerprint
             scope.set_local(name, value)
+            if self.scopes.get(scope.get_qualname()) is scope:
+                self.fingerprint ^= old_fingerprint ^ scope.fingerprint
     
     def merge_variable(self, name: str, value: Value, context: Optional[Context] = None, scope_name: Optional[str] = None):
         """Merge a new value with the existing value of a variable"""
@@ -317,6 +371,45 @@ class ClassHierarchy:
         return None
 
 
+def reachable_attributes(values: List[Value]) -> Dict[Tuple[Object, str], Value]:
+    """Get the attributes of all objects reachable from some values through attributes"""
+    attributes: Dict[Tuple[Object, str], Value] = {}
+    visited: Set[int] = set()
+    todo = [obj for value in values for obj in value.objects]
+    while todo:
+        obj = todo.pop()
+        if id(obj) in visited:
+            continue
+        visited.add(id(obj))
+        for name, value in obj.attributes.items():
+            attributes[(obj, name)] = value
+            todo.extend(value.objects)
+    return attributes
+
+
+@dataclass
+class FunctionSummary:
+    """The effect of a function for some abstract inputs: its return value, attribute writes and global writes"""
+    return_value: Value
+    side_effects: Dict[Tuple[Object, str], Value] = field(default_factory=dict)  # (object, attribute) -> value
+    global_writes: Dict[Tuple[Optional[Context], str], Value] = field(default_factory=dict)  # (context, name) -> value
+    
+    @staticmethod
+    def diff_attributes(before: Dict[Tuple[Object, str], Value],
+                        after: Dict[Tuple[Object, str], Value]) -> Dict[Tuple[Object, str], Value]:
+        """Get the attributes that changed between two results of ``reachable_attributes``"""
+        return {key: value for key, value in after.items() if before.get(key) is not value}
+    
+    def apply(self, memory: MemoryModel):
+        """Replay the attribute and global variable writes of the function"""
+        for (obj, name), value in self.side_effects.items():
+            obj.set_attr(name, value)
+        if self.global_writes and memory.global_scope:
+            global_qualname = memory.global_scope.get_qualname()
+            for (context, name), value in self.global_writes.items():
+                memory.set_variable(name, value, context, global_qualname)
+
+
 @dataclass
 class CallSite:
     """Represents a call site in the call graph"""
@@ -383,8 +476,10 @@ class CallGraph:
 class ControlFlowState:
     """Tracks the control flow state during abstract interpretation"""
     
-    def __init__(self, flow_sensitivity: FlowSensitivity = FlowSensitivity.SENSITIVE):
+    def __init__(self, flow_sensitivity: FlowSensitivity = FlowSensitivity.SENSITIVE,
+                 worklist_order: WorklistOrder = WorklistOrder.FIFO):
         self.flow_sensitivity = flow_sensitivity
+        self.worklist_order = worklist_order
         self.cfg: DefaultDict[str, Dict[int, Set[int]]] = defaultdict(dict)  # qualname -> {stmt_idx -> {next_idx}}
         self.reverse_cfg: DefaultDict[str, Dict[int, Set[int]]] = defaultdict(dict)  # qualname -> {stmt_idx -> {prev_idx}}
         self.current_function: Optional[str] = None
@@ -398,11 +493,15 @@ class ControlFlowState:
         # Flow-sensitive state
         self.visited_stmts: Set[Tuple[str, int]] = set()  # (function_qualname, stmt_idx)
         self.visit_count: Dict[Tuple[str, int], int] = {}  # (function_qualname, stmt_idx) -> count
-        self.worklist: List[Tuple[str, int]] = []  # (function_qualname, stmt_idx)
-        self.max_visits_per_stmt = 5  # Limit to prevent infinite loops
+        self.worklist: List[Tuple[float, int, Tuple[str, int]]] = []  # heap of (priority, seq, (function_qualname, stmt_idx))
+        self.in_worklist: Set[Tuple[str, int]] = set()  # keys currently queued, to drop duplicates
+        self.worklist_seq = 0  # insertion counter; the priority in FIFO mode and the tie-breaker otherwise
+        self.priorities: Dict[str, Dict[int, float]] = {}  # qualname -> {stmt_idx -> priority}, built lazily
+        self.loop_heads: Dict[str, Set[int]] = {}  # qualname -> targets of back edges, built with the priorities
+        self.max_visits_per_stmt: Optional[int] = 5  # Limit to prevent infinite loops; None for no limit
         
-        # State snapshots for merge points
-        self.state_snapshots: Dict[Tuple[str, int], List[Dict[str, 'Value']]] = {}  # (func, stmt) -> [variable_states]
+        # Joined variable state at each merge point, updated as states arrive
+        self.merge_states: Dict[Tuple[str, int], Union[Dict[str, 'Value'], PersistentMap]] = {}  # (func, stmt) -> variable_state
     
     def add_edge(self, function_qualname: str, from_idx: int, to_idx: int):
         """Add a control flow edge"""
@@ -417,6 +516,8 @@ class ControlFlowState:
         if to_idx not in self.reverse_cfg[function_qualname]:
             self.reverse_cfg[function_qualname][to_idx] = set()
         self.reverse_cfg[function_qualname][to_idx].add(from_idx)
+        self.priorities.pop(function_qualname, None)
+        self.loop_heads.pop(function_qualname, None)
     
     def register_label(self, function_qualname: str, label: Label, stmt_idx: int):
         """Register a label in the control flow graph"""
@@ -460,29 +561,130 @@ class ControlFlowState:
         """Add a statement to the worklist for flow-sensitive analysis"""
         key = (function_qualname, stmt_idx)
         
+        if key in self.in_worklist:
+            return
         # Check visit count to prevent infinite loops
         current_count = self.visit_count.get(key, 0)
-        if current_count < self.max_visits_per_stmt:
-            self.worklist.append(key)
+        if self.max_visits_per_stmt is None or current_count < self.max_visits_per_stmt:
+            if self.worklist_order == WorklistOrder.RPO:
+                priority = self.get_priority(function_qualname, stmt_idx)
+            else:
+                priority = self.worklist_seq
+            heapq.heappush(self.worklist, (priority, self.worklist_seq, key))
+            self.worklist_seq += 1
+            self.in_worklist.add(key)
             # Don't mark as visited here - we'll count visits during processing
     
     def get_next_from_worklist(self) -> Optional[Tuple[str, int]]:
         """Get the next statement from the worklist"""
         if self.worklist:
-            return self.worklist.pop(0)
+            _, _, key = heapq.heappop(self.worklist)
+            self.in_worklist.discard(key)
+            return key
         return None
     
-    def save_state_snapshot(self, function_qualname: str, stmt_idx: int, variable_state: Dict[str, 'Value']):
-        """Save a snapshot of variable state at a program point"""
+    def get_priority(self, function_qualname: str, stmt_idx: int) -> float:
+        """Get the RPO worklist priority of a statement; lower is processed first"""
+        if function_qualname not in self.priorities:
+            self._compute_priorities(function_qualname)
+        priorities = self.priorities[function_qualname]
+        if stmt_idx in priorities:
+            return priorities[stmt_idx]
+        # Statements unreachable from the entry go after all reachable ones, in textual order
+        return float(len(priorities) + stmt_idx)
+    
+    def get_loop_heads(self, function_qualname: str) -> Set[int]:
+        """Get the statements that are targets of back edges, i.e. the heads of loops"""
+        if function_qualname not in self.loop_heads:
+            self._compute_priorities(function_qualname)
+        return self.loop_heads[function_qualname]
+    
+    def _compute_priorities(self, function_qualname: str):
+        """Number the statements reachable from statement 0 in reverse postorder.
+
+        Successors are explored from the highest index down, so fall-through
+        code keeps its textual order. The head of each loop is then moved just
+        after the last statement of its body (the source of its latest back
+        edge), so a loop body stabilises before its head is revisited. Fills
+        ``priorities`` and ``loop_heads`` for the function.
+        """
+        succs = self.cfg.get(function_qualname, {})
+        postorder: List[int] = []
+        back_edges: List[Tuple[int, int]] = []
+        visited = {0}
+        on_stack = {0}
+        stack = [(0, iter(sorted(succs.get(0, ()), reverse=True)))]
+        while stack:
+            node, it = stack[-1]
+            for succ in it:
+                if succ in on_stack:
+                    back_edges.append((node, succ))
+                elif succ not in visited:
+                    visited.add(succ)
+                    on_stack.add(succ)
+                    stack.append((succ, iter(sorted(succs.get(succ, ()), reverse=True))))
+                    break
+            else:
+                stack.pop()
+                on_stack.discard(node)
+                postorder.append(node)
+        rpo = {node: float(i) for i, node in enumerate(reversed(postorder))}
+        priorities = dict(rpo)
+        for src, head in back_edges:
+            priorities[head] = max(priorities[head], rpo[src] + 0.5)
+        self.priorities[function_qualname] = priorities
+        self.loop_heads[function_qualname] = {head for _, head in back_edges}
+    
+    def is_merge_point(self, function_qualname: str, stmt_idx: int) -> bool:
+        """Check if a statement has more than one predecessor"""
+        return len(self.get_predecessors(function_qualname, stmt_idx)) > 1
+    
+    def join_merge_state(self, function_qualname: str, stmt_idx: int,
+                         variable_state: Union[Dict[str, 'Value'], PersistentMap]) -> bool:
+        """
+        Join an incoming variable state into the state of a merge point.
+        
+        Returns:
+            Whether the state of the merge point changed
+        """
         key = (function_qualname, stmt_idx)
-        if key not in self.state_snapshots:
-            self.state_snapshots[key] = []
-        self.state_snapshots[key].append(variable_state.copy())
+        joined = self.merge_states.get(key)
+        if joined is None:
+            self.merge_states[key] = variable_state.copy()
+            return True
+        
+        # Persistent states share structure, so only their differences are walked
+        if isinstance(joined, PersistentMap) and isinstance(variable_state, PersistentMap):
+            names = joined.diff(variable_state)
+        else:
+            names = variable_state.keys()
+        updates = {}
+        for name in names:
+            value = variable_state.get(name)
+            if value is None:
+                continue
+            old_value = joined.get(name)
+            if old_value is None:
+                updates[name] = value
+            elif old_value is not value and not old_value.includes(value):
+                updates[name] = old_value.merge(value)
+        if not updates:
+            return False
+        
+        joined = joined.copy()
+        for name, value in updates.items():
+            joined[name] = value
+        self.merge_states[key] = joined
+        return True
     
-    def get_state_snapshots(self, function_qualname: str, stmt_idx: int) -> List[Dict[str, 'Value']]:
-        """Get all state snapshots for a program point"""
-        key = (function_qualname, stmt_idx)
-        return self.state_snapshots.get(key, [])
+    def get_merge_state(self, function_qualname: str, stmt_idx: int) -> Optional[Union[Dict[str, 'Value'], PersistentMap]]:
+        """Get the joined variable state of a merge point"""
+        return self.merge_states.get((function_qualname, stmt_idx))
+    
+    def set_merge_state(self, function_qualname: str, stmt_idx: int,
+                        variable_state: Union[Dict[str, 'Value'], PersistentMap]):
+        """Replace the joined variable state of a merge point"""
+        self.merge_states[(function_qualname, stmt_idx)] = variable_state.copy()
 
 
 class AbstractState:
@@ -491,7 +693,9 @@ class AbstractState:
     def __init__(self, 
                 context_type: ContextType = ContextType.CALL_SITE,
                 flow_sensitivity: FlowSensitivity = FlowSensitivity.SENSITIVE,
-                context_depth: int = 1):
+                context_depth: int = 1,
+                worklist_order: WorklistOrder = WorklistOrder.FIFO,
+                persistent_store: bool = False):
         # Context sensitivity settings
         self.context_type = context_type
         self.context_depth = context_depth
@@ -501,7 +705,7 @@ class AbstractState:
         self.flow_sensitivity = flow_sensitivity
         
         # Memory model for storing variables
-        self.memory = MemoryModel()
+        self.memory = MemoryModel(persistent_store)
         
         # Create a default global scope for early testing
         # Using a simple module node as required by IRModule constructor
@@ -516,7 +720,7 @@ class AbstractState:
         self.call_graph = CallGraph()
         
         # Control flow state
-        self.control_flow = ControlFlowState(flow_sensitivity)
+        self.control_flow = ControlFlowState(flow_sensitivity, worklist_order)
         
         # Call stack for interprocedural analysis
         self.call_stack: List[Tuple[str, int, Context]] = []
@@ -569,6 +773,35 @@ class AbstractState:
         ctx = self.current_context if self.context_type != ContextType.INSENSITIVE else None
         return self.memory.get_variable(name, ctx)
     
+    def snapshot_variables(self) -> Union[Dict[str, Value], PersistentMap]:
+        """Get the values of the variables of the current scope in the current context.
+
+        With a persistent store and no context-specific storage in use, this is
+        the scope's own map, taken in O(1) and sharing structure with it.
+        """
+        scope = self.memory.current_scope
+        if not scope:
+            return {}
+        if self.memory.persistent and (self.context_type == ContextType.INSENSITIVE or
+                                       not self.current_context.context_id):
+            return scope.snapshot()
+        current_vars = {}
+        for var_name in scope.get_all_variable_names():
+            value = self.get_variable(var_name)
+            if value:
+                current_vars[var_name] = value
+        return current_vars
+    
+    def fingerprint(self) -> int:
+        """
+        Get a fingerprint of the variables and the current context.
+        
+        The variable part is maintained incrementally, so this is O(1). Keys are
+        128 bits wide, so distinct states sharing a fingerprint is not a practical
+        concern. Values are keyed by their objects; in-place changes to objects are not seen.
+        """
+        return self.memory.fingerprint ^ _zobrist_key("<context>", self.current_context)
+    
     def set_variable(self, name: str, value: Value):
         """Set a variable's value in the current context"""
         # Only pass context if we're using context sensitivity
@@ -695,7 +928,9 @@ class AbstractState:
 def create_abstract_state(
     context_type: ContextType = ContextType.CALL_SITE,
     flow_sensitivity: FlowSensitivity = FlowSensitivity.SENSITIVE,
-    context_depth: int = 1
+    context_depth: int = 1,
+    worklist_order: WorklistOrder = WorklistOrder.FIFO,
+    persistent_store: bool = False
 ) -> AbstractState:
     """Create a new abstract interpretation state"""
-    return AbstractState(context_type, flow_sensitivity, context_depth) 
\ No newline at end of file
+    return AbstractState(context_type, flow_sensitivity, context_depth, worklist_order, persistent_store) 
\ No newline at end of file
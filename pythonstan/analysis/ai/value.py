@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from enum import Enum, auto
-from typing import Dict, Set, List, Optional, Union, Tuple, Any, FrozenSet, TypeVar, Generic
+from typing import Dict, Set, List, Optional, Union, Tuple, Any, FrozenSet, TypeVar, Generic, Hashable
 import ast
+import itertools
+import weakref
 import sys
 import math
 from dataclasses import dataclass, field
@@ -55,38 +57,51 @@ class Object(ABC):
         """Merge this object with another object of the same type"""
         pass
     
+    def includes(self, other: 'Object') -> bool:
+        """Check if this object over-approximates another object"""
+        if self is other:
+            return True
+        if not Object.can_merge(self, other):
+            return False
+        return all(name in self.attributes and self.attributes[name].includes(value)
+                   for name, value in other.attributes.items())
+    
+    def widen(self, other: 'Object', thresholds: Optional['WideningThresholds'] = None) -> 'Object':
+        """Widen this object with another; objects without unbounded properties just merge"""
+        return self.merge(other)
+    
+    def narrow(self, other: 'Object') -> 'Object':
+        """Narrow this object with another; objects without unbounded properties stay as they are"""
+        return self
+    
+    def merge_key(self) -> Hashable:
+        """Key of the merge class of this object; objects merge iff their keys are equal"""
+        return self.obj_type
+    
     @staticmethod
     def can_merge(obj1: 'Object', obj2: 'Object') -> bool:
         """Check if two objects can be merged"""
-        # First, check if they're the same general object type
-        if obj1.obj_type != obj2.obj_type:
-            return False
-        
-        # For constant objects, also check const_type
-        if obj1.obj_type == ObjectType.CONSTANT and obj2.obj_type == ObjectType.CONSTANT:
-            if isinstance(obj1, ConstantObject) and isinstance(obj2, ConstantObject):
-                return obj1.const_type == obj2.const_type
-        
-        # For builtin objects, check builtin_type
-        if obj1.obj_type == ObjectType.BUILTIN and obj2.obj_type == ObjectType.BUILTIN:
-            if isinstance(obj1, BuiltinObject) and isinstance(obj2, BuiltinObject):
-                return obj1.builtin_type == obj2.builtin_type
-        
-        # For function, class, and instance objects, check qualname
-        if obj1.obj_type in (ObjectType.FUNCTION, ObjectType.CLASS, ObjectType.INSTANCE) and \
-           obj2.obj_type in (ObjectType.FUNCTION, ObjectType.CLASS, ObjectType.INSTANCE):
-            if hasattr(obj1, 'qualname') and hasattr(obj2, 'qualname'):
-                return obj1.qualname == obj2.qualname
-        
-        # Default to just checking if they're the same general object type
-        return obj1.obj_type == obj2.obj_type
+        return obj1.merge_key() == obj2.merge_key()
 
 
 class Value:
-    """Represents a set of possible objects a variable could have at runtime"""
+    """
+    Represents a set of possible objects a variable could have at runtime.
+    
+    The objects are kept in buckets by merge class, so merging two values only
+    merges objects within the same bucket. Values built by the lattice operations
+    are interned: each set of objects has one canonical, immutable value with a
+    unique id, so equal canonical values are identical and compare in O(1).
+    """
+    
+    _interned: 'weakref.WeakValueDictionary[FrozenSet[Object], Value]' = weakref.WeakValueDictionary()
+    _uids = itertools.count(1)
     
     def __init__(self, objects: Optional[Set[Object]] = None):
-        self.objects: Set[Object] = objects or set()
+        self.objects: FrozenSet[Object] = frozenset(objects or ())
+        self.uid: Optional[int] = None  # Set once the value is interned
+        self._buckets: Optional[Dict[Hashable, Tuple[Object, ...]]] = None
+        self._hash: Optional[int] = None
     
     def __bool__(self) -> bool:
         """Check if this value contains any objects"""
@@ -97,45 +112,120 @@ class Value:
             return "EmptyValue"
         return f"Value({', '.join(str(obj) for obj in self.objects)})"
     
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, Value):
+            return NotImplemented
+        if self.uid is not None and other.uid is not None:
+            # Canonical values are unique per set of objects
+            return False
+        return self.objects == other.objects
+    
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(self.objects)
+        return self._hash
+    
+    def __reduce__(self):
+        # Ids are only unique within a process, so values are unpickled uninterned
+        return Value, (set(self.objects),)
+    
     def add(self, obj: Object):
-        """Add an object to this value"""
-        self.objects.add(obj)
+        """Add an object to this value; only values that are not interned can be built up"""
+        if self.uid is not None:
+            raise TypeError("Interned values are immutable")
+        self.objects = self.objects | {obj}
+        self._buckets = None
+        self._hash = None
+    
+    def intern(self) -> 'Value':
+        """Get the canonical value with the same objects"""
+        if self.uid is not None:
+            return self
+        canonical = Value._interned.get(self.objects)
+        if canonical is None:
+            canonical = self
+            self.uid = next(Value._uids)
+            Value._interned[self.objects] = self
+        return canonical
+    
+    @property
+    def buckets(self) -> Dict[Hashable, Tuple[Object, ...]]:
+        """The objects of this value by merge class"""
+        if self._buckets is None:
+            buckets: Dict[Hashable, List[Object]] = defaultdict(list)
+            for obj in self.objects:
+                buckets[obj.merge_key()].append(obj)
+            self._buckets = {key: tuple(objs) for key, objs in buckets.items()}
+        return self._buckets
     
     def merge(self, other: 'Value') -> 'Value':
         """Merge this value with another value"""
-        if not other.objects:
+        if self is other or not other.objects:
             return self
         if not self.objects:
             return other
+        if other.objects <= self.objects:
+            # Nothing new to merge in
+            return self
         
-        # Create a new value to hold the merged result
-        result = Value()
-        
-        # Track which objects from both self and other have been merged together
-        merged_self_objects = set()
-        merged_other_objects = set()
-        
-        # Try to merge objects of the same type
-        for obj1 in self.objects:
-            for obj2 in other.objects:
-                if Object.can_merge(obj1, obj2):
-                    # Merge compatible objects
-                    merged_obj = obj1.merge(obj2)
-                    result.add(merged_obj)
-                    merged_self_objects.add(obj1)
-                    merged_other_objects.add(obj2)
-        
-        # Add any objects from self that weren't merged
-        for obj1 in self.objects:
-            if obj1 not in merged_self_objects:
-                result.add(obj1)
-        
-        # Add any objects from other that weren't merged
-        for obj2 in other.objects:
-            if obj2 not in merged_other_objects:
-                result.add(obj2)
-        
-        return result
+        other_buckets = other.buckets
+        result: Set[Object] = set()
+        for key, objs in self.buckets.items():
+            others = other_buckets.get(key)
+            if others is None:
+                result.update(objs)
+            else:
+                # Objects of the same merge class are merged pairwise
+                result.update(obj1.merge(obj2) for obj1 in objs for obj2 in others)
+        for key, objs in other_buckets.items():
+            if key not in self.buckets:
+                result.update(objs)
+        return Value(result).intern()
+    
+    def includes(self, other: 'Value') -> bool:
+        """Check if every object of another value is over-approximated by an object of this value"""
+        if self is other:
+            return True
+        buckets = self.buckets
+        return all(any(obj1.includes(obj2) for obj1 in buckets.get(key, ()))
+                   for key, objs in other.buckets.items() for obj2 in objs)
+    
+    def widen(self, other: 'Value', thresholds: Optional['WideningThresholds'] = None) -> 'Value':
+        """Widen this value with another value.
+
+        Returns this value itself if it already includes ``other``, so callers
+        can detect a stable loop head by identity.
+        """
+        if self.includes(other):
+            return self
+        other_buckets = other.buckets
+        result: Set[Object] = set()
+        for key, objs in self.buckets.items():
+            for obj1 in objs:
+                widened = obj1
+                for obj2 in other_buckets.get(key, ()):
+                    widened = widened.widen(obj2, thresholds)
+                result.add(widened)
+        for key, objs in other_buckets.items():
+            if key not in self.buckets:
+                result.update(objs)
+        return Value(result).intern()
+    
+    def narrow(self, other: 'Value') -> 'Value':
+        """Narrow this (widened) value with another value; objects are never added"""
+        other_buckets = other.buckets
+        result: Set[Object] = set()
+        changed = False
+        for key, objs in self.buckets.items():
+            for obj1 in objs:
+                narrowed = obj1
+                for obj2 in other_buckets.get(key, ()):
+                    narrowed = narrowed.narrow(obj2)
+                changed = changed or narrowed is not obj1
+                result.add(narrowed)
+        return Value(result).intern() if changed else self
     
     def get_objects_of_type(self, obj_type: ObjectType) -> Set[Object]:
         """Get all objects of a specific type"""
@@ -160,6 +250,57 @@ class Value:
         return result
 
 
+@dataclass
+class WideningThresholds:
+    """Threshold sets for widening, usually drawn from the constants of the analysed program.
+
+    A bound that grows during widening jumps to the nearest threshold past its
+    new value instead of straight to infinity.
+    """
+    numbers: List[Union[int, float]] = field(default_factory=list)
+    lengths: List[int] = field(default_factory=list)  # string lengths and container sizes
+    
+    def __post_init__(self):
+        self.numbers = sorted(set(self.numbers))
+        self.lengths = sorted(set(self.lengths))
+    
+    @classmethod
+    def from_constants(cls, constants) -> 'WideningThresholds':
+        """Numeric constants become number thresholds, string constants length thresholds"""
+        numbers, lengths = [], []
+        for const in constants:
+            if isinstance(const, bool):
+                continue
+            if isinstance(const, (int, float)) and math.isfinite(const):
+                numbers.append(const)
+            elif isinstance(const, str):
+                lengths.append(len(const))
+        return cls(numbers, lengths)
+    
+    def lower_number(self, value: Union[int, float]) -> Union[int, float]:
+        return max((t for t in self.numbers if t <= value), default=-math.inf)
+    
+    def upper_number(self, value: Union[int, float]) -> Union[int, float]:
+        return min((t for t in self.numbers if t >= value), default=math.inf)
+    
+    def lower_length(self, value: int) -> int:
+        return max((t for t in self.lengths if t <= value), default=0)
+    
+    def upper_length(self, value: Optional[int]) -> Optional[int]:
+        if value is None:
+            return None
+        return min((t for t in self.lengths if t >= value), default=None)
+
+
+def _widen_max_length(old: Optional[int], new: Optional[int], thresholds: 'WideningThresholds') -> Optional[int]:
+    """Widen an upper size bound, where ``None`` means unbounded"""
+    if old is None:
+        return None
+    if new is None or new > old:
+        return thresholds.upper_length(new)
+    return old
+
+
 class NumericProperty:
     """Tracks properties of numeric values (integers and floats)"""
     
@@ -216,6 +357,51 @@ class NumericProperty:
             may_be_negative=may_be_negative,
             may_be_positive=may_be_positive
         )
+    
+    def includes(self, other: 'NumericProperty') -> bool:
+        """Check if this property over-approximates another numeric property"""
+        if self.exact_values:
+            return bool(other.exact_values) and other.exact_values <= self.exact_values
+        return (self.lower_bound <= other.lower_bound and other.upper_bound <= self.upper_bound and
+                (self.may_be_zero or not other.may_be_zero) and
+                (self.may_be_negative or not other.may_be_negative) and
+                (self.may_be_positive or not other.may_be_positive))
+    
+    def widen(self, other: 'NumericProperty',
+              thresholds: Optional[WideningThresholds] = None) -> 'NumericProperty':
+        """Widen this property with another; a growing bound jumps to the next threshold"""
+        if self.includes(other):
+            return self
+        thresholds = thresholds or WideningThresholds()
+        lower_bound = self.lower_bound
+        if other.lower_bound < lower_bound:
+            lower_bound = thresholds.lower_number(other.lower_bound)
+        upper_bound = self.upper_bound
+        if other.upper_bound > upper_bound:
+            upper_bound = thresholds.upper_number(other.upper_bound)
+        return NumericProperty(
+            lower_bound=lower_bound,
+            upper_bound=upper_bound,
+            may_be_zero=self.may_be_zero or other.may_be_zero,
+            may_be_negative=self.may_be_negative or other.may_be_negative,
+            may_be_positive=self.may_be_positive or other.may_be_positive
+        )
+    
+    def narrow(self, other: 'NumericProperty') -> 'NumericProperty':
+        """Narrow this property with another, refining only the bounds widening made infinite"""
+        if self.exact_values or (self.lower_bound != -math.inf and self.upper_bound != math.inf):
+            return self
+        lower_bound = other.lower_bound if self.lower_bound == -math.inf else self.lower_bound
+        upper_bound = other.upper_bound if self.upper_bound == math.inf else self.upper_bound
+        if lower_bound == self.lower_bound and upper_bound == self.upper_bound:
+            return self
+        return NumericProperty(
+            lower_bound=lower_bound,
+            upper_bound=upper_bound,
+            may_be_zero=self.may_be_zero,
+            may_be_negative=self.may_be_negative,
+            may_be_positive=self.may_be_positive
+        )
 
 
 class StringProperty:
@@ -271,6 +457,52 @@ class StringProperty:
             min_length=min_length,
             max_length=max_length
         )
+    
+    def includes(self, other: 'StringProperty') -> bool:
+        """Check if this property over-approximates another string property"""
+        if self.exact_values:
+            return bool(other.exact_values) and other.exact_values <= self.exact_values
+        if self.prefixes and not (other.prefixes and other.prefixes <= self.prefixes):
+            return False
+        if self.suffixes and not (other.suffixes and other.suffixes <= self.suffixes):
+            return False
+        if self.max_length is not None and (other.max_length is None or other.max_length > self.max_length):
+            return False
+        return self.min_length <= other.min_length
+    
+    def widen(self, other: 'StringProperty',
+              thresholds: Optional[WideningThresholds] = None) -> 'StringProperty':
+        """Widen this property with another; growing value sets become unknown
+        and growing lengths jump to the next length threshold"""
+        if self.includes(other):
+            return self
+        thresholds = thresholds or WideningThresholds()
+        prefixes = self.prefixes if other.prefixes and other.prefixes <= self.prefixes else None
+        suffixes = self.suffixes if other.suffixes and other.suffixes <= self.suffixes else None
+        min_length = self.min_length
+        if other.min_length < min_length:
+            min_length = thresholds.lower_length(other.min_length)
+        return StringProperty(
+            prefixes=prefixes,
+            suffixes=suffixes,
+            min_length=min_length,
+            max_length=_widen_max_length(self.max_length, other.max_length, thresholds)
+        )
+    
+    def narrow(self, other: 'StringProperty') -> 'StringProperty':
+        """Narrow this property with another, refining only the length bounds widening gave up on"""
+        if self.exact_values or (self.min_length > 0 and self.max_length is not None):
+            return self
+        min_length = other.min_length if self.min_length == 0 else self.min_length
+        max_length = other.max_length if self.max_length is None else self.max_length
+        if min_length == self.min_length and max_length == self.max_length:
+            return self
+        return StringProperty(
+            prefixes=self.prefixes,
+            suffixes=self.suffixes,
+            min_length=min_length,
+            max_length=max_length
+        )
 
 
 class ContainerProperty:
@@ -310,6 +542,51 @@ class ContainerProperty:
             min_size=min_size,
             max_size=max_size
         )
+    
+    def includes(self, other: 'ContainerProperty') -> bool:
+        """Check if this property over-approximates another container property"""
+        if self.max_size is not None and (other.max_size is None or other.max_size > self.max_size):
+            return False
+        return (self.min_size <= other.min_size and
+                other.element_types <= self.element_types and other.key_types <= self.key_types and
+                self.element_values.includes(other.element_values) and
+                self.key_values.includes(other.key_values))
+    
+    def widen(self, other: 'ContainerProperty',
+              thresholds: Optional[WideningThresholds] = None) -> 'ContainerProperty':
+        """Widen this property with another, widening element and key values and size bounds"""
+        if self.includes(other):
+            return self
+        thresholds = thresholds or WideningThresholds()
+        min_size = self.min_size
+        if other.min_size < min_size:
+            min_size = thresholds.lower_length(other.min_size)
+        return ContainerProperty(
+            element_types=self.element_types.union(other.element_types),
+            element_values=self.element_values.widen(other.element_values, thresholds),
+            key_types=self.key_types.union(other.key_types),
+            key_values=self.key_values.widen(other.key_values, thresholds),
+            min_size=min_size,
+            max_size=_widen_max_length(self.max_size, other.max_size, thresholds)
+        )
+    
+    def narrow(self, other: 'ContainerProperty') -> 'ContainerProperty':
+        """Narrow this property with another, refining element values and the size bounds widening gave up on"""
+        element_values = self.element_values.narrow(other.element_values)
+        key_values = self.key_values.narrow(other.key_values)
+        min_size = other.min_size if self.min_size == 0 else self.min_size
+        max_size = other.max_size if self.max_size is None else self.max_size
+        if (element_values is self.element_values and key_values is self.key_values and
+                min_size == self.min_size and max_size == self.max_size):
+            return self
+        return ContainerProperty(
+            element_types=self.element_types,
+            element_values=element_values,
+            key_types=self.key_types,
+            key_values=key_values,
+            min_size=min_size,
+            max_size=max_size
+        )
 
 
 class ConstantObject(Object):
@@ -356,6 +633,10 @@ class ConstantObject(Object):
             return "None"
         return f"Const({self.const_type.__name__})"
     
+    def merge_key(self) -> Hashable:
+        """Constants merge with constants of the same type"""
+        return (self.obj_type, self.const_type)
+    
     def merge(self, other: Object) -> Object:
         """Merge this constant with another object"""
         if not isinstance(other, ConstantObject) or self.const_type != other.const_type:
@@ -380,6 +661,53 @@ class ConstantObject(Object):
                     result.bool_value = self.bool_value
                     
         return result
+    
+    def includes(self, other: Object) -> bool:
+        """Check if this constant over-approximates another object"""
+        if self is other:
+            return True
+        if not isinstance(other, ConstantObject) or self.const_type != other.const_type:
+            return False
+        if self.const_type in (int, float):
+            return self.numeric_property.includes(other.numeric_property)
+        if self.const_type == str:
+            return self.string_property.includes(other.string_property)
+        if self.const_type == bool:
+            bool_value = getattr(self, 'bool_value', None)
+            return bool_value is None or bool_value == getattr(other, 'bool_value', None)
+        return True
+    
+    def widen(self, other: Object, thresholds: Optional[WideningThresholds] = None) -> Object:
+        """Widen this constant with another object"""
+        if not isinstance(other, ConstantObject) or self.const_type != other.const_type:
+            return self
+        if self.const_type in (int, float):
+            result = ConstantObject(self.const_type)
+            result.numeric_property = self.numeric_property.widen(other.numeric_property, thresholds)
+            return result
+        if self.const_type == str:
+            result = ConstantObject(self.const_type)
+            result.string_property = self.string_property.widen(other.string_property, thresholds)
+            return result
+        return self.merge(other)
+    
+    def narrow(self, other: Object) -> Object:
+        """Narrow this constant with another object"""
+        if not isinstance(other, ConstantObject) or self.const_type != other.const_type:
+            return self
+        if self.const_type in (int, float):
+            narrowed = self.numeric_property.narrow(other.numeric_property)
+            if narrowed is not self.numeric_property:
+                result = ConstantObject(self.const_type)
+                result.numeric_property = narrowed
+                return result
+        elif self.const_type == str:
+            narrowed = self.string_property.narrow(other.string_property)
+            if narrowed is not self.string_property:
+                result = ConstantObject(self.const_type)
+                result.string_property = narrowed
+                return result
+        return self
 
 
 class BuiltinObject(Object):
@@ -412,6 +740,10 @@ class BuiltinObject(Object):
         
         return f"Builtin({self.builtin_type.__name__})"
     
+    def merge_key(self) -> Hashable:
+        """Builtins merge with builtins of the same type"""
+        return (self.obj_type, self.builtin_type)
+    
     def merge(self, other: Object) -> Object:
         """Merge this builtin with another object"""
         if not isinstance(other, BuiltinObject) or self.builtin_type != other.builtin_type:
@@ -434,6 +766,34 @@ class BuiltinObject(Object):
                 result.attributes[name] = value
                 
         return result
+    
+    def includes(self, other: Object) -> bool:
+        """Check if this builtin over-approximates another object"""
+        if self is other:
+            return True
+        if not isinstance(other, BuiltinObject) or self.builtin_type != other.builtin_type:
+            return False
+        return super().includes(other) and self.container_property.includes(other.container_property)
+    
+    def widen(self, other: Object, thresholds: Optional[WideningThresholds] = None) -> Object:
+        """Widen this builtin with another object, widening its container property"""
+        if not isinstance(other, BuiltinObject) or self.builtin_type != other.builtin_type:
+            return self
+        result = self.merge(other)
+        result.container_property = self.container_property.widen(other.container_property, thresholds)
+        return result
+    
+    def narrow(self, other: Object) -> Object:
+        """Narrow this builtin with another object, narrowing its container property"""
+        if not isinstance(other, BuiltinObject) or self.builtin_type != other.builtin_type:
+            return self
+        narrowed = self.container_property.narrow(other.container_property)
+        if narrowed is self.container_property:
+            return self
+        result = BuiltinObject(self.builtin_type)
+        result.container_property = narrowed
+        result.attributes = dict(self.attributes)
+        return result
 
 
 class FunctionObject(Object):
@@ -463,6 +823,10 @@ class FunctionObject(Object):
         async_prefix = "async " if self.is_async else ""
         return f"{async_prefix}{method_type}function {self.qualname}"
     
+    def merge_key(self) -> Hashable:
+        """Objects with the same qualname are merged"""
+        return (self.obj_type, self.qualname)
+    
     def merge(self, other: Object) -> Object:
         """Merge this function with another object"""
         if not isinstance(other, FunctionObject) or self.qualname != other.qualname:
@@ -497,6 +861,10 @@ class ClassObject(Object):
         """Get a method by name"""
         return self.methods.get(method_name)
     
+    def merge_key(self) -> Hashable:
+        """Objects with the same qualname are merged"""
+        return (self.obj_type, self.qualname)
+    
     def merge(self, other: Object) -> Object:
         """Merge this class with another object"""
         if not isinstance(other, ClassObject) or self.qualname != other.qualname:
@@ -542,6 +910,10 @@ class InstanceObject(Object):
     def __str__(self) -> str:
         return f"instance of {self.class_obj.qualname}"
     
+    def merge_key(self) -> Hashable:
+        """Instances of the same class are merged"""
+        return (self.obj_type, self.class_obj.qualname)
+    
     def merge(self, other: Object) -> Object:
         """Merge this instance with another object"""
         if not isinstance(other, InstanceObject):
@@ -581,6 +953,10 @@ class ExternalFunctionObject(Object):
     def __str__(self) -> str:
         return f"external function {self.qualname}"
     
+    def merge_key(self) -> Hashable:
+        """Objects with the same qualname are merged"""
+        return (self.obj_type, self.qualname)
+    
     def merge(self, other: Object) -> Object:
         """Merge this external function with another object"""
         if not isinstance(other, ExternalFunctionObject) or self.qualname != other.qualname:
@@ -613,6 +989,10 @@ class ExternalClassObject(Object):
         """Get a method by name"""
         return self.methods.get(method_name)
     
+    def merge_key(self) -> Hashable:
+        """Objects with the same qualname are merged"""
+        return (self.obj_type, self.qualname)
+    
     def merge(self, other: Object) -> Object:
         """Merge this external class with another object"""
         if not isinstance(other, ExternalClassObject) or self.qualname != other.qualname:
@@ -658,6 +1038,10 @@ class ExternalInstanceObject(Object):
     def __str__(self) -> str:
         return f"external instance of {self.class_obj.qualname}"
     
+    def merge_key(self) -> Hashable:
+        """Instances of the same class are merged"""
+        return (self.obj_type, self.class_obj.qualname)
+    
     def merge(self, other: Object) -> Object:
         """Merge this external instance with another object"""
         if not isinstance(other, ExternalInstanceObject):
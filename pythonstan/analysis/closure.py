@@ -1,9 +1,10 @@
 from ast import stmt
-from typing import Set, Iterator
+from typing import Set, Iterator, Optional
 
 from pythonstan.ir import IRScope, IRStatement, IRFunc, IRModule
 from pythonstan.graph.cfg import ControlFlowGraph
 from pythonstan.utils.var_collector import VarCollector
+from pythonstan.utils.parallel import fork_map
 from .analysis import AnalysisConfig, AnalysisDriver
 from .dataflow.driver import DataflowAnalysisDriver
 
@@ -32,38 +33,71 @@ class ClosureAnalysis(AnalysisDriver):
         parent_scope = {}
         subscopes = {}
 
-        from queue import Queue
-        q = Queue()
-
         for scope in scopes:
             subscopes[scope] = set()
+            # Scopes deferred by lazy lowering are handled when they are lowered
+            if not scope_manager.is_lowered(scope):
+                continue
             for subscope in scope_manager.get_subscopes(scope):
                 parent_scope[subscope] = scope
                 subscopes[scope].add(subscope)
-            if len(subscopes[scope]) == 0:
-                q.put(scope)
-        
-        while not q.empty():
-            scope = q.get()
-
-            cfg = scope_manager.get_ir(scope, "cfg")
-
-            if cfg:
-                self.liveness_analysis.analyze(scope, cfg)
-
-                # set cell vars for each scope
-                entry = cfg.get_entry()
-                cell_vars = self.liveness_analysis.results["out"][entry]
-                if isinstance(scope, IRFunc):
-                    arguments = scope.get_arg_names()
-                    cell_vars.difference_update(arguments)
-                if not isinstance(scope, IRModule):
-                    scope.cell_vars = cell_vars
-
-            parent = parent_scope.get(scope, None)
-            if parent:
-                subscopes[parent].remove(scope)
-                if len(subscopes[parent]) == 0:
-                    q.put(parent)
-        
+
+        # Scopes whose nested scopes are all done are independent of each
+        # other, so each wave may run on several processes
+        workers = self.config.options.get("workers", 0)
+        wave = [scope for scope in scopes if len(subscopes[scope]) == 0]
+        while len(wave) > 0:
+            lowered = [scope for scope in wave if scope_manager.is_lowered(scope)]
+            for scope in lowered:
+                self.prepare_scope(scope)
+            for scope, cell_vars in zip(lowered, fork_map(self.compute_cell_vars, lowered, workers)):
+                self.set_cell_vars(scope, cell_vars)
+
+            next_wave = []
+            for scope in wave:
+                parent = parent_scope.get(scope, None)
+                if parent:
+                    subscopes[parent].remove(scope)
+                    if len(subscopes[parent]) == 0:
+                        next_wave.append(parent)
+            wave = next_wave
+
         self.results = None
+
+    def analyze_scope(self, scope: IRScope):
+        """Sets the cell vars of a lowered scope from the liveness at its entry."""
+        self.prepare_scope(scope)
+        self.set_cell_vars(scope, self.compute_cell_vars(scope))
+
+    def prepare_scope(self, scope: IRScope):
+        """Lowers the deferred scopes nested in a function or class.
+
+        The liveness of a scope reads the cell vars of its nested scopes, which
+        are only known once those are lowered. Module cell vars are not kept,
+        so the scopes nested in a module stay deferred.
+        """
+        if isinstance(scope, IRModule):
+            return
+        scope_manager = self.world.scope_manager
+        for subscope in scope_manager.get_subscopes(scope):
+            scope_manager.lower(subscope)
+
+    def compute_cell_vars(self, scope: IRScope) -> Optional[Set[str]]:
+        if isinstance(scope, IRModule):
+            return None
+        cfg = self.world.scope_manager.get_ir(scope, "cfg")
+        if not cfg:
+            return None
+        self.liveness_analysis.analyze(scope, cfg)
+
+        entry = cfg.get_entry()
+        cell_vars = self.liveness_analysis.results["out"][entry]
+        if isinstance(scope, IRFunc):
+            arguments = scope.get_arg_names()
+            cell_vars.difference_update(arguments)
+        return cell_vars
+
+    @staticmethod
+    def set_cell_vars(scope: IRScope, cell_vars: Optional[Set[str]]):
+        if cell_vars is not None and not isinstance(scope, IRModule):
+            scope.cell_vars = cell_vars
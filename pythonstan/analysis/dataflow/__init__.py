@@ -1,4 +1,6 @@
 from .analysis import DataflowAnalysis
+from .bitvector import BitVectorDomain, BitVectorAnalysis
 from .driver import DataflowAnalysisDriver
-from .liveness import LivenessAnalysis
-from .reaching_definition import ReachingDefinitionAnalysis
+from .liveness import LivenessAnalysis, SetLivenessAnalysis
+from .reaching_definition import ReachingDefinitionAnalysis, SetReachingDefinitionAnalysis
+from .ifds import ZERO, IDEProblem, IFDSProblem, IDESolver, IFDSSolver
@@ -14,6 +14,7 @@ class DataflowAnalysis(Generic[Fact], Analysis):
     inputs: Dict[str, Any]
     cfg: ControlFlowGraph
     inter_procedure: bool
+    iterations: int  # block visits of the last solver run
 
     @abstractmethod
     def __init__(self, scope: IRScope, cfg: ControlFlowGraph, config: AnalysisConfig):
@@ -21,6 +22,7 @@ class DataflowAnalysis(Generic[Fact], Analysis):
         self.cfg = cfg
         self.scope = scope
         self.inputs = {}
+        self.iterations = 0
 
     @abstractmethod
     def new_boundary_fact(self) -> Fact:
@@ -45,6 +47,10 @@ class DataflowAnalysis(Generic[Fact], Analysis):
     def transfer_edge(self, edge: CFGEdge, node_fact: Fact) -> Fact:
         return node_fact
 
+    def decode_facts(self, facts: Dict[BaseBlock, Fact]) -> Dict[BaseBlock, Any]:
+        """Converts solver facts to the form reported in the results."""
+        return facts
+
     def get_scope(self) -> IRScope:
         return self.scope
 
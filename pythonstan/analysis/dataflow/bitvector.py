@@ -0,0 +1,109 @@
+from abc import abstractmethod
+from typing import Dict, Generic, Hashable, Iterable, List, Set, Tuple, TypeVar
+
+from pythonstan.graph.cfg import BaseBlock, CFGEdge, ControlFlowGraph
+from pythonstan.ir import IRScope
+from ..analysis import AnalysisConfig
+from .analysis import DataflowAnalysis
+
+__all__ = ["BitVectorDomain", "BitVectorAnalysis"]
+
+Elem = TypeVar('Elem', bound=Hashable)
+
+
+class BitVectorDomain(Generic[Elem]):
+    """Numbers the elements of a per-scope universe so sets of them are ``int`` bit vectors.
+
+    Elements are numbered on first use, so the universe does not have to be
+    known up front; bit ``i`` of a vector stands for ``elements[i]``.
+    """
+    index: Dict[Elem, int]
+    elements: List[Elem]
+
+    def __init__(self):
+        self.index = {}
+        self.elements = []
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def bit(self, elem: Elem) -> int:
+        """Returns the single-bit vector of ``elem``, numbering it if it is new."""
+        idx = self.index.get(elem)
+        if idx is None:
+            idx = self.index[elem] = len(self.elements)
+            self.elements.append(elem)
+        return 1 << idx
+
+    def encode(self, elems: Iterable[Elem]) -> int:
+        bits = 0
+        for elem in elems:
+            bits |= self.bit(elem)
+        return bits
+
+    def decode(self, bits: int) -> Set[Elem]:
+        elems = set()
+        while bits:
+            low = bits & -bits
+            elems.add(self.elements[low.bit_length() - 1])
+            bits ^= low
+        return elems
+
+
+class BitVectorAnalysis(DataflowAnalysis[int]):
+    """Gen/kill dataflow analysis whose facts are ``int`` bit vectors.
+
+    Subclasses describe each statement by its gen and kill sets in
+    :meth:`stmt_gen_kill`; these are folded into one gen/kill pair per
+    block up front, so the transfer of a block is ``gen | (fact & ~kill)``
+    and the meet is a bitwise or. Facts are decoded back to sets of
+    elements with :meth:`decode_facts`.
+    """
+    domain: BitVectorDomain
+    gen: Dict[BaseBlock, int]
+    kill: Dict[BaseBlock, int]
+
+    def __init__(self, scope: IRScope, cfg: ControlFlowGraph, config: AnalysisConfig):
+        super().__init__(scope, cfg, config)
+        self.domain = BitVectorDomain()
+        self.number_elements()
+        self.gen, self.kill = {}, {}
+        for blk in cfg.get_nodes():
+            self.gen[blk], self.kill[blk] = self.block_gen_kill(blk)
+
+    def number_elements(self):
+        """Numbers the elements known before the gen/kill sets are computed."""
+        pass
+
+    @abstractmethod
+    def stmt_gen_kill(self, stmt) -> Tuple[int, int]:
+        """Returns the (gen, kill) bit vectors of a single statement."""
+        pass
+
+    def block_gen_kill(self, blk: BaseBlock) -> Tuple[int, int]:
+        """Composes the statement transfers of ``blk`` in the analysis direction."""
+        gen, kill = 0, 0
+        stmts = blk.stmts if self.is_forward else reversed(blk.stmts)
+        for stmt in stmts:
+            stmt_gen, stmt_kill = self.stmt_gen_kill(stmt)
+            gen = stmt_gen | (gen & ~stmt_kill)
+            kill |= stmt_kill
+        return gen, kill
+
+    def new_boundary_fact(self) -> int:
+        return 0
+
+    def new_init_fact(self) -> int:
+        return 0
+
+    def meet(self, fact_1: int, fact_2: int) -> int:
+        return fact_1 | fact_2
+
+    def need_transfer_edge(self, edge: CFGEdge) -> bool:
+        return False
+
+    def transfer_node(self, node: BaseBlock, fact: int) -> int:
+        return self.gen[node] | (fact & ~self.kill[node])
+
+    def decode_facts(self, facts: Dict[BaseBlock, int]) -> Dict[BaseBlock, Set]:
+        return {blk: self.domain.decode(bits) for blk, bits in facts.items()}
@@ -1,9 +1,10 @@
-from typing import TypeVar, Generic, Dict, Type
+from typing import TypeVar, Generic, Dict, Type, List, Sequence
 
 from pythonstan.ir import IRScope
 from ..analysis import Analysis, AnalysisDriver, AnalysisConfig
 from .analysis import DataflowAnalysis
-from .solver import Solver, WorklistSolver
+from .bitvector import BitVectorAnalysis
+from .solver import Solver, WorklistSolver, BitVectorSolver
 
 Fact = TypeVar('Fact')
 
@@ -18,6 +19,8 @@ class DataflowAnalysisDriver(Generic[Fact], AnalysisDriver):
         self.analysis = DataflowAnalysis.get_analysis(config.id)
         if 'solver' in config.options:
             self.solver = Solver.get_solver(config.options['solver'])[Fact]
+        elif issubclass(self.analysis, BitVectorAnalysis):
+            self.solver = BitVectorSolver
         else:
             self.solver = WorklistSolver[Fact]
         self.results = {}
@@ -29,10 +32,28 @@ class DataflowAnalysisDriver(Generic[Fact], AnalysisDriver):
 
         analyzer = self.analysis(scope, cfg, self.config)
         for prev in self.config.prev_analysis:
-            if prev in prev_results:
-                analyzer.set_input(prev, prev_results[prev][scope])
+            prev_result = prev_results.get(prev)
+            if isinstance(prev_result, dict):
+                # Transform results are keyed by scope; dataflow results keep theirs under 'scopes'
+                scope_results = prev_result.get('scopes', prev_result)
+                if scope in scope_results:
+                    analyzer.set_input(prev, scope_results[scope])
 
         facts_in, facts_out = self.solver.solve(analyzer)
 
-        self.results = {'in': facts_in,
-                        'out': facts_out}
+        self.results = {'in': analyzer.decode_facts(facts_in),
+                        'out': analyzer.decode_facts(facts_out),
+                        'iterations': analyzer.iterations}
+
+    @staticmethod
+    def merge_results(scopes: Sequence[IRScope], results: List[Dict]) -> Dict:
+        """Merges the results of several scopes; blocks are distinct, so facts never clash.
+
+        The result of each scope is also kept under ``'scopes'``, for the analyses that use it as input.
+        """
+        merged = {'in': {}, 'out': {}, 'iterations': 0, 'scopes': dict(zip(scopes, results))}
+        for result in results:
+            merged['in'].update(result['in'])
+            merged['out'].update(result['out'])
+            merged['iterations'] += result['iterations']
+        return merged
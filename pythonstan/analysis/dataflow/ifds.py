@@ -0,0 +1,375 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Generic, Hashable, Iterable, List, Set, Tuple, TypeVar
+
+from pythonstan.graph.cfg import BaseBlock, CFGEdge
+from pythonstan.graph.icfg.icfg import InterControlFlowGraph
+from pythonstan.ir import IRScope
+
+__all__ = ["ZERO", "EdgeFunction", "EdgeIdentity", "AllTop", "AllBottom", "IDENTITY",
+           "IDEProblem", "IFDSProblem", "IDESolver", "IFDSSolver"]
+
+D = TypeVar('D', bound=Hashable)  # dataflow fact
+V = TypeVar('V')                  # IDE value
+
+
+class ZeroFact:
+    """The fact that holds everywhere reachable; facts generated from nothing flow from it."""
+
+    def __repr__(self):
+        return "<zero>"
+
+
+ZERO = ZeroFact()
+
+
+class EdgeFunction(ABC):
+    """A function over IDE values attached to an exploded-supergraph edge."""
+
+    @abstractmethod
+    def compute_target(self, value):
+        pass
+
+    @abstractmethod
+    def compose_with(self, second: 'EdgeFunction') -> 'EdgeFunction':
+        """Returns the function applying ``self`` first and ``second`` afterwards."""
+        pass
+
+    @abstractmethod
+    def join_with(self, other: 'EdgeFunction') -> 'EdgeFunction':
+        pass
+
+
+class EdgeIdentity(EdgeFunction):
+    def compute_target(self, value):
+        return value
+
+    def compose_with(self, second: EdgeFunction) -> EdgeFunction:
+        return second
+
+    def join_with(self, other: EdgeFunction) -> EdgeFunction:
+        if isinstance(other, EdgeIdentity):
+            return self
+        return other.join_with(self)
+
+    def __eq__(self, other):
+        return isinstance(other, EdgeIdentity)
+
+    def __hash__(self):
+        return hash(EdgeIdentity)
+
+    def __repr__(self):
+        return "id"
+
+
+IDENTITY = EdgeIdentity()
+
+
+class AllTop(EdgeFunction):
+    """Maps every value to the top element, i.e. no information."""
+
+    def __init__(self, top):
+        self.top = top
+
+    def compute_target(self, value):
+        return self.top
+
+    def compose_with(self, second: EdgeFunction) -> EdgeFunction:
+        return self
+
+    def join_with(self, other: EdgeFunction) -> EdgeFunction:
+        return other
+
+    def __eq__(self, other):
+        return isinstance(other, AllTop) and other.top == self.top
+
+    def __hash__(self):
+        return hash((AllTop, self.top))
+
+    def __repr__(self):
+        return f"top({self.top})"
+
+
+class AllBottom(EdgeFunction):
+    """Maps every value to the bottom element."""
+
+    def __init__(self, bottom):
+        self.bottom = bottom
+
+    def compute_target(self, value):
+        return self.bottom
+
+    def compose_with(self, second: EdgeFunction) -> EdgeFunction:
+        if isinstance(second, EdgeIdentity):
+            return self
+        return second
+
+    def join_with(self, other: EdgeFunction) -> EdgeFunction:
+        return self
+
+    def __eq__(self, other):
+        return isinstance(other, AllBottom) and other.bottom == self.bottom
+
+    def __hash__(self):
+        return hash((AllBottom, self.bottom))
+
+    def __repr__(self):
+        return f"bottom({self.bottom})"
+
+
+class IDEProblem(Generic[D, V], ABC):
+    """A distributive interprocedural problem over an :class:`InterControlFlowGraph`.
+
+    Flow functions map one fact holding before a block to the facts holding
+    on the way to the next node; the zero fact is always propagated by the
+    solver, so flow functions only return it when they want to. Edge
+    functions default to the identity. Call sites are blocks registered with
+    :meth:`InterControlFlowGraph.add_invoke`; their flows cover the whole
+    block, which with the default CFG holds just the call.
+    """
+    icfg: InterControlFlowGraph
+
+    def __init__(self, icfg: InterControlFlowGraph):
+        self.icfg = icfg
+
+    def initial_seeds(self) -> Dict[BaseBlock, Set[D]]:
+        """Returns the facts holding at the entries of the analysis, by default the zero fact at each entry scope."""
+        return {self.icfg.entry_of(scope): {ZERO} for scope in self.icfg.get_entry_scopes()}
+
+    @abstractmethod
+    def normal_flow(self, edge: CFGEdge, fact: D) -> Iterable[D]:
+        pass
+
+    @abstractmethod
+    def call_flow(self, call_site: BaseBlock, callee: IRScope, fact: D) -> Iterable[D]:
+        """Maps a fact at the call site to facts at the callee's entry."""
+        pass
+
+    @abstractmethod
+    def return_flow(self, call_site: BaseBlock, callee: IRScope, exit_blk: BaseBlock,
+                    ret_site: BaseBlock, fact: D) -> Iterable[D]:
+        """Maps a fact at the callee's exit back to facts at the return site."""
+        pass
+
+    @abstractmethod
+    def call_to_return_flow(self, call_site: BaseBlock, ret_site: BaseBlock, fact: D) -> Iterable[D]:
+        """Maps a fact at the call site to facts at the return site, bypassing the callees."""
+        pass
+
+    def normal_edge(self, edge: CFGEdge, src_fact: D, tgt_fact: D) -> EdgeFunction:
+        return IDENTITY
+
+    def call_edge(self, call_site: BaseBlock, callee: IRScope, src_fact: D, tgt_fact: D) -> EdgeFunction:
+        return IDENTITY
+
+    def return_edge(self, call_site: BaseBlock, callee: IRScope, exit_blk: BaseBlock,
+                    ret_site: BaseBlock, src_fact: D, tgt_fact: D) -> EdgeFunction:
+        return IDENTITY
+
+    def call_to_return_edge(self, call_site: BaseBlock, ret_site: BaseBlock,
+                            src_fact: D, tgt_fact: D) -> EdgeFunction:
+        return IDENTITY
+
+    @abstractmethod
+    def top(self) -> V:
+        pass
+
+    @abstractmethod
+    def bottom(self) -> V:
+        """Returns the value of the initial seeds."""
+        pass
+
+    @abstractmethod
+    def join(self, value_1: V, value_2: V) -> V:
+        pass
+
+
+class IFDSProblem(IDEProblem[D, bool]):
+    """An IDE problem whose values only record whether a fact holds."""
+
+    def top(self) -> bool:
+        return False
+
+    def bottom(self) -> bool:
+        return True
+
+    def join(self, value_1: bool, value_2: bool) -> bool:
+        return value_1 or value_2
+
+
+class IDESolver(Generic[D, V]):
+    """Tabulation solver for IDE problems (Sagiv, Reps and Horwitz).
+
+    Phase one computes jump functions from the facts at the entry of a scope
+    to the facts at each of its blocks. When a callee's exit is reached, the
+    end summary of the callee is turned into summary edges from the call
+    site to its return sites, and every later visit of that call site with
+    the same fact reuses them instead of walking the callee again. Phase two
+    evaluates the jump functions to values.
+    """
+    problem: IDEProblem[D, V]
+    icfg: InterControlFlowGraph
+    # jump[n][d2][d1]: from d1 at the entry of n's scope to d2 at n
+    jump: Dict[BaseBlock, Dict[D, Dict[D, EdgeFunction]]]
+    # end_summary[(entry, d1)][(exit, d2)]
+    end_summary: Dict[Tuple[BaseBlock, D], Dict[Tuple[BaseBlock, D], EdgeFunction]]
+    # incoming[(entry, d3)][(call_site, d2)]: the call edge function
+    incoming: Dict[Tuple[BaseBlock, D], Dict[Tuple[BaseBlock, D], EdgeFunction]]
+    # summaries[(call_site, d2)][(ret_site, d5)]
+    summaries: Dict[Tuple[BaseBlock, D], Dict[Tuple[BaseBlock, D], EdgeFunction]]
+    values: Dict[Tuple[BaseBlock, D], V]
+    propagations: int
+
+    def __init__(self, problem: IDEProblem[D, V]):
+        self.problem = problem
+        self.icfg = problem.icfg
+        self.jump = {}
+        self.end_summary = {}
+        self.incoming = {}
+        self.summaries = {}
+        self.values = {}
+        self.work_list: List[Tuple[D, BaseBlock, D]] = []
+        self.propagations = 0
+
+    def solve(self):
+        seeds = self.problem.initial_seeds()
+        for blk, facts in seeds.items():
+            for fact in facts:
+                self.propagate(fact, blk, fact, IDENTITY)
+        while len(self.work_list) > 0:
+            self.process(*self.work_list.pop())
+        self.compute_values(seeds)
+        return self
+
+    @staticmethod
+    def flow(facts: Iterable[D], src_fact: D) -> Set[D]:
+        targets = set(facts)
+        if src_fact is ZERO:
+            targets.add(ZERO)
+        return targets
+
+    def propagate(self, d1: D, n: BaseBlock, d2: D, f: EdgeFunction):
+        fns = self.jump.setdefault(n, {}).setdefault(d2, {})
+        old = fns.get(d1)
+        new = f if old is None else old.join_with(f)
+        if new != old:
+            fns[d1] = new
+            self.work_list.append((d1, n, d2))
+            self.propagations += 1
+
+    def process(self, d1: D, n: BaseBlock, d2: D):
+        icfg, problem = self.icfg, self.problem
+        f = self.jump[n][d2][d1]
+        if icfg.is_call_site(n):
+            self.process_call(d1, n, d2, f)
+            return
+        scope = icfg.scope_of(n)
+        if n == icfg.exit_of(scope):
+            self.process_exit(d1, n, d2, f)
+        for edge in icfg.get_cfg(scope).out_edges_of(n):
+            for d3 in self.flow(problem.normal_flow(edge, d2), d2):
+                self.propagate(d1, edge.get_tgt(), d3, f.compose_with(problem.normal_edge(edge, d2, d3)))
+
+    def process_call(self, d1: D, call_site: BaseBlock, d2: D, f: EdgeFunction):
+        icfg, problem = self.icfg, self.problem
+        for callee in icfg.callees_of(call_site):
+            entry = icfg.entry_of(callee)
+            for d3 in self.flow(problem.call_flow(call_site, callee, d2), d2):
+                call_fn = problem.call_edge(call_site, callee, d2, d3)
+                self.incoming.setdefault((entry, d3), {})[(call_site, d2)] = call_fn
+                self.propagate(d3, entry, d3, IDENTITY)
+                for (exit_blk, d4), end_fn in list(self.end_summary.get((entry, d3), {}).items()):
+                    self.add_summary(call_site, d2, callee, call_fn, exit_blk, d4, end_fn)
+        for (ret_site, d5), summary in list(self.summaries.get((call_site, d2), {}).items()):
+            self.propagate(d1, ret_site, d5, f.compose_with(summary))
+        for ret_site in icfg.return_sites_of(call_site):
+            for d3 in self.flow(problem.call_to_return_flow(call_site, ret_site, d2), d2):
+                ctr_fn = problem.call_to_return_edge(call_site, ret_site, d2, d3)
+                self.propagate(d1, ret_site, d3, f.compose_with(ctr_fn))
+
+    def process_exit(self, d1: D, exit_blk: BaseBlock, d2: D, f: EdgeFunction):
+        entry = self.icfg.entry_of(self.icfg.scope_of(exit_blk))
+        ends = self.end_summary.setdefault((entry, d1), {})
+        old = ends.get((exit_blk, d2))
+        new = f if old is None else old.join_with(f)
+        if new == old:
+            return
+        ends[(exit_blk, d2)] = new
+        callee = self.icfg.scope_of(entry)
+        for (call_site, d_call), call_fn in list(self.incoming.get((entry, d1), {}).items()):
+            self.add_summary(call_site, d_call, callee, call_fn, exit_blk, d2, new)
+
+    def add_summary(self, call_site: BaseBlock, d2: D, callee: IRScope, call_fn: EdgeFunction,
+                    exit_blk: BaseBlock, d4: D, end_fn: EdgeFunction):
+        """Turns an end summary of ``callee`` into summary edges at ``call_site`` and applies them."""
+        problem = self.problem
+        summaries = self.summaries.setdefault((call_site, d2), {})
+        for ret_site in self.icfg.return_sites_of(call_site):
+            for d5 in self.flow(problem.return_flow(call_site, callee, exit_blk, ret_site, d4), d4):
+                ret_fn = problem.return_edge(call_site, callee, exit_blk, ret_site, d4, d5)
+                summary = call_fn.compose_with(end_fn).compose_with(ret_fn)
+                old = summaries.get((ret_site, d5))
+                new = summary if old is None else old.join_with(summary)
+                if new == old:
+                    continue
+                summaries[(ret_site, d5)] = new
+                for d1, f in list(self.jump[call_site][d2].items()):
+                    self.propagate(d1, ret_site, d5, f.compose_with(new))
+
+    def compute_values(self, seeds: Dict[BaseBlock, Set[D]]):
+        """Phase two: values at scope entries first, then at every other block."""
+        icfg, problem = self.icfg, self.problem
+        top = problem.top()
+        call_sites: Dict[IRScope, List[BaseBlock]] = {}
+        for call_site in icfg.call_sites:
+            call_sites.setdefault(icfg.scope_of(call_site), []).append(call_site)
+
+        values = self.values
+        work = []
+        for blk, facts in seeds.items():
+            for fact in facts:
+                values[(blk, fact)] = problem.bottom()
+                work.append((blk, fact))
+        while len(work) > 0:
+            entry, d1 = work.pop()
+            value = values[(entry, d1)]
+            for call_site in call_sites.get(icfg.scope_of(entry), ()):
+                for d2, fns in self.jump.get(call_site, {}).items():
+                    if d1 not in fns:
+                        continue
+                    call_value = fns[d1].compute_target(value)
+                    for callee in icfg.callees_of(call_site):
+                        callee_entry = icfg.entry_of(callee)
+                        for d3 in self.flow(problem.call_flow(call_site, callee, d2), d2):
+                            call_fn = self.incoming[(callee_entry, d3)][(call_site, d2)]
+                            old = values.get((callee_entry, d3), top)
+                            new = problem.join(old, call_fn.compute_target(call_value))
+                            if new != old:
+                                values[(callee_entry, d3)] = new
+                                work.append((callee_entry, d3))
+
+        entry_values = dict(values)
+        for n, by_fact in self.jump.items():
+            entry = icfg.entry_of(icfg.scope_of(n))
+            for d2, fns in by_fact.items():
+                value = top
+                for d1, f in fns.items():
+                    value = problem.join(value, f.compute_target(entry_values.get((entry, d1), top)))
+                values[(n, d2)] = value
+
+    def value_at(self, n: BaseBlock, fact: D) -> Any:
+        return self.values.get((n, fact), self.problem.top())
+
+    def results_at(self, n: BaseBlock) -> Dict[D, V]:
+        """Returns the value of every fact reaching the start of ``n``."""
+        return {d: self.value_at(n, d) for d in self.jump.get(n, {}) if d is not ZERO}
+
+
+class IFDSSolver(IDESolver[D, bool]):
+    """Tabulation solver for IFDS problems; values are not needed, so phase two is skipped."""
+
+    def compute_values(self, seeds: Dict[BaseBlock, Set[D]]):
+        pass
+
+    def facts_at(self, n: BaseBlock) -> Set[D]:
+        """Returns the facts holding at the start of ``n``."""
+        return {d for d in self.jump.get(n, {}) if d is not ZERO}
@@ -1,11 +1,30 @@
-from typing import Set
+from typing import Set, Tuple
 
 from pythonstan.graph.cfg import BaseBlock, ControlFlowGraph
-from . import DataflowAnalysis
-from pythonstan.ir import IRScope
+from .analysis import DataflowAnalysis
+from .bitvector import BitVectorAnalysis
+from pythonstan.ir import IRScope, IRStatement
 
 
-class LivenessAnalysis(DataflowAnalysis[Set[str]]):
+class LivenessAnalysis(BitVectorAnalysis):
+    """Live variables; bit ``i`` stands for the variable ``domain.elements[i]``."""
+
+    def __init__(self, scope, cfg: ControlFlowGraph, config):
+        self.is_forward = False
+        self.inter_procedure = False
+        super().__init__(scope, cfg, config)
+
+    def stmt_gen_kill(self, stmt: IRStatement) -> Tuple[int, int]:
+        domain = self.domain
+        gen = domain.encode(stmt.get_nostores())
+        if isinstance(stmt, IRScope):
+            gen |= domain.encode(stmt.get_cell_vars() | stmt.get_nonlocal_vars())
+        return gen, domain.encode(stmt.get_stores())
+
+
+class SetLivenessAnalysis(DataflowAnalysis[Set[str]]):
+    """Live variables as plain sets; the reference for ``LivenessAnalysis``."""
+
     def __init__(self, scope, cfg: ControlFlowGraph, config):
         self.is_forward = False
         self.inter_procedure = False
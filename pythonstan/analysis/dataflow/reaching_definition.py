@@ -1,14 +1,45 @@
-from typing import Set, Dict
-from ast import stmt
+from typing import Dict, Set, Tuple
 
-from pythonstan.graph.cfg import BaseBlock
 from pythonstan.ir import IRScope, IRStatement
-from pythonstan.utils.var_collector import VarCollector
-from pythonstan.graph.cfg import ControlFlowGraph
+from pythonstan.graph.cfg import BaseBlock, ControlFlowGraph
 from .analysis import DataflowAnalysis
+from .bitvector import BitVectorAnalysis
 
 
-class ReachingDefinitionAnalysis(DataflowAnalysis[Set[IRStatement]]):
+class ReachingDefinitionAnalysis(BitVectorAnalysis):
+    """Reaching definitions; bit ``i`` stands for the statement ``domain.elements[i]``."""
+    defs: Dict[str, int]
+
+    def __init__(self, scope, cfg, config):
+        self.is_forward = True
+        self.inter_procedure = False
+
+        from pythonstan.world import World
+        cfg = World().scope_manager.get_ir(scope, "cfg")
+        super().__init__(scope, cfg, config)
+
+    def compute_defs(self, scope: IRScope, cfg: ControlFlowGraph) -> Dict[str, int]:
+        """Maps each variable to the bit vector of the statements storing it."""
+        defs = {}
+        for cur_stmt in cfg.stmts:
+            for var_id in cur_stmt.get_stores():
+                defs[var_id] = defs.get(var_id, 0) | self.domain.bit(cur_stmt)
+        return defs
+
+    def number_elements(self):
+        self.defs = self.compute_defs(self.scope, self.cfg)
+
+    def stmt_gen_kill(self, stmt: IRStatement) -> Tuple[int, int]:
+        kill = 0
+        for var_id in stmt.get_stores():
+            kill |= self.defs[var_id]
+        if kill == 0:
+            return 0, 0
+        return self.domain.bit(stmt), kill
+
+
+class SetReachingDefinitionAnalysis(DataflowAnalysis[Set[IRStatement]]):
+    """Reaching definitions as plain sets; the reference for ``ReachingDefinitionAnalysis``."""
     defs: Dict[str, Set[IRStatement]]
 
     def __init__(self, scope, cfg, config):
@@ -30,7 +61,7 @@ class ReachingDefinitionAnalysis(DataflowAnalysis[Set[IRStatement]]):
         return fact_1.union(fact_2)
 
     def need_transfer_edge(self, edge):
-        super().need_transfer_edge(edge)
+        return False
     
     def compute_defs(self, scope: IRScope, cfg: ControlFlowGraph):
         defs = {}
@@ -1,14 +1,68 @@
-from typing import Generic, TypeVar, Tuple, Dict, Type
+from typing import Generic, TypeVar, Tuple, Dict, Type, List
 from abc import ABC, abstractmethod
-from queue import Queue
+from heapq import heappush, heappop
 
 from .analysis import DataflowAnalysis
-from pythonstan.graph.cfg import BaseBlock
+from pythonstan.graph.cfg import BaseBlock, ControlFlowGraph
 
 
 Fact = TypeVar("Fact")
 
 
+def block_order(cfg: ControlFlowGraph, is_forward: bool) -> List[BaseBlock]:
+    """Orders the blocks of ``cfg`` for a worklist.
+
+    Forward problems visit blocks in reverse postorder of a depth-first
+    search from the entry, backward problems in postorder. Blocks not
+    reachable from the entry are ordered after the others.
+    """
+    order = []
+    visited = set()
+    roots = [cfg.entry_blk] + sorted((blk for blk in cfg.blks if blk != cfg.entry_blk),
+                                     key=lambda blk: blk.get_idx())
+    for root in roots:
+        if root in visited:
+            continue
+        visited.add(root)
+        postorder = []
+        stack = [(root, iter(cfg.succs_of(root)))]
+        while len(stack) > 0:
+            u, succs = stack[-1]
+            for v in succs:
+                if v not in visited:
+                    visited.add(v)
+                    stack.append((v, iter(cfg.succs_of(v))))
+                    break
+            else:
+                stack.pop()
+                postorder.append(u)
+        order.extend(reversed(postorder) if is_forward else postorder)
+    return order
+
+
+class PriorityWorklist:
+    """Worklist of blocks popped by a fixed priority; a block is queued at most once."""
+    priority: Dict[BaseBlock, int]
+
+    def __init__(self, order: List[BaseBlock]):
+        self.priority = {blk: idx for idx, blk in enumerate(order)}
+        self.heap = []
+        self.queued = set()
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def push(self, blk: BaseBlock):
+        if blk not in self.queued:
+            self.queued.add(blk)
+            heappush(self.heap, (self.priority[blk], blk))
+
+    def pop(self) -> BaseBlock:
+        blk = heappop(self.heap)[1]
+        self.queued.discard(blk)
+        return blk
+
+
 class Solver(Generic[Fact], ABC):
     solver_dict: Dict[str, 'Type[Solver[Fact]]'] = {}
 
@@ -58,6 +112,7 @@ class Solver(Generic[Fact], ABC):
     
     @classmethod
     def solve(cls, analysis: DataflowAnalysis[Fact]):
+        analysis.iterations = 0
         in_facts, out_facts = cls.init(analysis)
         if analysis.is_forward:
             cls.solve_forward(analysis, in_facts, out_facts)
@@ -81,6 +136,20 @@ class Solver(Generic[Fact], ABC):
 
 
 class WorklistSolver(Generic[Fact], Solver[Fact]):
+    """Worklist solver visiting blocks in reverse postorder (forward) or postorder (backward).
+
+    The number of block visits is recorded in ``analysis.iterations``.
+    """
+    @classmethod
+    def new_worklist(cls, analysis: DataflowAnalysis[Fact], boundary: BaseBlock) -> PriorityWorklist:
+        """Returns a worklist seeded with every block but ``boundary``."""
+        order = block_order(analysis.get_cfg(), analysis.is_forward)
+        work_list = PriorityWorklist(order)
+        for blk in order:
+            if blk != boundary:
+                work_list.push(blk)
+        return work_list
+
     @classmethod
     def init_forward(cls, analysis: DataflowAnalysis[Fact]
                      ) -> Tuple[Dict[BaseBlock, Fact], Dict[BaseBlock, Fact]]:
@@ -109,12 +178,10 @@ class WorklistSolver(Generic[Fact], Solver[Fact]):
                       in_facts: Dict[BaseBlock, Fact],
                       out_facts: Dict[BaseBlock, Fact]):
         cfg = analysis.get_cfg()
-        work_list = Queue()
-        for blk in cfg.blks:
-            if blk != cfg.entry_blk:
-                work_list.put(blk)
-        while not work_list.empty():
-            cur = work_list.get()
+        work_list = cls.new_worklist(analysis, cfg.entry_blk)
+        while len(work_list) > 0:
+            cur = work_list.pop()
+            analysis.iterations += 1
             fact_in = in_facts[cur]
             if cfg.in_degree_of(cur) > 0:
                 for e in cfg.in_edges_of(cur):
@@ -127,7 +194,7 @@ class WorklistSolver(Generic[Fact], Solver[Fact]):
             if fact_out != out_facts[cur]:
                 out_facts[cur] = fact_out
                 for succ in cfg.succs_of(cur):
-                    work_list.put(succ)
+                    work_list.push(succ)
 
     @classmethod
     def init_backward(cls, analysis: DataflowAnalysis[Fact]
@@ -157,12 +224,10 @@ class WorklistSolver(Generic[Fact], Solver[Fact]):
                        in_facts: Dict[BaseBlock, Fact],
                        out_facts: Dict[BaseBlock, Fact]):
         cfg = analysis.get_cfg()
-        work_list = Queue()
-        for blk in cfg.blks:
-            if blk != cfg.super_exit_blk:
-                work_list.put(blk)
-        while not work_list.empty():
-            cur = work_list.get()
+        work_list = cls.new_worklist(analysis, cfg.super_exit_blk)
+        while len(work_list) > 0:
+            cur = work_list.pop()
+            analysis.iterations += 1
             fact_out = out_facts[cur]
             if cfg.out_degree_of(cur) > 0:
                 for e in cfg.out_edges_of(cur):
@@ -175,4 +240,51 @@ class WorklistSolver(Generic[Fact], Solver[Fact]):
             if fact_in != in_facts[cur]:
                 in_facts[cur] = fact_in
                 for pred in cfg.preds_of(cur):
-                    work_list.put(pred)
+                    work_list.push(pred)
+
+
+class BitVectorSolver(Generic[Fact], WorklistSolver[Fact]):
+    """Worklist solver specialised for :class:`BitVectorAnalysis` facts.
+
+    Meets and transfers are inlined as bitwise operations on the per-block
+    gen/kill vectors.
+    """
+    @classmethod
+    def solve_forward(cls, analysis, in_facts, out_facts):
+        cfg = analysis.get_cfg()
+        gen, kill = analysis.gen, analysis.kill
+        preds = {blk: cfg.preds_of(blk) for blk in cfg.blks}
+        succs = {blk: cfg.succs_of(blk) for blk in cfg.blks}
+        work_list = cls.new_worklist(analysis, cfg.entry_blk)
+        while len(work_list) > 0:
+            cur = work_list.pop()
+            analysis.iterations += 1
+            fact_in = in_facts[cur]
+            for pred in preds[cur]:
+                fact_in |= out_facts[pred]
+            in_facts[cur] = fact_in
+            fact_out = gen[cur] | (fact_in & ~kill[cur])
+            if fact_out != out_facts[cur]:
+                out_facts[cur] = fact_out
+                for succ in succs[cur]:
+                    work_list.push(succ)
+
+    @classmethod
+    def solve_backward(cls, analysis, in_facts, out_facts):
+        cfg = analysis.get_cfg()
+        gen, kill = analysis.gen, analysis.kill
+        preds = {blk: cfg.preds_of(blk) for blk in cfg.blks}
+        succs = {blk: cfg.succs_of(blk) for blk in cfg.blks}
+        work_list = cls.new_worklist(analysis, cfg.super_exit_blk)
+        while len(work_list) > 0:
+            cur = work_list.pop()
+            analysis.iterations += 1
+            fact_out = out_facts[cur]
+            for succ in succs[cur]:
+                fact_out |= in_facts[succ]
+            out_facts[cur] = fact_out
+            fact_in = gen[cur] | (fact_out & ~kill[cur])
+            if fact_in != in_facts[cur]:
+                in_facts[cur] = fact_in
+                for pred in preds[cur]:
+                    work_list.push(pred)
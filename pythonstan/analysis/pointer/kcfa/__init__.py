@@ -45,6 +45,7 @@ from .constraints import (
 )
 from .class_hierarchy import ClassHierarchyManager, MROError
 from .builtin_api_handler import BuiltinAPIHandler, BuiltinSummaryManager
+from .serialization import SnapshotQuery, save_state, save_query, load_query
 
 __all__ = [
     # Main entry points
@@ -101,6 +102,12 @@ __all__ = [
     # Extension points
     "BuiltinAPIHandler",
     "BuiltinSummaryManager",
+    
+    # Serialization
+    "SnapshotQuery",
+    "save_state",
+    "save_query",
+    "load_query",
 ]
 
 __version__ = "1.0.0"
@@ -37,7 +37,6 @@ class PointerAnalysis(AnalysisDriver):
         from .class_hierarchy import ClassHierarchyManager
         from .builtin_api_handler import BuiltinSummaryManager        
         from pythonstan.world import World
-        from .debug_monitor import DebugMonitor
         
         self.config = analysis_config
         if not hasattr(self.config, 'options'):
@@ -50,6 +49,7 @@ class PointerAnalysis(AnalysisDriver):
         # Initialize debug monitor if enabled
         self.debug_monitor = None
         if self.kcfa_config.enable_debug_monitor:
+            from .debug_monitor import DebugMonitor
             self.debug_monitor = DebugMonitor(
                 output_dir=self.kcfa_config.debug_output_dir,
                 log_interval=self.kcfa_config.debug_log_interval,
@@ -393,3 +393,15 @@ class AnalysisResult:
             Dictionary with analysis statistics
         """
         return self._query.get_statistics()
+    
+    def save(self, path: str) -> None:
+        """Serialize the result to a binary snapshot.
+        
+        The snapshot can be reopened with ``serialization.load_query`` without
+        re-running the solver.
+        
+        Args:
+            path: Output file path
+        """
+        from .serialization import save_query
+        save_query(self._query, path)
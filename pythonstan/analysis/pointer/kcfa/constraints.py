@@ -6,8 +6,8 @@ provides efficient storage and indexing for constraint-based solving.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Set, Dict, Type, Tuple, Optional, List, FrozenSet, TYPE_CHECKING
-from collections import defaultdict
+from typing import Any, Set, Dict, Type, Tuple, Optional, List, FrozenSet, Iterator, TYPE_CHECKING
+from itertools import islice
 
 if TYPE_CHECKING:
     from pythonstan.ir import IRCall
@@ -342,33 +342,101 @@ class ReturnConstraint(Constraint):
         return f"ReturnConstraint: {self.caller_target} = return({self.callee_return})"
 
 
+_MISSING = object()
+
+
+class _IndexBucket:
+    """Insertion-ordered constraint bucket with O(1) removal.
+    
+    Entries live in an append-only list; removal leaves a ``None`` tombstone
+    found through ``slots``. Iteration is bounded by the list length when the
+    iterator is created, so constraints added while iterating are not visited
+    and no copy is made. Once tombstones dominate, the list is replaced (not
+    modified in place), so iterators over the old list remain valid; they
+    check ``slots`` and skip the entries removed since they were created.
+    """
+    
+    __slots__ = ("entries", "slots")
+    
+    def __init__(self):
+        self.entries: List[Optional[Tuple['Scope', Constraint]]] = []
+        self.slots: Dict[Tuple['Scope', Constraint], int] = {}
+    
+    def add(self, entry: Tuple['Scope', Constraint]):
+        self.slots[entry] = len(self.entries)
+        self.entries.append(entry)
+    
+    def discard(self, entry: Tuple['Scope', Constraint]) -> bool:
+        idx = self.slots.pop(entry, None)
+        if idx is None:
+            return False
+        self.entries[idx] = None
+        if len(self.entries) > 32 and len(self.slots) * 2 < len(self.entries):
+            self.entries = [e for e in self.entries if e is not None]
+            self.slots = {e: i for i, e in enumerate(self.entries)}
+        return True
+    
+    def __iter__(self) -> Iterator[Tuple['Scope', Constraint]]:
+        # The old list keeps removed entries after a compaction, so liveness is checked in slots
+        return (entry for entry in islice(self.entries, len(self.entries))
+                if entry is not None and entry in self.slots)
+    
+    def __len__(self) -> int:
+        return len(self.slots)
+
+
 class ConstraintManager:
     """Efficient constraint storage and indexing.
     
-    Provides fast lookup of constraints by variable and by type.
+    Provides fast lookup of constraints by variable, by type and by scope.
+    Lookups return iterators over the live index without copying; an iterator
+    sees the constraints present when it was created (constraints added later
+    are skipped). Every add or remove bumps ``generation``, which callers can
+    use to detect that the constraint set changed.
     """
     
     def __init__(self):
         """Initialize empty constraint manager."""
-        self._constraints: Set[Tuple['Scope', Constraint]] = set()
-        self._by_variable: Dict['Variable', List[Tuple['Scope', Constraint]]] = defaultdict(list)
-        self._by_type: Dict[Type[Constraint], List[Tuple['Scope', Constraint]]] = defaultdict(list)
+        # Maps each (scope, constraint) to the variable it is indexed under
+        self._constraints: Dict[Tuple['Scope', Constraint], Any] = {}
+        self._by_variable: Dict[Any, _IndexBucket] = {}
+        self._by_type: Dict[Type[Constraint], _IndexBucket] = {}
+        self._by_scope: Dict['Scope', _IndexBucket] = {}
+        self.generation = 0
+    
+    @staticmethod
+    def _index(index: Dict[Any, _IndexBucket], key: Any, entry: Tuple['Scope', Constraint]):
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = _IndexBucket()
+        bucket.add(entry)
+    
+    @staticmethod
+    def _unindex(index: Dict[Any, _IndexBucket], key: Any, entry: Tuple['Scope', Constraint]):
+        bucket = index.get(key)
+        if bucket is not None and bucket.discard(entry) and not bucket:
+            del index[key]
     
     def add(self, scope, var, constraint: Constraint) -> bool:
         """Add constraint to manager.
         
         Args:
+            scope: Scope in which the constraint is defined
+            var: Variable whose points-to changes trigger the constraint
             constraint: Constraint to add
         
         Returns:
             True if constraint was new (not duplicate)
         """
-        if (scope, constraint) in self._constraints:
+        entry = (scope, constraint)
+        if entry in self._constraints:
             return False
    
-        self._constraints.add((scope, constraint))
-        self._by_variable[var].append((scope, constraint))
-        self._by_type[type(constraint)].append((scope, constraint))
+        self._constraints[entry] = var
+        self._index(self._by_variable, var, entry)
+        self._index(self._by_type, type(constraint), entry)
+        self._index(self._by_scope, scope, entry)
+        self.generation += 1
 
         return True
     
@@ -376,33 +444,44 @@ class ConstraintManager:
         """Remove constraint from manager.
         
         Args:
+            scope: Scope in which the constraint is defined
+            var: Variable the constraint was added under
             constraint: Constraint to remove
         
         Returns:
-            True if constraint existed
+            True if constraint existed under ``var``
         """
-        if (scope, constraint) not in self._constraints:
+        entry = (scope, constraint)
+        if self._constraints.get(entry, _MISSING) != var:
             return False
+        del self._constraints[entry]
         
-        self._constraints.remove((scope, constraint))
+        self._unindex(self._by_variable, var, entry)
+        self._unindex(self._by_type, type(constraint), entry)
+        self._unindex(self._by_scope, scope, entry)
+        self.generation += 1
         
-        # Remove from variable index
-        for involved_var in constraint.variables():
-            scoped_list = self._by_variable.get(involved_var)
-            if not scoped_list:
-                continue
-            self._by_variable[involved_var] = [
-                (s, c) for (s, c) in scoped_list if not (s == scope and c == constraint)
-            ]
+        return True
+    
+    def remove_scope(self, scope: 'Scope') -> int:
+        """Remove all constraints defined in a scope.
         
-        # Remove from type index
-        scoped_list = self._by_type.get(type(constraint))
-        if scoped_list:
-            self._by_type[type(constraint)] = [
-                (s, c) for (s, c) in scoped_list if not (s == scope and c == constraint)
-            ]
+        Used by incremental re-analysis to drop the constraints of a changed
+        scope before translating it again.
         
-        return True
+        Args:
+            scope: Scope whose constraints are removed
+        
+        Returns:
+            Number of constraints removed
+        """
+        bucket = self._by_scope.get(scope)
+        if bucket is None:
+            return 0
+        entries = list(bucket)
+        for entry in entries:
+            self.remove(entry[0], self._constraints[entry], entry[1])
+        return len(entries)
     
     def get_by_variable(self, var: 'Variable') -> List[Constraint]:
         """Get all constraints involving variable.
@@ -413,11 +492,16 @@ class ConstraintManager:
         Returns:
             Set of constraints (empty if none)
         """
-        return [constraint for _, constraint in self._by_variable.get(var, list())]
+        return [constraint for _, constraint in self.iter_scoped_by_variable(var)]
     
-    def iter_scoped_by_variable(self, var: 'Variable') -> List[Tuple['Scope', Constraint]]:
-        """Iterate constraints with their defining scope for a variable."""
-        return list(self._by_variable.get(var, list()))
+    def iter_scoped_by_variable(self, var: 'Variable') -> Iterator[Tuple['Scope', Constraint]]:
+        """Iterate constraints with their defining scope for a variable.
+        
+        The iterator is safe to use while constraints are added; it does not
+        visit constraints added after it was created.
+        """
+        bucket = self._by_variable.get(var)
+        return iter(bucket) if bucket is not None else iter(())
     
     def get_by_type(self, constraint_type: Type[Constraint]) -> List[Constraint]:
         """Get all constraints of given type.
@@ -428,7 +512,35 @@ class ConstraintManager:
         Returns:
             Set of constraints of that type
         """
-        return [constraint for _, constraint in self._by_type.get(constraint_type, list())]
+        bucket = self._by_type.get(constraint_type)
+        return [constraint for _, constraint in bucket] if bucket is not None else []
+    
+    def count_by_type(self, constraint_type: Type[Constraint]) -> int:
+        """Get number of constraints of given type without materializing them."""
+        bucket = self._by_type.get(constraint_type)
+        return len(bucket) if bucket is not None else 0
+    
+    def size_by_kind(self) -> Dict[str, int]:
+        """Get number of constraints per constraint kind, for profiling.
+        
+        Returns:
+            Mapping from constraint class name to count
+        """
+        return {ctype.__name__: len(bucket) for ctype, bucket in self._by_type.items()}
+    
+    def get_index_statistics(self) -> Dict[str, int]:
+        """Get sizes of the constraint indexes, for profiling.
+        
+        Returns:
+            Dictionary with the number of constraints, indexed variables and
+            scopes, and the largest per-variable bucket
+        """
+        return {
+            "num_constraints": len(self._constraints),
+            "num_indexed_variables": len(self._by_variable),
+            "num_indexed_scopes": len(self._by_scope),
+            "max_constraints_per_variable": max((len(b) for b in self._by_variable.values()), default=0),
+        }
     
     def all(self) -> Set[Constraint]:
         """Get all constraints.
@@ -436,8 +548,8 @@ class ConstraintManager:
         Returns:
             Copy of all constraints
         """
-        return self._constraints.copy()
+        return set(self._constraints)
     
     def __len__(self) -> int:
         """Get number of constraints."""
-        return len(self._constraints)
\ No newline at end of file
+        return len(self._constraints)
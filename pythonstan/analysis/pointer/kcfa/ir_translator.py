@@ -424,7 +424,8 @@ class IRTranslator:
             self._register_local_var(lval)
         
         call_site_scope = self._get_current_scope_label()
-        call_site_id = f"{call_site_scope}:{stmt.get_ast().lineno}:{stmt.get_ast().col_offset}:{stmt}"
+        span = stmt.get_span()
+        call_site_id = f"{call_site_scope}:{span.lineno}:{span.col_offset}:{stmt}"
         keyword_vars = {kw_name: self._make_variable(kw_val) 
                         for kw_name, kw_val in stmt.get_keywords() 
                         if kw_name is not None}
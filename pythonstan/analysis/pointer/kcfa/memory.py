@@ -0,0 +1,290 @@
+"""Memory accounting for pointer analysis.
+
+This module breaks down the memory held by a running or finished pointer
+analysis into the structures that usually dominate it: contexts, heap
+objects and fields, the pointer flow graph, constraint indexes, points-to
+sets and the IR/AST retained by the scope manager.
+
+Sizes are computed by deep ``sys.getsizeof`` traversal. Every object is
+charged once, to the first category that reaches it, in the order listed in
+:data:`CATEGORIES`; e.g. an abstract object referenced from many points-to
+sets is charged to ``heap_objects``. IR statements and AST nodes are only
+charged to ``ir`` and ``ast``, even when analysis structures such as
+allocation sites reference them. Large collections are sampled and the
+result is extrapolated.
+
+For allocation-site attribution instead of reachability, use
+:func:`tracemalloc_by_module` on a ``tracemalloc`` snapshot.
+
+Example:
+    >>> report = measure_memory(result.query()._state, World().scope_manager)
+    >>> print(report.format())
+"""
+
+import ast
+import enum
+import os
+import sys
+import types
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import tracemalloc
+    from pythonstan.world.scope_manager import ScopeManager
+    from .state import PointerAnalysisState
+
+__all__ = [
+    "CATEGORIES",
+    "MemoryCategory",
+    "MemoryReport",
+    "deep_sizeof",
+    "measure_memory",
+    "tracemalloc_by_module",
+]
+
+CATEGORIES = (
+    "ir",
+    "ast",
+    "contexts",
+    "heap_objects",
+    "heap_fields",
+    "pfg_nodes",
+    "pfg_edges",
+    "constraints",
+    "points_to_sets",
+)
+
+# Shared, program-independent objects that are never charged to a category
+_SKIP_TYPES = (
+    type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+    types.MethodType, types.CodeType, enum.Enum, type(None), bool,
+)
+
+
+@dataclass
+class MemoryCategory:
+    """Memory charged to one category.
+
+    Attributes:
+        name: Category name
+        count: Number of logical items (contexts, nodes, constraints, ...)
+        bytes: Estimated bytes exclusively charged to the category
+        sampled: Whether ``bytes`` was extrapolated from a sample
+    """
+
+    name: str
+    count: int = 0
+    bytes: int = 0
+    sampled: bool = False
+
+
+@dataclass
+class MemoryReport:
+    """Per-category memory breakdown of a pointer analysis."""
+
+    categories: Dict[str, MemoryCategory] = field(default_factory=dict)
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(c.bytes for c in self.categories.values())
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {"count": c.count, "bytes": c.bytes, "sampled": c.sampled}
+            for name, c in self.categories.items()
+        }
+
+    def format(self) -> str:
+        """Render the report as a fixed-width table, largest category first."""
+        total = self.total_bytes or 1
+        lines = [f"{'category':<16}{'count':>12}{'MiB':>12}{'share':>8}"]
+        for c in sorted(self.categories.values(), key=lambda c: -c.bytes):
+            mark = "~" if c.sampled else " "
+            lines.append(f"{c.name:<16}{c.count:>12}{c.bytes / 2**20:>11.2f}{mark}{c.bytes / total:>8.1%}")
+        lines.append(f"{'total':<16}{'':>12}{self.total_bytes / 2**20:>11.2f} ")
+        return "\n".join(lines)
+
+
+def _referents(obj: Any) -> Iterable[Any]:
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            yield k
+            yield v
+        return
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        yield from obj
+        return
+    d = getattr(obj, "__dict__", None)
+    if isinstance(d, dict):
+        yield d
+    for cls in type(obj).__mro__:
+        for slot in cls.__dict__.get("__slots__", ()):
+            if slot in ("__dict__", "__weakref__"):
+                continue
+            try:
+                yield getattr(obj, slot)
+            except AttributeError:
+                pass
+
+
+def _walk(roots: Iterable[Any], seen: Set[int],
+          mark: Optional[Callable[[Any], bool]] = None,
+          skip: Tuple[type, ...] = ()) -> Iterable[Tuple[Any, bool]]:
+    """Yield every object reachable from ``roots`` not already in ``seen``.
+
+    Traversal is iterative, so deeply nested ASTs do not hit the recursion
+    limit. If ``mark`` is given, each object is yielded with a flag that is
+    set once ``mark`` held for it or any object on the path leading to it.
+    Instances of ``skip`` are neither yielded nor traversed.
+    """
+    stack: List[Tuple[Any, bool]] = [(root, False) for root in roots]
+    while stack:
+        obj, marked = stack.pop()
+        if isinstance(obj, _SKIP_TYPES) or isinstance(obj, skip) or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        marked = marked or (mark is not None and mark(obj))
+        yield obj, marked
+        if isinstance(obj, (str, bytes, int, float, complex)):
+            continue
+        stack.extend((child, marked) for child in _referents(obj))
+
+
+def deep_sizeof(obj: Any, seen: Optional[Set[int]] = None) -> int:
+    """Compute the total size of an object and everything it references.
+
+    Args:
+        obj: Root object
+        seen: IDs of objects already charged elsewhere; updated in place
+
+    Returns:
+        Size in bytes
+    """
+    if seen is None:
+        seen = set()
+    return sum(sys.getsizeof(o) for o, _ in _walk([obj], seen))
+
+
+def _measure(name: str, container: Any, entries: Iterable[Tuple[Any, ...]], count: int,
+             seen: Set[int], sample_size: int, skip: Tuple[type, ...] = ()) -> MemoryCategory:
+    """Charge a container and its entries, sampling when there are many entries.
+
+    Each entry is a tuple of roots (e.g. a key and its value); the tuple
+    itself is a temporary and is not charged.
+    """
+    cat = MemoryCategory(name, count)
+    if container is not None and id(container) not in seen:
+        seen.add(id(container))
+        cat.bytes += sys.getsizeof(container)
+
+    def size(entry: Tuple[Any, ...]) -> int:
+        return sum(sys.getsizeof(o) for o, _ in _walk(entry, seen, skip=skip))
+
+    if sample_size <= 0 or count <= sample_size:
+        cat.bytes += sum(size(entry) for entry in entries)
+        return cat
+    # Size an evenly strided sample and extrapolate to the whole collection
+    stride = count // sample_size
+    sampled = sum(size(entry) for entry in islice(entries, 0, None, stride))
+    cat.bytes += sampled * count // len(range(0, count, stride))
+    cat.sampled = True
+    return cat
+
+
+def _singles(items: Iterable[Any]) -> Iterable[Tuple[Any]]:
+    return ((item,) for item in items)
+
+
+def measure_memory(
+    state: 'PointerAnalysisState',
+    scope_manager: Optional['ScopeManager'] = None,
+    sample_size: int = 10000
+) -> MemoryReport:
+    """Measure the memory held by a pointer analysis.
+
+    Args:
+        state: Analysis state to measure
+        scope_manager: Scope manager holding IR and ASTs; skipped if None
+        sample_size: Maximum items sized per collection before sampling;
+            0 disables sampling
+
+    Returns:
+        Memory report with one entry per category
+    """
+    from pythonstan.ir import IRStatement
+    from . import context
+
+    seen: Set[int] = set()
+    report = MemoryReport()
+    program = (IRStatement, ast.AST)
+
+    def add(cat: MemoryCategory):
+        report.categories[cat.name] = cat
+
+    def measure(name: str, container: Any, entries: Iterable[Tuple[Any, ...]], count: int) -> MemoryCategory:
+        return _measure(name, container, entries, count, seen, sample_size, skip=program)
+
+    def measure_all(cat: MemoryCategory, *containers: Any) -> None:
+        for container in containers:
+            cat.bytes += measure("", container, container.items(), len(container)).bytes
+
+    if scope_manager is not None:
+        ir = MemoryCategory("ir", len(scope_manager.scope_ir))
+        tree = MemoryCategory("ast", 0)
+        roots = [scope_manager.scope_ir, scope_manager.scopes]
+        for obj, in_ast in _walk(roots, seen, mark=lambda o: isinstance(o, ast.AST)):
+            cat = tree if in_ast else ir
+            cat.bytes += sys.getsizeof(obj)
+            if isinstance(obj, ast.AST):
+                cat.count += 1
+        add(ir)
+        add(tree)
+
+    pool = context.context_pool
+    add(measure("contexts", pool, pool.items(), len(pool)))
+
+    heap = state._heap
+    add(measure("heap_objects", heap.objects, heap.objects.items(), len(heap.objects)))
+    heap_fields = measure("heap_fields", state._field_accesses, state._field_accesses.items(),
+                          len(state._field_accesses))
+    measure_all(heap_fields, heap.heap, heap.field_accesses, heap.cell_vars, heap.global_vars, heap.nonlocal_vars)
+    add(heap_fields)
+
+    pfg = state.pointer_flow_graph
+    add(measure("pfg_nodes", pfg.nodes, _singles(pfg.nodes), len(pfg.nodes)))
+    pfg_edges = measure("pfg_edges", pfg.edges, _singles(pfg.edges), len(pfg.edges))
+    measure_all(pfg_edges, pfg.succs, pfg.preds)
+    add(pfg_edges)
+
+    cm = state.constraints
+    constraints = measure("constraints", cm._constraints, _singles(cm._constraints), len(cm._constraints))
+    measure_all(constraints, cm._by_variable, cm._by_type, cm._by_scope)
+    add(constraints)
+
+    add(measure("points_to_sets", state._env, state._env.items(), len(state._env)))
+
+    return report
+
+
+def tracemalloc_by_module(snapshot: 'tracemalloc.Snapshot', package: Optional[str] = None) -> Dict[str, int]:
+    """Group traced allocations by the source module that made them.
+
+    Args:
+        snapshot: Snapshot taken with ``tracemalloc.take_snapshot()``
+        package: Directory whose modules are reported individually; defaults
+            to the kcfa package. Allocations elsewhere are grouped as "<other>".
+
+    Returns:
+        Mapping from module file name to allocated bytes, largest first
+    """
+    if package is None:
+        package = os.path.dirname(os.path.abspath(__file__))
+    package = os.path.join(package, "")
+    totals: Dict[str, int] = {}
+    for stat in snapshot.statistics("filename"):
+        filename = stat.traceback[0].filename
+        name = os.path.relpath(filename, package) if filename.startswith(package) else "<other>"
+        totals[name] = totals.get(name, 0) + stat.size
+    return dict(sorted(totals.items(), key=lambda kv: -kv[1]))
@@ -0,0 +1,685 @@
+"""Binary serialization of solved pointer analysis state.
+
+This module writes the result of a :class:`PointerAnalysis` run (points-to
+sets, heap fields, call graph edges, contexts and statistics) into a single
+versioned binary file and loads it back as a read-only query object, so that
+downstream checkers running in separate processes do not need to solve again.
+
+Objects, contexts, scopes and names are interned into integer IDs; identical
+points-to sets are stored once and shared. The loaded file is memory-mapped
+and records are decoded lazily on first access.
+
+File layout (all integers are little-endian unsigned 32-bit unless noted)::
+
+    magic (8 bytes) | version | section count
+    section table: name (4 bytes) | offset (u64) | length (u64)
+    sections: STRS CTXS OBJS PTSS VARS FLDS EDGS STAT
+
+Example:
+    >>> from pythonstan.analysis.pointer.kcfa.serialization import save_query, load_query
+    >>> save_query(result.query(), "project.pts")
+    >>> query = load_query("project.pts")
+    >>> query.points_to_name("prog.main", "x")
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+from pythonstan.graph.call_graph import AbstractCallGraph, CallEdge, CallKind
+
+from .points_to_set import PointsToSet
+
+if TYPE_CHECKING:
+    from .state import PointerAnalysisState
+    from .solver_interface import ISolverQuery
+    from .heap_model import Field
+
+__all__ = [
+    "FORMAT_VERSION",
+    "ContextRecord",
+    "ObjectRecord",
+    "PointerKey",
+    "pointer_key_of",
+    "CallSiteRecord",
+    "ScopeRecord",
+    "SnapshotCallGraph",
+    "SnapshotQuery",
+    "save_state",
+    "save_query",
+    "load_query",
+]
+
+MAGIC = b"PSTNPTA\x00"
+FORMAT_VERSION = 1
+
+NONE_ID = 0xFFFFFFFF
+
+_HEADER = struct.Struct("<8sII")
+_SECTION = struct.Struct("<4sQQ")
+_U32 = struct.Struct("<I")
+
+_SECTIONS = ("STRS", "CTXS", "OBJS", "PTSS", "VARS", "FLDS", "EDGS", "STAT")
+
+# Number of u32 words per record in the fixed-width sections
+_OBJ_WIDTH = 5     # type, kind, site, context, label
+_VAR_WIDTH = 6     # scope name, scope context, context, name, kind, pts
+_FLD_WIDTH = 5     # object, field kind, field name, field index, pts
+_EDGE_WIDTH = 6    # kind, caller scope, caller context, call site, callee scope, callee context
+
+# Points-to set partitions, stored in the low bits of each points-to entry
+_PART_OBJECT = 0
+_PART_CLASSMETHOD = 1
+_PART_INSTANCEMETHOD = 2
+
+
+@dataclass(frozen=True)
+class ContextRecord:
+    """Context loaded from a snapshot.
+
+    Attributes:
+        id: Interned context ID within the snapshot
+        description: Human-readable context string
+    """
+
+    id: int
+    description: str
+
+    def __str__(self) -> str:
+        return self.description
+
+
+@dataclass(frozen=True)
+class ObjectRecord:
+    """Abstract object loaded from a snapshot.
+
+    Attributes:
+        id: Interned object ID within the snapshot
+        type_name: Class name of the original abstract object
+        kind: Allocation kind value (e.g. "list", "func")
+        alloc_site: String form of the allocation site statement
+        context: Allocation context
+        label: String form of the original object
+    """
+
+    id: int
+    type_name: str
+    kind: str
+    alloc_site: str
+    context: ContextRecord
+    label: str
+
+    def __str__(self) -> str:
+        return self.label
+
+
+@dataclass(frozen=True)
+class PointerKey:
+    """Context-qualified variable identity used in snapshots.
+
+    Attributes:
+        scope: Qualified name of the owning scope
+        scope_context: Context of the owning scope
+        context: Context of the variable
+        name: Variable name
+        kind: Variable kind value (e.g. "local", "global")
+    """
+
+    scope: str
+    scope_context: str
+    context: str
+    name: str
+    kind: str
+
+
+@dataclass(frozen=True)
+class ScopeRecord:
+    """Context-qualified scope loaded from a snapshot."""
+
+    name: str
+    context: ContextRecord
+
+    def __str__(self) -> str:
+        return f"Scope[{self.name}@{self.context}]"
+
+
+@dataclass(frozen=True)
+class CallSiteRecord:
+    """Context-qualified call site loaded from a snapshot."""
+
+    scope: ScopeRecord
+    call_site: str
+
+    def __str__(self) -> str:
+        return f"{self.call_site}@{self.scope}"
+
+
+def _describe_context(ctx: Any) -> str:
+    if ctx is None:
+        return "-"
+    try:
+        return ctx.to_string()
+    except Exception:
+        return repr(ctx)
+
+
+def _scope_name(scope: Any) -> str:
+    if scope is None:
+        return "-"
+    name = getattr(scope, "name", None)
+    return name if isinstance(name, str) else str(scope)
+
+
+def pointer_key_of(cvar: Any) -> Optional[PointerKey]:
+    """Compute the snapshot key of a live contextualized variable.
+
+    Args:
+        cvar: ``Ctx[Variable]`` from a live analysis state
+
+    Returns:
+        Snapshot key, or None if ``cvar`` is not a contextualized variable
+    """
+    from .context import Ctx
+    from .variable import Variable
+
+    if not isinstance(cvar, Ctx) or not isinstance(cvar.content, Variable):
+        return None
+    scope = cvar.scope
+    return PointerKey(
+        scope=_scope_name(scope),
+        scope_context=_describe_context(getattr(scope, "context", None)),
+        context=_describe_context(cvar.context),
+        name=cvar.content.name,
+        kind=cvar.content.kind.value,
+    )
+
+
+class _Writer:
+    """Interns analysis entities and lays out the binary sections."""
+
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.contexts: Dict[Any, int] = {}
+        self.context_strs = array("I")
+        self.objects: Dict[Any, int] = {}
+        self.object_words = array("I")
+        self.pts_ids: Dict[FrozenSet[int], int] = {}
+        self.pts_offsets = array("I", [0])
+        self.pts_words = array("I")
+        self.var_words = array("I")
+        self.field_words = array("I")
+        self.edge_words = array("I")
+
+    def string(self, s: Optional[str]) -> int:
+        if s is None:
+            return NONE_ID
+        sid = self.strings.get(s)
+        if sid is None:
+            sid = len(self.strings)
+            self.strings[s] = sid
+        return sid
+
+    def context(self, ctx: Any) -> int:
+        if ctx is None:
+            return NONE_ID
+        cid = self.contexts.get(ctx)
+        if cid is None:
+            cid = len(self.contexts)
+            self.contexts[ctx] = cid
+            self.context_strs.append(self.string(_describe_context(ctx)))
+        return cid
+
+    def obj(self, obj: Any) -> int:
+        oid = self.objects.get(obj)
+        if oid is None:
+            oid = len(self.objects)
+            self.objects[obj] = oid
+            alloc_site = getattr(obj, "alloc_site", None)
+            kind = getattr(alloc_site, "kind", None)
+            self.object_words.extend((
+                self.string(type(obj).__name__),
+                self.string(kind.value if kind is not None else None),
+                self.string(str(alloc_site.stmt) if alloc_site is not None else None),
+                self.context(getattr(obj, "context", None)),
+                self.string(str(obj)),
+            ))
+        return oid
+
+    def pts(self, pts: PointsToSet) -> int:
+        # The low two bits of each entry record which partition the object belongs to
+        key = frozenset(
+            [self.obj(o) << 2 | _PART_OBJECT for o in pts.objects]
+            + [self.obj(o) << 2 | _PART_CLASSMETHOD for o in pts.classmethods]
+            + [self.obj(o) << 2 | _PART_INSTANCEMETHOD for o in pts.instancemethods]
+        )
+        pid = self.pts_ids.get(key)
+        if pid is None:
+            pid = len(self.pts_ids)
+            self.pts_ids[key] = pid
+            self.pts_words.extend(sorted(key))
+            self.pts_offsets.append(len(self.pts_words))
+        return pid
+
+    def add_variable(self, cvar: Any, pts: PointsToSet):
+        scope = cvar.scope
+        var = cvar.content
+        self.var_words.extend((
+            self.string(_scope_name(scope)),
+            self.context(getattr(scope, "context", None)),
+            self.context(cvar.context),
+            self.string(var.name),
+            self.string(var.kind.value),
+            self.pts(pts),
+        ))
+
+    def add_field(self, field_access: Any, pts: PointsToSet):
+        field = field_access.field
+        self.field_words.extend((
+            self.obj(field_access.obj),
+            self.string(field.kind.value),
+            self.string(field.name),
+            NONE_ID if field.index is None else field.index,
+            self.pts(pts),
+        ))
+
+    def add_call_edge(self, edge: CallEdge):
+        callsite = edge.get_callsite()
+        callee = edge.get_callee()
+        caller_scope = getattr(callsite, "scope", None)
+        self.edge_words.extend((
+            self.string(edge.get_kind().name),
+            self.string(_scope_name(caller_scope)),
+            self.context(getattr(callsite, "context", None)),
+            self.string(str(getattr(callsite, "content", callsite))),
+            self.string(_scope_name(callee)),
+            self.context(getattr(callee, "context", None)),
+        ))
+
+    def sections(self, stats: Dict[str, Any]) -> Dict[str, bytes]:
+        strs = list(self.strings)
+        encoded = [s.encode("utf-8", "surrogatepass") for s in strs]
+        str_offsets = array("I", [0])
+        for b in encoded:
+            str_offsets.append(str_offsets[-1] + len(b))
+
+        def words(*arrays: array) -> bytes:
+            out = array("I")
+            for a in arrays:
+                out.extend(a)
+            if sys.byteorder == "big":
+                out.byteswap()
+            return out.tobytes()
+
+        return {
+            "STRS": words(array("I", [len(strs)]), str_offsets) + b"".join(encoded),
+            "CTXS": words(array("I", [len(self.context_strs)]), self.context_strs),
+            "OBJS": words(array("I", [len(self.objects)]), self.object_words),
+            "PTSS": words(array("I", [len(self.pts_ids)]), self.pts_offsets, self.pts_words),
+            "VARS": words(array("I", [len(self.var_words) // _VAR_WIDTH]), self.var_words),
+            "FLDS": words(array("I", [len(self.field_words) // _FLD_WIDTH]), self.field_words),
+            "EDGS": words(array("I", [len(self.edge_words) // _EDGE_WIDTH]), self.edge_words),
+            "STAT": json.dumps(stats, default=str, sort_keys=True).encode("utf-8"),
+        }
+
+
+def save_state(
+    state: 'PointerAnalysisState',
+    path: str,
+    stats: Optional[Dict[str, Any]] = None
+) -> None:
+    """Serialize a solved pointer analysis state to a binary file.
+
+    Only contextualized variables and field accesses are written; pointer
+    flow graph nodes are solver internals and are skipped.
+
+    Args:
+        state: Solved analysis state
+        path: Output file path
+        stats: Statistics to store, defaults to ``state.get_statistics()``
+    """
+    from .context import Ctx
+    from .variable import Variable, FieldAccess
+
+    writer = _Writer()
+    for key, pts in state._env.items():
+        if not isinstance(key, Ctx) or pts.is_empty():
+            continue
+        if isinstance(key.content, Variable):
+            writer.add_variable(key, pts)
+        elif isinstance(key.content, FieldAccess):
+            writer.add_field(key.content, pts)
+    for edge in state.call_graph.get_edges():
+        writer.add_call_edge(edge)
+
+    if stats is None:
+        stats = state.get_statistics()
+    sections = writer.sections(stats)
+
+    offset = _HEADER.size + _SECTION.size * len(_SECTIONS)
+    table = []
+    for name in _SECTIONS:
+        data = sections[name]
+        # Keep every section 4-byte aligned so it can be viewed as u32 words
+        padding = (-offset) % 4
+        offset += padding
+        table.append((name, offset, len(data), padding))
+        offset += len(data)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(_SECTIONS)))
+        for name, sec_offset, length, _ in table:
+            f.write(_SECTION.pack(name.encode("ascii"), sec_offset, length))
+        for name, _, _, padding in table:
+            f.write(b"\x00" * padding)
+            f.write(sections[name])
+
+
+def save_query(query: 'ISolverQuery', path: str) -> None:
+    """Serialize the state behind a solver query to a binary file.
+
+    Args:
+        query: Query returned by ``PointerSolver.query()`` or ``AnalysisResult.query()``
+        path: Output file path
+    """
+    state = getattr(query, "_state", None)
+    if state is None:
+        raise TypeError(f"Cannot serialize query of type {type(query).__name__}: no solver state attached")
+    save_state(state, path, query.get_statistics())
+
+
+class SnapshotCallGraph(AbstractCallGraph[CallSiteRecord, ScopeRecord]):
+    """Call graph rebuilt from a snapshot, keyed by scope and call-site records."""
+
+    def __init__(self):
+        super().__init__()
+        self.plain_edges = set()
+
+    def add_edge(self, edge: CallEdge[CallSiteRecord, ScopeRecord]):
+        super().add_edge(edge)
+        self.reachable_scopes.add(edge.get_callee())
+        self.plain_edges.add((edge.callsite.scope.name, edge.callsite.call_site, edge.callee.name))
+
+    def num_plain_edges(self) -> int:
+        return len(self.plain_edges)
+
+
+class SnapshotQuery:
+    """Read-only query interface over a serialized pointer analysis result.
+
+    Implements the ``ISolverQuery`` protocol. Points-to sets are returned as
+    :class:`PointsToSet` instances holding :class:`ObjectRecord` entries.
+    """
+
+    def __init__(self, path: str, lazy: bool = True):
+        """Open a snapshot file.
+
+        Args:
+            path: Snapshot file path
+            lazy: If True, memory-map the file and decode records on demand;
+                otherwise read the whole file into memory
+
+        Raises:
+            ValueError: If the file is not a snapshot or has an unsupported version
+        """
+        self.path = path
+        self._words: Dict[str, Any] = {}
+        self._file = open(path, "rb")
+        if lazy:
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self._buf = self._file.read()
+
+        magic, version, n_sections = _HEADER.unpack_from(self._buf, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a pointer analysis snapshot")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"Unsupported snapshot version {version} (expected {FORMAT_VERSION})")
+
+        self._sections: Dict[str, Tuple[int, int]] = {}
+        for i in range(n_sections):
+            name, offset, length = _SECTION.unpack_from(self._buf, _HEADER.size + i * _SECTION.size)
+            self._sections[name.decode("ascii")] = (offset, length)
+
+        self._strings: Dict[int, str] = {}
+        self._contexts: Dict[int, ContextRecord] = {}
+        self._objects: Dict[int, ObjectRecord] = {}
+        self._pts: Dict[int, PointsToSet] = {}
+        self._var_index: Optional[Dict[Tuple[str, str, str, str], List[int]]] = None
+        self._name_index: Optional[Dict[Tuple[str, str], List[int]]] = None
+        self._field_index: Optional[Dict[Tuple[int, str, Optional[str], Optional[int]], int]] = None
+        self._call_graph: Optional[SnapshotCallGraph] = None
+        self._stats: Optional[Dict[str, Any]] = None
+
+    def close(self) -> None:
+        """Release the underlying file and memory map."""
+        for words in self._words.values():
+            if isinstance(words, memoryview):
+                words.release()
+        self._words.clear()
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
+        self._file.close()
+
+    def __enter__(self) -> 'SnapshotQuery':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ------------------------------------------------------------------
+    # Raw section access
+    # ------------------------------------------------------------------
+
+    def _section_words(self, name: str):
+        words = self._words.get(name)
+        if words is None:
+            offset, length = self._sections[name]
+            view = memoryview(self._buf)[offset:offset + length - length % 4]
+            if sys.byteorder == "big":
+                words = array("I", view.tobytes())
+                words.byteswap()
+            else:
+                words = view.cast("I")
+            self._words[name] = words
+        return words
+
+    def _count(self, name: str) -> int:
+        return self._section_words(name)[0]
+
+    def _string(self, sid: int) -> Optional[str]:
+        if sid == NONE_ID:
+            return None
+        s = self._strings.get(sid)
+        if s is None:
+            words = self._section_words("STRS")
+            count = words[0]
+            start, end = words[1 + sid], words[2 + sid]
+            base = self._sections["STRS"][0] + 4 * (count + 2)
+            s = bytes(self._buf[base + start:base + end]).decode("utf-8", "surrogatepass")
+            self._strings[sid] = s
+        return s
+
+    def _context(self, cid: int) -> Optional[ContextRecord]:
+        if cid == NONE_ID:
+            return None
+        ctx = self._contexts.get(cid)
+        if ctx is None:
+            ctx = ContextRecord(cid, self._string(self._section_words("CTXS")[1 + cid]))
+            self._contexts[cid] = ctx
+        return ctx
+
+    def _context_str(self, cid: int) -> str:
+        ctx = self._context(cid)
+        return ctx.description if ctx is not None else "-"
+
+    def _object(self, oid: int) -> ObjectRecord:
+        obj = self._objects.get(oid)
+        if obj is None:
+            base = 1 + oid * _OBJ_WIDTH
+            w = self._section_words("OBJS")[base:base + _OBJ_WIDTH]
+            obj = ObjectRecord(oid, self._string(w[0]), self._string(w[1]), self._string(w[2]),
+                               self._context(w[3]), self._string(w[4]))
+            self._objects[oid] = obj
+        return obj
+
+    def _points_to_set(self, pid: int) -> PointsToSet:
+        pts = self._pts.get(pid)
+        if pts is None:
+            words = self._section_words("PTSS")
+            count = words[0]
+            start, end = words[1 + pid], words[2 + pid]
+            base = 2 + count
+            parts: Tuple[List[ObjectRecord], ...] = ([], [], [])
+            for entry in words[base + start:base + end]:
+                parts[entry & 3].append(self._object(entry >> 2))
+            pts = PointsToSet(frozenset(parts[_PART_OBJECT]),
+                              frozenset(parts[_PART_CLASSMETHOD]),
+                              frozenset(parts[_PART_INSTANCEMETHOD]))
+            self._pts[pid] = pts
+        return pts
+
+    def _var_record(self, idx: int):
+        base = 1 + idx * _VAR_WIDTH
+        return self._section_words("VARS")[base:base + _VAR_WIDTH]
+
+    def _build_var_index(self):
+        self._var_index = {}
+        self._name_index = {}
+        for idx in range(self._count("VARS")):
+            scope, scope_ctx, ctx, name, _, _ = self._var_record(idx)
+            scope_name, var_name = self._string(scope), self._string(name)
+            key = (scope_name, self._context_str(scope_ctx), self._context_str(ctx), var_name)
+            self._var_index.setdefault(key, []).append(idx)
+            self._name_index.setdefault((scope_name, var_name), []).append(idx)
+
+    def _build_field_index(self):
+        self._field_index = {}
+        for idx in range(self._count("FLDS")):
+            base = 1 + idx * _FLD_WIDTH
+            oid, kind, name, index, pid = self._section_words("FLDS")[base:base + _FLD_WIDTH]
+            key = (oid, self._string(kind), self._string(name), None if index == NONE_ID else index)
+            self._field_index[key] = pid
+
+    def _union(self, pids: List[int]) -> PointsToSet:
+        if len(pids) == 1:
+            return self._points_to_set(pids[0])
+        result = PointsToSet.empty()
+        for pid in pids:
+            result = result.union(self._points_to_set(pid))
+        return result
+
+    # ------------------------------------------------------------------
+    # Query interface
+    # ------------------------------------------------------------------
+
+    def points_to(self, var: Union[PointerKey, Any]) -> PointsToSet:
+        """Get points-to set for a contextualized variable.
+
+        Args:
+            var: A :class:`PointerKey`, or a live ``Ctx[Variable]`` whose key
+                is computed with :func:`pointer_key_of`
+
+        Returns:
+            Points-to set for variable (empty if not found)
+        """
+        key = var if isinstance(var, PointerKey) else pointer_key_of(var)
+        if key is None:
+            return PointsToSet.empty()
+        if self._var_index is None:
+            self._build_var_index()
+        idxs = self._var_index.get((key.scope, key.scope_context, key.context, key.name), [])
+        return self._union([self._var_record(idx)[5] for idx in idxs])
+
+    def points_to_name(self, scope: str, name: str) -> PointsToSet:
+        """Get the context-insensitive points-to set of a variable.
+
+        Args:
+            scope: Qualified name of the owning scope
+            name: Variable name
+
+        Returns:
+            Union of the points-to sets over all contexts
+        """
+        if self._name_index is None:
+            self._build_var_index()
+        idxs = self._name_index.get((scope, name), [])
+        return self._union([self._var_record(idx)[5] for idx in idxs])
+
+    def get_field(self, obj: ObjectRecord, field: 'Field') -> PointsToSet:
+        """Get points-to set for object field.
+
+        Args:
+            obj: Object record returned by a previous query
+            field: Field to query
+
+        Returns:
+            Points-to set for field (empty if not found)
+        """
+        if self._field_index is None:
+            self._build_field_index()
+        pid = self._field_index.get((obj.id, field.kind.value, field.name, field.index))
+        if pid is None:
+            return PointsToSet.empty()
+        return self._points_to_set(pid)
+
+    def may_alias(self, v1: Union[PointerKey, Any], v2: Union[PointerKey, Any]) -> bool:
+        """Check if two variables may point to the same object."""
+        return not self.points_to(v1).intersection(self.points_to(v2)).is_empty()
+
+    def variables(self) -> Iterator[PointerKey]:
+        """Iterate over all contextualized variables in the snapshot."""
+        for idx in range(self._count("VARS")):
+            scope, scope_ctx, ctx, name, kind, _ = self._var_record(idx)
+            yield PointerKey(self._string(scope), self._context_str(scope_ctx),
+                             self._context_str(ctx), self._string(name), self._string(kind))
+
+    def objects(self) -> Iterator[ObjectRecord]:
+        """Iterate over all abstract objects in the snapshot."""
+        for oid in range(self._count("OBJS")):
+            yield self._object(oid)
+
+    def contexts(self) -> Iterator[ContextRecord]:
+        """Iterate over all contexts in the snapshot."""
+        for cid in range(self._count("CTXS")):
+            yield self._context(cid)
+
+    def call_graph(self) -> SnapshotCallGraph:
+        """Get the call graph, rebuilt on first access."""
+        if self._call_graph is None:
+            graph = SnapshotCallGraph()
+            words = self._section_words("EDGS")
+            for idx in range(words[0]):
+                base = 1 + idx * _EDGE_WIDTH
+                kind, caller, caller_ctx, site, callee, callee_ctx = words[base:base + _EDGE_WIDTH]
+                callsite = CallSiteRecord(ScopeRecord(self._string(caller), self._context(caller_ctx)),
+                                          self._string(site))
+                callee_scope = ScopeRecord(self._string(callee), self._context(callee_ctx))
+                graph.add_edge(CallEdge(CallKind[self._string(kind)], callsite, callee_scope))
+            self._call_graph = graph
+        return self._call_graph
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get the analysis statistics stored with the snapshot."""
+        if self._stats is None:
+            offset, length = self._sections["STAT"]
+            self._stats = json.loads(bytes(self._buf[offset:offset + length]).decode("utf-8"))
+        return dict(self._stats)
+
+
+def load_query(path: str, lazy: bool = True) -> SnapshotQuery:
+    """Load a serialized pointer analysis result.
+
+    Args:
+        path: Snapshot file path written by :func:`save_query`
+        lazy: Memory-map the file and decode records on demand
+
+    Returns:
+        Query interface over the stored result
+    """
+    return SnapshotQuery(path, lazy=lazy)
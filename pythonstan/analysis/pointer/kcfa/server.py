@@ -0,0 +1,411 @@
+"""Local points-to query server.
+
+This module keeps a solved pointer analysis in memory and answers queries
+over a Unix domain socket, so editor integrations and hooks do not pay the
+startup and solve cost for every question.
+
+The protocol is line-delimited JSON. Each request is one JSON object per line::
+
+    {"id": 1, "method": "points_to", "params": {"scope": "prog.main", "var": "x"}}
+
+and each response is one JSON object per line carrying the same ``id`` and
+either a ``result`` or an ``error`` member.
+
+Supported methods:
+    - ping: Liveness check, returns the current result generation
+    - points_to: Objects a variable may point to (``scope``, ``var``)
+    - may_alias: Whether two variables may alias (``scope``, ``var``, ``other_scope``, ``other_var``)
+    - field: Objects a variable's field may point to (``scope``, ``var``, ``field``)
+    - call_graph: Call edges, optionally filtered by caller/callee scope (``caller``, ``callee``)
+    - stats: Analysis statistics
+    - module_changed: Notify that modules changed (``modules``); re-runs the analysis
+      of the whole program, since points-to facts flow across modules
+    - shutdown: Stop the server
+
+Example:
+    $ python -m pythonstan.analysis.pointer.kcfa.server --config project.yaml --socket /tmp/pts.sock
+    $ echo '{"id": 1, "method": "points_to", "params": {"scope": "app", "var": "x"}}' | nc -U /tmp/pts.sock
+"""
+
+import argparse
+import json
+import logging
+import os
+import socketserver
+import stat
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+
+from .heap_model import Field, FieldKind, attr, elem, key, unknown, value
+from .points_to_set import PointsToSet
+
+if TYPE_CHECKING:
+    from .solver_interface import ISolverQuery
+
+__all__ = [
+    "QueryError",
+    "QueryService",
+    "PointsToServer",
+    "pipeline_analyzer",
+    "snapshot_analyzer",
+    "serve",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class QueryError(Exception):
+    """Error reported back to the client for a malformed or unanswerable request."""
+
+
+def pipeline_analyzer(pipeline_config: Dict[str, Any]) -> Callable[[], 'ISolverQuery']:
+    """Create an analyzer that runs the pipeline and returns the pointer query.
+
+    If the configuration has no ``PointerAnalysis`` entry, one with default
+    options is appended after the ``ir`` stage.
+
+    Args:
+        pipeline_config: Pipeline configuration dictionary
+
+    Returns:
+        Callable running a full analysis and returning its solver query
+    """
+    from .config import Config
+
+    config = dict(pipeline_config)
+    config["analysis"] = list(config.get("analysis", []))
+    name = next((a["name"] for a in config["analysis"] if a["id"] == "PointerAnalysis"), None)
+    if name is None:
+        name = "pointer_analysis"
+        config["analysis"].append({
+            "name": name,
+            "id": "PointerAnalysis",
+            "description": "k-CFA pointer analysis",
+            "prev_analysis": ["ir"],
+            "options": Config().to_dict(),
+        })
+
+    def analyze() -> 'ISolverQuery':
+        from pythonstan.world.pipeline import Pipeline
+        ppl = Pipeline(config=config)
+        ppl.run()
+        return ppl.analysis_manager.get_results(name).query()
+
+    return analyze
+
+
+def snapshot_analyzer(path: str) -> Callable[[], 'ISolverQuery']:
+    """Create an analyzer that (re)loads a serialized snapshot.
+
+    Args:
+        path: Snapshot file written by ``serialization.save_query``
+
+    Returns:
+        Callable returning a query over the snapshot
+    """
+    from .serialization import load_query
+
+    def analyze() -> 'ISolverQuery':
+        return load_query(path)
+
+    return analyze
+
+
+def parse_field(spec: str) -> Field:
+    """Parse a field specification from a request.
+
+    Accepts ``"name"`` or ``".name"`` for attributes, ``"[i]"`` for tuple
+    positions, ``"['k']"`` for dictionary keys and ``"elem"``, ``"value"``
+    or ``"unknown"`` for the summary fields.
+
+    Args:
+        spec: Field specification string
+
+    Returns:
+        Parsed field
+
+    Raises:
+        QueryError: If the specification is empty
+    """
+    if not isinstance(spec, str) or not spec:
+        raise QueryError(f"Invalid field specification: {spec!r}")
+    if spec in (".elem", "elem"):
+        return elem()
+    if spec in (".value", "value"):
+        return value()
+    if spec in (".unknown", "unknown"):
+        return unknown()
+    if spec.startswith("['") and spec.endswith("']"):
+        return key(spec[2:-2])
+    if spec.startswith("[") and spec.endswith("]") and spec[1:-1].isdigit():
+        return Field(FieldKind.POSITION, index=int(spec[1:-1]))
+    return attr(spec[1:] if spec.startswith(".") else spec)
+
+
+class QueryService:
+    """Dispatches protocol requests against the current analysis result.
+
+    The service owns the analyzer callable and the latest solver query. A
+    ``module_changed`` notification re-runs the analyzer over the whole
+    program, not only the named modules; queries received meanwhile wait on
+    the lock and are answered from the new result.
+    """
+
+    def __init__(self, analyzer: Callable[[], 'ISolverQuery']):
+        """Initialize the service and run the first analysis.
+
+        Args:
+            analyzer: Callable returning a solved query interface
+        """
+        self._analyzer = analyzer
+        self._lock = threading.RLock()
+        self._query: Optional['ISolverQuery'] = None
+        self._names: Optional[Dict[Tuple[str, str], List[Any]]] = None
+        self.generation = 0
+        self.changed_modules: List[str] = []
+        self.shutdown_requested = False
+        self.reanalyze()
+
+    @property
+    def query(self) -> 'ISolverQuery':
+        return self._query
+
+    def reanalyze(self) -> None:
+        """Run the analyzer and swap in the new result."""
+        with self._lock:
+            logger.info("Running pointer analysis (generation %d)", self.generation + 1)
+            query = self._analyzer()
+            old, self._query = self._query, query
+            self._names = None
+            self.generation += 1
+            self.changed_modules = []
+            if old is not None and hasattr(old, "close"):
+                old.close()
+
+    def handle_line(self, line: str) -> str:
+        """Handle one protocol line and return the encoded response line."""
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            return json.dumps({"id": None, "error": f"Invalid JSON: {e}"})
+        return json.dumps(self.handle(request))
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle a decoded request.
+
+        Args:
+            request: Request object with ``method`` and optional ``id``/``params``
+
+        Returns:
+            Response object
+        """
+        req_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+                raise QueryError("Request must be an object with a 'method' string")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise QueryError("'params' must be an object")
+            handler = getattr(self, f"_do_{request['method']}", None)
+            if handler is None:
+                raise QueryError(f"Unknown method: {request['method']}")
+            with self._lock:
+                result = handler(params)
+            return {"id": req_id, "result": result}
+        except QueryError as e:
+            return {"id": req_id, "error": str(e)}
+        except Exception as e:
+            logger.exception("Error handling request %r", request)
+            return {"id": req_id, "error": f"{type(e).__name__}: {e}"}
+
+    # ------------------------------------------------------------------
+    # Variable resolution
+    # ------------------------------------------------------------------
+
+    def _name_index(self) -> Dict[Tuple[str, str], List[Any]]:
+        if self._names is None:
+            from .context import Ctx
+            from .variable import Variable
+
+            names: Dict[Tuple[str, str], List[Any]] = {}
+            state = getattr(self._query, "_state", None)
+            if state is not None:
+                for cvar in state._env:
+                    if isinstance(cvar, Ctx) and isinstance(cvar.content, Variable) and cvar.scope is not None:
+                        names.setdefault((cvar.scope.name, cvar.content.name), []).append(cvar)
+            self._names = names
+        return self._names
+
+    def points_to(self, scope: str, var: str) -> PointsToSet:
+        """Get the context-insensitive points-to set of a named variable."""
+        if hasattr(self._query, "points_to_name"):
+            return self._query.points_to_name(scope, var)
+        result = PointsToSet.empty()
+        for cvar in self._name_index().get((scope, var), []):
+            result = result.union(self._query.points_to(cvar))
+        return result
+
+    @staticmethod
+    def _require(params: Dict[str, Any], *names: str) -> Iterable[str]:
+        for name in names:
+            if not isinstance(params.get(name), str):
+                raise QueryError(f"Missing string parameter '{name}'")
+        return [params[name] for name in names]
+
+    @staticmethod
+    def _objects(pts: PointsToSet) -> List[str]:
+        return sorted(str(obj) for obj in pts)
+
+    # ------------------------------------------------------------------
+    # Methods
+    # ------------------------------------------------------------------
+
+    def _do_ping(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"generation": self.generation}
+
+    def _do_points_to(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        scope, var = self._require(params, "scope", "var")
+        return {"objects": self._objects(self.points_to(scope, var))}
+
+    def _do_may_alias(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        scope, var, other_var = self._require(params, "scope", "var", "other_var")
+        other_scope = params.get("other_scope", scope)
+        common = self.points_to(scope, var).intersection(self.points_to(other_scope, other_var))
+        return {"may_alias": not common.is_empty(), "common": self._objects(common)}
+
+    def _do_field(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        scope, var, spec = self._require(params, "scope", "var", "field")
+        field = parse_field(spec)
+        result = PointsToSet.empty()
+        for obj in self.points_to(scope, var):
+            result = result.union(self._query.get_field(obj, field))
+        return {"field": str(field), "objects": self._objects(result)}
+
+    def _do_call_graph(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        caller = params.get("caller")
+        callee = params.get("callee")
+        edges = []
+        for edge in self._query.call_graph().get_edges():
+            callsite = edge.get_callsite()
+            caller_name = getattr(getattr(callsite, "scope", None), "name", None)
+            callee_name = getattr(edge.get_callee(), "name", str(edge.get_callee()))
+            if caller is not None and caller_name != caller:
+                continue
+            if callee is not None and callee_name != callee:
+                continue
+            site = getattr(callsite, "content", getattr(callsite, "call_site", callsite))
+            edges.append({
+                "kind": edge.get_kind().name,
+                "caller": caller_name,
+                "call_site": str(site),
+                "callee": callee_name,
+            })
+        edges.sort(key=lambda e: (str(e["caller"]), e["call_site"], e["callee"], e["kind"]))
+        return {"edges": edges}
+
+    def _do_stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        stats = self._query.get_statistics()
+        return {"generation": self.generation, "statistics": json.loads(json.dumps(stats, default=str))}
+
+    def _do_module_changed(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        modules = params.get("modules", [])
+        if isinstance(modules, str):
+            modules = [modules]
+        self.changed_modules.extend(modules)
+        logger.info("Modules changed: %s", ", ".join(modules) or "<unspecified>")
+        self.reanalyze()
+        return {"generation": self.generation}
+
+    def _do_shutdown(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        self.shutdown_requested = True
+        return {"generation": self.generation}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads request lines from a client connection until it closes."""
+
+    def handle(self):
+        service: QueryService = self.server.service
+        for raw in self.rfile:
+            line = raw.decode("utf-8").strip()
+            if not line:
+                continue
+            self.wfile.write(service.handle_line(line).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if service.shutdown_requested:
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                break
+
+
+class PointsToServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix domain socket server answering queries from a :class:`QueryService`."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, service: QueryService):
+        """Bind the server socket.
+
+        A stale socket file left by a previous server is removed first.
+
+        Args:
+            socket_path: Filesystem path of the Unix socket
+            service: Query service answering requests
+
+        Raises:
+            FileExistsError: If something other than a socket exists at ``socket_path``
+        """
+        try:
+            mode = os.lstat(socket_path).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            if not stat.S_ISSOCK(mode):
+                raise FileExistsError(f"{socket_path} exists and is not a socket")
+            os.unlink(socket_path)
+        self.socket_path = socket_path
+        self.service = service
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path: str, analyzer: Callable[[], 'ISolverQuery']) -> None:
+    """Solve once and answer queries until a ``shutdown`` request arrives.
+
+    Args:
+        socket_path: Filesystem path of the Unix socket
+        analyzer: Callable returning a solved query interface
+    """
+    service = QueryService(analyzer)
+    with PointsToServer(socket_path, service) as server:
+        logger.info("Points-to server listening on %s", socket_path)
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve points-to queries over a Unix domain socket")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--config", help="Pipeline configuration file (YAML)")
+    source.add_argument("--snapshot", help="Serialized analysis snapshot")
+    parser.add_argument("--socket", required=True, help="Unix socket path")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.config:
+        import yaml
+        with open(args.config, "r") as f:
+            analyzer = pipeline_analyzer(yaml.safe_load(f))
+    else:
+        analyzer = snapshot_analyzer(args.snapshot)
+    serve(args.socket, analyzer)
+
+
+if __name__ == "__main__":
+    main()
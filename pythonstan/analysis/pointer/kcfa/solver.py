@@ -170,7 +170,7 @@ class PointerSolver:
             logger.warning(f"Reached max iterations {max_iter}")
         
         logger.info(f"Processed {len(self._modules)} modules: {self._modules}")
-        logger.info(f"Call Constraints: {len(self.state.constraints.get_by_type(CallConstraint))}")
+        logger.info(f"Call Constraints: {self.state.constraints.count_by_type(CallConstraint)}")
         logger.info(f"Call graph: {self.state._call_graph} node: {len(self.state._call_graph.get_nodes())} edge: {self.state._call_graph.get_number_of_edges()} absolute: {self.state._call_graph.num_plain_edges()}")
         logger.info(f"Pointer flow graph: {self.state._pointer_flow_graph} node: {len(self.state._pointer_flow_graph.get_nodes())} edge: {len(self.state._pointer_flow_graph.get_edges())}")        
         self._stats["iterations"] = self._iteration
@@ -1501,11 +1501,18 @@ class SolverQuery(ISolverQuery):
         self._stats = stats
         self._unknown_tracker = unknown_tracker
     
+    @property
+    def state(self) -> 'PointerAnalysisState':
+        return self._state
+    
     def points_to(self, var: 'Variable') -> 'PointsToSet':
         return self._state.get_points_to(var)
     
     def get_field(self, obj: 'AbstractObject', field: 'Field') -> 'PointsToSet':
-        return self._state.get_field(obj, field)
+        field_access = self._state.has_field(None, None, obj, field)
+        if field_access is None:
+            return PointsToSet.empty()
+        return self._state.get_points_to(Ctx(obj.context, None, field_access))
     
     def may_alias(self, v1: 'Variable', v2: 'Variable') -> bool:
         pts1 = self._state.get_points_to(v1)
@@ -115,6 +115,7 @@ class PointerAnalysisState:
         self._static_constraints: List[Tuple['Scope', 'AbstractContext', 'Constraint']] = []
         self._internal_scope = {}
         self.obj_scope = {}
+        self._version = 0
         
         # Debug monitoring
         self._debug_monitor = debug_monitor
@@ -128,6 +129,15 @@ class PointerAnalysisState:
     def get_internal_scope(self, obj) -> Scope:
         return self._internal_scope.get(obj, None)
     
+    @property
+    def version(self) -> int:
+        """Number of points-to updates applied so far; changes whenever a points-to set grows."""
+        return self._version
+    
+    def points_to_items(self) -> Iterable[Tuple[Union['Ctx[Any]', 'PointerFlowNode'], PointsToSet]]:
+        """Iterate over all tracked pointers and their points-to sets."""
+        return self._env.items()
+    
     def get_points_to(self, var: Union['Ctx[Any]', 'PointerFlowNode']) -> PointsToSet:
         """Get points-to set for variable.
         
@@ -156,6 +166,7 @@ class PointerAnalysisState:
         
         if new_pts != old_pts:
             self._env[var] = new_pts
+            self._version += 1
             
             # Debug monitoring
             if self._debug_monitor and self._debug_monitor.enabled:
@@ -629,6 +640,10 @@ class PointerAnalysisState:
             "num_call_edges": self._call_graph.get_number_of_edges(),
             "num_pfg_nodes": len(self._pointer_flow_graph.get_nodes()),
             "num_pfg_edges": len(self._pointer_flow_graph.get_edges()),
+            "constraints": {
+                **self._constraints.get_index_statistics(),
+                "by_kind": self._constraints.size_by_kind(),
+            },
             "points_to": {
                 "avg_size": sum(pts_sizes) / len(pts_sizes) if pts_sizes else 0.0,
                 "max_size": max(pts_sizes) if pts_sizes else 0,
@@ -1,7 +1,7 @@
 from .transform import Transform
 from .driver import TransformDriver
 
-# from .ssa import *
+from .ssa import *
 from .cfg import *
 from .block_cfg import *
 from .three_address import *
@@ -28,6 +28,8 @@ class BlockCFG(Transform):
             transformer.build_graph(cur_ir)
             World().scope_manager.set_ir(cur_scope, STAGE_NAME, transformer.cfg)
             for subscope in World().scope_manager.get_subscopes(cur_scope):
+                if not World().scope_manager.is_lowered(subscope):
+                    continue
                 if World().scope_manager.get_ir(subscope, STAGE_NAME) is None:
                     subscope_ir = World().scope_manager.get_ir(subscope, "ir")
                     q.put((subscope, subscope_ir))
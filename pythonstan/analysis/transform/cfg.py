@@ -1,5 +1,5 @@
 import copy
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
 from ..analysis import AnalysisConfig
 from .transform import Transform
@@ -15,7 +15,7 @@ class CFG(Transform):
 
     def __init__(self, config: AnalysisConfig):
         super().__init__(config)
-        self.transformer = CFGTransformer()
+        self.transformer = CFGTransformer(basic_blocks=config.options.get("basic_blocks", False))
 
     def transform(self, module: IRModule):
         block_cfg = World().scope_manager.get_ir(module, "block cfg")
@@ -24,13 +24,23 @@ class CFG(Transform):
 
 
 class CFGTransformer:
+    """Builds the "cfg" IR of a scope from its "block cfg".
+
+    By default every statement gets its own block. With ``basic_blocks``,
+    straight-line code stays in one multi-statement block per basic block;
+    use :class:`StatementIndex` for per-statement positions.
+    """
     scope: IRScope
     cfg: ControlFlowGraph
+    basic_blocks: bool
 
     # map a bblock in source cfg to the head block in the target cfg
     head_map: Dict[BaseBlock, BaseBlock]
     next_idx: int
 
+    def __init__(self, basic_blocks: bool = False):
+        self.basic_blocks = basic_blocks
+
     def trans(self, scope: IRScope, block_cfg: ControlFlowGraph):
         self.scope = scope
         self.cfg = ControlFlowGraph()
@@ -43,10 +53,10 @@ class CFGTransformer:
 
         World().scope_manager.set_ir(scope, "cfg", self.cfg)
         for subscope in World().scope_manager.get_subscopes(scope):
-            sub_transformer = CFGTransformer()
+            if not World().scope_manager.is_lowered(subscope):
+                continue
+            sub_transformer = CFGTransformer(self.basic_blocks)
             sub_block_cfg = World().scope_manager.get_ir(subscope, "block cfg")
-            # print(f"Subscope: {subscope.qualname} {sub_block_cfg}")
-            # print(World().scope_manager.scope_ir.keys())
             sub_transformer.trans(subscope, sub_block_cfg)
 
     def new_blk(self, statement: Optional[IRStatement] = None):
@@ -58,38 +68,53 @@ class CFGTransformer:
         self.next_idx += 1
         return blk
 
+    def _copy_blk(self, blk: BaseBlock) -> Tuple[BaseBlock, BaseBlock]:
+        """Adds the target block(s) for ``blk``, returning the head and tail blocks."""
+        tgt_cfg = self.cfg
+        if blk.n_stmt() == 0 or self.basic_blocks:
+            new_blk = BaseBlock(self.next_idx, list(blk.stmts))
+            self.next_idx += 1
+            tgt_cfg.add_blk(new_blk)
+            return new_blk, new_blk
+        head_blk = tail_blk = None
+        for cur_stmt in blk.stmts:
+            new_blk = self.new_blk(cur_stmt)
+            tgt_cfg.add_blk(new_blk)
+            if head_blk is None:
+                head_blk = new_blk
+            else:
+                tgt_cfg.add_edge(NormalEdge(tail_blk, new_blk))
+            tail_blk = new_blk
+        return head_blk, tail_blk
+
     def _trans(self, cfg: ControlFlowGraph, entry: BaseBlock, stmt_entry: BaseBlock):
+        # Depth-first over the block cfg with an explicit stack, so long
+        # functions do not hit the recursion limit
         tgt_cfg = self.cfg
         if entry in cfg.exit_blks:
             tgt_cfg.add_exit(stmt_entry)
-        for e in cfg.out_edges_of(entry):
+        stack = [(stmt_entry, iter(cfg.out_edges_of(entry)))]
+        while len(stack) > 0:
+            tail, edges = stack[-1]
+            e = next(edges, None)
+            if e is None:
+                stack.pop()
+                continue
             if e.tgt == cfg.super_exit_blk:
                 continue
-            stmt_e = copy.deepcopy(e)
-            stmt_e.src = stmt_entry
+            # Edges only carry their endpoints and immutable labels
+            stmt_e = copy.copy(e)
+            stmt_e.src = tail
             if e.tgt in self.head_map:
                 stmt_e.tgt = self.head_map[e.tgt]
                 tgt_cfg.add_edge(stmt_e)
-            else:
-                head_blk = stmt_entry
-                tail_blk = stmt_entry
-                if e.tgt.n_stmt() > 0:
-                    for idx, cur_stmt in enumerate(e.tgt.stmts):
-                        blk = self.new_blk(cur_stmt)
-                        tgt_cfg.add_blk(blk)
-                        if idx == 0:
-                            head_blk = blk
-                        else:
-                            tgt_cfg.add_edge(NormalEdge(tail_blk, blk))
-                        tail_blk = blk
-                else:
-                    blk = self.new_blk()
-                    tgt_cfg.add_blk(blk)
-                    head_blk = blk
-                    tail_blk = blk
-                self.head_map[e.tgt] = head_blk
-                if e.tgt in cfg.blk2label:
-                    tgt_cfg.add_label(cfg.blk2label[e.tgt], head_blk)
-                stmt_e.tgt = head_blk
-                tgt_cfg.add_edge(stmt_e)
-                self._trans(cfg, e.tgt, tail_blk)
+                continue
+            head_blk, tail_blk = self._copy_blk(e.tgt)
+            self.head_map[e.tgt] = head_blk
+            if e.tgt in cfg.blk2label:
+                tgt_cfg.add_label(cfg.blk2label[e.tgt], head_blk)
+            stmt_e.tgt = head_blk
+            tgt_cfg.add_edge(stmt_e)
+            if e.tgt in cfg.exit_blks:
+                tgt_cfg.add_exit(tail_blk)
+            stack.append((tail_blk, iter(cfg.out_edges_of(e.tgt))))
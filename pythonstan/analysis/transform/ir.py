@@ -99,21 +99,27 @@ class IRTransformer(NodeVisitor):
     def visit_FunctionDef(self, func_def: Union[FunctionDef, AsyncFunctionDef]):
         qualname = f"{self.scope.get_qualname()}.{func_def.name}"
         func = IRFunc(qualname, func_def, is_method=isinstance(self.scope, IRClass))
-        trans = IRTransformer(func)
-        trans.process_stmts(func_def.body)
-        World().scope_manager.add_class(self.scope, func)
-        World().scope_manager.set_ir(func, "ir", trans.get_stmts())
+        self.add_subscope(func, func_def.body)
         self.stmts.append(func)
 
     def visit_ClassDef(self, cls_def: ClassDef):
         qualname = f"{self.scope.get_qualname()}.{cls_def.name}"
         cls = IRClass(qualname, cls_def)
-        trans = IRTransformer(cls)
-        trans.process_stmts(cls_def.body)
-        World().scope_manager.add_class(self.scope, cls)
-        World().scope_manager.set_ir(cls, "ir", trans.get_stmts())
+        self.add_subscope(cls, cls_def.body)
         self.stmts.append(cls)
 
+    def add_subscope(self, scope: IRScope, body: List[stmt]):
+        """Registers a nested scope, lowering its body now or deferring it."""
+        scope_manager = World().scope_manager
+        if scope_manager.defers_lowering():
+            scope_manager.add_class(self.scope, scope)
+            scope_manager.defer(scope)
+            return
+        trans = IRTransformer(scope)
+        trans.process_stmts(body)
+        scope_manager.add_class(self.scope, scope)
+        scope_manager.set_ir(scope, "ir", trans.get_stmts())
+
     def visit_AsyncFunctionDef(self, node: AsyncFunctionDef):
         self.visit_FunctionDef(node)
 
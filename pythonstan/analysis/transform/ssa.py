@@ -0,0 +1,238 @@
+import ast
+import copy
+import re
+from typing import List, Dict, Optional, Set, Tuple
+
+from ..analysis import AnalysisConfig
+from .transform import Transform
+from pythonstan.graph.cfg import *
+from pythonstan.graph.dominator_tree import DominatorTree
+from pythonstan.world import World
+from pythonstan.ir import *
+
+__all__ = ['SSA', 'SSATransformer', 'base_name']
+STAGE_NAME = 'ssa'
+SSA_TEMPLATE = "%s$%d"
+_VERSION_SUFFIX = re.compile(r'\$\d+$')
+
+LIVENESS_CONFIG = AnalysisConfig(
+    name="liveness-analysis",
+    id="LivenessAnalysis",
+    options={"type": "dataflow analysis"})
+
+
+def base_name(name: str) -> str:
+    """Strips the SSA version from ``name``, e.g. ``x$2`` -> ``x``."""
+    return _VERSION_SUFFIX.sub('', name)
+
+
+class SSA(Transform):
+    def __init__(self, config: AnalysisConfig):
+        super().__init__(config)
+
+    def transform(self, module: IRModule):
+        scope_manager = World().scope_manager
+        q = [module]
+        while len(q) > 0:
+            scope = q.pop()
+            cfg = scope_manager.get_ir(scope, "cfg")
+            if cfg is not None:
+                scope_manager.set_ir(scope, STAGE_NAME, SSATransformer(scope, cfg).build())
+            for subscope in scope_manager.get_subscopes(scope):
+                if scope_manager.is_lowered(subscope):
+                    q.append(subscope)
+        self.results = None
+
+
+class SSATransformer:
+    """Builds the pruned SSA form of a scope's "cfg".
+
+    Phis are placed on the iterated dominance frontier of each variable's
+    definitions, but only where the variable is live on entry. Renaming
+    walks the dominator tree. Versions are named ``x$1``, ``x$2``, ... and
+    function arguments keep their name as the initial version. The input
+    CFG is left untouched: renamed statements are copies, the others are
+    shared.
+
+    Only variables local to the scope are renamed. Globals, nonlocals,
+    names captured by nested scopes and deleted names keep their names.
+    In module and class bodies, where names are visible from outside,
+    only ``$tmp`` temporaries are renamed.
+    """
+    scope: IRScope
+    cfg: ControlFlowGraph
+    dom_tree: DominatorTree
+    live_in: Dict[BaseBlock, Set[str]]
+    shared: Dict[int, object]
+    memo: Dict[int, object]
+    failed: Set[str]
+
+    def __init__(self, scope: IRScope, cfg: ControlFlowGraph):
+        from pythonstan.analysis.dataflow import LivenessAnalysis
+        from pythonstan.analysis.dataflow.solver import BitVectorSolver
+
+        self.scope = scope
+        self.cfg = cfg
+        self.dom_tree = DominatorTree.of(cfg)
+        liveness = LivenessAnalysis(scope, cfg, LIVENESS_CONFIG)
+        live_in, _ = BitVectorSolver.solve(liveness)
+        self.live_in = liveness.decode_facts(live_in)
+        # Labels, nested scopes and the source ASTs anchoring jumps and
+        # handlers are shared with the input CFG, not copied
+        self.shared = {}
+        for stmt in cfg.get_stmts():
+            if isinstance(stmt, (Label, IRScope)):
+                self.shared[id(stmt)] = stmt
+            elif isinstance(stmt, (JumpIfTrue, JumpIfFalse)) and stmt.stmt_ast is not None:
+                self.shared[id(stmt.stmt_ast)] = stmt.stmt_ast
+            elif isinstance(stmt, IRCatchException) and stmt.exception_ast is not None:
+                self.shared[id(stmt.exception_ast)] = stmt.exception_ast
+
+    def build(self) -> ControlFlowGraph:
+        """Builds the SSA CFG, keeping the names of variables some statement cannot rename."""
+        excluded = self.fixed_vars()
+        while True:
+            ssa_cfg = self._build(excluded)
+            if len(self.failed) == 0:
+                return ssa_cfg
+            excluded.update(self.failed)
+
+    def fixed_vars(self) -> Set[str]:
+        """Collects the variables whose names must be kept."""
+        fixed = set(self.scope.get_global_vars()) | set(self.scope.get_nonlocal_vars())
+        for stmt in self.cfg.get_stmts():
+            fixed.update(stmt.get_dels())
+            if isinstance(stmt, IRScope):
+                fixed.update(stmt.get_stores())
+                fixed.update(stmt.get_cell_vars())
+                fixed.update(stmt.get_nonlocal_vars())
+        return fixed
+
+    def is_renamed(self, var: str, excluded: Set[str]) -> bool:
+        if var in excluded:
+            return False
+        return isinstance(self.scope, IRFunc) or var.startswith("$tmp")
+
+    def _build(self, excluded: Set[str]) -> ControlFlowGraph:
+        cfg = self.cfg
+        entry = cfg.get_entry()
+        self.memo = dict(self.shared)
+        self.failed = set()
+        reachable = self.dom_tree.nodes
+
+        def_blks: Dict[str, Set[BaseBlock]] = {}
+        for blk in reachable:
+            for stmt in blk.stmts:
+                for var in stmt.get_stores():
+                    if self.is_renamed(var, excluded):
+                        def_blks.setdefault(var, {entry}).add(blk)
+
+        phi_vars: Dict[BaseBlock, List[str]] = {blk: [] for blk in reachable}
+        for var in sorted(def_blks):
+            for blk in self.dom_tree.iterated_dominance_frontier(def_blks[var]):
+                if var in self.live_in[blk]:
+                    phi_vars[blk].append(var)
+
+        preds = {blk: cfg.preds_of(blk) for blk in reachable}
+        stacks: Dict[str, List[str]] = {var: [] for var in def_blks}
+        if isinstance(self.scope, IRFunc):
+            for arg in self.scope.get_arg_names():
+                if arg in stacks:
+                    stacks[arg].append(arg)
+        counters: Dict[str, int] = {}
+
+        def fresh(var: str) -> str:
+            counters[var] = counters.get(var, 0) + 1
+            name = SSA_TEMPLATE % (var, counters[var])
+            stacks[var].append(name)
+            return name
+
+        def top(var: str) -> Optional[str]:
+            stack = stacks.get(var)
+            return stack[-1] if stack else None
+
+        ssa_cfg = ControlFlowGraph(BaseBlock(entry.get_idx()))
+        blk_map = {blk: BaseBlock(blk.get_idx()) for blk in cfg.get_nodes() if blk != entry}
+        blk_map[entry] = ssa_cfg.get_entry()
+        for blk in cfg.get_nodes():
+            if blk not in self.dom_tree.dfn:
+                blk_map[blk].stmts = list(blk.stmts)
+        phi_names: Dict[Tuple[BaseBlock, str], str] = {}
+        phi_items: Dict[Tuple[BaseBlock, str], List[Optional[ast.Name]]] = {}
+        ssa_edges = []
+
+        # Rename along the dominator tree with an explicit stack
+        work: List[Tuple[BaseBlock, Optional[List[str]]]] = [(entry, None)]
+        while len(work) > 0:
+            blk, pushed = work.pop()
+            if pushed is not None:
+                for var in pushed:
+                    stacks[var].pop()
+                continue
+            pushed = []
+            for var in phi_vars[blk]:
+                phi_names[(blk, var)] = fresh(var)
+                pushed.append(var)
+            blk_map[blk].stmts = [self.rename_stmt(stmt, excluded, top, fresh, pushed) for stmt in blk.stmts]
+
+            for e in cfg.out_edges_of(blk):
+                ssa_e = copy.copy(e)
+                if isinstance(e, IfEdge) and top(e.test) is not None:
+                    ssa_e.test = top(e.test)
+                ssa_edges.append(ssa_e)
+            for succ in dict.fromkeys(cfg.succs_of(blk)):
+                for var in phi_vars[succ]:
+                    items = phi_items.setdefault((succ, var), [None] * len(preds[succ]))
+                    name = top(var)
+                    for idx, pred in enumerate(preds[succ]):
+                        if pred is blk and name is not None:
+                            items[idx] = ast.Name(id=name, ctx=ast.Load())
+
+            work.append((blk, pushed))
+            work.extend((child, None) for child in reversed(self.dom_tree.children_of(blk)))
+
+        for blk in reachable:
+            new_blk = blk_map[blk]
+            for var in reversed(phi_vars[blk]):
+                lval = ast.Name(id=phi_names[(blk, var)], ctx=ast.Store())
+                items = phi_items.get((blk, var), [None] * len(preds[blk]))
+                new_blk.add_front(IRPhi(lval, items))
+
+        for blk in cfg.get_nodes():
+            ssa_cfg.add_blk(blk_map[blk])
+            if blk not in self.dom_tree.dfn:
+                ssa_edges.extend(copy.copy(e) for e in cfg.out_edges_of(blk))
+        for ssa_e in ssa_edges:
+            ssa_e.src = blk_map[ssa_e.src]
+            ssa_e.tgt = blk_map[ssa_e.tgt]
+            ssa_cfg.add_edge(ssa_e)
+        for blk in cfg.exit_blks:
+            ssa_cfg.add_exit(blk_map[blk])
+        if cfg.super_exit_blk is not None:
+            ssa_cfg.super_exit_blk = blk_map[cfg.super_exit_blk]
+        for label, blk in cfg.label2blk.items():
+            ssa_cfg.add_label(label, blk_map[blk])
+        return ssa_cfg
+
+    def rename_stmt(self, stmt: IRStatement, excluded: Set[str], top, fresh, pushed: List[str]) -> IRStatement:
+        """Returns ``stmt`` with its uses and definitions renamed to the current versions."""
+        if isinstance(stmt, (Label, IRScope)):
+            return stmt
+        loads = [var for var in stmt.get_loads()
+                 if self.is_renamed(var, excluded) and top(var) not in (None, var)]
+        stores = [var for var in stmt.get_stores() if self.is_renamed(var, excluded)]
+        if len(loads) == 0 and len(stores) == 0:
+            return stmt
+
+        new_stmt = copy.deepcopy(stmt, self.memo)
+        for var in loads:
+            new_stmt.rename(var, top(var), (ast.Load,))
+            if var in new_stmt.get_loads():
+                self.failed.add(var)
+        for var in stores:
+            name = fresh(var)
+            pushed.append(var)
+            new_stmt.rename(var, name, (ast.Store,))
+            if var in new_stmt.get_stores() or name not in new_stmt.get_stores():
+                self.failed.add(var)
+        return new_stmt
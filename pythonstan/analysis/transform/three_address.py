@@ -24,6 +24,7 @@ class ThreeAddress(Transform):
         self.transformer = ThreeAddressTransformer()
 
     def transform(self, module: IRModule):
+        self.transformer.defer_bodies = World().scope_manager.defers_lowering()
         tac = module.stmt
         for _ in range(1):
            tac = self.transformer.visit(tac)
@@ -64,8 +65,10 @@ class ThreeAddressTransformer(NodeTransformer):
     tmp_func_gen: TempVarGenerator
     const_colle: ConstCollector
     import_stmts: Set[ast.stmt]
+    defer_bodies: bool
 
-    def __init__(self):
+    def __init__(self, defer_bodies: bool = False):
+        self.defer_bodies = defer_bodies
         self.reset()
 
     def not_temp(self, exp):
@@ -981,6 +984,25 @@ class ThreeAddressTransformer(NodeTransformer):
         blk.append(ins2)
         return blk
 
+    def lower_body(self, stmts: List[ast.stmt]) -> List[ast.stmt]:
+        """Lowers a module or function body, prefixing the constants it introduces."""
+        stmts = self.visit_stmt_list(stmts)
+        const_stmts = [ast.Assign(targets=[ast.Name(id=n, ctx=ast.Store())],
+                                  value=ast.Constant(value=v))
+                       for n, v in self.const_colle.dump()]
+        return const_stmts + stmts
+
+    def scope_body(self, stmts: List[ast.stmt]) -> List[ast.stmt]:
+        """Lowers a nested function body, or keeps it as is when deferred.
+
+        Class bodies do not go through here: they run where the class is
+        defined, so they are always lowered with the enclosing body and their
+        constants are hoisted there, as without deferral.
+        """
+        if self.defer_bodies:
+            return stmts
+        return self.visit_stmt_list(stmts)
+
     def visit_stmt_list(self, stmts):
         blk = []
         if stmts is None:
@@ -1026,7 +1048,7 @@ class ThreeAddressTransformer(NodeTransformer):
         ins = ast.FunctionDef(
             name=node.name,
             args=args,
-            body=self.visit_stmt_list(node.body),
+            body=self.scope_body(node.body),
             decorator_list=node.decorator_list,
             returns=node.returns,
             type_comment=node.type_comment
@@ -1040,7 +1062,7 @@ class ThreeAddressTransformer(NodeTransformer):
         ins = ast.AsyncFunctionDef(
             name=node.name,
             args=args,
-            body=self.visit_stmt_list(node.body),
+            body=self.scope_body(node.body),
             decorator_list=node.decorator_list,
             returns=node.returns,
             type_comment=node.type_comment
@@ -1142,11 +1164,7 @@ class ThreeAddressTransformer(NodeTransformer):
 
     def visit_Module(self, node):
         self.reset()
-        stmts = self.visit_stmt_list(node.body)
-        const_stmts = [ast.Assign(targets=[ast.Name(id=n, ctx=ast.Store())],
-                                  value=ast.Constant(value=v))
-                       for n, v in self.const_colle.dump()]
-        stmts = const_stmts + stmts
+        stmts = self.lower_body(node.body)
         mod = ast.Module(body=stmts,
                          type_ignores=node.type_ignores)
         ast.copy_location(mod, node)
@@ -1,2 +1,3 @@
 from .call_edge import CallKind, CallEdge
 from .call_graph import AbstractCallGraph
+from .export import ExportedEdge, iter_edges, write_tsv, write_jsonl, write_binary, read_binary
@@ -0,0 +1,356 @@
+"""Streaming call graph exporters.
+
+Call graphs are written edge by edge, so exporting a context-sensitive graph
+with millions of edges never materializes a whole-graph dict or string.
+
+Each exporter writes either the full context-sensitive graph or its
+context-insensitive projection, where contexts are dropped and edges that
+become identical are emitted once. Three formats are supported:
+
+    - TSV edge list (:func:`write_tsv`)
+    - JSON lines, one edge object per line (:func:`write_jsonl`)
+    - Binary adjacency (:func:`write_binary`, read back with :func:`read_binary`)
+
+The binary format starts with an 8-byte magic, a u32 version and a u32 flags
+word, followed by a stream of tagged records using LEB128 varints:
+
+    - ``S id len bytes``: define string ``id``
+    - ``A caller caller_ctx site site_ctx n (callee callee_ctx kind){n}``:
+      the callees of one call site, all given as string ids
+
+String ids are assigned on first use, so a reader needs only the records it
+has already seen.
+"""
+
+import json
+import struct
+from contextlib import contextmanager
+from typing import Any, BinaryIO, Dict, IO, Iterator, NamedTuple, Optional, Set, TextIO, Tuple, Union
+
+from .call_edge import CallKind
+from .call_graph import AbstractCallGraph
+
+__all__ = [
+    "ExportedEdge",
+    "iter_edges",
+    "write_tsv",
+    "write_jsonl",
+    "write_binary",
+    "read_binary",
+]
+
+BINARY_MAGIC = b"PSTNCG\x00\x00"
+BINARY_VERSION = 1
+FLAG_CONTEXT_SENSITIVE = 1
+
+_HEADER = struct.Struct("<8sII")
+_NO_STRING = 0
+
+TSV_COLUMNS = ("kind", "caller", "caller_context", "call_site", "call_site_context", "callee", "callee_context")
+
+
+class ExportedEdge(NamedTuple):
+    """Call edge flattened to strings.
+
+    Context fields are None in the context-insensitive projection.
+    """
+
+    kind: str
+    caller: str
+    caller_context: Optional[str]
+    call_site: str
+    call_site_context: Optional[str]
+    callee: str
+    callee_context: Optional[str]
+
+
+class _Describer:
+    """Renders call sites and callees of the supported graph flavours.
+
+    Handles ``PointerCallGraph`` (``Ctx`` call sites and ``Scope`` callees),
+    snapshot call graphs (record call sites) and plain graphs, where call
+    sites and callees are rendered with ``str``. Context strings are cached
+    per context object, so the cache is bounded by the number of contexts.
+    """
+
+    def __init__(self):
+        self._contexts: Dict[Any, str] = {}
+
+    def context(self, ctx: Any) -> Optional[str]:
+        if ctx is None:
+            return None
+        s = self._contexts.get(ctx)
+        if s is None:
+            to_string = getattr(ctx, "to_string", None)
+            try:
+                s = to_string() if to_string is not None else str(ctx)
+            except Exception:
+                s = repr(ctx)
+            self._contexts[ctx] = s
+        return s
+
+    @staticmethod
+    def scope(scope: Any) -> str:
+        if scope is None:
+            return ""
+        name = getattr(scope, "name", None)
+        return name if isinstance(name, str) else str(scope)
+
+    @staticmethod
+    def caller_of(callsite: Any) -> Any:
+        return getattr(callsite, "scope", None)
+
+    @staticmethod
+    def site_of(callsite: Any) -> Any:
+        if hasattr(callsite, "content"):
+            return callsite.content
+        return getattr(callsite, "call_site", callsite)
+
+    def site_context(self, callsite: Any) -> Optional[str]:
+        if hasattr(callsite, "context"):
+            return self.context(callsite.context)
+        return self.context(getattr(self.caller_of(callsite), "context", None))
+
+    @staticmethod
+    def plain(x: Any) -> Any:
+        """Context-free identity of a scope or call site for deduplication."""
+        return getattr(x, "stmt", getattr(x, "name", x))
+
+
+def iter_edges(graph: AbstractCallGraph, context_sensitive: bool = True) -> Iterator[ExportedEdge]:
+    """Stream the edges of a call graph as flat records.
+
+    Edges are visited call site by call site. For the context-insensitive
+    projection, a set of context-free edge identities is kept to suppress
+    duplicates; it references existing IR objects and holds no strings.
+
+    Args:
+        graph: Call graph to export
+        context_sensitive: Keep contexts, or project them away
+
+    Returns:
+        Iterator over exported edges
+    """
+    describe = _Describer()
+    seen: Set[Tuple[Any, ...]] = set()
+    for callsite, edges in graph.callsite_to_edges.items():
+        caller = describe.caller_of(callsite)
+        site = describe.site_of(callsite)
+        for edge in edges:
+            callee = edge.get_callee()
+            if context_sensitive:
+                yield ExportedEdge(
+                    edge.get_kind().name,
+                    describe.scope(caller),
+                    describe.context(getattr(caller, "context", None)),
+                    str(site),
+                    describe.site_context(callsite),
+                    describe.scope(callee),
+                    describe.context(getattr(callee, "context", None)),
+                )
+            else:
+                ident = (edge.get_kind(), describe.plain(caller), site, describe.plain(callee))
+                if ident in seen:
+                    continue
+                seen.add(ident)
+                yield ExportedEdge(edge.get_kind().name, describe.scope(caller), None,
+                                   str(site), None, describe.scope(callee), None)
+
+
+@contextmanager
+def _open(out: Union[str, IO], mode: str):
+    if isinstance(out, str):
+        with open(out, mode, **({} if "b" in mode else {"encoding": "utf-8", "newline": ""})) as f:
+            yield f
+    else:
+        yield out
+
+
+def _tsv_field(value: Optional[str]) -> str:
+    if value is None:
+        return ""
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def write_tsv(graph: AbstractCallGraph, out: Union[str, TextIO], context_sensitive: bool = True) -> int:
+    """Write a call graph as a tab-separated edge list.
+
+    The first line is a header. Backslashes, tabs and newlines inside fields
+    are escaped; context columns are empty in the context-insensitive projection.
+
+    Args:
+        graph: Call graph to export
+        out: Output path or text stream
+        context_sensitive: Keep contexts, or project them away
+
+    Returns:
+        Number of edges written
+    """
+    count = 0
+    with _open(out, "w") as f:
+        f.write("\t".join(TSV_COLUMNS) + "\n")
+        for edge in iter_edges(graph, context_sensitive):
+            f.write("\t".join(_tsv_field(v) for v in edge) + "\n")
+            count += 1
+    return count
+
+
+def write_jsonl(graph: AbstractCallGraph, out: Union[str, TextIO], context_sensitive: bool = True) -> int:
+    """Write a call graph as JSON lines, one edge object per line.
+
+    Context members are omitted in the context-insensitive projection.
+
+    Args:
+        graph: Call graph to export
+        out: Output path or text stream
+        context_sensitive: Keep contexts, or project them away
+
+    Returns:
+        Number of edges written
+    """
+    count = 0
+    with _open(out, "w") as f:
+        for edge in iter_edges(graph, context_sensitive):
+            record = edge._asdict()
+            if not context_sensitive:
+                for field in ("caller_context", "call_site_context", "callee_context"):
+                    del record[field]
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def _varint(buf: bytearray, n: int) -> None:
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+class _BinaryWriter:
+    """Assigns string ids and emits string definitions on first use."""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        # Id 0 is reserved for "no string" (absent context)
+        self.ids: Dict[str, int] = {}
+
+    def string(self, buf: bytearray, s: Optional[str]) -> int:
+        if s is None:
+            return _NO_STRING
+        sid = self.ids.get(s)
+        if sid is None:
+            sid = len(self.ids) + 1
+            self.ids[s] = sid
+            data = s.encode("utf-8", "surrogatepass")
+            buf.append(ord("S"))
+            _varint(buf, sid)
+            _varint(buf, len(data))
+            buf.extend(data)
+        return sid
+
+
+def write_binary(graph: AbstractCallGraph, out: Union[str, BinaryIO], context_sensitive: bool = True) -> int:
+    """Write a call graph in the compact binary adjacency format.
+
+    Edges from one call site are grouped into a single adjacency record, and
+    every string is written once and referenced by id afterwards.
+
+    Args:
+        graph: Call graph to export
+        out: Output path or binary stream
+        context_sensitive: Keep contexts, or project them away
+
+    Returns:
+        Number of edges written
+    """
+    count = 0
+    with _open(out, "wb") as f:
+        f.write(_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, FLAG_CONTEXT_SENSITIVE if context_sensitive else 0))
+        writer = _BinaryWriter(f)
+        group: Optional[Tuple[str, Optional[str], str, Optional[str]]] = None
+        targets = []
+
+        def flush():
+            if not targets:
+                return
+            buf = bytearray()
+            ids = [writer.string(buf, s) for s in group]
+            target_ids = [(writer.string(buf, callee), writer.string(buf, ctx), kind)
+                          for callee, ctx, kind in targets]
+            buf.append(ord("A"))
+            for sid in ids:
+                _varint(buf, sid)
+            _varint(buf, len(target_ids))
+            for callee_id, ctx_id, kind in target_ids:
+                _varint(buf, callee_id)
+                _varint(buf, ctx_id)
+                _varint(buf, kind)
+            f.write(buf)
+            targets.clear()
+
+        for edge in iter_edges(graph, context_sensitive):
+            key = (edge.caller, edge.caller_context, edge.call_site, edge.call_site_context)
+            if key != group:
+                flush()
+                group = key
+            targets.append((edge.callee, edge.callee_context, CallKind[edge.kind].value))
+            count += 1
+        flush()
+    return count
+
+
+def _read_varint(f: BinaryIO) -> int:
+    result = 0
+    shift = 0
+    while True:
+        b = f.read(1)
+        if not b:
+            raise ValueError("Truncated call graph file")
+        byte = b[0]
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result
+        shift += 7
+
+
+def read_binary(inp: Union[str, BinaryIO]) -> Iterator[ExportedEdge]:
+    """Stream the edges of a binary call graph file.
+
+    Args:
+        inp: Input path or binary stream
+
+    Returns:
+        Iterator over exported edges
+
+    Raises:
+        ValueError: If the input is not a call graph file or is truncated
+    """
+    with _open(inp, "rb") as f:
+        header = f.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise ValueError("Not a call graph file")
+        magic, version, _ = _HEADER.unpack(header)
+        if magic != BINARY_MAGIC:
+            raise ValueError("Not a call graph file")
+        if version != BINARY_VERSION:
+            raise ValueError(f"Unsupported call graph version {version} (expected {BINARY_VERSION})")
+
+        strings: Dict[int, Optional[str]] = {_NO_STRING: None}
+        while True:
+            tag = f.read(1)
+            if not tag:
+                return
+            if tag == b"S":
+                sid = _read_varint(f)
+                length = _read_varint(f)
+                strings[sid] = f.read(length).decode("utf-8", "surrogatepass")
+            elif tag == b"A":
+                caller, caller_ctx, site, site_ctx = (strings[_read_varint(f)] for _ in range(4))
+                for _ in range(_read_varint(f)):
+                    callee = strings[_read_varint(f)]
+                    callee_ctx = strings[_read_varint(f)]
+                    kind = CallKind(_read_varint(f)).name
+                    yield ExportedEdge(kind, caller, caller_ctx, site, site_ctx, callee, callee_ctx)
+            else:
+                raise ValueError(f"Unknown record tag {tag!r}")
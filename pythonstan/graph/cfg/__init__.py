@@ -1,3 +1,4 @@
 from .base_block import *
 from .edges import *
 from .cfg import *
+from .stmt_index import *
@@ -0,0 +1,77 @@
+from typing import Dict, Iterator, List, Tuple
+
+from pythonstan.ir import IRStatement
+from .base_block import BaseBlock
+from .cfg import ControlFlowGraph
+
+__all__ = ["StatementIndex"]
+
+
+class StatementIndex:
+    """Statement-level view of a control flow graph.
+
+    Works for both statement-level and basic-block CFGs: each statement is
+    located by its block and its index within the block, and statement
+    predecessors/successors skip over empty blocks.
+    """
+    cfg: ControlFlowGraph
+    stmts: List[IRStatement]
+    positions: Dict[IRStatement, Tuple[BaseBlock, int]]
+
+    def __init__(self, cfg: ControlFlowGraph):
+        self.cfg = cfg
+        self.stmts = []
+        self.positions = {}
+        for blk in sorted(cfg.get_nodes(), key=lambda b: b.get_idx()):
+            for idx, stmt in enumerate(blk.stmts):
+                self.positions[stmt] = (blk, idx)
+                self.stmts.append(stmt)
+
+    def __len__(self) -> int:
+        return len(self.stmts)
+
+    def __iter__(self) -> Iterator[IRStatement]:
+        return iter(self.stmts)
+
+    def __contains__(self, stmt: IRStatement) -> bool:
+        return stmt in self.positions
+
+    def block_of(self, stmt: IRStatement) -> BaseBlock:
+        return self.positions[stmt][0]
+
+    def index_of(self, stmt: IRStatement) -> int:
+        return self.positions[stmt][1]
+
+    def stmt_at(self, blk: BaseBlock, idx: int) -> IRStatement:
+        return blk.stmts[idx]
+
+    def preds_of(self, stmt: IRStatement) -> List[IRStatement]:
+        blk, idx = self.positions[stmt]
+        if idx > 0:
+            return [blk.stmts[idx - 1]]
+        return self._collect(self.cfg.preds_of(blk), forward=False)
+
+    def succs_of(self, stmt: IRStatement) -> List[IRStatement]:
+        blk, idx = self.positions[stmt]
+        if idx + 1 < blk.n_stmt():
+            return [blk.stmts[idx + 1]]
+        return self._collect(self.cfg.succs_of(blk), forward=True)
+
+    def _collect(self, blks: List[BaseBlock], forward: bool) -> List[IRStatement]:
+        """Collects the first (or last) statements of ``blks``, looking through empty blocks."""
+        ret = []
+        visited = {*()}
+        stack = list(reversed(blks))
+        while len(stack) > 0:
+            blk = stack.pop()
+            if blk in visited:
+                continue
+            visited.add(blk)
+            if blk.n_stmt() > 0:
+                stmt = blk.stmts[0] if forward else blk.stmts[-1]
+                if stmt not in ret:
+                    ret.append(stmt)
+            else:
+                nexts = self.cfg.succs_of(blk) if forward else self.cfg.preds_of(blk)
+                stack.extend(reversed(nexts))
+        return ret
@@ -1,43 +1,71 @@
-from typing import Dict, List, Collection, Set
+from typing import Dict, List, Collection, Set, Tuple
+from weakref import WeakKeyDictionary
 
 from .graph import Graph, Node
 
+__all__ = ["DominatorTree"]
+
 
 class DominatorTree:
+    """(Post-)dominator tree and dominance frontiers of a graph.
+
+    Immediate dominators are computed with the iterative algorithm of Cooper,
+    Harvey and Kennedy ("A Simple, Fast Dominance Algorithm") over a reverse
+    post-order obtained with an explicit stack, so arbitrarily large graphs do
+    not hit the recursion limit. Nodes unreachable from the entry (or, for
+    post-dominators, not reaching the exit) are left out.
+
+    Use :meth:`of` to share one tree per graph; trees built that way are
+    cached until :meth:`invalidate` is called for the graph.
+    """
     graph: Graph
     is_post: bool
-    dfn: Dict[Node, int]
+    dfn: Dict[Node, int]   # reverse post-order number
     idom: Dict[Node, Node]
-    sdom: Dict[Node, Node]
-    father: Dict[Node, Node]
-    nodes: List[Node]
-    f: Dict[Node, Node]
-    ran: Dict[Node, Node]
+    nodes: List[Node]      # reachable nodes in reverse post-order
+    children: Dict[Node, List[Node]]
     df: Dict[Node, Set[Node]]
+    # pre/post numbers on the dominator tree, for O(1) dominance queries
+    tree_in: Dict[Node, int]
+    tree_out: Dict[Node, int]
+
+    _cache: 'WeakKeyDictionary[Graph, Dict[bool, DominatorTree]]' = WeakKeyDictionary()
 
     def __init__(self, graph: Graph, is_post: bool = False):
         self.graph = graph
         self.is_post = is_post
 
         self.reset()
-        self.lengauer_tarjan()
+        self.cooper_harvey_kennedy()
+        self.gen_tree()
         self.gen_df()
 
+    @classmethod
+    def of(cls, graph: Graph, is_post: bool = False) -> 'DominatorTree':
+        """Returns the cached (post-)dominator tree of ``graph``, building it on first use."""
+        trees = cls._cache.get(graph)
+        if trees is None:
+            trees = cls._cache[graph] = {}
+        if is_post not in trees:
+            trees[is_post] = cls(graph, is_post)
+        return trees[is_post]
+
+    @classmethod
+    def invalidate(cls, graph: Graph):
+        """Drops the cached trees of ``graph``; call it after modifying the graph."""
+        cls._cache.pop(graph, None)
+
     def reset(self):
         self.idom = {}
+        self.children = {}
         self.df = {}
+        self.tree_in = {}
+        self.tree_out = {}
 
-        self.dfn = {}
-        self.father = {}
-        self.nodes = []
-        start = self.get_entry()
-        self.dfs(start)
-
-        self.sdom = {}
-        self.f = {}
-        self.ran = {}
+        self.nodes = self.reverse_post_order()
+        self.dfn = {u: idx for idx, u in enumerate(self.nodes)}
         for u in self.nodes:
-            self.sdom[u] = self.f[u] = self.ran[u] = u
+            self.children[u] = []
             self.df[u] = {*()}
 
     def get_entry(self) -> Node:
@@ -58,69 +86,112 @@ class DominatorTree:
         else:
             return self.graph.preds_of(node)
 
-    def dfs(self, u: Node):
-        self.dfn[u] = len(self.nodes)
-        self.nodes.append(u)
-        for v in self.succs_of(u):
-            if v not in self.dfn:
-                self.father[v] = u
-                self.dfs(v)
-
-    def sdom_min(self, u: Node, v: Node) -> Node:
-        u_idx = self.dfn[self.sdom[u]]
-        v_idx = self.dfn[self.sdom[v]]
-        return u if u_idx <= v_idx else v
-
-    def merge(self, u: Node):
-        if self.f[u] == u:
-            return u
-        res = self.merge(self.f[u])
-        self.ran[u] = self.sdom_min(self.ran[u], self.ran[self.f[u]])
-        self.f[u] = res
-        return res
-
-    def lengauer_tarjan(self):
-        tr = {}
-        for u in self.nodes[::-1]:
-            if u != self.get_entry():
-                for v in self.preds_of(u):
-                    if v in self.dfn:
-                        self.merge(v)
-                        self.sdom[u] = self.sdom[self.sdom_min(u, self.ran[v])]
-
-                self.f[u] = self.father[u]
-                if self.sdom[u] in tr:
-                    tr[self.sdom[u]].append(u)
-                else:
-                    tr[self.sdom[u]] = [u]
-                fa = self.father[u]
-                if fa in tr:
-                    for v in tr[fa]:
-                        self.merge(v)
-                        if fa == self.sdom[self.ran[v]]:
-                            self.idom[v] = fa
-                        else:
-                            self.idom[v] = self.ran[v]
-                tr[fa] = []
-
-        for u in self.nodes[1::]:
-            if self.idom[u] != self.sdom[u]:
-                self.idom[u] = self.idom[self.idom[u]]
+    def reverse_post_order(self) -> List[Node]:
+        entry = self.get_entry()
+        order = []
+        visited = {entry}
+        stack = [(entry, iter(self.succs_of(entry)))]
+        while len(stack) > 0:
+            u, succs = stack[-1]
+            for v in succs:
+                if v not in visited:
+                    visited.add(v)
+                    stack.append((v, iter(self.succs_of(v))))
+                    break
+            else:
+                stack.pop()
+                order.append(u)
+        order.reverse()
+        return order
+
+    def cooper_harvey_kennedy(self):
+        dfn = self.dfn
+        # idom by reverse post-order number; the entry is its own idom here
+        doms = [-1] * len(self.nodes)
+        doms[0] = 0
+        preds = [[dfn[v] for v in self.preds_of(u) if v in dfn] for u in self.nodes]
+
+        changed = True
+        while changed:
+            changed = False
+            for u in range(1, len(self.nodes)):
+                new_idom = -1
+                for p in preds[u]:
+                    if doms[p] == -1:
+                        continue
+                    if new_idom == -1:
+                        new_idom = p
+                        continue
+                    # intersect: walk both fingers up towards the entry
+                    a, b = p, new_idom
+                    while a != b:
+                        while a > b:
+                            a = doms[a]
+                        while b > a:
+                            b = doms[b]
+                    new_idom = a
+                if doms[u] != new_idom:
+                    doms[u] = new_idom
+                    changed = True
+
+        for u in range(1, len(self.nodes)):
+            self.idom[self.nodes[u]] = self.nodes[doms[u]]
+
+    def gen_tree(self):
+        for u, d in self.idom.items():
+            self.children[d].append(u)
+        counter = 0
+        stack: List[Tuple[Node, bool]] = [(self.get_entry(), False)]
+        while len(stack) > 0:
+            u, done = stack.pop()
+            if done:
+                self.tree_out[u] = counter
+                counter += 1
+                continue
+            self.tree_in[u] = counter
+            counter += 1
+            stack.append((u, True))
+            stack.extend((v, False) for v in reversed(self.children[u]))
 
     def gen_df(self):
         entry = self.get_entry()
         for u in self.nodes:
+            preds = [v for v in self.preds_of(u) if v in self.dfn]
             if u == entry:
+                # the entry is also reached from outside the graph, so any
+                # back edge into it makes it a join point
+                stop = None
+            elif len(preds) > 1:
+                stop = self.idom[u]
+            else:
                 continue
-            if len(self.preds_of(u)) > 1:
-                for pred in self.preds_of(u):
-                    runner = pred
-                    while runner != self.idom[u]:
-                        self.df[runner].add(u)
-                        runner = self.idom[runner]
+            for pred in preds:
+                runner = pred
+                while runner != stop:
+                    self.df[runner].add(u)
+                    runner = self.idom.get(runner)
 
     def intermediate_dominator(self, u: Node) -> Node:
         return self.idom[u]
 
     def dominance_frontier(self, u: Node) -> Collection[Node]:
         return self.df[u]
+
+    def children_of(self, u: Node) -> List[Node]:
+        return self.children[u]
+
+    def dominates(self, u: Node, v: Node) -> bool:
+        """Whether ``u`` (post-)dominates ``v``; every node dominates itself."""
+        return self.tree_in[u] <= self.tree_in[v] and self.tree_out[v] <= self.tree_out[u]
+
+    def iterated_dominance_frontier(self, nodes: Collection[Node]) -> Set[Node]:
+        """Computes DF+ of ``nodes``, e.g. the phi placement points of a variable."""
+        ret = {*()}
+        work = [u for u in nodes if u in self.df]
+        while len(work) > 0:
+            u = work.pop()
+            for v in self.df[u]:
+                if v not in ret:
+                    ret.add(v)
+                    work.append(v)
+        return ret
@@ -17,7 +17,7 @@ class InterControlFlowGraph(ControlFlowGraph):
 
     def __init__(self):
         super().__init__()
-        self.super_entry_blk = BaseBlock()
+        self.super_entry_blk = BaseBlock(-1)
         self.add_blk(self.super_entry_blk)
         self.entry_scopes = {*()}
         self.scope2cfg = {}
@@ -36,8 +36,9 @@ class InterControlFlowGraph(ControlFlowGraph):
     def add_scope(self, scope: IRScope, cfg: ControlFlowGraph):
         self.scope2cfg[scope] = cfg
 
-        self.in_edges |= cfg.in_edges
-        self.out_edges |= cfg.out_edges
+        # copy the edge lists so interprocedural edges stay out of the scope's cfg
+        self.in_edges |= {blk: list(edges) for blk, edges in cfg.in_edges.items()}
+        self.out_edges |= {blk: list(edges) for blk, edges in cfg.out_edges.items()}
         self.blks |= cfg.blks
         self.stmts |= cfg.stmts
         self.label2blk |= cfg.label2blk
@@ -59,7 +60,7 @@ class InterControlFlowGraph(ControlFlowGraph):
         ret_vals = {stmt.get_ast() for blk in callee_cfg.exit_blks
                     for stmt in blk.stmts if isinstance(stmt, IRReturn)}
         for ret_site in self.return_sites_of(call_site):
-            ret_edge = ReturnEdge(callee_cfg.get_entry(), ret_site, call_site, ret_vals)
+            ret_edge = ReturnEdge(callee_cfg.get_exit(), ret_site, call_site, ret_vals)
             self.add_edge(ret_edge)
 
     def get_entry_scopes(self) -> Set[IRScope]:
@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Set, Union, List, Optional, Tuple, Type
+from typing import Set, Union, List, NamedTuple, Optional, Tuple, Type, Iterator
+from contextlib import contextmanager
+from sys import intern
 import ast
+import copy
 from ast import stmt as Statement
 from ast import Module, ClassDef, Name
 
-from pythonstan.utils.var_collector import VarCollector
+from pythonstan.utils.var_collector import VarEffects, NO_VARS, collect_vars
 from pythonstan.utils.ast_rename import RenameTransformer
 
 
@@ -37,12 +40,100 @@ __all__ = [
     'IRScope',
     'IRModule',
     'IRFunc',
-    'IRClass'
+    'IRClass',
+    'SourceSpan',
+    'set_compact_ir',
+    'compact_ir'
 ]
 
 
+_NO_EFFECTS: VarEffects = (NO_VARS, NO_VARS, NO_VARS)
+
+_compact_ir = False
+
+
+def set_compact_ir(enabled: bool) -> None:
+    """Toggles compact IR construction.
+
+    In compact mode, IR statements only fill in the missing source location
+    of their root AST node instead of running ``ast.fix_missing_locations``
+    over the whole subtree. Locations of nested nodes are then left as the
+    lowering passes produced them.
+    """
+    global _compact_ir
+    _compact_ir = enabled
+
+
+@contextmanager
+def compact_ir(enabled: bool) -> Iterator[None]:
+    """Builds IR in compact mode (or not) within the block.
+
+    The previous mode is restored on exit, so IR built by another pipeline
+    in the same process keeps its own setting.
+    """
+    global _compact_ir
+    previous, _compact_ir = _compact_ir, enabled
+    try:
+        yield
+    finally:
+        _compact_ir = previous
+
+
+class SourceSpan(NamedTuple):
+    """Source position of an IR statement, kept when its AST is released."""
+
+    lineno: int
+    col_offset: int
+    end_lineno: Optional[int]
+    end_col_offset: Optional[int]
+
+    @classmethod
+    def of(cls, node: Optional[ast.AST]) -> Optional['SourceSpan']:
+        """Returns the span of ``node``, or ``None`` if it has no location."""
+        if node is None or not hasattr(node, 'lineno'):
+            return None
+        return cls(node.lineno, getattr(node, 'col_offset', 0),
+                   getattr(node, 'end_lineno', None), getattr(node, 'end_col_offset', None))
+
+
+_BODY_FIELDS = ('body', 'orelse', 'handlers', 'finalbody')
+
+
+def _without_body(node: Optional[ast.AST]) -> Optional[ast.AST]:
+    """Returns a shallow copy of a compound AST node with its nested statements dropped.
+
+    Headers (names, arguments, tests, decorators) and source locations are
+    kept, so signatures and spans can still be read from the copy.
+    """
+    if node is None:
+        return None
+    stripped = copy.copy(node)
+    for field in _BODY_FIELDS:
+        if isinstance(getattr(stripped, field, None), list):
+            setattr(stripped, field, [])
+    return stripped
+
+
+def _fix_locations(node: Optional[ast.AST]) -> None:
+    """Fills in missing source locations of a freshly lowered AST node."""
+    if node is None:
+        return
+    if not _compact_ir:
+        ast.fix_missing_locations(node)
+        return
+    for start, end in (('lineno', 'end_lineno'), ('col_offset', 'end_col_offset')):
+        if start in node._attributes:
+            if not hasattr(node, start):
+                setattr(node, start, 1 if start == 'lineno' else 0)
+            if getattr(node, end, None) is None:
+                setattr(node, end, getattr(node, start))
+
+
 class IRStatement(ABC):
     """Abstract base for every normalized IR node emitted after TAC lowering."""
+
+    __slots__ = ()
+
     @abstractmethod
     def __str__(self) -> str:
         """Returns the SSA friendly textual form used by downstream analyses."""
@@ -71,6 +162,18 @@ class IRStatement(ABC):
     def get_ast(self) -> ast.AST:
         """Exposes the backing AST node produced by ``IRTransformer``."""
 
+    def get_span(self) -> Optional[SourceSpan]:
+        """Returns the source position of the statement, if known."""
+        return SourceSpan.of(self.get_ast())
+
+    def release_ast(self) -> None:
+        """Drops AST parts that are not needed once IR and CFG are built.
+
+        Only compound nodes that merely anchor the statement (e.g. the ``If``
+        owning a guard) are trimmed; operands the IR exposes stay intact, so
+        ``__str__`` and ``get_span`` keep working. No-op by default.
+        """
+
     def rename(
         self,
         old_name: str,
@@ -85,19 +188,45 @@ class IRStatement(ABC):
 
 
 class IRAbstractStmt(IRStatement, ABC):
-    """Convenience base for IR nodes that have no intrinsic var effects."""
+    """Convenience base for IR nodes that have no intrinsic var effects.
+
+    Var effects are collected once, on first use, and cached as frozensets of
+    interned names; subclasses describe them by overriding ``_collect_vars``
+    and call ``_reset_vars`` whenever their backing AST changes.
+    """
+
+    __slots__ = ('_vars',)
 
     def get_stores(self) -> Set[str]:
-        """Defaults to an empty def-set for structural statements."""
-        return {*()}
+        """Returns the cached def-set (empty for structural statements)."""
+        return self._var_effects()[0]
 
     def get_loads(self) -> Set[str]:
-        """Defaults to an empty use-set for structural statements."""
-        return {*()}
+        """Returns the cached use-set (empty for structural statements)."""
+        return self._var_effects()[1]
 
     def get_dels(self) -> Set[str]:
-        """Defaults to an empty delete-set for structural statements."""
-        return {*()}
+        """Returns the cached delete-set (empty for structural statements)."""
+        return self._var_effects()[2]
+
+    def _var_effects(self) -> VarEffects:
+        """Returns ``(stores, loads, dels)``, collecting them on first use."""
+        try:
+            return self._vars
+        except AttributeError:
+            self._vars = self._collect_vars()
+            return self._vars
+
+    def _collect_vars(self) -> VarEffects:
+        """Computes ``(stores, loads, dels)``; structural statements have none."""
+        return _NO_EFFECTS
+
+    def _reset_vars(self) -> None:
+        """Drops cached var effects after the backing AST was rewritten."""
+        try:
+            del self._vars
+        except AttributeError:
+            pass
 
     def rename(
         self,
@@ -110,16 +239,12 @@ class IRAbstractStmt(IRStatement, ABC):
 
 
 class IRAstStmt(IRAbstractStmt):
-    """Wraps a raw AST statement while exposing VarCollector metadata."""
+    """Wraps a raw AST statement while exposing its collected var effects."""
+
+    __slots__ = ('stmt',)
 
     stmt: Statement
     #: Backing AST node emitted by ``ThreeAddressTransformer``.
-    store_collector: VarCollector
-    #: Tracks write contexts discovered when scanning ``stmt``.
-    load_collector: VarCollector
-    #: Tracks read contexts discovered when scanning ``stmt``.
-    del_collector: VarCollector
-    #: Tracks delete contexts discovered when scanning ``stmt``.
 
     def __init__(self, stmt: Statement):
         """Initialises the wrapper with a freshly normalised AST node."""
@@ -130,39 +255,18 @@ class IRAstStmt(IRAbstractStmt):
         return ast.unparse(self.stmt)
 
     def set_stmt(self, stmt: Statement):
-        """Updates the wrapped AST node and rebuilds all collectors. [side effects: mutates ``stmt`` and resets collector caches]"""
+        """Updates the wrapped AST node. [side effects: mutates ``stmt`` and resets cached var effects]"""
         self.stmt = stmt
-        ast.fix_missing_locations(self.stmt)
-        self.collector_reset()
-        self.collect_from_stmt(stmt)
+        _fix_locations(self.stmt)
+        self._reset_vars()
 
     def get_ast(self) -> Statement:
         """Returns the current AST node backing this IR leaf."""
         return self.stmt
 
-    def collector_reset(self):
-        """Initialises per-effect collectors before rescanning a statement."""
-        self.store_collector = VarCollector("store")
-        self.load_collector = VarCollector("load")
-        self.del_collector = VarCollector("del")
-
-    def collect_from_stmt(self, stmt: Statement):
-        """Populates collectors by visiting ``stmt``."""
-        self.store_collector.visit(stmt)
-        self.load_collector.visit(stmt)
-        self.del_collector.visit(stmt)
-
-    def get_stores(self) -> Set[str]:
-        """Returns variables bound by ``stmt``."""
-        return self.store_collector.get_vars()
-
-    def get_loads(self) -> Set[str]:
-        """Returns variables read by ``stmt``."""
-        return self.load_collector.get_vars()
-
-    def get_dels(self) -> Set[str]:
-        """Returns variables deleted by ``stmt``."""
-        return self.del_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects stores, loads and deletes of the whole ``stmt``."""
+        return collect_vars(self.stmt)
 
     def rename(
         self,
@@ -173,11 +277,14 @@ class IRAstStmt(IRAbstractStmt):
         """Applies ``RenameTransformer`` to the underlying AST."""
         renamer = RenameTransformer(old_name, new_name, ctxs)
         self.stmt = renamer.visit(self.stmt)
+        self._reset_vars()
 
 
 class Label(IRAbstractStmt):
     """Control-flow anchor generated by ``LabelGenerator``."""
 
+    __slots__ = ('idx',)
+
     idx: int
     #: Sequential identifier unique within the current IR stream.
 
@@ -204,6 +311,8 @@ class Label(IRAbstractStmt):
 class IRCatchException(IRAbstractStmt):
     """Metadata emitted for each ``try`` handler in the IR stream."""
 
+    __slots__ = ('exception', 'from_label', 'to_label', 'goto_label', 'exception_ast')
+
     exception: List[str]
     #: Qualified exception names handled by this clause.
     from_label: Label
@@ -238,11 +347,17 @@ class IRCatchException(IRAbstractStmt):
         """Returns the original ``ast.ExceptHandler`` if one existed."""
         return self.exception_ast
 
+    def release_ast(self) -> None:
+        """Drops the handler body, which is already lowered into the IR stream."""
+        self.exception_ast = _without_body(self.exception_ast)
+
 
 # goto label
 class Goto(IRAbstractStmt):
     """Explicit control-transfer edge inserted when lowering loops."""
 
+    __slots__ = ('label',)
+
     label: Optional[Label]
     #: Destination label patched in a later pass.
 
@@ -267,14 +382,14 @@ class Goto(IRAbstractStmt):
 class JumpIfFalse(IRAbstractStmt):
     """Conditional branch emitted for ``if`` and loop guards."""
 
+    __slots__ = ('test', 'label', 'stmt_ast')
+
     test: ast.expr
     #: Boolean guard evaluated using the TAC-normalised AST.
     label: Label
     #: Destination label executed when ``test`` evaluates to ``False``.
     stmt_ast: Optional[ast.stmt]
     #: Original AST statement that owns the guard.
-    load_collector: VarCollector
-    #: Tracks free variables referenced by ``test``.
 
     def __init__(
         self,
@@ -284,9 +399,7 @@ class JumpIfFalse(IRAbstractStmt):
     ):
         """Captures guard metadata for control-flow reconstruction."""
         self.test = test
-        ast.fix_missing_locations(self.test)
-        self.load_collector = VarCollector("load")
-        self.load_collector.visit(self.test)
+        _fix_locations(self.test)
         if label is None:
             self.label = Label(-1)
         else:
@@ -302,9 +415,9 @@ class JumpIfFalse(IRAbstractStmt):
         test_str = ast.unparse(self.test)
         return f"if not ({test_str}) goto {self.label.to_s()}"
 
-    def get_loads(self) -> Set[str]:
-        """Returns variables read solely by the guard expression."""
-        return self.load_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects variables read solely by the guard expression."""
+        return NO_VARS, collect_vars(self.test)[1], NO_VARS
 
     def rename(
         self,
@@ -315,19 +428,25 @@ class JumpIfFalse(IRAbstractStmt):
         """Renames symbols referenced by ``test``."""
         renamer = RenameTransformer(old_name, new_name, ctxs)
         self.test = renamer.visit(self.test)
+        self._reset_vars()
 
     def get_ast(self):
         """Provides the AST node that originated this conditional."""
         return self.stmt_ast
 
+    def release_ast(self) -> None:
+        """Keeps only the header of the owning ``if``/``while`` statement."""
+        self.stmt_ast = _without_body(self.stmt_ast)
+
 
 # if test goto label
 class JumpIfTrue(IRAbstractStmt):
     """Conditional branch used when the true branch is non-fallthrough."""
 
+    __slots__ = ('test', 'label', 'stmt_ast')
+
     test: ast.expr
     label: Label
-    load_collector: VarCollector
     stmt_ast: Optional[ast.stmt]
 
     def __init__(
@@ -338,9 +457,7 @@ class JumpIfTrue(IRAbstractStmt):
     ):
         """Captures jump metadata for short-circuiting ``if`` constructs."""
         self.test = test
-        ast.fix_missing_locations(self.test)
-        self.load_collector = VarCollector("load")
-        self.load_collector.visit(self.test)
+        _fix_locations(self.test)
         self.label = label
         self.stmt_ast = stmt_ast
 
@@ -353,9 +470,9 @@ class JumpIfTrue(IRAbstractStmt):
         """Patches the successor once CFG layout is known."""
         self.label = label
 
-    def get_loads(self) -> Set[str]:
-        """Returns guard dependencies for use-def chains."""
-        return self.load_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects guard dependencies for use-def chains."""
+        return NO_VARS, collect_vars(self.test)[1], NO_VARS
 
     def rename(
         self,
@@ -366,24 +483,27 @@ class JumpIfTrue(IRAbstractStmt):
         """Renames identifiers referenced by the guard expression."""
         renamer = RenameTransformer(old_name, new_name, ctxs)
         self.test = renamer.visit(self.test)
+        self._reset_vars()
 
     def get_ast(self):
         """Returns the AST node that produced this positive jump."""
         return self.stmt_ast
 
+    def release_ast(self) -> None:
+        """Keeps only the header of the owning statement."""
+        self.stmt_ast = _without_body(self.stmt_ast)
+
 
 # [target] = yield value
 class IRYield(IRAbstractStmt):
     """Represents ``yield`` lowered from generator bodies."""
 
+    __slots__ = ('stmt', 'value', 'target', '_is_yield_from')
+
     stmt: Statement
     #: Either ``ast.Expr`` or ``ast.Assign`` containing the yield.
     value: Optional[ast.Name]
     #: The yielded symbol, normalised by ``ThreeAddressTransformer``.
-    load_collector: VarCollector
-    #: Records reads pulled in by the awaitable/value expression.
-    store_collector: VarCollector
-    #: Records names bound by ``target = yield`` forms.
     target: Optional[ast.expr]
     #: Assignment target when the yield appears on RHS.
     _is_yield_from: bool
@@ -398,11 +518,7 @@ class IRYield(IRAbstractStmt):
         assert isinstance(yield_value, ast.Name) or yield_value is None
         self.value = yield_value
         self._is_yield_from = isinstance(self.value, ast.YieldFrom)
-        ast.fix_missing_locations(self.stmt)
-        self.load_collector = VarCollector("load")
-        self.load_collector.visit(self.stmt)
-        self.store_collector = VarCollector("store")
-        self.store_collector.visit(self.stmt)
+        _fix_locations(self.stmt)
 
     def __str__(self):
         """Displays ``yield`` or ``yield <name>`` for IR dumps."""
@@ -416,13 +532,10 @@ class IRYield(IRAbstractStmt):
         """Returns ``True`` when representing ``yield from``."""
         return self._is_yield_from
 
-    def get_loads(self) -> Set[str]:
-        """Returns referenced variables within the yield expression."""
-        return self.load_collector.get_vars()
-
-    def get_stores(self) -> Set[str]:
-        """Returns assignment targets updated by the yield."""
-        return self.store_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects the yielded variables and the assignment targets updated by the yield."""
+        stores, loads, _ = collect_vars(self.stmt)
+        return stores, loads, NO_VARS
 
     def rename(
         self,
@@ -430,9 +543,12 @@ class IRYield(IRAbstractStmt):
         new_name: str,
         ctxs: Tuple[Type[ast.AST], ...],
     ) -> None:
-        """Renames load operands participating in the yield."""
+        """Renames the yielded operand and the assignment target receiving the sent value."""
         renamer = RenameTransformer(old_name, new_name, ctxs)
-        self.value = renamer.visit(self.value)
+        self.stmt = renamer.visit(self.stmt)
+        self.target = self.stmt.targets[0] if isinstance(self.stmt, ast.Assign) else None
+        self.value = self.stmt.value.value
+        self._reset_vars()
 
     def get_ast(self):
         """Exposes the normalised AST statement for this yield."""
@@ -443,32 +559,30 @@ class IRYield(IRAbstractStmt):
 class IRReturn(IRAbstractStmt):
     """Represents canonicalised ``return`` statements."""
 
+    __slots__ = ('value', 'stmt')
+
     value: Optional[ast.Name]
     #: Symbol returned to the caller, or ``None`` for bare ``return``.
     stmt: ast.stmt
     #: Underlying ``ast.Return`` node.
-    load_collector: VarCollector
-    #: Tracks upstream values needed to produce the return value.
 
     def __init__(self, stmt: ast.Return):
         """Normalises return value into a plain ``ast.Name`` when present."""
-        ast.fix_missing_locations(stmt)
+        _fix_locations(stmt)
         if stmt.value is not None:
             assert isinstance(stmt.value, ast.Name), "Return value of IR should be ast.Name or None!"
-            self.value = stmt.value.id
+            self.value = intern(stmt.value.id)
         else:
             self.value = None
         self.stmt = stmt
-        self.load_collector = VarCollector("load")
-        self.load_collector.visit(self.stmt)
 
     def __str__(self):
         """Pretty-prints the ``return`` statement."""
         return ast.unparse(self.stmt)
 
-    def get_loads(self) -> Set[str]:
-        """Returns identifiers whose value feeds into the return."""
-        return self.load_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects identifiers whose value feeds into the return."""
+        return NO_VARS, collect_vars(self.stmt)[1], NO_VARS
 
     def get_value(self) -> Optional[str]:
         """Returns the symbolic name returned to the caller."""
@@ -483,6 +597,7 @@ class IRReturn(IRAbstractStmt):
         """Renames the returned identifier if it matches ``old_name``."""
         renamer = RenameTransformer(old_name, new_name, ctxs)
         self.value = renamer.visit(self.stmt)
+        self._reset_vars()
 
     def get_ast(self):
         """Returns the AST representation of this return statement."""
@@ -493,31 +608,29 @@ class IRReturn(IRAbstractStmt):
 class IRRaise(IRAbstractStmt):
     """Normalised ``raise`` statements, preserving optional causes."""
 
+    __slots__ = ('exc', 'cause', 'stmt')
+
     exc: Optional[ast.expr]
     #: Exception instance being raised.
     cause: Optional[ast.expr]
     #: Optional ``from`` cause to preserve chaining semantics.
     stmt: ast.Raise
     #: Original AST node tracked for location/diagnostics.
-    load_collector: VarCollector
-    #: Records evaluated expressions required to raise.
 
     def __init__(self, stmt: ast.Raise):
         """Extracts operands for ``raise`` so SCCP can reason about them."""
         self.stmt = stmt
-        ast.fix_missing_locations(self.stmt)
+        _fix_locations(self.stmt)
         self.exc = stmt.exc
         self.cause = stmt.cause
-        self.load_collector = VarCollector("load")
-        self.load_collector.visit(self.stmt)
 
     def __str__(self):
         """Reconstructs the ``raise`` expression text."""
         return ast.unparse(self.stmt)
 
-    def get_loads(self) -> Set[str]:
-        """Returns variable dependencies for the exception and cause."""
-        return self.load_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects variable dependencies for the exception and cause."""
+        return NO_VARS, collect_vars(self.stmt)[1], NO_VARS
 
     def rename(
         self,
@@ -532,6 +645,7 @@ class IRRaise(IRAbstractStmt):
             self.exc = renamer.visit(self.exc)
         if self.cause is not None:
             self.cause = renamer.visit(self.cause)
+        self._reset_vars()
 
     def get_ast(self):
         """Returns the wrapped ``ast.Raise``."""
@@ -542,6 +656,8 @@ class IRRaise(IRAbstractStmt):
 class IRPass(IRAbstractStmt):
     """Represents structural ``pass`` placeholders introduced post-lowering."""
 
+    __slots__ = ('pass_ast',)
+
     pass_ast: ast.Pass
     #: Real AST node kept for positional fidelity.
 
@@ -565,14 +681,12 @@ class IRPass(IRAbstractStmt):
 class IRAwait(IRAbstractStmt):
     """Encodes ``await`` expressions after coroutine lowering."""
 
+    __slots__ = ('stmt', 'value', 'target')
+
     stmt: Statement
     #: AST statement containing the await expression.
     value: ast.expr
     #: Await operand extracted from the statement.
-    load_collector: VarCollector
-    #: Names read while evaluating the await.
-    store_collector: VarCollector
-    #: Names written when assigning the awaited value.
     target: Optional[ast.Name]
     #: Assignment target if ``await`` is part of an ``Assign``.
 
@@ -587,11 +701,7 @@ class IRAwait(IRAbstractStmt):
             assert isinstance(stmt.value, ast.Await)
             self.value = stmt.value.value
             self.target = None
-        ast.fix_missing_locations(self.stmt)
-        self.load_collector = VarCollector("load")
-        self.load_collector.visit(self.stmt)
-        self.store_collector = VarCollector("store")
-        self.store_collector.visit(self.stmt)
+        _fix_locations(self.stmt)
 
     def __str__(self):
         """Returns ``await`` expression text."""
@@ -605,13 +715,10 @@ class IRAwait(IRAbstractStmt):
         """Returns the await operand (already normalised)."""
         return self.value
 
-    def get_loads(self) -> Set[str]:
-        """Returns identifiers read while preparing the await."""
-        return self.load_collector.get_vars()
-
-    def get_stores(self) -> Set[str]:
-        """Returns identifiers written by assigning the await result."""
-        return self.store_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects identifiers read while preparing the await and written by assigning its result."""
+        stores, loads, _ = collect_vars(self.stmt)
+        return stores, loads, NO_VARS
 
     def rename(
         self,
@@ -622,6 +729,7 @@ class IRAwait(IRAbstractStmt):
         """Renames operands captured by the await expression."""
         renamer = RenameTransformer(old_name, new_name, ctxs)
         self.value = renamer.visit(self.value)
+        self._reset_vars()
 
     def get_ast(self):
         """Returns the AST statement representing this await."""
@@ -632,27 +740,25 @@ class IRAwait(IRAbstractStmt):
 class IRDel(IRAbstractStmt):
     """Represents single-target ``del`` statements."""
 
+    __slots__ = ('value',)
+
     value: ast.Name
     #: The identifier being deleted.
-    del_collector: VarCollector
-    #: Collector reused to expose delete-set semantics.
 
     def __init__(self, stmt: ast.Delete):
         """Records the symbol removed from the current scope."""
         assert len(stmt.targets) == 1 and isinstance(stmt.targets[0], ast.Name)
-        ast.fix_missing_locations(stmt)
+        _fix_locations(stmt)
         self.value = stmt.targets[0]
-        self.del_collector = VarCollector("del")
-        self.del_collector.visit(self.value)
 
     def __str__(self):
         """Displays ``del`` with the associated symbol."""
         val_str = ast.unparse(self.value)
         return f"del {val_str}"
 
-    def get_dels(self) -> Set[str]:
-        """Returns the identifier removed from scope."""
-        return self.del_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects the identifier removed from scope."""
+        return NO_VARS, NO_VARS, collect_vars(self.value)[2]
 
     def rename(
         self,
@@ -663,6 +769,7 @@ class IRDel(IRAbstractStmt):
         """Renames the deleted target when applicable."""
         renamer = RenameTransformer(old_name, new_name, ctxs)
         self.value = renamer.visit(self.value)
+        self._reset_vars()
 
     def get_ast(self):
         """Returns the ``ast.Name`` representing the deleted target."""
@@ -673,6 +780,8 @@ class IRDel(IRAbstractStmt):
 class IRImport(IRAbstractStmt):
     """Represents ``import``/``from`` statements with alias tracking."""
 
+    __slots__ = ('stmt', 'module', 'name', 'asname', 'level')
+
     stmt: Union[ast.Import, ast.ImportFrom]
     #: Backing AST import node in normalised form.
     module: Optional[str]
@@ -689,15 +798,16 @@ class IRImport(IRAbstractStmt):
         self.stmt = stmt
         if isinstance(stmt, ast.ImportFrom):
             if stmt.module is not None:
-                self.module = stmt.module
+                self.module = intern(stmt.module)
             else:
                 self.module = ""
             self.level = stmt.level
         else:
             self.module = None
             self.level = 0
-        self.name = stmt.names[0].name
-        self.asname = stmt.names[0].asname
+        self.name = intern(stmt.names[0].name)
+        asname = stmt.names[0].asname
+        self.asname = intern(asname) if asname is not None else None
 
     def __str__(self):
         """Returns the canonical source representation."""
@@ -707,15 +817,11 @@ class IRImport(IRAbstractStmt):
         """Keeps debugger output consistent with ``__str__``."""
         return ast.unparse(self.stmt)
 
-    def get_stores(self) -> Set[str]:
-        """Returns symbols introduced into the current namespace."""
-        stores = {*()}
-        for name in self.stmt.names:
-            if name.asname is None:
-                stores.add(name.name)
-            else:
-                stores.add(name.asname)
-        return stores
+    def _collect_vars(self) -> VarEffects:
+        """Collects symbols introduced into the current namespace."""
+        stores = frozenset(intern(name.name if name.asname is None else name.asname)
+                           for name in self.stmt.names)
+        return stores, NO_VARS, NO_VARS
 
     def rename(
         self,
@@ -728,6 +834,7 @@ class IRImport(IRAbstractStmt):
             return
         renamer = RenameTransformer(old_name, new_name, ctxs)
         self.stmt = renamer.visit(self.stmt)
+        self._reset_vars()
 
     def get_ast(self) -> Union[ast.Import, ast.ImportFrom]:
         """Returns the ``ast`` import node."""
@@ -738,6 +845,8 @@ class IRImport(IRAbstractStmt):
 class IRCall(IRAbstractStmt):
     """Captures function call sites in their three-address form."""
 
+    __slots__ = ('stmt', 'call', 'target', 'func_name', 'args', 'keywords')
+
     stmt: Union[ast.Assign, ast.Call]
     #: Either the enclosing assignment or the call expression itself.
     call: ast.Call
@@ -750,17 +859,20 @@ class IRCall(IRAbstractStmt):
     #: Positional arguments represented as ``(arg_name, is_starred)``.
     keywords: List[Tuple[Optional[str], str]]
     #: Keyword arguments represented as ``(keyword_name, arg_name)``.
-    load_collector: VarCollector
-    #: Tracks names read during call evaluation.
 
     def __init__(self, stmt: Union[ast.Assign, ast.Call]):
         """Stores callee metadata for call graph construction."""
+        self.set_stmt(stmt)
+
+    def set_stmt(self, stmt: Union[ast.Assign, ast.Call]):
+        """Rebinds the call and re-derives its metadata. [side effects: resets cached var effects]"""
         self.stmt = stmt
+        self._reset_vars()
         if isinstance(stmt, ast.Assign):
             assert isinstance(stmt.targets[0], ast.Name)
             assert isinstance(stmt.value, ast.Call)
             self.call = stmt.value
-            self.target = stmt.targets[0].id
+            self.target = intern(stmt.targets[0].id)
         else:
             assert isinstance(stmt, ast.Call), f"stmt must be an ast.Call, but got {ast.dump(stmt, indent=4)}"
             self.call = stmt
@@ -768,13 +880,13 @@ class IRCall(IRAbstractStmt):
 
         assert isinstance(self.call.func, ast.Name), ast.dump(self.call, indent=4)
 
-        self.func_name = self.call.func.id
+        self.func_name = intern(self.call.func.id)
         self.args = []
         for arg in self.call.args:
             if isinstance(arg, ast.Name):
-                self.args.append((arg.id, False))
+                self.args.append((intern(arg.id), False))
             elif isinstance(arg, ast.Starred) and isinstance(arg.value, ast.Name):
-                self.args.append((arg.value.id, True))
+                self.args.append((intern(arg.value.id), True))
             elif isinstance(arg, ast.Constant):
                 self.args.append((f'<Constant: {str(arg.value)}>', False))
             else:
@@ -783,11 +895,9 @@ class IRCall(IRAbstractStmt):
         for kw in self.call.keywords:
             assert isinstance(kw.value, ast.Name), "Keywords in function call should be Name"
             if kw.arg is None:
-                self.keywords.append((None, kw.value.id))
+                self.keywords.append((None, intern(kw.value.id)))
             else:
-                self.keywords.append((kw.arg, kw.value.id))
-        self.load_collector = VarCollector("load")
-        self.load_collector.visit(self.stmt)
+                self.keywords.append((intern(kw.arg), intern(kw.value.id)))
 
     def __str__(self):
         """Returns the reconstructed call text."""
@@ -805,20 +915,14 @@ class IRCall(IRAbstractStmt):
         """Returns keyword bindings represented in the call."""
         return self.keywords
 
-    def get_loads(self) -> Set[str]:
-        """Returns all symbols referenced by the call expression."""
-        return self.load_collector.get_vars()
-
     def get_target(self) -> Optional[str]:
         """Returns the SSA target receiving the call result, if any."""
         return self.target
 
-    def get_stores(self) -> Set[str]:
-        """Returns the single assignment target or an empty set."""
-        if self.target is not None:
-            return {self.target}
-        else:
-            return {*()}
+    def _collect_vars(self) -> VarEffects:
+        """Collects the single assignment target and all symbols referenced by the call."""
+        stores = frozenset((self.target,)) if self.target is not None else NO_VARS
+        return stores, collect_vars(self.stmt)[1], NO_VARS
 
     def rename(
         self,
@@ -828,7 +932,7 @@ class IRCall(IRAbstractStmt):
     ) -> None:
         """Renames operands across the full call expression."""
         renamer = RenameTransformer(old_name, new_name, ctxs)
-        self.stmt = renamer.visit(self.stmt)
+        self.set_stmt(renamer.visit(self.stmt))
 
     def get_ast(self) -> ast.Call:
         """Returns the ``ast`` node representing the call."""
@@ -839,19 +943,17 @@ class IRCall(IRAbstractStmt):
 class IRAnno(IRAbstractStmt):
     """Represents annotated assignments maintained for type hints."""
 
+    __slots__ = ('target', 'anno', 'stmt')
+
     target: ast.expr
     #: The assignment target receiving the annotation.
     anno: ast.expr
     #: The annotation expression.
     stmt: Statement
     #: Underlying ``ast.AnnAssign`` node.
-    store_collector: VarCollector
-    #: Tracks definitions introduced by the target.
-    load_collector: VarCollector
-    #: Tracks references required by the annotation expression.
 
     def __init__(self, stmt: ast.AnnAssign):
-        """Initialises collector state for the provided annotation."""
+        """Binds the provided annotation; var effects are collected on demand."""
         self.set_stmt(stmt)
 
     def __str__(self):
@@ -861,13 +963,12 @@ class IRAnno(IRAbstractStmt):
         return f"{tgt_str} : {ann_str}"
 
     def set_stmt(self, stmt: ast.AnnAssign):
-        """Rebinds to a new ``AnnAssign`` node. [side effects: resets collectors and cached AST nodes]"""
+        """Rebinds to a new ``AnnAssign`` node. [side effects: resets cached var effects and AST nodes]"""
         self.target = stmt.target
         self.anno = stmt.annotation
         self.stmt = stmt
-        ast.fix_missing_locations(self.stmt)
-        self.collector_reset()
-        self.collect_from_stmt(stmt)
+        _fix_locations(self.stmt)
+        self._reset_vars()
 
     def get_ast(self) -> Statement:
         """Returns the annotation AST."""
@@ -881,23 +982,9 @@ class IRAnno(IRAbstractStmt):
         """Returns the annotation payload."""
         return self.anno
 
-    def collector_reset(self):
-        """Initialises collectors before visiting a new statement."""
-        self.store_collector = VarCollector("store")
-        self.load_collector = VarCollector("load")
-
-    def collect_from_stmt(self, stmt: Statement):
-        """Collects store/load effects from the target/annotation."""
-        self.store_collector.visit(self.target)
-        self.load_collector.visit(self.anno)
-
-    def get_stores(self) -> Set[str]:
-        """Returns identifiers introduced by the annotation's target."""
-        return self.store_collector.get_vars()
-
-    def get_loads(self) -> Set[str]:
-        """Returns identifiers referenced by the annotation expression."""
-        return self.load_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects stores of the annotated target and loads of the annotation."""
+        return collect_vars(self.target)[0], collect_vars(self.anno)[1], NO_VARS
 
     def rename(
         self,
@@ -912,21 +999,20 @@ class IRAnno(IRAbstractStmt):
             self.anno = renamer.visit(self.anno)
         if isinstance(ast.Store(), ctxs):
             self.target = renamer.visit(self.target)
+        self._reset_vars()
 
 
 class AbstractIRAssign(IRAbstractStmt):
     """Common scaffolding for single-target assignments emitted by TAC."""
 
+    __slots__ = ('lval', 'rval', 'stmt')
+
     lval: ast.expr
     #: Left-hand side produced by ``resolve_single_Assign``.
     rval: ast.expr
     #: Right-hand side expression after TAC lowering.
     stmt: Statement
     #: Backing ``ast.Assign`` node.
-    store_collector: VarCollector
-    #: Tracks bound identifiers.
-    load_collector: VarCollector
-    #: Tracks referenced identifiers.
 
     @abstractmethod
     def __init__(self, stmt: ast.Assign):
@@ -941,13 +1027,12 @@ class AbstractIRAssign(IRAbstractStmt):
         return f"{lstr} = {rstr}"
 
     def set_stmt(self, stmt: ast.Assign):
-        """Rebinds the assignment operands. [side effects: resets collectors and rewrites cached AST]"""
+        """Rebinds the assignment operands. [side effects: resets cached var effects and rewrites cached AST]"""
         self.lval = stmt.targets[0]
         self.rval = stmt.value
         self.stmt = stmt
-        ast.fix_missing_locations(self.stmt)
-        self.collector_reset()
-        self.collect_from_stmt(stmt)
+        _fix_locations(self.stmt)
+        self._reset_vars()
 
     def get_ast(self) -> Statement:
         """Returns the ``ast.Assign`` associated with this IR node."""
@@ -961,23 +1046,9 @@ class AbstractIRAssign(IRAbstractStmt):
         """Returns the right-hand side expression."""
         return self.rval
 
-    def collector_reset(self):
-        """Initialises collectors before rescanning operands."""
-        self.store_collector = VarCollector("store")
-        self.load_collector = VarCollector("load")
-
-    def collect_from_stmt(self, stmt: Statement):
-        """Recomputes the store/load sets."""
-        self.store_collector.visit(self.lval)
-        self.load_collector.visit(self.rval)
-
-    def get_stores(self) -> Set[str]:
-        """Returns identifiers defined by the assignment."""
-        return self.store_collector.get_vars()
-
-    def get_loads(self) -> Set[str]:
-        """Returns identifiers referenced by the RHS."""
-        return self.load_collector.get_vars()
+    def _collect_vars(self) -> VarEffects:
+        """Collects identifiers defined by the LHS and referenced by the RHS."""
+        return collect_vars(self.lval)[0], collect_vars(self.rval)[1], NO_VARS
 
     def rename(
         self,
@@ -987,21 +1058,17 @@ class AbstractIRAssign(IRAbstractStmt):
     ) -> None:
         """Renames operands based on the contexts provided."""
         renamer = RenameTransformer(old_name, new_name, ctxs)
-        self.stmt = renamer.visit(self.stmt)
-        if isinstance(ast.Load(), ctxs):
-            self.rval = renamer.visit(self.rval)
-        if isinstance(ast.Store(), ctxs):
-            self.lval = renamer.visit(self.lval)
+        self.set_stmt(renamer.visit(self.stmt))
 
 
 # lval = ...
 class IRAssign(AbstractIRAssign):
     """Generic SSA assignment ``name = expr``."""
 
+    __slots__ = ()
+
     lval: ast.Name
     stmt: Statement
-    store_collector: VarCollector
-    load_collector: VarCollector
 
     def __init__(self, stmt: ast.Assign):
         """Validates that TAC already reduced the LHS to ``ast.Name``."""
@@ -1017,11 +1084,11 @@ class IRAssign(AbstractIRAssign):
 class IRCopy(AbstractIRAssign):
     """Represents ``x = y`` copies used during SSA phi placement."""
 
+    __slots__ = ()
+
     lval: ast.Name
     rval: ast.Name
     stmt: Statement
-    store_collector: VarCollector
-    load_collector: VarCollector
 
     def __init__(self, stmt: ast.Assign):
         """Ensures both operands are already ``ast.Name`` values."""
@@ -1042,6 +1109,8 @@ class IRCopy(AbstractIRAssign):
 class IRStoreAttr(AbstractIRAssign):
     """Represents attribute stores ``obj.attr = name``."""
 
+    __slots__ = ('obj', 'attr')
+
     rval: ast.Name
     #: Value assigned into the attribute.
     obj: ast.Name
@@ -1051,14 +1120,18 @@ class IRStoreAttr(AbstractIRAssign):
 
     def __init__(self, stmt: ast.Assign):
         """Captures object/attribute metadata for store statements."""
-        super().__init__(stmt)
-
         target = stmt.targets[0]
         assert isinstance(target, ast.Attribute)
         assert isinstance(target.value, ast.Name)
         assert isinstance(stmt.value, ast.Name)
+        super().__init__(stmt)
+
+    def set_stmt(self, stmt: ast.Assign):
+        """Rebinds the operands and the receiver/attribute metadata."""
+        super().set_stmt(stmt)
+        target = stmt.targets[0]
         self.obj = target.value
-        self.attr = target.attr
+        self.attr = intern(target.attr)
 
     def get_rval(self) -> ast.Name:
         """Returns the assigned name."""
@@ -1077,6 +1150,8 @@ class IRStoreAttr(AbstractIRAssign):
 class IRLoadAttr(AbstractIRAssign):
     """Represents attribute loads ``tmp = obj.attr``."""
 
+    __slots__ = ('obj', 'attr')
+
     lval: ast.Name
     #: SSA temp capturing the attribute value.
     obj: ast.Name
@@ -1086,13 +1161,16 @@ class IRLoadAttr(AbstractIRAssign):
 
     def __init__(self, stmt: ast.Assign):
         """Captures object/attribute metadata for load statements."""
-        super().__init__(stmt)
-
         assert isinstance(stmt.targets[0], ast.Name)
         assert isinstance(stmt.value, ast.Attribute)
         assert isinstance(stmt.value.value, ast.Name)
+        super().__init__(stmt)
+
+    def set_stmt(self, stmt: ast.Assign):
+        """Rebinds the operands and the receiver/attribute metadata."""
+        super().set_stmt(stmt)
         self.obj = stmt.value.value
-        self.attr = stmt.value.attr
+        self.attr = intern(stmt.value.attr)
 
     def get_lval(self) -> ast.Name:
         """Returns the SSA temp receiving the attribute."""
@@ -1111,6 +1189,8 @@ class IRLoadAttr(AbstractIRAssign):
 class IRStoreSubscr(AbstractIRAssign):
     """Represents ``obj[idx] = name`` stores."""
 
+    __slots__ = ('obj', 'subslice')
+
     lval: ast.Subscript
     #: Subscript expression present on the LHS.
     rval: ast.Name
@@ -1122,13 +1202,17 @@ class IRStoreSubscr(AbstractIRAssign):
 
     def __init__(self, stmt: ast.Assign):
         """Captures subscription metadata for store statements."""
-        super().__init__(stmt)
-
         target = stmt.targets[0]
         assert isinstance(target, ast.Subscript)
         assert isinstance(target.value, ast.Name)
         assert isinstance(target.slice, ast.Slice) or isinstance(target.slice, ast.Name)
         assert isinstance(stmt.value, ast.Name)
+        super().__init__(stmt)
+
+    def set_stmt(self, stmt: ast.Assign):
+        """Rebinds the operands and the container/slice metadata."""
+        super().set_stmt(stmt)
+        target = stmt.targets[0]
         self.obj = target.value
         self.subslice = target.slice
 
@@ -1153,6 +1237,8 @@ class IRStoreSubscr(AbstractIRAssign):
 class IRLoadSubscr(AbstractIRAssign):
     """Represents ``tmp = obj[idx]`` loads."""
 
+    __slots__ = ('obj', 'slice')
+
     lval: ast.Name
     #: SSA temp capturing the load result.
     rval: ast.Subscript
@@ -1164,15 +1250,18 @@ class IRLoadSubscr(AbstractIRAssign):
 
     def __init__(self, stmt: ast.Assign):
         """Captures subscription metadata for load statements."""
-        super().__init__(stmt)
-
         assert isinstance(stmt.targets[0], ast.Name)
         value = stmt.value
         assert isinstance(value, ast.Subscript)
         assert isinstance(value.value, ast.Name)
         assert isinstance(value.slice, ast.Slice) or isinstance(value.slice, ast.Name)
-        self.obj = value.value
-        self.slice = value.slice
+        super().__init__(stmt)
+
+    def set_stmt(self, stmt: ast.Assign):
+        """Rebinds the operands and the container/slice metadata."""
+        super().set_stmt(stmt)
+        self.obj = stmt.value.value
+        self.slice = stmt.value.slice
 
     def get_lval(self) -> ast.Name:
         """Returns the SSA temp capturing the subscript result."""
@@ -1195,17 +1284,16 @@ class IRLoadSubscr(AbstractIRAssign):
 class IRPhi(AbstractIRAssign):
     """SSA phi node tying together predecessors' values."""
 
+    __slots__ = ('items',)
+
     lval: ast.Name
     #: Variable defined by the phi node.
     items: List[Optional[ast.Name]]
     #: Incoming candidate values ordered per predecessor.
-    store_collector: VarCollector
-    #: Tracks the phi's definition site.
-    load_collector: VarCollector
-    #: Tracks the phi's inbound operands.
 
     def __init__(self, lval: ast.Name, items: List[Optional[ast.Name]]):
         """Synthesises an ``ast.Assign`` that encodes Phi semantics."""
+        self.items = list(items)
         stmt = self._get_phi_expr(lval, items)
         super().__init__(stmt)
 
@@ -1220,15 +1308,22 @@ class IRPhi(AbstractIRAssign):
     def __str__(self):
         """Shows ``x = Phi(a, b, ...)`` in dumps."""
         item_str = ", ".join([f"{item.id}" if item is not None else "None" for item in self.items])
-        return f"{self.lval} = Phi({item_str})"
+        return f"{self.lval.id} = Phi({item_str})"
+
+    def _collect_vars(self) -> VarEffects:
+        """Collects the phi target and its incoming operands, skipping the ``Phi`` marker."""
+        loads = frozenset(intern(item.id) for item in self.items if item is not None)
+        return collect_vars(self.lval)[0], loads, NO_VARS
 
     def _get_phi_expr(self, lval: ast.Name, items: List[Optional[ast.Name]]) -> ast.Assign:
         """Constructs a fake AST call ``Phi([...])`` for compatibility."""
-        args = ast.List(elts=[ast.Name(id=item.id) if item is not None else ast.Name(id="None") for item in items], ctx=ast.Load())
+        elts = [ast.Name(id=item.id, ctx=ast.Load()) if item is not None else ast.Constant(value=None)
+                for item in items]
+        args = [ast.List(elts=elts, ctx=ast.Load())]
         phi_expr = ast.Call(func=ast.Name(id="Phi", ctx=ast.Load()), args=args, keywords=[])
         stmt = ast.Assign(targets=[lval], value=phi_expr)
-        ast.set_location(stmt, lval.lineno, lval.col_offset)
-        ast.fix_missing_locations(stmt)
+        if hasattr(lval, 'lineno'):
+            ast.copy_location(stmt, lval)
         return stmt
 
     def rename(
@@ -1247,6 +1342,7 @@ class IRPhi(AbstractIRAssign):
                     self.items[idx] = renamer.visit(self.items[idx])
         if isinstance(ast.Store(), ctxs):
             self.lval = renamer.visit(self.lval)
+        self._reset_vars()
 
 
 class IRScope(ABC):
@@ -1297,6 +1393,10 @@ class IRScope(ABC):
         """Returns names captured into closure cells."""
         return self.cell_vars
 
+    def release_ast(self) -> None:
+        """Drops the scope body, which is lowered into the scope's own IR."""
+        self.stmt = _without_body(self.stmt)
+
 
 class IRModule(IRScope, IRStatement):
     """Top-level scope representing a parsed Python module."""
@@ -0,0 +1,55 @@
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+__all__ = ["LRUCache"]
+
+V = TypeVar('V')
+
+
+class LRUCache(Generic[V]):
+    """A bounded mapping that evicts its least recently used entry when full.
+
+    Lookups through ``get`` count as hits or misses; ``evictions`` counts the
+    entries dropped to stay within ``maxsize``.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.entries: 'OrderedDict[Hashable, V]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Membership test; neither counted nor refreshing the entry."""
+        return key in self.entries
+
+    def get(self, key: Hashable, default: Optional[V] = None) -> Optional[V]:
+        try:
+            value = self.entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: V):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drops all entries; the statistics are kept."""
+        self.entries.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / max(1, self.hits + self.misses)
@@ -0,0 +1,74 @@
+import io
+import logging
+import multiprocessing
+import pickle
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, TypeVar
+
+__all__ = ["fork_map", "can_fork"]
+
+logger = logging.getLogger(__name__)
+
+Item = TypeVar('Item')
+Result = TypeVar('Result')
+
+# Task of the running fork_map; set in the parent right before the pool forks
+_task: Optional[tuple] = None
+
+
+def can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+class _SharedPickler(pickle.Pickler):
+    """Pickles objects shared with the parent by their id instead of by value."""
+
+    def __init__(self, file, shared: Dict[int, Any]):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.shared = shared
+
+    def persistent_id(self, obj):
+        key = id(obj)
+        if key in self.shared and self.shared[key] is obj:
+            return key
+        return None
+
+
+class _SharedUnpickler(pickle.Unpickler):
+    def __init__(self, file, shared: Dict[int, Any]):
+        super().__init__(file)
+        self.shared = shared
+
+    def persistent_load(self, pid):
+        return self.shared[pid]
+
+
+def _run(idx: int) -> bytes:
+    func, items, shared = _task
+    buf = io.BytesIO()
+    _SharedPickler(buf, shared).dump(func(items[idx]))
+    return buf.getvalue()
+
+
+def fork_map(func: Callable[[Item], Result], items: Sequence[Item], workers: int,
+             shared: Iterable[Any] = ()) -> List[Result]:
+    """Maps ``func`` over ``items`` on a pool of forked processes, keeping the order of ``items``.
+
+    Workers are forked, so they see the parent's state (e.g. the ``World``) as
+    it is when this is called, and their changes to it are lost: ``func``
+    must return what it computes. Objects in ``shared`` that appear in a
+    result are returned as the parent's own objects rather than copies.
+    Runs serially when ``workers`` is at most 1, there is at most one item,
+    or the platform cannot fork.
+    """
+    global _task
+    if workers <= 1 or len(items) <= 1 or not can_fork():
+        return [func(item) for item in items]
+    shared = {id(obj): obj for obj in shared}
+    _task = (func, items, shared)
+    try:
+        with multiprocessing.get_context("fork").Pool(min(workers, len(items))) as pool:
+            dumps = pool.map(_run, range(len(items)))
+    finally:
+        _task = None
+    logger.debug("fork_map ran %d tasks on %d workers", len(items), workers)
+    return [_SharedUnpickler(io.BytesIO(data), shared).load() for data in dumps]
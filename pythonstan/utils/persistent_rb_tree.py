@@ -183,7 +183,7 @@ class RBTree(Generic[T]):
             return (x, (B, E, y, E))
         (c, a, x, b) = t
         x_, a_ = RBTree._min_del(a)
-        return (x_, RBTree.rotate(c, a_, x, b))
+        return (x_, RBTree.rotate((c, a_, x, b)))
     
     def _delete(self, t: Node_t, x: T) -> Node_t:
         if is_empty(t):
@@ -284,9 +284,11 @@ class PersistentMap(Generic[K, V]):
     def __setitem__(self, key: K, value: V):
         self.set(key, value)
     
-    def get(self, key: K) -> Optional[V]:
-        _, value = self.tree.find(self.root, (key, None))
-        return value
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        found = self.tree.find(self.root, (key, None))
+        if found is None:
+            return default
+        return found[1]
 
     def __getitem__(self, item: K) -> Optional[K]:
         return self.get(item)
@@ -307,10 +309,44 @@ class PersistentMap(Generic[K, V]):
         return [v for k, v in self.tree.to_list(self.root)]
 
     def __contains__(self, item: K) -> bool:
-        if self.get(item) is None:
-            return False
-        else:
-            return True
+        return self.tree.find(self.root, (item, None)) is not None
+
+    def __len__(self) -> int:
+        return len(self.tree.to_list(self.root))
+
+    def copy(self) -> 'PersistentMap[K, V]':
+        """Returns an independent map sharing this map's tree; O(1)."""
+        return PersistentMap(self.root)
+
+    def diff(self, other: 'PersistentMap[K, V]') -> Set[K]:
+        """Returns the keys bound in only one of the maps or to different (non-identical) values.
+
+        Subtrees shared by the two maps are skipped, so for maps derived from
+        one another this costs time proportional to the changes, not the size.
+        """
+        changed = set()
+
+        def walk(t1, t2):
+            if t1 is t2:
+                return
+            if not is_empty(t1) and not is_empty(t2):
+                (_, l1, (k1, v1), r1) = t1
+                (_, l2, (k2, v2), r2) = t2
+                if k1 == k2:
+                    if v1 is not v2:
+                        changed.add(k1)
+                    walk(l1, l2)
+                    walk(r1, r2)
+                    return
+            # The trees diverge in shape here: compare their bindings directly
+            items1 = dict(self.tree.to_list(t1))
+            items2 = dict(self.tree.to_list(t2))
+            for key in items1.keys() | items2.keys():
+                if key not in items1 or key not in items2 or items1[key] is not items2[key]:
+                    changed.add(key)
+
+        walk(self.root, other.root)
+        return changed
     
     def backup(self) -> Node_t:
         return self.root
@@ -1,5 +1,9 @@
-from ast import NodeVisitor, expr_context, Store, Load, Del, Name
-from typing import Dict, Tuple
+from ast import (
+    AST, NodeVisitor, expr_context, Store, Load, Del, Name, alias, arg,
+    ClassDef, FunctionDef, AsyncFunctionDef, iter_child_nodes
+)
+from sys import intern
+from typing import Dict, FrozenSet, Optional, Tuple
 
 
 class VarCollector(NodeVisitor):
@@ -70,3 +74,47 @@ class VarCollector(NodeVisitor):
         if isinstance(Store(), self.ctx) and node.arg not in self.var_map:
             self.var_map[node.arg] = self.next_idx
             self.next_idx += 1
+
+
+_DEFS = (ClassDef, FunctionDef, AsyncFunctionDef)
+
+VarEffects = Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str]]
+
+NO_VARS: FrozenSet[str] = frozenset()
+
+
+def collect_vars(node: Optional[AST]) -> VarEffects:
+    """Collects stored, loaded and deleted names of ``node`` in one pass.
+
+    Follows the same rules as ``VarCollector`` (aliases, function/class names
+    and arguments count as stores; nested function and class bodies are not
+    entered), but walks the tree iteratively and returns interned names.
+
+    Args:
+        node: Root AST node, or None
+
+    Returns:
+        Tuple of (stores, loads, dels) frozensets
+    """
+    if node is None:
+        return NO_VARS, NO_VARS, NO_VARS
+    stores, loads, dels = set(), set(), set()
+    by_ctx = {Store: stores, Load: loads, Del: dels}
+    stack = [node]
+    while stack:
+        cur = stack.pop()
+        cls = type(cur)
+        if cls is Name:
+            names = by_ctx.get(type(getattr(cur, "ctx", None)))
+            if names is not None:
+                names.add(intern(cur.id))
+        elif cls is alias:
+            if cur.name != '*':
+                stores.add(intern(cur.name))
+        elif cls in _DEFS:
+            stores.add(intern(cur.name))
+        elif cls is arg:
+            stores.add(intern(cur.arg))
+        else:
+            stack.extend(iter_child_nodes(cur))
+    return frozenset(stores), frozenset(loads), frozenset(dels)
@@ -1,9 +1,11 @@
 from typing import Dict, List, Any, Tuple, Literal, Generator
 from queue import Queue
+import copy
 import time
 
 from pythonstan.analysis import AnalysisDriver, AnalysisConfig
-from pythonstan.ir import IRModule
+from pythonstan.ir import IRModule, IRScope
+from pythonstan.utils.parallel import fork_map
 
 # Analysis drivers
 from pythonstan.analysis.transform import TransformDriver
@@ -35,6 +37,12 @@ DEFAULT_ANALYSIS = [
         prev_analysis=["block cfg"],
         options={"type": "transform"}
     ),
+    AnalysisConfig(
+        name="ssa",
+        id="SSA",
+        prev_analysis=["cfg"],
+        options={"type": "transform"}
+    ),
     AnalysisConfig(
         name="closure",
         id="Closure",
@@ -42,6 +50,7 @@ DEFAULT_ANALYSIS = [
         options={"type": "closure analysis"}
     )
 ]
+DEFAULT_ANALYSIS_NAMES = {config.name for config in DEFAULT_ANALYSIS}
 
 
 class AnalysisManager:
@@ -66,6 +75,18 @@ class AnalysisManager:
         for config in configs:
             self.add_analyzer(config)
     
+    def set_option(self, analyzer_name: str, key: str, value: Any):
+        """Overrides one option of a registered analyzer.
+
+        The config is copied first, so the shared ``DEFAULT_ANALYSIS`` entries
+        are left untouched.
+        """
+        analyzer = self.analyzers[analyzer_name]
+        config = copy.copy(analyzer.config)
+        config.options = {**config.options, key: value}
+        self.analysis_configs[self.analysis_configs.index(analyzer.config)] = config
+        analyzer.config = config
+
     def set_time_count(self, time_count: bool):
         self.time_count = time_count
 
@@ -107,11 +128,40 @@ class AnalysisManager:
             if not isinstance(analyzer, TransformDriver):
                 print(f"Analysis {analyzer_name} for module {module.get_qualname()} took {end_time - start_time:.2f} seconds")
 
-    def do_analysis(self, analyzer: AnalysisDriver, module: IRModule):
+    def prev_results_of(self, analyzer: AnalysisDriver) -> Dict[str, Any]:
         prev_results = {}
         for anal_name in self.prev_analyzers[analyzer.config.name]:
             prev_results[anal_name] = self.results[anal_name]
-        analyzer.analyze(module, prev_results)
+        return prev_results
+
+    def do_analysis(self, analyzer: AnalysisDriver, module: IRModule):
+        analyzer.analyze(module, self.prev_results_of(analyzer))
+        self.results[analyzer.config.name] = analyzer.results
+
+    def do_scope_analysis(self, analyzer: DataflowAnalysisDriver, scopes: List[IRScope], workers: int = 0):
+        """Runs an intraprocedural analysis on each of ``scopes`` and merges the results.
+
+        With more than one worker, the scopes are analysed on a pool of forked
+        processes, one scope per task. Results are merged in the order of
+        ``scopes`` whatever order the tasks finish in.
+        """
+        from pythonstan.world import World
+
+        prev_results = self.prev_results_of(analyzer)
+
+        def analyze(scope: IRScope):
+            analyzer.analyze(scope, prev_results)
+            return analyzer.results
+
+        # Blocks and statements in the results are mapped back to the parent's objects
+        scope_manager = World().scope_manager
+        ir_name = analyzer.config.options.get("ir", "cfg")
+        shared = list(scope_manager.get_scopes())
+        for scope in scopes:
+            cfg = scope_manager.get_ir(scope, ir_name)
+            shared.extend(cfg.blks)
+            shared.extend(cfg.stmts)
+        analyzer.results = analyzer.merge_results(scopes, fork_map(analyze, scopes, workers, shared))
         self.results[analyzer.config.name] = analyzer.results
 
     def generator(self) -> Generator[AnalysisDriver, None, None]:
@@ -125,7 +175,7 @@ class AnalysisManager:
             visited.add(cur_name)
             cur_analyzer = self.analyzers[cur_name]
             
-            if cur_analyzer.config not in DEFAULT_ANALYSIS:
+            if cur_name not in DEFAULT_ANALYSIS_NAMES:
                 yield cur_analyzer
                 
             for succ in self.next_analyzers[cur_name]:
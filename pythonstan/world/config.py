@@ -15,13 +15,25 @@ class Config:
     analysis: Dict[str, AnalysisConfig]
     succ_analysis: Dict[str, Set[str]]
     lazy_ir_construction: bool
+    lazy_function_ir: bool
     import_level: int
     time_count: bool
+    compact_ir: bool
+    release_ast: bool
+    basic_block_cfg: bool
+    ssa: bool
+    parallel_workers: int
 
     def __init__(self, filename, project_path,
                  lazy_ir_construction: bool = False,
                  import_level: int = -1,
-                 time_count: bool = False):
+                 time_count: bool = False,
+                 compact_ir: bool = False,
+                 release_ast: bool = False,
+                 lazy_function_ir: bool = False,
+                 basic_block_cfg: bool = False,
+                 ssa: bool = False,
+                 parallel_workers: int = 0):
         self.filename = filename
         self.project_path = project_path
         self.library_paths = []
@@ -30,6 +42,12 @@ class Config:
         self.lazy_ir_construction = lazy_ir_construction
         self.import_level = import_level
         self.time_count = time_count
+        self.compact_ir = compact_ir
+        self.release_ast = release_ast
+        self.lazy_function_ir = lazy_function_ir
+        self.basic_block_cfg = basic_block_cfg
+        self.ssa = ssa
+        self.parallel_workers = parallel_workers
         
     @classmethod
     def from_dict(cls, info: Dict):
@@ -45,6 +63,12 @@ class Config:
             conf.add_library_path(library_path)
         conf.import_level = info.get('import_level', -1)
         conf.time_count = info.get('time_count', False)
+        conf.compact_ir = info.get('compact_ir', False)
+        conf.release_ast = info.get('release_ast', False)
+        conf.lazy_function_ir = info.get('lazy_function_ir', False)
+        conf.basic_block_cfg = info.get('basic_block_cfg', False)
+        conf.ssa = info.get('ssa', False)
+        conf.parallel_workers = info.get('parallel_workers', 0)
         return conf
 
     @classmethod
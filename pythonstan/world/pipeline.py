@@ -1,4 +1,4 @@
-from pythonstan.ir import IRModule
+from pythonstan.ir import IRModule, IRScope, IRClass, IRImport, compact_ir
 from pythonstan.analysis import AnalysisConfig, AnalysisDriver
 from .namespace import Namespace
 from .world import World
@@ -6,8 +6,9 @@ from .config import Config
 from .scope_manager import ModuleGraph
 from .analysis_manager import AnalysisManager
 
-from typing import List, Tuple, Generator
+from typing import List, Tuple, Generator, Set
 from queue import Queue
+import ast
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,6 +16,7 @@ logger = logging.getLogger(__name__)
 class Pipeline:
     config: Config
     analysis_manager: AnalysisManager
+    visited_modules: Set[str]
 
     def __init__(self, config=None, filename=None):
         if config is not None:
@@ -28,12 +30,110 @@ class Pipeline:
         self.analysis_manager = AnalysisManager()
         self.analysis_manager.build(self.config.get_analysis_list())
         self.analysis_manager.set_time_count(self.config.time_count)
+        if self.config.basic_block_cfg:
+            self.analysis_manager.set_option("cfg", "basic_blocks", True)
+        if self.config.parallel_workers > 1:
+            self.analysis_manager.set_option("closure", "workers", self.config.parallel_workers)
         print("Time count: ", self.config.time_count)
-        self.build_scope_graph(self.config.filename)
+        if self.config.lazy_function_ir:
+            World().scope_manager.set_lowerer(self.lower_scope)
+        self.visited_modules = {*()}
+        with compact_ir(self.config.compact_ir):
+            self.build_scope_graph(self.config.filename)
 
     def get_world(self):
         return World()
 
+    def traverse_imports(self, q: List[Tuple[Namespace, IRModule, int]], g: ModuleGraph) -> IRModule:
+        """Lowers the queued modules and everything they import, up to ``import_level``.
+
+        Returns the last module lowered.
+        """
+        mod = None
+        while len(q) > 0:
+            ns, mod, level = q.pop()
+
+            if mod.get_qualname() in self.visited_modules:
+                continue
+            self.visited_modules.add(mod.get_qualname())
+
+            # Preprocess module
+            # TODO to be completed
+            self.analysis_manager.analysis("three address", mod)
+            self.analysis_manager.analysis("ir", mod)
+            self.analysis_manager.analysis("block cfg", mod)
+            self.analysis_manager.analysis("cfg", mod)
+            imports = World().scope_manager.get_ir(mod, "imports")
+            self.link_imports(ns, mod, imports, level, q, g)
+        return mod
+
+    def link_imports(self, ns: Namespace, mod: IRModule, imports: List[IRImport], level: int,
+                     q: List[Tuple[Namespace, IRModule, int]], g: ModuleGraph):
+        for stmt in imports:
+            get_import = World().namespace_manager.get_import(ns, stmt)
+            if get_import is not None:
+                mod_ns, mod_path = get_import
+
+                new_mod = World().scope_manager.add_module(mod_ns, mod_path)
+                if new_mod is None:
+                    continue
+
+                g.add_edge(mod, stmt, new_mod)
+                if self.config.import_level < 0 or level < self.config.import_level:
+                    q.append((mod_ns, new_mod, level + 1))
+                World().import_manager.set_import(mod, stmt, new_mod)
+
+    def lower_scope(self, scope: IRScope):
+        """Lowers one deferred function or class body on first request.
+
+        Runs three-address, IR, block CFG and CFG construction, the closure
+        analysis and, if enabled, SSA for ``scope`` alone; nested functions and classes are
+        deferred again. A class body is already in three-address form, since it is
+        lowered with the body that defines the class. Imports found in the body are linked into the module
+        graph, and newly reached modules are lowered at module level.
+        """
+        with compact_ir(self.config.compact_ir):
+            self._lower_scope(scope)
+
+    def _lower_scope(self, scope: IRScope):
+        from pythonstan.analysis.transform.three_address import ThreeAddressTransformer
+        from pythonstan.analysis.transform.ir import IRTransformer
+        from pythonstan.analysis.transform.block_cfg import BlockCFGBuilder
+        from pythonstan.analysis.transform.cfg import CFGTransformer
+        from pythonstan.analysis.transform.ssa import SSATransformer
+
+        scope_manager = World().scope_manager
+        scope_ast = scope.get_ast()
+        if not isinstance(scope, IRClass):
+            # Class bodies are put in three-address form with their enclosing body
+            scope_ast.body = ThreeAddressTransformer(defer_bodies=True).lower_body(scope_ast.body)
+        ast.fix_missing_locations(scope_ast)
+        ir_transformer = IRTransformer(scope)
+        ir_transformer.process_stmts(scope_ast.body)
+        ir = ir_transformer.get_stmts()
+        scope_manager.set_ir(scope, "ir", ir)
+        builder = BlockCFGBuilder(scope)
+        builder.build_graph(ir)
+        scope_manager.set_ir(scope, "block cfg", builder.cfg)
+        CFGTransformer(self.config.basic_block_cfg).trans(scope, builder.cfg)
+        self.analysis_manager.analyzers["closure"].analyze_scope(scope)
+        if self.config.ssa:
+            scope_manager.set_ir(scope, "ssa", SSATransformer(scope, scope_manager.get_ir(scope, "cfg")).build())
+        if self.config.release_ast:
+            scope_manager.release_scope_ast(scope)
+
+        imports = [stmt for stmt in ir if isinstance(stmt, IRImport)]
+        if len(imports) == 0:
+            return
+        mod = scope
+        while not isinstance(mod, IRModule):
+            mod = scope_manager.father[mod]
+        q: List[Tuple[Namespace, IRModule, int]] = []
+        g = scope_manager.get_module_graph()
+        self.link_imports(Namespace.from_str(mod.get_qualname()), mod, imports, 0, q, g)
+        if not self.config.lazy_ir_construction:
+            self.traverse_imports(q, g)
+
     def build_scope_graph(self, entry_path: str):
         entry_ns = World().namespace_manager.set_entry_module(entry_path, self.config.project_path)
         entry_mod = World().scope_manager.add_module(entry_ns, entry_path)
@@ -66,52 +166,50 @@ class Pipeline:
                         
         else:
             # Original behavior: process all imports transitively
-            while len(q) > 0:
-                ns, mod, level = q.pop()
-                
-                if mod.get_qualname() in visited_ns:
-                    continue                
-                visited_ns.add(mod.get_qualname())
-                
-                # Preprocess module
-                # TODO to be completed
-                self.analysis_manager.analysis("three address", mod)
-                self.analysis_manager.analysis("ir", mod)
-                self.analysis_manager.analysis("block cfg", mod)
-                self.analysis_manager.analysis("cfg", mod)
-                # self.analysis_manager.analysis("ssa", mod)
-                imports = World().scope_manager.get_ir(mod, "imports")
-
-                for stmt in imports:
-                    get_import = World().namespace_manager.get_import(ns, stmt)
-                    if get_import is not None:
-                        mod_ns, mod_path = get_import
-
-                        new_mod = World().scope_manager.add_module(mod_ns, mod_path)
-                        if new_mod is None:
-                            continue
-                        
-                        g.add_edge(mod, stmt, new_mod)
-                        if self.config.import_level < 0 or level < self.config.import_level:
-                            q.append((mod_ns, new_mod, level + 1))                 
-                        World().import_manager.set_import(mod, stmt, new_mod)
+            mod = self.traverse_imports(q, g)
 
         self.analysis_manager.analysis("closure", mod)
         World().scope_manager.set_module_graph(g)
+        if self.config.ssa:
+            # SSA keeps variables captured by nested scopes, so it runs after closure analysis
+            for module in g.get_modules():
+                if World().scope_manager.get_ir(module, "cfg") is not None:
+                    self.analysis_manager.analysis("ssa", module)
+        if self.config.release_ast:
+            World().scope_manager.release_ast()
 
     def analyse_intra_procedure(self, analyzer):
-        module_graph = World().scope_manager.get_module_graph()
+        """Runs an intraprocedural analysis on every scope that has the IR it needs.
+
+        Modules are visited in BFS order over the module graph, each followed
+        by its nested scopes; the scopes run on ``parallel_workers`` processes.
+        Scopes whose lowering is still deferred are skipped rather than lowered.
+        """
+        scope_manager = World().scope_manager
+        module_graph = scope_manager.get_module_graph()
+        ir_name = analyzer.config.options.get("ir", "cfg")
         q = Queue()
         for entry in module_graph.get_entries():
             q.put(entry)
         visited = {*()}
+        scopes = []
         while not q.empty():
             cur_module = q.get()
-            self.analysis_manager.do_analysis(analyzer, cur_module)
+            if cur_module in visited:
+                continue
             visited.add(cur_module)
+            todo = [cur_module]
+            while len(todo) > 0:
+                scope = todo.pop()
+                if not scope_manager.is_lowered(scope):
+                    continue
+                if scope_manager.get_ir(scope, ir_name) is not None:
+                    scopes.append(scope)
+                todo.extend(reversed(scope_manager.get_subscopes(scope)))
             for succ in module_graph.succs_of(cur_module):
                 if not succ in visited:
                     q.put(succ)
+        self.analysis_manager.do_scope_analysis(analyzer, scopes, self.config.parallel_workers)
 
     def analyse_inter_procedure(self, analyzer: AnalysisDriver):
         entry_mod = World().get_entry_module()
@@ -147,5 +245,6 @@ class Pipeline:
                 self.analyse_inter_procedure(analyzer)
 
     def run(self):
-        analyzer_generator = self.analysis_manager.generator()
-        self.do_analysis(analyzer_generator)
+        with compact_ir(self.config.compact_ir):
+            analyzer_generator = self.analysis_manager.generator()
+            self.do_analysis(analyzer_generator)
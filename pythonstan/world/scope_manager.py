@@ -1,6 +1,7 @@
 import ast
 import os
-from typing import Set, List, Dict, Tuple, Any, Optional, FrozenSet
+from collections.abc import MutableSet
+from typing import Set, List, Dict, Tuple, Any, Optional, FrozenSet, Callable
 
 from .namespace import Namespace
 from pythonstan.ir import IRScope, IRFunc, IRClass, IRModule, IRImport
@@ -53,6 +54,51 @@ class ModuleGraph:
         return self.succ_module_index.get((src, stmt), None)
 
 
+class PendingCellVars(MutableSet):
+    """Cell vars of a scope whose lowering is deferred.
+
+    The cell vars come from the liveness of the lowered body, so the first
+    access lowers the scope; lowering replaces this placeholder with the
+    computed set, to which all operations are then delegated.
+    """
+
+    def __init__(self, scope_manager: 'ScopeManager', scope: IRScope):
+        self.scope_manager = scope_manager
+        self.scope = scope
+
+    def resolve(self) -> Set[str]:
+        self.scope_manager.lower(self.scope)
+        if self.scope.cell_vars is self:
+            # Nothing was computed for the body (or it is being lowered right now)
+            self.scope.cell_vars = {*()}
+        return self.scope.cell_vars
+
+    @classmethod
+    def _from_iterable(cls, it):
+        return set(it)
+
+    def __getattr__(self, name: str):
+        # Other set methods (union, copy, ...) act on the computed set
+        if name.startswith("__") or name in ("scope", "scope_manager"):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __contains__(self, var) -> bool:
+        return var in self.resolve()
+
+    def __iter__(self):
+        return iter(self.resolve())
+
+    def __len__(self) -> int:
+        return len(self.resolve())
+
+    def add(self, var: str):
+        self.resolve().add(var)
+
+    def discard(self, var: str):
+        self.resolve().discard(var)
+
+
 class ScopeManager:
     module_graph: ModuleGraph
     scopes: Set[IRScope]
@@ -62,6 +108,8 @@ class ScopeManager:
     names2scope: Dict[str, IRScope]
     scope_ir: Dict[Tuple[str, str], Any]
     file2mod: Dict[str, IRModule]
+    lowerer: Optional[Callable[[IRScope], None]]
+    pending: Set[IRScope]
 
     def build(self):
         self.scopes = {*()}
@@ -71,6 +119,8 @@ class ScopeManager:
         self.names2scope = {}
         self.scope_ir = {}
         self.file2mod = {}
+        self.lowerer = None
+        self.pending = {*()}
         
     def get_module_graph(self) -> ModuleGraph:
         return self.module_graph
@@ -82,7 +132,60 @@ class ScopeManager:
         self.scope_ir[(scope.qualname, fmt)] = ir
 
     def get_ir(self, scope: IRScope, fmt: str) -> Any:
-        return self.scope_ir.get((scope.qualname, fmt), None)
+        ir = self.scope_ir.get((scope.qualname, fmt), None)
+        if ir is None and scope in self.pending:
+            self.lower(scope)
+            ir = self.scope_ir.get((scope.qualname, fmt), None)
+        return ir
+
+    def set_lowerer(self, lowerer: Optional[Callable[[IRScope], None]]):
+        """Enables function-level lazy lowering.
+
+        While a lowerer is set, function and class bodies are not lowered
+        with their module. Each such scope is registered as pending and
+        ``lowerer`` is called the first time its IR or subscopes are requested.
+        """
+        self.lowerer = lowerer
+
+    def defers_lowering(self) -> bool:
+        return self.lowerer is not None
+
+    def defer(self, scope: IRScope):
+        self.pending.add(scope)
+        scope.cell_vars = PendingCellVars(self, scope)
+
+    def is_lowered(self, scope: IRScope) -> bool:
+        return scope not in self.pending
+
+    def lower(self, scope: IRScope):
+        if scope in self.pending:
+            self.pending.remove(scope)
+            self.lowerer(scope)
+
+    def release_ast(self):
+        """Drops ASTs that are no longer needed once IR and CFG are built.
+
+        Removes the stored three-address ASTs and trims the bodies of scope
+        and compound-statement ASTs; the IR keeps its operands and source
+        spans, so IR dumps and positions stay available. Scopes still
+        pending lazy lowering keep their ASTs until they are lowered.
+        """
+        for key in [key for key in self.scope_ir if key[1] == "three address form"]:
+            del self.scope_ir[key]
+        for scope in self.scopes:
+            if scope not in self.pending:
+                self.release_scope_ast(scope)
+
+    def release_scope_ast(self, scope: IRScope):
+        scope.release_ast()
+        for stmt in self.get_ir(scope, "ir") or ():
+            if stmt not in self.pending:
+                stmt.release_ast()
+        ssa = self.get_ir(scope, "ssa")
+        if ssa is not None:
+            for stmt in ssa.get_stmts():
+                if stmt not in self.pending:
+                    stmt.release_ast()
 
     def check_analysis_done(self, scope: IRScope, analysis_name: str) -> bool:
         return (scope, analysis_name) in self.scope_ir
@@ -127,6 +230,8 @@ class ScopeManager:
         return self.subscope_idx.get((scope, name), None)
 
     def get_subscopes(self, scope: IRScope) -> List[IRScope]:
+        if scope in self.pending:
+            self.lower(scope)
         return self.subscopes.get(scope, [])
 
     def get_scopes(self) -> Set[IRScope]:
@@ -129,7 +129,13 @@ def run_benchmark(benchmark_file, analyses=None, output_dir=None):
     # Create and run the pipeline
     pipeline = Pipeline(config=config)
     pipeline.run()
-    
+
+    # Print solver work of the dataflow analyses
+    for analysis in selected_analyses:
+        if analysis["options"]["type"] == "dataflow analysis":
+            results = pipeline.analysis_manager.get_results(analysis["name"])
+            print(f"{analysis['name']}: {results['iterations']} block visits")
+
     # Print results
     print(f"\n----- Three Address Form -----")
     print('\n'.join([ast.unparse(x) for x in pipeline.get_world().scope_manager.get_ir(
@@ -15,7 +15,7 @@ from pythonstan.analysis.ai import (
     create_int_value, create_float_value, create_str_value, create_bool_value,
     create_none_value, create_list_value, create_dict_value, create_unknown_value,
     create_function_value,
-    AbstractState, Context, ContextType, FlowSensitivity,
+    AbstractState, Context, ContextType, FlowSensitivity, WorklistOrder, ControlFlowState,
     AbstractInterpreter, AbstractInterpretationSolver, create_solver
 )
 
@@ -178,7 +178,34 @@ class TestValueAndObject:
         # Object types in the merged value
         types = {obj.obj_type for obj in complex_merged.objects}
         assert ObjectType.CONSTANT in types
-    
+
+    def test_merge_buckets_and_interning(self):
+        int_val, str_val = create_int_value(1), create_str_value("a")
+        mixed = Value(int_val.objects | str_val.objects)
+        assert set(mixed.buckets) == {(ObjectType.CONSTANT, int), (ObjectType.CONSTANT, str)}
+
+        # Only the int bucket is merged; the str object is carried over as is
+        merged = mixed.merge(create_int_value(2))
+        assert merged.uid is not None
+        assert next(iter(str_val.objects)) in merged.objects
+        assert [str(obj) for obj in merged.buckets[(ObjectType.CONSTANT, int)]] == ["Int([1, 2])"]
+
+        # Merges that add nothing return the value itself
+        assert merged.merge(merged) is merged
+        assert merged.merge(Value(str_val.objects)) is merged
+
+        # Equal sets of objects have one canonical value
+        assert Value(merged.objects).intern() is merged
+        assert Value(merged.objects) == merged and hash(Value(merged.objects)) == hash(merged)
+        with pytest.raises(TypeError):
+            merged.add(next(iter(create_int_value(3).objects)))
+
+    def test_merge_keeps_instances_of_different_classes(self):
+        class_a = ClassObject(create_mock_class("A"))
+        class_b = ClassObject(create_mock_class("B"))
+        merged = Value({InstanceObject(class_a)}).merge(Value({InstanceObject(class_b)}))
+        assert {obj.class_obj.qualname for obj in merged.objects} == {class_a.qualname, class_b.qualname}
+
     def test_container_values(self):
         list_val = create_list_value()
         obj = list(list_val.objects)[0]
@@ -256,6 +283,70 @@ class TestAbstractState:
         assert obj1.numeric_property.lower_bound == 1
         assert obj2.numeric_property.lower_bound == 2
 
+    def test_fingerprint_follows_variables(self):
+        state = AbstractState(ContextType.CALL_SITE, FlowSensitivity.SENSITIVE)
+        empty = state.fingerprint()
+        one, two = create_int_value(1), create_int_value(2)
+        state.set_variable("x", one)
+        with_one = state.fingerprint()
+        state.set_variable("x", two)
+        assert state.fingerprint() not in (empty, with_one)
+        # Restoring the bindings restores the fingerprint
+        state.set_variable("x", one)
+        assert state.fingerprint() == with_one
+        state.set_current_context(state.create_context(1))
+        assert state.fingerprint() != with_one
+        state.set_variable("x", two)
+        state.set_variable("x", one)
+        with_ctx = state.fingerprint()
+        state.set_variable("x", two)
+        assert state.fingerprint() != with_ctx
+        # Keys are 128 bits wide
+        assert state.fingerprint() >> 64
+
+# Tests for worklist ordering
+class TestWorklist:
+    @staticmethod
+    def loop_cfg(order):
+        # 0 -> 1 (loop head) -> 2 -> 3 -> 1, and 1 -> 4 on exit
+        control_flow = ControlFlowState(worklist_order=order)
+        for src, dst in [(0, 1), (1, 2), (2, 3), (3, 1), (1, 4)]:
+            control_flow.add_edge("f", src, dst)
+        return control_flow
+
+    @staticmethod
+    def drain(control_flow):
+        order = []
+        while (item := control_flow.get_next_from_worklist()) is not None:
+            order.append(item[1])
+        return order
+
+    def test_fifo_drops_duplicates(self):
+        control_flow = self.loop_cfg(WorklistOrder.FIFO)
+        for idx in [3, 1, 3, 2, 1]:
+            control_flow.add_to_worklist("f", idx)
+        assert self.drain(control_flow) == [3, 1, 2]
+        # Keys can be queued again once handed out
+        control_flow.add_to_worklist("f", 3)
+        assert self.drain(control_flow) == [3]
+
+    def test_rpo_puts_loop_head_after_body(self):
+        control_flow = self.loop_cfg(WorklistOrder.RPO)
+        for idx in [4, 1, 3, 2, 0]:
+            control_flow.add_to_worklist("f", idx)
+        assert self.drain(control_flow) == [0, 2, 3, 1, 4]
+
+    def test_rpo_respects_visit_limit(self):
+        control_flow = self.loop_cfg(WorklistOrder.RPO)
+        control_flow.visit_count[("f", 2)] = control_flow.max_visits_per_stmt
+        control_flow.add_to_worklist("f", 2)
+        assert control_flow.get_next_from_worklist() is None
+
+    def test_solver_passes_order(self):
+        solver = create_solver(worklist_order=WorklistOrder.RPO)
+        assert solver.state.control_flow.worklist_order == WorklistOrder.RPO
+        assert create_solver().state.control_flow.worklist_order == WorklistOrder.FIFO
+
 # Tests for AbstractInterpreter class
 class TestAbstractInterpreter:
     def setup_method(self):
@@ -349,6 +440,26 @@ class TestAbstractInterpretationSolver:
         assert (1, 2) in edges  # cond -> stmt2
         assert (2, 3) in edges  # stmt2 -> label
 
+    def test_transfer_cache_is_lru(self):
+        class Pointer:
+            def pointer_digest_version(self):
+                return "v1"
+
+        solver = create_solver(pointer=Pointer(), transfer_cache_size=2)
+        results = [create_int_value(i) for i in range(3)]
+        solver._cache_result(0, solver.state, results[0])
+        solver._cache_result(1, solver.state, results[1])
+        # Using statement 0 keeps it when statement 2 is cached
+        assert solver._should_use_cache(0, solver.state) is results[0]
+        solver._cache_result(2, solver.state, results[2])
+        assert solver._should_use_cache(1, solver.state) is None
+        assert solver._should_use_cache(0, solver.state) is results[0]
+        # Results are cached per state
+        solver.state.set_variable("x", results[0])
+        assert solver._should_use_cache(0, solver.state) is None
+        cache = solver._transfer_cache
+        assert (cache.hits, cache.misses, cache.evictions) == (2, 2, 1)
+
 # Integration tests using benchmark files
 class TestBenchmarkIntegration:
     @pytest.mark.parametrize("benchmark_file", [
@@ -546,4 +546,84 @@ class TestContextSensitiveInterproceduralAnalysis:
                 else:
                     assert obj.numeric_property.lower_bound <= 42 <= obj.numeric_property.upper_bound
                 found = True
-        assert found 
\ No newline at end of file
+        assert found 
+
+    def test_call_summaries_are_reused(self):
+        """The callee is analysed once per abstract input; repeated calls reuse its summary"""
+        add_one_func = create_mock_function("add_one", ["x"])
+        add_one_qualname = add_one_func.get_qualname()
+        add_one_statements = [create_mock_assign("x_plus_one", "x_plus_one_val"), create_mock_return("x_plus_one")]
+        self.solver.func_statements[add_one_qualname] = add_one_statements
+        main_qualname = "test_module.main"
+        main_call = create_mock_call("b", "add_one", ["a"])
+        self.solver.func_statements[main_qualname] = [main_call]
+        
+        self.solver.state.set_variable("add_one", create_function_value(add_one_func))
+        self.solver.state.set_variable("a", create_int_value(5))
+        self.solver.state.set_variable("x_plus_one_val", create_int_value(6))
+        self.solver._build_cfg(add_one_qualname, add_one_statements)
+        self.solver.state.call_graph.add_call_edge(
+            main_qualname, add_one_qualname, main_call, 0, self.solver.state.current_context)
+        
+        analyzed = []
+        analyze_scope = self.solver._analyze_scope
+        self.solver._analyze_scope = lambda qualname, stmts: (analyzed.append(qualname), analyze_scope(qualname, stmts))
+        self.solver.analyzed_functions.add(add_one_qualname)
+        self.solver._perform_interprocedural_analysis()
+        
+        assert analyzed == [add_one_qualname]
+        assert len(self.solver.function_summaries) == 1
+        summary = next(iter(self.solver.function_summaries.values()))
+        assert self.solver.state.get_variable("b") is summary.return_value
+
+    def test_summary_replays_attribute_writes(self):
+        obj = ConstantObject(int, 1)
+        arg = Value({obj})
+        key, attributes = self.solver.summary_key("test_module.f", [arg], self.solver.state.current_context)
+        obj.set_attr("field", create_int_value(2))
+        summary = self.solver.record_summary(key, attributes, [arg], create_none_value(), self.solver.global_bindings())
+        assert set(summary.side_effects) == {(obj, "field")}
+        
+        obj.set_attr("field", create_int_value(3))
+        assert self.solver.lookup_summary(key) is summary
+        summary.apply(self.solver.state.memory)
+        assert str(obj.get_attr("field")) == "Value(Int([2]))"
+        # Different attributes on the inputs make a different key
+        assert self.solver.summary_key("test_module.f", [arg], self.solver.state.current_context)[0] != key
+    
+    def test_summary_replays_global_writes(self):
+        memory = self.solver.state.memory
+        memory.create_global_scope(create_mock_module("test_module"))
+        memory.set_variable("counter", create_int_value(0))
+        key, attributes = self.solver.summary_key("test_module.f", [], self.solver.state.current_context)
+        global_bindings = self.solver.global_bindings()
+        written = create_int_value(1)
+        memory.set_variable("counter", written)
+        summary = self.solver.record_summary(key, attributes, [], create_none_value(), global_bindings)
+        assert summary.global_writes == {(None, "counter"): written}
+        
+        memory.set_variable("counter", create_int_value(0))
+        summary.apply(memory)
+        assert memory.get_variable("counter") is written
+    
+    def test_summary_covers_objects_reachable_from_globals(self):
+        memory = self.solver.state.memory
+        memory.create_global_scope(create_mock_module("test_module"))
+        obj = ConstantObject(int, 1)
+        memory.set_variable("G", Value({obj}))
+        self.solver.func_statements["test_module.f"] = [create_mock_assign("y", "G")]
+        context = self.solver.state.current_context
+        obj.set_attr("x", create_int_value(1))
+        key, attributes = self.solver.summary_key("test_module.f", [], context)
+        assert (obj, "x") in attributes
+        assert self.solver.summary_key("test_module.f", [], context)[0] == key
+        
+        # f reads G, so a new value of G.x is a different input
+        obj.set_attr("x", create_int_value(2))
+        assert self.solver.summary_key("test_module.f", [], context)[0] != key
+        summary = self.solver.record_summary(key, attributes, [], create_none_value(), self.solver.global_bindings())
+        assert set(summary.side_effects) == {(obj, "x")}
+        # Globals the callee does not read are not part of the key
+        key = self.solver.summary_key("test_module.f", [], context)[0]
+        memory.set_variable("H", create_int_value(3))
+        assert self.solver.summary_key("test_module.f", [], context)[0] == key
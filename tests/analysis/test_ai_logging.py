@@ -0,0 +1,97 @@
+"""Tests for batched file output and bounded retention in AILogger."""
+
+import csv
+import gzip
+import json
+import subprocess
+import sys
+import time
+
+from pythonstan.analysis.ai.logging import AILogger, EventType, LogLevel, configure_logging
+
+
+def read_lines(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_events_are_written_in_batches(tmp_path):
+    json_file = tmp_path / "logs" / "events.jsonl"
+    csv_file = tmp_path / "events.csv"
+    logger = AILogger(enable_console=False, min_level=LogLevel.DEBUG, enable_json=True, enable_csv=True,
+                      json_file=json_file, csv_file=csv_file, batch_size=3)
+    logger.iteration_start("main", 1)
+    logger.iteration_start("main", 2)
+    assert not json_file.exists()
+    logger.iteration_start("main", 3)
+    assert [event["iteration"] for event in read_lines(json_file)] == [1, 2, 3]
+    logger.iteration_start("main", 4)
+    assert len(read_lines(json_file)) == 3
+    logger.close()
+    assert [event["iteration"] for event in read_lines(json_file)] == [1, 2, 3, 4]
+    with open(csv_file) as f:
+        assert [row["iteration"] for row in csv.DictReader(f)] == ["1", "2", "3", "4"]
+
+
+def test_recent_events_are_kept_in_a_ring_buffer():
+    logger = AILogger(enable_console=False, min_level=LogLevel.DEBUG, max_events=5)
+    for iteration in range(12):
+        logger.iteration_start("main", iteration)
+    assert [event.iteration for event in logger.get_events(EventType.ITERATION_START)] == [7, 8, 9, 10, 11]
+    summary = logger.get_summary()
+    assert summary["total_events"] == 12
+    assert summary["retained_events"] == 5
+    assert summary["dropped_events"] == 7
+
+
+def test_compressed_json_lines(tmp_path):
+    json_file = tmp_path / "events.jsonl.gz"
+    with AILogger(enable_console=False, min_level=LogLevel.DEBUG, enable_json=True, json_file=json_file, compress_json=True) as logger:
+        for iteration in range(4):
+            logger.iteration_start("main", iteration)
+    with gzip.open(json_file, "rt") as f:
+        assert [json.loads(line)["iteration"] for line in f] == [0, 1, 2, 3]
+
+
+def test_background_writer_flushes_periodically(tmp_path):
+    json_file = tmp_path / "events.jsonl"
+    logger = AILogger(enable_console=False, min_level=LogLevel.DEBUG, enable_json=True, json_file=json_file,
+                      batch_size=1000, flush_interval=0.01)
+    logger.iteration_start("main", 1)
+    deadline = time.time() + 5
+    while not json_file.exists() and time.time() < deadline:
+        time.sleep(0.01)
+    logger.close()
+    assert [event["iteration"] for event in read_lines(json_file)] == [1]
+
+
+def test_errors_and_analysis_end_are_written_immediately(tmp_path):
+    json_file = tmp_path / "events.jsonl"
+    logger = AILogger(enable_console=False, enable_json=True, json_file=json_file)
+    logger.analysis_start("main")
+    logger.error("main", "TypeError", "bad operand")
+    assert [event["event_type"] for event in read_lines(json_file)] == ["analysis_start", "error_event"]
+    logger.analysis_end("main")
+    assert len(read_lines(json_file)) == 3
+    logger.close()
+
+
+def test_reconfiguring_closes_the_previous_logger(tmp_path):
+    first, second = tmp_path / "first.jsonl", tmp_path / "second.jsonl"
+    logger = configure_logging(enable_console=False, enable_json=True, json_file=first)
+    logger.analysis_start("main")
+    configure_logging(enable_console=False, enable_json=True, json_file=second)
+    assert [event["scope"] for event in read_lines(first)] == ["main"]
+
+
+def test_buffered_events_are_written_at_exit(tmp_path):
+    json_file = tmp_path / "events.jsonl"
+    script = (
+        "from pythonstan.analysis.ai.logging import LogLevel, configure_logging, log_analysis_start, log_iteration\n"
+        f"configure_logging(enable_console=False, enable_json=True, json_file={str(json_file)!r}, "
+        "min_level=LogLevel.DEBUG)\n"
+        "log_analysis_start('m')\n"
+        "log_iteration('m', 1)\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)
+    assert [event["event_type"] for event in read_lines(json_file)] == ["analysis_start", "iteration_start"]
@@ -0,0 +1,78 @@
+"""Tests for summarizing calls of the abstract interpreter on a process pool."""
+
+import ast
+
+import pytest
+
+from pythonstan.ir.ir_statements import IRAssign, IRCall, IRFunc, IRReturn
+from pythonstan.analysis.ai import FunctionObject, Value, create_int_value, create_solver
+from pythonstan.utils.parallel import can_fork
+
+
+def function(name, args):
+    node = ast.FunctionDef(name=name, args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=arg) for arg in args],
+                                                         kwonlyargs=[], kw_defaults=[], defaults=[]),
+                           body=[ast.Pass()], decorator_list=[], returns=None, type_comment=None)
+    return IRFunc(name, node)
+
+
+def assign(target, source):
+    return IRAssign(ast.Assign(targets=[ast.Name(id=target, ctx=ast.Store())],
+                               value=ast.Name(id=source, ctx=ast.Load())))
+
+
+def call(target, func_name, args):
+    return IRCall(ast.Assign(targets=[ast.Name(id=target, ctx=ast.Store())],
+                             value=ast.Call(func=ast.Name(id=func_name, ctx=ast.Load()),
+                                            args=[ast.Name(id=arg, ctx=ast.Load()) for arg in args], keywords=[])))
+
+
+def ret(name):
+    stmt = IRReturn(ast.Return(value=ast.Name(id=name, ctx=ast.Load())))
+    # The interpreter reads the returned name from an ast.Name
+    stmt.value = ast.Name(id=name, ctx=ast.Load())
+    return stmt
+
+
+def run(workers):
+    # main calls leaf and mid, mid calls leaf: leaf is at level 0, mid at 1 and main at 2
+    solver = create_solver(workers=workers, max_iterations=20)
+    bodies = {
+        "leaf": (["x"], [assign("r", "x"), ret("r")]),
+        "other_leaf": (["y"], [assign("s", "seven"), ret("s")]),
+        "mid": (["z"], [call("t", "leaf", ["z"]), ret("t")]),
+    }
+    for name, (args, stmts) in bodies.items():
+        solver.func_statements[name] = stmts
+        solver.state.set_variable(name, Value({FunctionObject(function(name, args))}))
+    solver.state.set_variable("a", create_int_value(1))
+    solver.state.set_variable("seven", create_int_value(7))
+    calls = [call("b", "leaf", ["a"]), call("c", "other_leaf", ["a"]), call("d", "mid", ["a"])]
+    context = solver.state.current_context
+    for idx, stmt in enumerate(calls):
+        solver.state.call_graph.add_call_edge("main", stmt.get_func_name(), stmt, idx, context)
+    solver.state.call_graph.add_call_edge("mid", "leaf", bodies["mid"][1][0], 0, context)
+    solver._perform_interprocedural_analysis_with_scc()
+    return solver
+
+
+def test_call_graph_levels():
+    solver = run(0)
+    assert solver._call_graph_levels() == {"leaf": 0, "other_leaf": 0, "mid": 1, "main": 2}
+    # Functions calling each other share their level
+    solver.state.call_graph.add_call_edge("leaf", "mid", None, 0)
+    assert solver._call_graph_levels() == {"leaf": 0, "other_leaf": 0, "mid": 0, "main": 1}
+
+
+@pytest.mark.skipif(not can_fork(), reason="needs the fork start method")
+def test_parallel_matches_serial():
+    serial, parallel = run(0), run(3)
+    for name in ["b", "c", "d"]:
+        assert str(parallel.state.get_variable(name)) == str(serial.state.get_variable(name))
+    assert str(parallel.state.get_variable("c")) == "Value(Int([7]))"
+    summaries = lambda solver: {(key[0], key[2], str(summary.return_value))
+                                for key, summary in solver.function_summaries.items()}
+    assert summaries(parallel) == summaries(serial)
+    # The worklist pass reused the summaries computed by the workers
+    assert parallel._summary_hits >= len(parallel.state.call_graph.callers)
+    assert {"leaf", "other_leaf", "mid"} <= parallel.analyzed_functions
@@ -0,0 +1,91 @@
+"""Tests for the persistent-map variable store of the abstract interpreter."""
+
+import ast
+
+from pythonstan.ir.ir_statements import IRModule, IRFunc, IRAssign, JumpIfFalse, Goto, Label
+from pythonstan.utils.persistent_rb_tree import PersistentMap
+from pythonstan.analysis.ai import ContextType, FlowSensitivity, create_int_value, create_solver
+
+
+def make_solver(persistent_store):
+    solver = create_solver(context_type=ContextType.INSENSITIVE, flow_sensitivity=FlowSensitivity.SENSITIVE,
+                           persistent_store=persistent_store)
+    module = IRModule("test_module", ast.Module(body=[], type_ignores=[]))
+    solver.state.initialize_for_module(module)
+    func = IRFunc("test_module.test_func", ast.parse("def test_func():\n    pass\n").body[0])
+    solver.state.memory.create_function_scope(func, "test_module")
+    solver.state.memory.set_current_scope(func.get_qualname())
+    return solver
+
+
+def assign(lval, rval):
+    return IRAssign(ast.Assign(targets=[ast.Name(id=lval, ctx=ast.Store())],
+                               value=ast.Name(id=rval, ctx=ast.Load())))
+
+
+def test_persistent_map_copy_and_diff():
+    values = [object() for _ in range(64)]
+    base = PersistentMap()
+    for idx, value in enumerate(values):
+        base[f"v{idx}"] = value
+    copy = base.copy()
+    copy["v10"] = object()
+    copy["new"] = object()
+    assert base.get("v10") is values[10]
+    assert base.get("new") is None and "new" not in base
+    assert len(base) == 64 and len(copy) == 65
+    assert base.diff(copy) == {"v10", "new"}
+    assert base.diff(base.copy()) == set()
+
+
+def test_snapshots_share_the_scope_map():
+    solver = make_solver(persistent_store=True)
+    solver.state.set_variable("x", create_int_value(1))
+    snapshot = solver.state.snapshot_variables()
+    assert isinstance(snapshot, PersistentMap)
+    assert snapshot.backup() is solver.state.memory.current_scope.locals.backup()
+    solver.state.set_variable("x", create_int_value(2))
+    assert str(snapshot.get("x")) == "Value(Int([1]))"
+    assert str(solver.state.get_variable("x")) == "Value(Int([2]))"
+
+
+def test_merge_point_matches_dict_store():
+    results = []
+    for persistent_store in (False, True):
+        solver = make_solver(persistent_store)
+        for name, value in [("x", 0), ("a", 1), ("b", 2), ("c", 3)]:
+            solver.state.set_variable(name, create_int_value(value))
+        else_label, end_label = Label(1), Label(2)
+        # if c: x = a else: x = b; merge at end_label
+        statements = [
+            JumpIfFalse(ast.Name(id="c", ctx=ast.Load()), else_label),
+            assign("x", "a"),
+            Goto(end_label),
+            else_label,
+            assign("x", "b"),
+            end_label,
+            assign("y", "x"),
+        ]
+        solver.state.control_flow.set_current_function("test_func")
+        solver._build_cfg("test_func", statements)
+        solver._analyze_scope("test_func", statements)
+        # The merge point keeps one joined state holding both branches' values of x
+        joined = solver.state.control_flow.get_merge_state("test_func", 5)
+        assert joined is not None and joined.get("x") is not None
+        results.append({name: str(solver.state.get_variable(name)) for name in ["x", "y", "a", "b"]})
+    assert results[0] == results[1]
+
+
+def test_unchanged_merge_state_is_not_rescheduled():
+    solver = make_solver(False)
+    solver.state.set_variable("x", create_int_value(1))
+    control_flow = solver.state.control_flow
+    control_flow.set_current_function("test_func")
+    control_flow.add_edge("test_func", 0, 2)
+    control_flow.add_edge("test_func", 1, 2)
+    assert control_flow.is_merge_point("test_func", 2)
+    assert control_flow.join_merge_state("test_func", 2, solver.state.snapshot_variables())
+    assert not control_flow.join_merge_state("test_func", 2, solver.state.snapshot_variables())
+    solver.state.set_variable("x", create_int_value(2))
+    assert control_flow.join_merge_state("test_func", 2, solver.state.snapshot_variables())
+    assert not control_flow.join_merge_state("test_func", 2, solver.state.snapshot_variables())
@@ -435,3 +435,114 @@ class TestRealisticScenarios:
         
         # Should be consistent (this is a property the real implementation should maintain)
         assert may_alias_before == may_alias_after
+
+
+class TestKCFAPointerResults:
+    """Test the indexed adapter over a k-CFA solver query."""
+
+    @staticmethod
+    def make_state():
+        from pythonstan.analysis.pointer.kcfa.context import CallSite as KCFACallSite, CallStringContext, Ctx
+        from pythonstan.analysis.pointer.kcfa.context import Scope as KCFAScope
+        from pythonstan.analysis.pointer.kcfa.heap_model import attr, elem
+        from pythonstan.analysis.pointer.kcfa.object import AbstractObject as KCFAObject, AllocKind, AllocSite
+        from pythonstan.analysis.pointer.kcfa.points_to_set import PointsToSet
+        from pythonstan.analysis.pointer.kcfa.state import PointerAnalysisState
+        from pythonstan.analysis.pointer.kcfa.variable import FieldAccess, Variable
+        from pythonstan.graph.call_graph import CallEdge, CallKind
+
+        empty_ctx = CallStringContext((), 2)
+        call_ctx = CallStringContext((KCFACallSite("m.py:3:0:call", "m"),), 2)
+        scope = KCFAScope(IRModule("m", ast.parse(""), "m"), None, empty_ctx, None, None)
+        lst = KCFAObject(empty_ctx, AllocSite("m:1:list", AllocKind.LIST))
+        obj = KCFAObject(call_ctx, AllocSite("m:2:obj", AllocKind.OBJECT))
+
+        state = PointerAnalysisState()
+        state.set_points_to(Ctx(empty_ctx, scope, Variable("x")), PointsToSet.singleton(lst))
+        state.set_points_to(Ctx(call_ctx, scope, Variable("x")), PointsToSet.singleton(obj))
+        state.set_points_to(Ctx(empty_ctx, scope, Variable("y")), PointsToSet.singleton(obj))
+        for fld, target in ((elem(), obj), (attr("size"), lst)):
+            field_access = FieldAccess(lst, fld)
+            state.set_field(scope, empty_ctx, lst, fld, field_access)
+            state.set_points_to(Ctx(empty_ctx, None, field_access), PointsToSet.singleton(target))
+        state.call_graph.add_edge(CallEdge(CallKind.FUNCTION, Ctx(empty_ctx, scope, "f(x)"), scope))
+        return state, scope, lst, obj
+
+    def test_points_to_is_projected_by_context(self):
+        from pythonstan.analysis.pointer.kcfa.solver import SolverQuery
+        from pythonstan.analysis.pointer.kcfa.unknown_tracker import UnknownTracker
+        from pythonstan.analysis.ai import KCFAPointerResults
+
+        state, _, lst, obj = self.make_state()
+        pointer = KCFAPointerResults(SolverQuery(state, {}, UnknownTracker()))
+        assert {o.obj for o in pointer.points_to("x")} == {lst, obj}
+        call_ctx = MockContext((MockCallSite("m.py:3:0:call"),))
+        assert {o.obj for o in pointer.points_to("x", call_ctx)} == {obj}
+        assert pointer.is_singleton("x", call_ctx)
+        assert not pointer.is_singleton("x")
+        assert pointer.may_alias("x", "y")
+        assert pointer.may_alias("x", "unknown")
+        assert len(pointer.points_to("unknown")) == 0
+
+        x_list = next(o for o in pointer.points_to("x") if o.obj == lst)
+        assert {o.obj for o in pointer.field_points_to(x_list, ElemFieldKey())} == {obj}
+        assert {o.obj for o in pointer.field_points_to(x_list, AttrFieldKey("size"))} == {lst}
+        assert {o.obj for o in pointer.field_points_to(x_list, UnknownFieldKey())} == {lst, obj}
+
+        callees = pointer.possible_callees(MockCallSite("f(x)"))
+        assert {fn.name for fn in callees} == {"m"}
+        assert pointer.call_graph_successors(next(iter(callees))) == callees
+        assert pointer.possible_callees(MockCallSite("g(x)")) == set()
+
+    def test_points_to_is_keyed_by_scope(self):
+        from pythonstan.analysis.pointer.kcfa.context import CallStringContext, Ctx
+        from pythonstan.analysis.pointer.kcfa.context import Scope as KCFAScope
+        from pythonstan.analysis.pointer.kcfa.points_to_set import PointsToSet
+        from pythonstan.analysis.pointer.kcfa.variable import Variable
+        from pythonstan.analysis.ai import KCFAPointerResults
+
+        state, scope, lst, obj = self.make_state()
+        other = KCFAScope(IRModule("n", ast.parse(""), "n"), None, CallStringContext((), 2), None, None)
+        state.set_points_to(Ctx(CallStringContext((), 2), other, Variable("y")), PointsToSet.singleton(lst))
+        pointer = KCFAPointerResults(state)
+        assert {o.obj for o in pointer.points_to("y", scope="m")} == {obj}
+        assert {o.obj for o in pointer.points_to("y", scope="n")} == {lst}
+        assert {o.obj for o in pointer.points_to("y")} == {lst, obj}
+        assert pointer.is_singleton("y", scope="n")
+        assert not pointer.is_singleton("y")
+        assert pointer.may_alias("x", "y", scope="m")
+        assert pointer.may_alias("x", "y", scope="n")  # x is not a variable of n
+
+    def test_callees_match_interpreter_call_sites(self):
+        from pythonstan.analysis.pointer.kcfa.context import CallStringContext, Ctx
+        from pythonstan.analysis.ai import KCFAPointerResults
+        from pythonstan.graph.call_graph import CallEdge, CallKind
+
+        call = IRCall(ast.parse("\nb = f(a)").body[0])
+        state, scope, _, _ = self.make_state()
+        site_id = f"__main__:2:0:{call}"
+        state.call_graph.add_edge(CallEdge(CallKind.FUNCTION, Ctx(CallStringContext((), 2), scope, site_id), scope))
+        pointer = KCFAPointerResults(state)
+        interpreter = AbstractInterpreter(AbstractState(ContextType.CALL_SITE, FlowSensitivity.SENSITIVE))
+        call_site = interpreter._create_call_site_for_ir(call)
+        assert {fn.name for fn in pointer.possible_callees(call_site)} == {"m"}
+        assert {fn.name for fn in pointer.possible_callees(MockCallSite(site_id))} == {"m"}
+
+    def test_digest_tracks_solver_state(self):
+        from pythonstan.analysis.pointer.kcfa.context import CallStringContext, Ctx
+        from pythonstan.analysis.pointer.kcfa.points_to_set import PointsToSet
+        from pythonstan.analysis.pointer.kcfa.variable import Variable
+        from pythonstan.analysis.ai import KCFAPointerResults
+
+        state, scope, lst, _ = self.make_state()
+        pointer = KCFAPointerResults(state)
+        version = pointer.pointer_digest_version()
+        assert version.startswith("kcfa-")
+        assert KCFAPointerResults(self.make_state()[0]).pointer_digest_version() == version
+
+        # Re-adding a known fact changes nothing; a new fact rebuilds the index
+        state.set_points_to(Ctx(CallStringContext((), 2), scope, Variable("y")), PointsToSet.empty())
+        assert pointer.pointer_digest_version() == version
+        state.set_points_to(Ctx(CallStringContext((), 2), scope, Variable("z")), PointsToSet.singleton(lst))
+        assert pointer.pointer_digest_version() != version
+        assert {o.obj for o in pointer.points_to("z")} == {lst}
@@ -0,0 +1,158 @@
+"""Tests for widening and narrowing in the abstract interpreter."""
+
+import ast
+import math
+
+from pythonstan.ir.ir_statements import IRModule, IRFunc, IRAssign, JumpIfFalse, Goto, Label
+from pythonstan.analysis.ai import (
+    NumericProperty, StringProperty, ContainerProperty, WideningThresholds,
+    ContextType, FlowSensitivity, WorklistOrder,
+    create_int_value, create_str_value, create_solver
+)
+
+
+def bounds(value):
+    prop = next(iter(value.objects)).numeric_property
+    return prop.lower_bound, prop.upper_bound
+
+
+def make_solver(**kwargs):
+    solver = create_solver(context_type=ContextType.INSENSITIVE,
+                           flow_sensitivity=FlowSensitivity.SENSITIVE, **kwargs)
+    module = IRModule("test_module", ast.Module(body=[], type_ignores=[]))
+    solver.state.initialize_for_module(module)
+    func_ast = ast.parse("def test_func():\n    pass\n").body[0]
+    func = IRFunc("test_module.test_func", func_ast)
+    solver.state.memory.create_function_scope(func, "test_module")
+    solver.state.memory.set_current_scope(func.get_qualname())
+    return solver
+
+
+def assign(lval, rval):
+    return IRAssign(ast.Assign(targets=[ast.Name(id=lval, ctx=ast.Store())],
+                               value=ast.Name(id=rval, ctx=ast.Load())))
+
+
+class TestDomainWidening:
+    def test_numeric_widening_uses_thresholds(self):
+        thresholds = WideningThresholds([0, 10, 100])
+        old = NumericProperty(exact_values={0})
+        new = NumericProperty(exact_values={1})
+        widened = old.widen(new, thresholds)
+        assert (widened.lower_bound, widened.upper_bound) == (0, 10)
+        assert not widened.exact_values
+        widened = widened.widen(NumericProperty(exact_values={11}), thresholds)
+        assert (widened.lower_bound, widened.upper_bound) == (0, 100)
+        widened = widened.widen(NumericProperty(exact_values={101}), thresholds)
+        assert widened.upper_bound == math.inf
+        # A stable widening returns the old property itself
+        assert widened.widen(NumericProperty(exact_values={5}), thresholds) is widened
+
+    def test_numeric_narrowing_refines_infinite_bounds(self):
+        widened = NumericProperty(lower_bound=0)
+        narrowed = widened.narrow(NumericProperty(lower_bound=0, upper_bound=10))
+        assert (narrowed.lower_bound, narrowed.upper_bound) == (0, 10)
+        assert narrowed.narrow(NumericProperty(lower_bound=0, upper_bound=5)) is narrowed
+
+    def test_string_widening(self):
+        thresholds = WideningThresholds.from_constants(["abcd", 3, True])
+        assert thresholds.numbers == [3] and thresholds.lengths == [4]
+        old = StringProperty(exact_values={"a"})
+        widened = old.widen(StringProperty(exact_values={"ab"}), thresholds)
+        assert not widened.exact_values
+        assert (widened.min_length, widened.max_length) == (1, 4)
+        widened = widened.widen(StringProperty(exact_values={"abcde"}), thresholds)
+        assert widened.max_length is None
+        narrowed = widened.narrow(StringProperty(min_length=1, max_length=8))
+        assert narrowed.max_length == 8
+
+    def test_container_widening(self):
+        thresholds = WideningThresholds(lengths=[8])
+        old = ContainerProperty(element_values=create_int_value(0), min_size=1, max_size=1)
+        new = ContainerProperty(element_values=create_int_value(1), min_size=2, max_size=2)
+        widened = old.widen(new, thresholds)
+        assert (widened.min_size, widened.max_size) == (1, 8)
+        assert bounds(widened.element_values) == (0, math.inf)
+        assert widened.widen(ContainerProperty(element_values=create_int_value(1), min_size=3, max_size=3),
+                             thresholds) is widened
+
+    def test_value_widening_keeps_incompatible_objects(self):
+        value = create_int_value(0)
+        widened = value.widen(create_str_value("a"))
+        assert len(widened.objects) == 2
+        assert widened.widen(create_str_value("a")) is widened
+
+
+class TestLoopHeadWidening:
+    def test_widen_and_narrow_at_loop_head(self):
+        solver = make_solver()
+        thresholds = WideningThresholds([10])
+        solver.state.set_variable("i", create_int_value(0))
+        assert solver._widen_at_loop_head("f", 2, thresholds)
+        solver.state.set_variable("i", create_int_value(0).merge(create_int_value(1)))
+        assert solver._widen_at_loop_head("f", 2, thresholds)
+        assert bounds(solver.state.get_variable("i")) == (0, 10)
+        # Nothing grew since the last visit: the loop is stable
+        solver.state.set_variable("i", create_int_value(3))
+        assert not solver._widen_at_loop_head("f", 2, thresholds)
+        solver.state.set_variable("i", create_int_value(11))
+        assert solver._widen_at_loop_head("f", 2, thresholds)
+        assert bounds(solver.state.get_variable("i")) == (0, math.inf)
+
+        # Narrowing joins the entry state {0} with the state coming around the loop
+        solver.state.set_variable("i", create_int_value(5))
+        assert solver._narrow_at_loop_head("f", 2)
+        assert bounds(solver.state.get_variable("i")) == (0, 5)
+        solver.state.set_variable("i", create_int_value(5))
+        assert not solver._narrow_at_loop_head("f", 2)
+
+    def counting_loop(self, solver):
+        loop_start, loop_end = Label(1), Label(2)
+        compare = ast.Compare(left=ast.Name(id="i", ctx=ast.Load()), ops=[ast.Lt()],
+                              comparators=[ast.Name(id="n", ctx=ast.Load())])
+        statements = [
+            assign("i", "i"),
+            loop_start,
+            JumpIfFalse(compare, loop_end),
+            assign("i", "one"),
+            Goto(loop_start),
+            loop_end,
+        ]
+        solver.state.control_flow.set_current_function("test_func")
+        solver._build_cfg("test_func", statements)
+        return statements
+
+    def test_loop_terminates_by_widening(self):
+        for order in WorklistOrder:
+            solver = make_solver(worklist_order=order, max_iterations=100)
+            control_flow = solver.state.control_flow
+            # The visit cap stays as a backstop only
+            assert control_flow.max_visits_per_stmt == 100
+            for name, value in [("i", 0), ("n", 3), ("one", 1)]:
+                solver.state.set_variable(name, create_int_value(value))
+            statements = self.counting_loop(solver)
+            assert control_flow.get_loop_heads("test_func") == {1}
+            solver._analyze_scope("test_func", statements)
+            # Without constants to use as thresholds, widening gives up the upper bound
+            # and narrowing recovers it from the loop entry and body
+            assert bounds(solver.state.get_variable("i")) == (0, 1)
+            key = (solver.state.current_context, "test_func", 1)
+            assert bounds(solver.loop_head_states[key]["i"]) == (0, 1)
+
+    def test_loop_head_states_are_fresh_for_each_run(self):
+        solver = make_solver()
+        statements = self.counting_loop(solver)
+        for name, value in [("i", 0), ("n", 3), ("one", 1)]:
+            solver.state.set_variable(name, create_int_value(value))
+        solver._analyze_scope("test_func", statements)
+        key = (solver.state.current_context, "test_func", 1)
+        assert bounds(solver.loop_head_states[key]["i"]) == (0, 1)
+
+        # Another run, e.g. the same callee with other arguments, must not start
+        # from the head state of the first one
+        solver.state.control_flow.merge_states.clear()
+        solver.state.control_flow.visit_count.clear()
+        for name, value in [("i", 5), ("n", 10), ("one", 7)]:
+            solver.state.set_variable(name, create_int_value(value))
+        solver._analyze_scope("test_func", statements)
+        assert bounds(solver.loop_head_states[key]["i"]) == (5, 7)
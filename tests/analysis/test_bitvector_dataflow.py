@@ -0,0 +1,150 @@
+"""Tests for the bit-vector dataflow framework."""
+
+from pathlib import Path
+
+import pytest
+
+from pythonstan.analysis import AnalysisConfig
+from pythonstan.analysis.dataflow import BitVectorDomain, LivenessAnalysis, ReachingDefinitionAnalysis
+from pythonstan.analysis.dataflow.driver import DataflowAnalysisDriver
+from pythonstan.analysis.dataflow.solver import BitVectorSolver, WorklistSolver, block_order
+from pythonstan.ir import IRModule, IRScope
+from pythonstan.world import World
+from pythonstan.world.pipeline import Pipeline
+
+
+def get_benchmark_path(filename):
+    project_root = Path(__file__).parent.parent.parent.absolute()
+    return project_root / 'benchmark' / filename
+
+
+def lowered_scopes(filename):
+    path = get_benchmark_path(filename)
+    Pipeline(config={
+        "filename": str(path),
+        "project_path": str(path.parent),
+        "library_paths": [],
+        "import_level": 0,
+        "analysis": [],
+    })
+    scope_manager = World().scope_manager
+    return [(scope, scope_manager.get_ir(scope, "cfg")) for scope in scope_manager.get_scopes()
+            if scope_manager.get_ir(scope, "cfg") is not None]
+
+
+def module_scope(filename):
+    return next((scope, cfg) for scope, cfg in lowered_scopes(filename) if isinstance(scope, IRModule))
+
+
+def naive_liveness(cfg):
+    """Set-based round-robin liveness; returns the facts at block starts and ends."""
+    live_in = {blk: set() for blk in cfg.blks}
+    live_out = {blk: set() for blk in cfg.blks}
+    changed = True
+    while changed:
+        changed = False
+        for blk in cfg.blks:
+            out = set().union(*(live_in[succ] for succ in cfg.succs_of(blk)))
+            fact = set(out)
+            for stmt in reversed(blk.stmts):
+                fact.difference_update(stmt.get_stores())
+                fact.update(stmt.get_nostores())
+                if isinstance(stmt, IRScope):
+                    fact.update(stmt.get_cell_vars() | stmt.get_nonlocal_vars())
+            if out != live_out[blk] or fact != live_in[blk]:
+                live_out[blk], live_in[blk] = out, fact
+                changed = True
+    return live_in, live_out
+
+
+def naive_reaching_definitions(cfg):
+    defs = {}
+    for stmt in cfg.stmts:
+        for var in stmt.get_stores():
+            defs.setdefault(var, set()).add(stmt)
+    rd_in = {blk: set() for blk in cfg.blks}
+    rd_out = {blk: set() for blk in cfg.blks}
+    changed = True
+    while changed:
+        changed = False
+        for blk in cfg.blks:
+            if blk == cfg.entry_blk:
+                continue
+            fact_in = set().union(*(rd_out[pred] for pred in cfg.preds_of(blk)))
+            fact = set(fact_in)
+            for stmt in blk.stmts:
+                for var in stmt.get_stores():
+                    fact.difference_update(defs[var])
+                    fact.add(stmt)
+            if fact_in != rd_in[blk] or fact != rd_out[blk]:
+                rd_in[blk], rd_out[blk] = fact_in, fact
+                changed = True
+    return rd_in, rd_out
+
+
+def test_domain_round_trip():
+    domain = BitVectorDomain()
+    bits = domain.encode(["a", "b", "c"])
+    assert bits == 0b111
+    assert domain.bit("b") == 0b010
+    assert domain.decode(bits & ~domain.bit("b")) == {"a", "c"}
+    assert domain.decode(0) == set()
+    assert len(domain) == 3
+
+
+@pytest.mark.parametrize("filename", ["dataflow.py", "closures.py", "control_flow.py"])
+@pytest.mark.parametrize("solver", [WorklistSolver, BitVectorSolver])
+def test_liveness_matches_set_semantics(filename, solver):
+    config = AnalysisConfig("liveness", "LivenessAnalysis", options={"type": "dataflow analysis"})
+    for scope, cfg in lowered_scopes(filename):
+        analysis = LivenessAnalysis(scope, cfg, config)
+        facts_in, facts_out = solver.solve(analysis)
+        assert all(isinstance(bits, int) for bits in facts_in.values())
+        expected_in, expected_out = naive_liveness(cfg)
+        assert analysis.decode_facts(facts_in) == expected_in
+        assert analysis.decode_facts(facts_out) == expected_out
+
+
+@pytest.mark.parametrize("solver", [WorklistSolver, BitVectorSolver])
+def test_reaching_definitions_match_set_semantics(solver):
+    config = AnalysisConfig("rd", "ReachingDefinitionAnalysis", options={"type": "dataflow analysis"})
+    for scope, cfg in lowered_scopes("dataflow.py"):
+        analysis = ReachingDefinitionAnalysis(scope, cfg, config)
+        facts_in, facts_out = solver.solve(analysis)
+        expected_in, expected_out = naive_reaching_definitions(cfg)
+        assert analysis.decode_facts(facts_in) == expected_in
+        assert analysis.decode_facts(facts_out) == expected_out
+
+
+def test_driver_reports_sets():
+    config = AnalysisConfig("liveness", "LivenessAnalysis", options={"type": "dataflow analysis"})
+    driver = DataflowAnalysisDriver(config)
+    assert driver.solver is BitVectorSolver
+    scope, cfg = module_scope("dataflow.py")
+    driver.analyze(scope, {})
+    assert driver.results["in"] == naive_liveness(cfg)[0]
+
+
+@pytest.mark.parametrize("filename", ["dataflow.py", "closures.py", "control_flow.py"])
+@pytest.mark.parametrize("name", ["LivenessAnalysis", "ReachingDefinitionAnalysis"])
+def test_bitvector_analyses_match_set_based_ones(filename, name):
+    bitvector = DataflowAnalysisDriver(AnalysisConfig(name, name, options={"type": "dataflow analysis"}))
+    set_based = DataflowAnalysisDriver(AnalysisConfig(name, f"Set{name}", options={"type": "dataflow analysis"}))
+    assert set_based.solver is not BitVectorSolver
+    for scope, _ in lowered_scopes(filename):
+        bitvector.analyze(scope, {})
+        set_based.analyze(scope, {})
+        assert bitvector.results["in"] == set_based.results["in"]
+        assert bitvector.results["out"] == set_based.results["out"]
+
+
+def test_worklist_order_visits_acyclic_blocks_once():
+    config = AnalysisConfig("liveness", "LivenessAnalysis", options={"type": "dataflow analysis"})
+    scope, cfg = module_scope("dataflow.py")
+    assert block_order(cfg, is_forward=True)[0] == cfg.entry_blk
+    assert block_order(cfg, is_forward=False) == block_order(cfg, is_forward=True)[::-1]
+    for solver in (WorklistSolver, BitVectorSolver):
+        analysis = LivenessAnalysis(scope, cfg, config)
+        solver.solve(analysis)
+        # Module bodies without loops converge in a single postorder pass
+        assert analysis.iterations == len(cfg.blks) - 1
@@ -0,0 +1,71 @@
+"""Tests for basic-block CFG construction and the statement-index view."""
+
+import inspect
+import sys
+from pathlib import Path
+
+from pythonstan.analysis.transform.cfg import CFGTransformer
+from pythonstan.graph.cfg import StatementIndex
+from pythonstan.world import World
+from pythonstan.world.pipeline import Pipeline
+
+
+def get_benchmark_path(filename):
+    project_root = Path(__file__).parent.parent.parent.absolute()
+    return project_root / 'benchmark' / filename
+
+
+def build(path: Path, basic_blocks: bool) -> Pipeline:
+    config = {
+        "filename": str(path),
+        "project_path": str(path.parent),
+        "library_paths": [],
+        "import_level": 0,
+        "basic_block_cfg": basic_blocks,
+        "analysis": [],
+    }
+    return Pipeline(config=config)
+
+
+def stmt_flow(path: Path, basic_blocks: bool):
+    """Returns per-scope block counts and statement-level flow edges."""
+    build(path, basic_blocks)
+    scope_manager = World().scope_manager
+    blocks, flow = {}, {}
+    for scope in scope_manager.get_scopes():
+        cfg = scope_manager.get_ir(scope, "cfg")
+        index = StatementIndex(cfg)
+        assert len(index) == len(cfg.get_stmts())
+        blocks[scope.get_qualname()] = len(cfg.get_nodes())
+        flow[scope.get_qualname()] = {(str(s), str(t)) for s in index for t in index.succs_of(s)}
+        for s in index:
+            for t in index.succs_of(s):
+                assert s in index.preds_of(t)
+    return blocks, flow
+
+
+def test_basic_blocks_keep_statement_flow():
+    path = get_benchmark_path("control_flow.py")
+    stmt_blocks, stmt_edges = stmt_flow(path, basic_blocks=False)
+    bb_blocks, bb_edges = stmt_flow(path, basic_blocks=True)
+    assert bb_edges == stmt_edges
+    assert all(bb_blocks[name] <= stmt_blocks[name] for name in stmt_blocks)
+    assert sum(bb_blocks.values()) < sum(stmt_blocks.values())
+
+
+def test_long_function_does_not_recurse(tmp_path):
+    body = "".join(f"    if x == {i}:\n        y = {i}\n" for i in range(200))
+    path = tmp_path / "long.py"
+    path.write_text(f"def f(x):\n    y = 0\n{body}    return y\n")
+    build(path, basic_blocks=False)
+    func = World().scope_manager.get_subscopes(World().get_entry_module())[0]
+    block_cfg = World().scope_manager.get_ir(func, "block cfg")
+    assert len(block_cfg.get_nodes()) > 200
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(len(inspect.stack()) + 50)
+    try:
+        for basic_blocks in (False, True):
+            CFGTransformer(basic_blocks).trans(func, block_cfg)
+    finally:
+        sys.setrecursionlimit(limit)
+    assert len(StatementIndex(World().scope_manager.get_ir(func, "cfg"))) > 600
@@ -0,0 +1,106 @@
+"""Tests for the iterative dominator tree."""
+
+import random
+
+import pytest
+
+from pythonstan.graph.cfg import BaseBlock, ControlFlowGraph, NormalEdge
+from pythonstan.graph.dominator_tree import DominatorTree
+
+
+def make_cfg(n, edges):
+    """Builds a CFG over blocks 0..n-1 (0 is the entry) plus a super exit."""
+    cfg = ControlFlowGraph()
+    blks = [cfg.get_entry()] + [BaseBlock(i) for i in range(1, n)]
+    for blk in blks:
+        cfg.add_blk(blk)
+    for u, v in edges:
+        cfg.add_edge(NormalEdge(blks[u], blks[v]))
+    for blk in blks:
+        if cfg.out_degree_of(blk) == 0:
+            cfg.add_exit(blk)
+    cfg.add_super_exit_blk(BaseBlock(n))
+    return cfg
+
+
+def naive_dominators(nodes, entry, preds):
+    dom = {u: set(nodes) for u in nodes}
+    dom[entry] = {entry}
+    changed = True
+    while changed:
+        changed = False
+        for u in nodes:
+            if u == entry:
+                continue
+            ps = [dom[p] for p in preds(u) if p in dom]
+            new = set.intersection(*ps) | {u}
+            if new != dom[u]:
+                dom[u] = new
+                changed = True
+    return dom
+
+
+def naive_frontiers(nodes, dom, preds):
+    df = {u: set() for u in nodes}
+    for v in nodes:
+        for p in preds(v):
+            if p not in dom:
+                continue
+            for u in dom[p]:
+                if u not in dom[v] or u == v:
+                    df[u].add(v)
+    return df
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("is_post", [False, True])
+def test_matches_naive_dominators(seed, is_post):
+    rng = random.Random(seed)
+    n = rng.randint(2, 30)
+    edges = [(i, i + 1) for i in range(n - 1)]
+    edges += [(rng.randrange(n), rng.randrange(n)) for _ in range(n)]
+    cfg = make_cfg(n, edges)
+    tree = DominatorTree(cfg, is_post=is_post)
+
+    preds = tree.preds_of
+    nodes = tree.nodes
+    dom = naive_dominators(nodes, tree.get_entry(), preds)
+    for v in nodes:
+        for u in nodes:
+            assert tree.dominates(u, v) == (u in dom[v])
+        if v != tree.get_entry():
+            strict = dom[v] - {v}
+            assert tree.intermediate_dominator(v) in strict
+            assert all(tree.dominates(d, tree.intermediate_dominator(v)) for d in strict)
+    df = naive_frontiers(nodes, dom, preds)
+    assert {u: set(tree.dominance_frontier(u)) for u in nodes} == df
+
+
+def test_diamond_frontier_and_idf():
+    cfg = make_cfg(5, [(0, 1), (0, 2), (1, 3), (2, 3), (3, 1), (3, 4)])
+    blks = {b.get_idx(): b for b in cfg.get_nodes()}
+    tree = DominatorTree(cfg)
+    assert tree.intermediate_dominator(blks[3]) == blks[0]
+    assert tree.dominance_frontier(blks[2]) == {blks[3]}
+    assert tree.iterated_dominance_frontier([blks[2]]) == {blks[3], blks[1]}
+    post = DominatorTree(cfg, is_post=True)
+    assert post.intermediate_dominator(blks[1]) == blks[3]
+
+
+def test_long_chain_does_not_recurse():
+    n = 50000
+    cfg = make_cfg(n, [(i, i + 1) for i in range(n - 1)] + [(n - 2, 0)])
+    tree = DominatorTree(cfg)
+    post = DominatorTree(cfg, is_post=True)
+    assert len(tree.nodes) == n + 1
+    assert tree.dominates(cfg.get_entry(), cfg.get_exit())
+    assert post.dominates(cfg.get_exit(), cfg.get_entry())
+
+
+def test_trees_are_cached_per_graph():
+    cfg = make_cfg(3, [(0, 1), (1, 2)])
+    tree = DominatorTree.of(cfg)
+    assert DominatorTree.of(cfg) is tree
+    assert DominatorTree.of(cfg, is_post=True) is not tree
+    DominatorTree.invalidate(cfg)
+    assert DominatorTree.of(cfg) is not tree
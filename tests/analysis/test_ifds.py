@@ -0,0 +1,262 @@
+"""Tests for the IFDS/IDE tabulation solver."""
+
+import re
+
+import pytest
+
+from pythonstan.analysis.dataflow import ZERO, IDEProblem, IFDSProblem, IDESolver, IFDSSolver
+from pythonstan.analysis.dataflow.ifds import IDENTITY, EdgeFunction
+from pythonstan.graph.icfg.icfg import InterControlFlowGraph
+from pythonstan.ir import IRCall, IRReturn
+from pythonstan.world import World
+from pythonstan.world.pipeline import Pipeline
+
+SOURCE = """
+def source():
+    return 1
+
+def ident(a):
+    return a
+
+def sink(b):
+    return b
+
+def main():
+    x = source()
+    y = ident(x)
+    z = ident(3)
+    sink(y)
+    sink(z)
+"""
+
+RET = "$return"
+
+
+RECURSIVE_SOURCE = """
+def source():
+    return 1
+
+def sink(b):
+    return b
+
+def loop(a, n):
+    r = a
+    while n:
+        r = loop(a, n - 1)
+        n = 0
+    return r
+
+def ping(a, n):
+    r = a
+    while n:
+        r = pong(a, n - 1)
+        n = 0
+    return r
+
+def pong(b, n):
+    return ping(b, n)
+
+def main():
+    x = source()
+    y = loop(x, 3)
+    z = ping(x, 2)
+    w = loop(3, 2)
+    sink(y)
+    sink(z)
+    sink(w)
+"""
+
+
+@pytest.fixture
+def icfg(tmp_path):
+    return build_icfg(tmp_path, SOURCE)
+
+
+@pytest.fixture
+def recursive_icfg(tmp_path):
+    return build_icfg(tmp_path, RECURSIVE_SOURCE)
+
+
+def build_icfg(tmp_path, source):
+    path = tmp_path / "prog.py"
+    path.write_text(source)
+    Pipeline(config={
+        "filename": str(path),
+        "project_path": str(tmp_path),
+        "library_paths": [],
+        "import_level": 0,
+        "analysis": [],
+    })
+    scope_manager = World().scope_manager
+    funcs = {name_of(scope): scope for scope in scope_manager.get_scopes()
+             if scope.get_qualname().startswith("prog.")}
+    icfg = InterControlFlowGraph()
+    for scope in funcs.values():
+        icfg.add_scope(scope, scope_manager.get_ir(scope, "cfg"))
+    icfg.add_entry_scope(funcs["main"])
+    for scope in funcs.values():
+        for blk in icfg.get_cfg(scope).get_nodes():
+            call = call_of(blk)
+            if call is not None and call.get_func_name() in funcs:
+                icfg.add_invoke(blk, funcs[call.get_func_name()])
+    return icfg
+
+
+def name_of(scope):
+    return scope.get_qualname().split(".")[-1]
+
+
+def call_of(blk):
+    return blk.stmts[-1] if len(blk.stmts) > 0 and isinstance(blk.stmts[-1], IRCall) else None
+
+
+def block_of(icfg, text):
+    return next(blk for blk in icfg.blks if any(str(stmt) == text for stmt in blk.stmts))
+
+
+def params_of(scope):
+    return [arg.arg for arg in scope.get_ast().args.args]
+
+
+class Taint(IFDSProblem):
+    """Variables holding a value returned by ``source()``; ``$return`` is a tainted return value."""
+
+    def __init__(self, icfg):
+        super().__init__(icfg)
+        self.leaks = set()
+
+    def normal_flow(self, edge, fact):
+        if fact is ZERO:
+            return ()
+        out = {fact}
+        for stmt in edge.get_src().stmts:
+            if isinstance(stmt, IRReturn) and stmt.get_value() == fact:
+                out.add(RET)
+            elif fact in stmt.get_loads():
+                out.update(stmt.get_stores())
+            elif fact in stmt.get_stores():
+                out.discard(fact)
+        return out
+
+    def call_flow(self, call_site, callee, fact):
+        args = [name for name, _ in call_of(call_site).get_args()]
+        if name_of(callee) == "sink" and fact in args:
+            self.leaks.add(str(call_of(call_site)))
+        return {param for arg, param in zip(args, params_of(callee)) if arg == fact}
+
+    def return_flow(self, call_site, callee, exit_blk, ret_site, fact):
+        target = call_of(call_site).get_target()
+        return {target} if fact == RET and target is not None else ()
+
+    def call_to_return_flow(self, call_site, ret_site, fact):
+        call = call_of(call_site)
+        if fact is ZERO:
+            return {call.get_target()} if call.get_func_name() == "source" else ()
+        return () if fact == call.get_target() else {fact}
+
+
+def test_taint_through_summaries(icfg):
+    problem = Taint(icfg)
+    solver = IFDSSolver(problem).solve()
+    tainted = solver.facts_at(block_of(icfg, "$tmp_5 = $tmp_6"))
+    assert {"x", "y"} <= tainted
+    assert "z" not in tainted
+    assert problem.leaks == {"$tmp_4 = sink(y)"}
+
+    # ident is analysed once per entry fact; both call sites reuse its summaries
+    ident = next(scope for scope in icfg.get_scopes() if name_of(scope) == "ident")
+    entry = icfg.entry_of(ident)
+    assert set(solver.jump[entry]) == {ZERO, "a"}
+    assert (icfg.exit_of(ident), RET) in solver.end_summary[(entry, "a")]
+    assert len([key for key in solver.summaries if key[0] in icfg.callers[ident]]) == 3
+
+
+def sink_args(leaks):
+    return {re.search(r"sink\((\w+)\)", leak).group(1) for leak in leaks}
+
+
+def scope_named(icfg, name):
+    return next(scope for scope in icfg.get_scopes() if name_of(scope) == name)
+
+
+def test_taint_through_self_recursion(recursive_icfg):
+    problem = Taint(recursive_icfg)
+    solver = IFDSSolver(problem).solve()
+    # The recursive call reuses the summary being built for loop, so each entry fact is analysed once
+    entry = recursive_icfg.entry_of(scope_named(recursive_icfg, "loop"))
+    assert set(solver.jump[entry]) == {ZERO, "a"}
+    assert (recursive_icfg.exit_of(scope_named(recursive_icfg, "loop")), RET) in solver.end_summary[(entry, "a")]
+    assert "y" in sink_args(problem.leaks)
+    assert "w" not in sink_args(problem.leaks)
+
+
+def test_taint_through_mutual_recursion(recursive_icfg):
+    problem = Taint(recursive_icfg)
+    solver = IFDSSolver(problem).solve()
+    ping, pong = scope_named(recursive_icfg, "ping"), scope_named(recursive_icfg, "pong")
+    assert set(solver.jump[recursive_icfg.entry_of(ping)]) == {ZERO, "a"}
+    assert set(solver.jump[recursive_icfg.entry_of(pong)]) == {ZERO, "b"}
+    assert (recursive_icfg.exit_of(pong), RET) in solver.end_summary[(recursive_icfg.entry_of(pong), "b")]
+    assert sink_args(problem.leaks) == {"y", "z"}
+
+
+class CallDepth(IDEProblem):
+    """Call depth of each block; values are ints joined by max."""
+
+    def normal_flow(self, edge, fact):
+        return {fact}
+
+    def call_flow(self, call_site, callee, fact):
+        return {fact}
+
+    def return_flow(self, call_site, callee, exit_blk, ret_site, fact):
+        return ()
+
+    def call_to_return_flow(self, call_site, ret_site, fact):
+        return {fact}
+
+    def call_edge(self, call_site, callee, src_fact, tgt_fact):
+        return Shift(1)
+
+    def return_edge(self, call_site, callee, exit_blk, ret_site, src_fact, tgt_fact):
+        return Shift(-1)
+
+    def top(self):
+        return -1
+
+    def bottom(self):
+        return 0
+
+    def join(self, value_1, value_2):
+        return max(value_1, value_2)
+
+
+class Shift(EdgeFunction):
+    def __init__(self, n):
+        self.n = n
+
+    def compute_target(self, value):
+        return value if value < 0 else value + self.n
+
+    def compose_with(self, second):
+        if isinstance(second, Shift):
+            return Shift(self.n + second.n)
+        return self if second == IDENTITY else second
+
+    def join_with(self, other):
+        return Shift(max(self.n, other.n)) if isinstance(other, Shift) else Shift(max(self.n, 0))
+
+    def __eq__(self, other):
+        return isinstance(other, Shift) and other.n == self.n
+
+    def __hash__(self):
+        return hash((Shift, self.n))
+
+
+def test_ide_values(icfg):
+    solver = IDESolver(CallDepth(icfg)).solve()
+    main_blk = block_of(icfg, "$tmp_5 = $tmp_6")
+    ident = next(scope for scope in icfg.get_scopes() if name_of(scope) == "ident")
+    assert solver.value_at(main_blk, ZERO) == 0
+    assert solver.value_at(icfg.entry_of(ident), ZERO) == 1
+    assert solver.value_at(icfg.exit_of(ident), ZERO) == 1
@@ -0,0 +1,153 @@
+"""Tests for slotted IR statements and cached variable effects."""
+
+import ast
+from pathlib import Path
+
+import pytest
+
+from pythonstan.ir import (
+    IRAssign, IRCall, IRDel, IRFunc, IRImport, IRLoadAttr, IRPhi, IRReturn, JumpIfFalse, SourceSpan,
+    compact_ir
+)
+from pythonstan.ir import ir_statements
+from pythonstan.utils.var_collector import VarCollector, collect_vars
+
+
+def get_benchmark_path(filename):
+    project_root = Path(__file__).parent.parent.parent.absolute()
+    return project_root / 'benchmark' / filename
+
+SOURCE = """
+import os.path as p, sys
+from mod import *
+def f(a, *b, c=1, **d):
+    z = 1
+class C(Base):
+    pass
+x[i] = y
+del q
+r = lambda u: u + w
+out = [k for k in it if k]
+"""
+
+
+def stmt(src: str) -> ast.stmt:
+    return ast.parse(src).body[0]
+
+
+@pytest.mark.parametrize("node", ast.parse(SOURCE).body, ids=lambda n: type(n).__name__)
+def test_collect_vars_matches_var_collector(node):
+    expected = []
+    for ctx in ("store", "load", "del"):
+        collector = VarCollector(ctx)
+        collector.visit(node)
+        expected.append(collector.get_vars())
+    assert [set(names) for names in collect_vars(node)] == expected
+
+
+def test_statements_are_slotted():
+    for ir in (IRAssign(stmt("a = b")), IRCall(stmt("t = f(x)")), IRLoadAttr(stmt("t = o.attr")),
+               IRReturn(stmt("return v")), IRPhi(ast.Name(id="v", ctx=ast.Store()), [ast.Name(id="v1")])):
+        assert not hasattr(ir, "__dict__")
+
+
+def test_var_effects_are_cached():
+    ir = IRCall(stmt("t = f(a, *b, k=v)"))
+    assert ir.get_stores() == {"t"}
+    assert ir.get_loads() == {"f", "a", "b", "v"}
+    assert ir.get_loads() is ir.get_loads()
+    assert ir.get_nostores() == {"f", "a", "b", "v"}
+    assert IRDel(stmt("del q")).get_dels() == {"q"}
+    assert IRImport(stmt("import os.path as p")).get_stores() == {"p"}
+    assert JumpIfFalse(ast.parse("c", mode="eval").body).get_loads() == {"c"}
+
+
+def test_rename_invalidates_var_effects():
+    ir = IRAssign(stmt("a = b + c"))
+    assert ir.get_loads() == {"b", "c"}
+    ir.rename("b", "b_1", (ast.Load,))
+    assert ir.get_loads() == {"b_1", "c"}
+    assert str(ir) == "a = b_1 + c"
+
+
+def test_phi():
+    phi = IRPhi(ast.Name(id="x", ctx=ast.Store()), [ast.Name(id="x_1"), None, ast.Name(id="x_2")])
+    assert str(phi) == "x = Phi(x_1, None, x_2)"
+    assert phi.get_stores() == {"x"}
+    assert phi.get_loads() == {"x_1", "x_2"}
+
+
+def test_compact_mode_fixes_root_location_only():
+    node = ast.Assign(targets=[ast.Name(id="q", ctx=ast.Store())], value=ast.Name(id="r", ctx=ast.Load()))
+    with compact_ir(True):
+        ir = IRAssign(node)
+    assert (ir.get_ast().lineno, ir.get_ast().col_offset) == (1, 0)
+    assert not hasattr(ir.get_rval(), "lineno")
+    assert ir.get_loads() == {"r"}
+
+
+def test_pipeline_scopes_compact_mode_to_its_own_lowering(monkeypatch):
+    from pythonstan.world import World
+    from pythonstan.world.pipeline import Pipeline
+
+    modes = []
+    fix_locations = ir_statements._fix_locations
+
+    def record(node):
+        modes.append(ir_statements._compact_ir)
+        fix_locations(node)
+
+    monkeypatch.setattr(ir_statements, "_fix_locations", record)
+    path = get_benchmark_path("dataflow.py")
+    Pipeline(config={"filename": str(path), "project_path": str(path.parent), "library_paths": [],
+                     "import_level": 0, "lazy_function_ir": True, "compact_ir": True, "analysis": []})
+    assert modes and all(modes) and not ir_statements._compact_ir
+    scope_manager = World().scope_manager
+    deferred = [s for s in list(scope_manager.get_scopes()) if not scope_manager.is_lowered(s)]
+    modes.clear()
+    scope_manager.get_ir(deferred[0], "ir")
+    assert modes and all(modes) and not ir_statements._compact_ir
+
+
+def test_release_ast_keeps_headers_and_spans():
+    func_def = stmt("def f(a, b=1):\n    if a:\n        return b\n    return a")
+    func = IRFunc("m.f", func_def)
+    guard = JumpIfFalse(func_def.body[0].test, stmt_ast=func_def.body[0])
+    span = guard.get_span()
+    func.release_ast()
+    guard.release_ast()
+    assert func.get_ast().body == [] and func_def.body != []
+    assert [a.arg for a in func.get_ast().args.args] == ["a", "b"]
+    assert guard.get_ast().body == [] and guard.get_span() == span == SourceSpan(2, 4, 3, 16)
+    assert str(guard) == "if not (a) goto label_-1"
+
+
+def dump_pipeline(release_ast: bool):
+    from pythonstan.world import World
+    from pythonstan.world.pipeline import Pipeline
+
+    path = get_benchmark_path("dataflow.py")
+    config = {
+        "filename": str(path),
+        "project_path": str(path.parent),
+        "library_paths": [],
+        "release_ast": release_ast,
+        "analysis": [{"name": "liveness", "id": "LivenessAnalysis", "description": "",
+                      "prev_analysis": ["cfg"], "options": {"type": "dataflow analysis"}}],
+    }
+    pipeline = Pipeline(config=config)
+    pipeline.run()
+    scope_manager = World().scope_manager
+    dump = {scope.get_qualname(): [str(s) for s in scope_manager.get_ir(scope, "ir") or ()]
+            for scope in scope_manager.get_scopes()}
+    has_tac = any(fmt == "three address form" for _, fmt in scope_manager.scope_ir)
+    liveness = pipeline.analysis_manager.get_results("liveness")
+    return dump, has_tac, {str(k): v for k, v in liveness["in"].items()}
+
+
+def test_pipeline_release_ast():
+    full, full_has_tac, full_liveness = dump_pipeline(release_ast=False)
+    released, released_has_tac, released_liveness = dump_pipeline(release_ast=True)
+    assert full_has_tac and not released_has_tac
+    assert released == full
+    assert released_liveness == full_liveness
@@ -0,0 +1,138 @@
+"""Tests for function-level lazy IR construction."""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from pythonstan.ir import IRClass, IRFunc
+from pythonstan.world import World
+from pythonstan.world.pipeline import Pipeline
+
+
+def get_benchmark_path(filename):
+    project_root = Path(__file__).parent.parent.parent.absolute()
+    return project_root / 'benchmark' / filename
+
+
+def build(lazy: bool, release_ast: bool = False, filename: str = "dataflow.py", analysis=()) -> Pipeline:
+    path = get_benchmark_path(filename)
+    config = {
+        "filename": str(path),
+        "project_path": str(path.parent),
+        "library_paths": [],
+        "import_level": 0,
+        "lazy_function_ir": lazy,
+        "release_ast": release_ast,
+        "analysis": list(analysis),
+    }
+    return Pipeline(config=config)
+
+
+def dump_scopes():
+    """Dumps the IR and cell vars of every scope reachable from the entry module.
+
+    Hoisted constants are numbered per lowered body, so they are dropped and
+    temporaries are compared without their index.
+    """
+    scope_manager = World().scope_manager
+    dump = {}
+    todo = [World().get_entry_module()]
+    while todo:
+        scope = todo.pop()
+        stmts = [re.sub(r'\$(const|tmp)_\d+', r'$\1', str(s)) for s in scope_manager.get_ir(scope, "ir")]
+        cell_vars = {v for v in getattr(scope, "cell_vars", None) or () if not v.startswith("$const")}
+        assert scope_manager.get_ir(scope, "cfg") is not None
+        dump[scope.get_qualname()] = ([s for s in stmts if not s.startswith("$const")], cell_vars)
+        todo.extend(scope_manager.get_subscopes(scope))
+    return dump
+
+
+def test_function_bodies_are_deferred():
+    build(lazy=True)
+    scope_manager = World().scope_manager
+    funcs = [s for s in scope_manager.get_scopes() if isinstance(s, IRFunc)]
+    assert len(funcs) > 0
+    assert all(not scope_manager.is_lowered(f) for f in funcs)
+    assert scope_manager.is_lowered(World().get_entry_module())
+
+    func = funcs[0]
+    assert scope_manager.get_ir(func, "three address form") is None
+    assert scope_manager.is_lowered(func)
+    assert scope_manager.get_ir(func, "cfg") is not None
+    assert any(str(s).startswith("$const_0 = ") for s in scope_manager.get_ir(func, "ir"))
+
+
+def test_lazy_ir_matches_eager_ir():
+    build(lazy=False)
+    eager = dump_scopes()
+    build(lazy=True)
+    lazy = dump_scopes()
+    assert len(World().scope_manager.pending) == 0
+    assert lazy == eager
+
+
+def test_lazy_ir_with_release_ast():
+    build(lazy=False, filename="closures.py")
+    eager = dump_scopes()
+    build(lazy=True, release_ast=True, filename="closures.py")
+    assert len(World().scope_manager.pending) > 0
+    lazy = dump_scopes()
+    assert lazy == eager
+
+
+def test_cell_vars_of_deferred_scopes_are_exact():
+    def cell_vars(scope):
+        return {v for v in scope.cell_vars if not v.startswith("$const")}
+
+    build(lazy=False, filename="closures.py")
+    eager = {scope.get_qualname(): cell_vars(scope) for scope in World().scope_manager.get_scopes()}
+    build(lazy=True, filename="closures.py")
+    scope_manager = World().scope_manager
+    deferred = [scope for scope in scope_manager.get_scopes() if not scope_manager.is_lowered(scope)]
+    assert len(deferred) > 0
+    # Reading the cell vars of a deferred scope lowers it first
+    assert {scope.get_qualname(): cell_vars(scope) for scope in deferred} == \
+        {scope.get_qualname(): eager[scope.get_qualname()] for scope in deferred}
+
+
+def test_lazy_call_edges_match_eager():
+    from pythonstan.analysis.pointer.kcfa import Config
+
+    def call_edges(lazy):
+        path = get_benchmark_path("closures.py")
+        options = Config(context_policy="2-cfa", project_path=str(path.parent), library_paths=[]).to_dict()
+        ppl = build(lazy=lazy, filename="closures.py", analysis=[
+            {"name": "pta", "id": "PointerAnalysis", "description": "", "prev_analysis": ["ir"], "options": options}])
+        ppl.run()
+        call_graph = ppl.analysis_manager.get_results("pta").query().call_graph()
+        return {(edge.get_callsite().scope.name, edge.get_callee().name) for edge in call_graph.get_edges()}
+
+    eager = call_edges(lazy=False)
+    assert len(eager) > 0
+    assert call_edges(lazy=True) == eager
+
+
+def test_class_bodies_keep_their_constants_out_of_the_class():
+    def class_constants():
+        scope_manager = World().scope_manager
+        return {scope.get_qualname(): [str(s) for s in scope_manager.get_ir(scope, "ir") if str(s).startswith("$const")]
+                for scope in list(scope_manager.get_scopes()) if isinstance(scope, IRClass)}
+
+    build(lazy=False, filename="oop.py")
+    eager = class_constants()
+    assert len(eager) > 0
+    build(lazy=True, filename="oop.py")
+    assert class_constants() == eager
+
+
+def test_intraprocedural_analyses_skip_deferred_scopes():
+    ppl = build(lazy=True, filename="closures.py", analysis=[{"name": "liveness", "id": "LivenessAnalysis", "description": "",
+                                      "prev_analysis": ["cfg"], "options": {"type": "dataflow analysis"}}])
+    scope_manager = World().scope_manager
+    deferred = {scope for scope in scope_manager.get_scopes() if not scope_manager.is_lowered(scope)}
+    assert len(deferred) > 0
+    ppl.run()
+    analysed = set(ppl.analysis_manager.get_results("liveness")["scopes"])
+    assert World().get_entry_module() in analysed
+    assert not analysed & deferred
@@ -0,0 +1,84 @@
+"""Tests for per-scope intraprocedural analyses on a process pool."""
+
+from pathlib import Path
+
+import pytest
+
+from pythonstan.analysis.dataflow import DataflowAnalysis
+from pythonstan.utils.parallel import can_fork, fork_map
+from pythonstan.world import World
+from pythonstan.world.pipeline import Pipeline
+
+pytestmark = pytest.mark.skipif(not can_fork(), reason="needs the fork start method")
+
+
+def get_benchmark_path(filename):
+    project_root = Path(__file__).parent.parent.parent.absolute()
+    return project_root / 'benchmark' / filename
+
+
+def run(filename, workers):
+    path = get_benchmark_path(filename)
+    analysis = {"description": "", "prev_analysis": ["cfg"], "options": {"type": "dataflow analysis"}}
+    pipeline = Pipeline(config={
+        "filename": str(path),
+        "project_path": str(path.parent),
+        "library_paths": [],
+        "import_level": 0,
+        "parallel_workers": workers,
+        "analysis": [{"name": "liveness", "id": "LivenessAnalysis", **analysis},
+                     {"name": "rd", "id": "ReachingDefinitionAnalysis", **analysis}],
+    })
+    pipeline.run()
+    scope_manager = World().scope_manager
+    blocks = {}
+    for scope in scope_manager.get_scopes():
+        for blk in scope_manager.get_ir(scope, "cfg").blks:
+            blocks[blk] = (scope.get_qualname(), blk.get_idx())
+    liveness = pipeline.analysis_manager.get_results("liveness")
+    rd = pipeline.analysis_manager.get_results("rd")
+    stmts = {stmt for blk in blocks for stmt in blk.stmts}
+    # Reaching definitions must be the statements of the parent process, not copies
+    assert all(stmt in stmts for facts in rd["in"].values() for stmt in facts)
+    return ({blocks[blk]: facts for blk, facts in liveness["in"].items()},
+            {blocks[blk]: {str(stmt) for stmt in facts} for blk, facts in rd["out"].items()},
+            liveness["iterations"],
+            {scope.get_qualname(): set(getattr(scope, "cell_vars", None) or ())
+             for scope in scope_manager.get_scopes()})
+
+
+@pytest.mark.parametrize("filename", ["closures.py", "dataflow.py"])
+def test_parallel_matches_serial(filename):
+    serial = run(filename, workers=0)
+    parallel = run(filename, workers=3)
+    assert parallel == serial
+    # Every scope is analysed, not just the module
+    assert len({qualname for qualname, _ in serial[0]}) > 1
+
+
+def test_dataflow_results_are_inputs_per_scope(monkeypatch):
+    inputs = []
+    monkeypatch.setattr(DataflowAnalysis, "set_input",
+                        lambda self, item, value: inputs.append((self.scope, item, value)))
+    path = get_benchmark_path("dataflow.py")
+    analysis = {"description": "", "options": {"type": "dataflow analysis"}}
+    pipeline = Pipeline(config={
+        "filename": str(path),
+        "project_path": str(path.parent),
+        "library_paths": [],
+        "import_level": 0,
+        "analysis": [{"name": "liveness", "id": "LivenessAnalysis", "prev_analysis": ["cfg"], **analysis},
+                     {"name": "rd", "id": "ReachingDefinitionAnalysis", "prev_analysis": ["liveness"], **analysis}],
+    })
+    pipeline.run()
+    liveness = pipeline.analysis_manager.get_results("liveness")["scopes"]
+    assert len(liveness) > 1
+    assert {scope: value for scope, item, value in inputs if item == "liveness"} == liveness
+
+
+def test_fork_map_keeps_order_and_shared_objects():
+    shared = [object() for _ in range(5)]
+    results = fork_map(lambda idx: (idx * idx, shared[idx], object()), list(range(5)), 2, shared)
+    assert [square for square, _, _ in results] == [0, 1, 4, 9, 16]
+    assert all(obj is shared[idx] for idx, (_, obj, _) in enumerate(results))
+    assert all(fresh not in shared for _, _, fresh in results)
@@ -0,0 +1,93 @@
+"""Tests for the pruned SSA stage."""
+
+import pytest
+
+from pythonstan.analysis.transform.ssa import base_name
+from pythonstan.graph.dominator_tree import DominatorTree
+from pythonstan.ir import IRPhi
+from pythonstan.world import World
+from pythonstan.world.pipeline import Pipeline
+
+SOURCE = """
+def f(a, n):
+    x = 0
+    y = 1
+    i = 0
+    while i < n:
+        x = x + i
+        y = i
+        i = i + 1
+    return x
+
+def g(k):
+    def inner():
+        return k
+    k = k + 1
+    return inner
+
+t = 1
+t = t + 1
+"""
+
+
+@pytest.fixture(params=[False, True], ids=["eager", "lazy"])
+def scopes(tmp_path, request):
+    path = tmp_path / "prog.py"
+    path.write_text(SOURCE)
+    config = {
+        "filename": str(path),
+        "project_path": str(tmp_path),
+        "library_paths": [],
+        "ssa": True,
+        "lazy_function_ir": request.param,
+        "analysis": [],
+    }
+    Pipeline(config=config)
+    scope_manager = World().scope_manager
+    return {scope.get_qualname(): scope for scope in scope_manager.get_scopes()}
+
+
+def ssa_of(scope):
+    return World().scope_manager.get_ir(scope, "ssa")
+
+
+def test_single_assignment_and_dominance(scopes):
+    func = scopes["prog.f"]
+    ssa = ssa_of(func)
+    tree = DominatorTree.of(ssa)
+    defs = {}
+    for blk in ssa.get_nodes():
+        for stmt in blk.stmts:
+            for var in stmt.get_stores():
+                assert var not in defs, f"{var} defined twice"
+                defs[var] = blk
+    assert {"x", "y", "i"} <= {base_name(var) for var in defs}
+    assert all(var != base_name(var) for var in defs)
+    for blk in ssa.get_nodes():
+        for stmt in blk.stmts:
+            if isinstance(stmt, IRPhi):
+                continue
+            for var in stmt.get_loads():
+                if var in defs:
+                    assert tree.dominates(defs[var], blk)
+
+
+def test_pruned_phis(scopes):
+    ssa = ssa_of(scopes["prog.f"])
+    phis = [stmt for stmt in ssa.get_stmts() if isinstance(stmt, IRPhi)]
+    # y is redefined in the loop but never read, so it gets no phi
+    assert sorted(base_name(phi.get_lval().id) for phi in phis) == ["i", "x"]
+    for phi in phis:
+        blk = next(b for b in ssa.get_nodes() if phi in b.stmts)
+        assert len(phi.get_items()) == len(ssa.preds_of(blk))
+        assert all(item is not None for item in phi.get_items())
+
+
+def test_cfg_is_unchanged_and_captured_vars_keep_names(scopes):
+    cfg = World().scope_manager.get_ir(scopes["prog.f"], "cfg")
+    assert {base_name(v) for s in cfg.get_stmts() for v in s.get_stores()} == \
+        {v for s in cfg.get_stmts() for v in s.get_stores()}
+    # k is captured by inner, t is a module global
+    assert any(str(s).startswith("k = k + ") for s in ssa_of(scopes["prog.g"]).get_stmts())
+    module_stores = {v for s in ssa_of(scopes["prog"]).get_stmts() for v in s.get_stores()}
+    assert "t" in module_stores
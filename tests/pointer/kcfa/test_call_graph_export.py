@@ -0,0 +1,76 @@
+"""Tests for streaming call graph export."""
+
+import ast
+import io
+import json
+
+import pytest
+
+from pythonstan.analysis.pointer.kcfa.context import CallSite, CallStringContext, Ctx, Scope
+from pythonstan.analysis.pointer.kcfa.state import PointerCallGraph
+from pythonstan.graph.call_graph import (
+    CallEdge, CallKind, ExportedEdge, iter_edges, read_binary, write_binary, write_jsonl, write_tsv
+)
+from pythonstan.ir import IRModule
+
+
+@pytest.fixture
+def call_graph():
+    """Module ``m`` calls ``g`` from the same call site under two contexts."""
+    empty_ctx = CallStringContext((), 2)
+    call_ctx = CallStringContext((CallSite("m.py:3:0:call", "m"),), 2)
+    m = IRModule("m", ast.parse(""), "m")
+    g = IRModule("g", ast.parse(""), "g")
+    caller = Scope(m, None, empty_ctx, None, None)
+    caller2 = Scope(m, None, call_ctx, None, None)
+    callee = Scope(g, None, empty_ctx, None, None)
+    callee2 = Scope(g, None, call_ctx, None, None)
+
+    graph = PointerCallGraph()
+    graph.add_edge(CallEdge(CallKind.FUNCTION, Ctx(empty_ctx, caller, "g()"), callee))
+    graph.add_edge(CallEdge(CallKind.FUNCTION, Ctx(call_ctx, caller2, "g()"), callee2))
+    graph.add_edge(CallEdge(CallKind.FUNCTION, Ctx(call_ctx, caller2, "g()"), callee))
+    return graph
+
+
+def test_iter_edges_projection(call_graph):
+    full = list(iter_edges(call_graph, context_sensitive=True))
+    plain = list(iter_edges(call_graph, context_sensitive=False))
+    assert len(full) == 3
+    assert {e.callee_context for e in full} == {"[]", "[m.py:3:0:call#0]"}
+    assert plain == [ExportedEdge("FUNCTION", "m", None, "g()", None, "g", None)]
+
+
+def test_write_tsv(call_graph):
+    out = io.StringIO()
+    assert write_tsv(call_graph, out) == 3
+    lines = out.getvalue().splitlines()
+    assert lines[0].split("\t")[0] == "kind"
+    assert len(lines) == 4
+    assert all(len(line.split("\t")) == 7 for line in lines)
+
+    out = io.StringIO()
+    assert write_tsv(call_graph, out, context_sensitive=False) == 1
+    assert out.getvalue().splitlines()[1] == "FUNCTION\tm\t\tg()\t\tg\t"
+
+
+def test_write_jsonl(call_graph, tmp_path):
+    path = str(tmp_path / "cg.jsonl")
+    assert write_jsonl(call_graph, path, context_sensitive=False) == 1
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert records == [{"kind": "FUNCTION", "caller": "m", "call_site": "g()", "callee": "g"}]
+
+
+@pytest.mark.parametrize("context_sensitive", [True, False])
+def test_binary_round_trip(call_graph, tmp_path, context_sensitive):
+    path = str(tmp_path / "cg.bin")
+    count = write_binary(call_graph, path, context_sensitive=context_sensitive)
+    edges = list(read_binary(path))
+    assert len(edges) == count
+    assert sorted(edges, key=str) == sorted(iter_edges(call_graph, context_sensitive), key=str)
+
+
+def test_binary_rejects_bad_input():
+    with pytest.raises(ValueError):
+        list(read_binary(io.BytesIO(b"garbage-garbage-garbage")))
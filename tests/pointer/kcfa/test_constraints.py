@@ -640,3 +640,77 @@ class TestConstraintUsagePatterns:
         assert len(manager.get_by_type(StoreConstraint)) == 1
         assert len(manager.get_by_type(LoadConstraint)) == 1
 
+
+
+class TestConstraintManagerIndexes:
+    """Tests for the scoped constraint indexes."""
+    
+    @staticmethod
+    def copies(n):
+        from pythonstan.analysis.pointer.kcfa import Variable
+        return [CopyConstraint(Variable(f"s{i}"), Variable(f"t{i}")) for i in range(n)]
+    
+    def test_iterator_is_stable_while_adding(self):
+        """Constraints added during iteration are not visited."""
+        manager = ConstraintManager()
+        c1, c2, c3 = self.copies(3)
+        manager.add("m", "x", c1)
+        manager.add("m", "x", c2)
+        
+        seen = []
+        for scope, constraint in manager.iter_scoped_by_variable("x"):
+            seen.append(constraint)
+            manager.add("m", "x", c3)
+        assert seen == [c1, c2]
+        assert manager.get_by_variable("x") == [c1, c2, c3]
+    
+    def test_remove_matches_variable(self):
+        manager = ConstraintManager()
+        c1, c2 = self.copies(2)
+        manager.add("m", "x", c1)
+        manager.add("m", "x", c2)
+        generation = manager.generation
+        
+        assert manager.remove("m", "y", c1) is False
+        assert manager.generation == generation
+        assert manager.remove("m", "x", c1) is True
+        assert manager.remove("m", "x", c1) is False
+        assert manager.get_by_variable("x") == [c2]
+        assert manager.get_by_type(CopyConstraint) == [c2]
+        assert manager.generation > generation
+    
+    def test_remove_many_compacts_bucket(self):
+        manager = ConstraintManager()
+        constraints = self.copies(100)
+        for c in constraints:
+            manager.add("m", "x", c)
+        it = manager.iter_scoped_by_variable("x")
+        for c in constraints[:90]:
+            manager.remove("m", "x", c)
+        assert manager.get_by_variable("x") == constraints[90:]
+        # An iterator created before the removals skips them, across the compaction too
+        assert list(it) == [("m", c) for c in constraints[90:]]
+        assert manager.get_index_statistics()["max_constraints_per_variable"] == 10
+    
+    def test_remove_scope(self):
+        manager = ConstraintManager()
+        c1, c2, c3 = self.copies(3)
+        manager.add("a", "x", c1)
+        manager.add("a", "y", c2)
+        manager.add("b", "x", c3)
+        
+        assert manager.remove_scope("a") == 2
+        assert manager.remove_scope("a") == 0
+        assert len(manager) == 1
+        assert manager.get_by_variable("x") == [c3]
+        assert manager.get_by_variable("y") == []
+    
+    def test_size_by_kind(self):
+        from pythonstan.analysis.pointer.kcfa import Variable
+        manager = ConstraintManager()
+        for c in self.copies(2):
+            manager.add("m", "x", c)
+        manager.add("m", "y", LoadConstraint(Variable("o"), attr("f"), Variable("r")))
+        assert manager.size_by_kind() == {"CopyConstraint": 2, "LoadConstraint": 1}
+        assert manager.count_by_type(LoadConstraint) == 1
+        assert manager.count_by_type(StoreConstraint) == 0
@@ -0,0 +1,73 @@
+"""Tests for pointer analysis memory accounting."""
+
+import ast
+import tracemalloc
+
+from pythonstan.analysis.pointer.kcfa.context import CallStringContext, Ctx, Scope
+from pythonstan.analysis.pointer.kcfa.memory import (
+    CATEGORIES, deep_sizeof, measure_memory, tracemalloc_by_module
+)
+from pythonstan.analysis.pointer.kcfa.object import AbstractObject, AllocKind, AllocSite
+from pythonstan.analysis.pointer.kcfa.points_to_set import PointsToSet
+from pythonstan.analysis.pointer.kcfa.state import PointerAnalysisState
+from pythonstan.analysis.pointer.kcfa.variable import Variable
+from pythonstan.ir import IRModule
+
+
+class FakeScopeManager:
+    def __init__(self, module):
+        self.scopes = {module}
+        self.scope_ir = {(module.get_qualname(), "ir"): [module]}
+
+
+def make_state(num_vars: int):
+    ctx = CallStringContext((), 2)
+    module = IRModule("m", ast.parse("x = [1, 2]\ny = x"), "m")
+    scope = Scope(module, None, ctx, None, None)
+    obj = AbstractObject(ctx, AllocSite(module, AllocKind.LIST))
+    state = PointerAnalysisState()
+    for i in range(num_vars):
+        state.set_points_to(Ctx(ctx, scope, Variable(f"v{i}")), PointsToSet.singleton(obj))
+    return state, module
+
+
+def test_deep_sizeof_counts_shared_objects_once():
+    shared = list(range(100))
+    seen = set()
+    first = deep_sizeof([shared], seen)
+    second = deep_sizeof([shared], seen)
+    assert first > deep_sizeof(shared) > 0
+    assert second < first
+
+
+def test_measure_memory_categories():
+    state, module = make_state(50)
+    report = measure_memory(state, FakeScopeManager(module), sample_size=0)
+    assert set(report.categories) == set(CATEGORIES)
+    assert report.categories["points_to_sets"].count == 50
+    assert report.categories["points_to_sets"].bytes > 0
+    assert report.categories["ast"].count > 0
+    # The allocation site references the module, which is charged to ir/ast only
+    assert report.categories["ir"].bytes > 0
+    assert report.total_bytes == sum(c.bytes for c in report.categories.values())
+    assert "points_to_sets" in report.format()
+
+
+def test_measure_memory_sampling():
+    state, _ = make_state(400)
+    exact = measure_memory(state, sample_size=0).categories["points_to_sets"]
+    sampled = measure_memory(state, sample_size=40).categories["points_to_sets"]
+    assert sampled.sampled and not exact.sampled
+    assert abs(sampled.bytes - exact.bytes) < exact.bytes * 0.5
+
+
+def test_tracemalloc_by_module():
+    tracemalloc.start()
+    try:
+        state, _ = make_state(20)
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    by_module = tracemalloc_by_module(snapshot)
+    assert "<other>" in by_module and "state.py" in by_module
+    assert all(size > 0 for size in by_module.values())
@@ -0,0 +1,108 @@
+"""Tests for binary serialization of pointer analysis state."""
+
+import ast
+
+import pytest
+
+from pythonstan.analysis.pointer.kcfa.context import CallSite, CallStringContext, Ctx, Scope
+from pythonstan.analysis.pointer.kcfa.heap_model import attr, elem
+from pythonstan.analysis.pointer.kcfa.object import AbstractObject, AllocKind, AllocSite
+from pythonstan.analysis.pointer.kcfa.points_to_set import PointsToSet
+from pythonstan.analysis.pointer.kcfa.serialization import (
+    FORMAT_VERSION, PointerKey, SnapshotQuery, load_query, pointer_key_of, save_state
+)
+from pythonstan.analysis.pointer.kcfa.state import PointerAnalysisState
+from pythonstan.analysis.pointer.kcfa.variable import FieldAccess, Variable
+from pythonstan.graph.call_graph import CallEdge, CallKind
+from pythonstan.ir import IRModule
+
+
+@pytest.fixture
+def solved_state():
+    """Build a small solved state by hand: two contexts, a heap field and a call edge."""
+    empty_ctx = CallStringContext((), 2)
+    call_ctx = CallStringContext((CallSite("m.py:3:0:call", "m"),), 2)
+    module = IRModule("m", ast.parse(""), "m")
+    scope = Scope(module, None, empty_ctx, None, None)
+
+    lst = AbstractObject(empty_ctx, AllocSite("m:1:list", AllocKind.LIST))
+    obj = AbstractObject(call_ctx, AllocSite("m:2:obj", AllocKind.OBJECT))
+
+    state = PointerAnalysisState()
+    x = Ctx(empty_ctx, scope, Variable("x"))
+    y = Ctx(empty_ctx, scope, Variable("y"))
+    z = Ctx(call_ctx, scope, Variable("x"))
+    state.set_points_to(x, PointsToSet.singleton(lst))
+    state.set_points_to(y, PointsToSet.from_objects([lst, obj]))
+    state.set_points_to(z, PointsToSet.singleton(obj))
+    field = Ctx(empty_ctx, None, FieldAccess(lst, elem()))
+    state.set_points_to(field, PointsToSet.singleton(obj))
+    state.call_graph.add_edge(CallEdge(CallKind.FUNCTION, Ctx(empty_ctx, scope, "f(x)"), scope))
+    return state, scope, (x, y, z), (lst, obj)
+
+
+@pytest.mark.parametrize("lazy", [True, False])
+def test_round_trip_points_to(tmp_path, solved_state, lazy):
+    state, _, (x, y, z), _ = solved_state
+    path = str(tmp_path / "state.pts")
+    save_state(state, path)
+
+    with load_query(path, lazy=lazy) as query:
+        assert isinstance(query, SnapshotQuery)
+        assert {o.kind for o in query.points_to(x)} == {"list"}
+        assert {o.kind for o in query.points_to(y)} == {"list", "obj"}
+        assert {o.kind for o in query.points_to(z)} == {"obj"}
+        assert {o.kind for o in query.points_to_name("m", "x")} == {"list", "obj"}
+        assert query.may_alias(x, y)
+        assert not query.may_alias(x, z)
+        assert len(list(query.variables())) == 3
+
+
+def test_points_to_sets_are_interned(tmp_path, solved_state):
+    state, _, (x, y, _), _ = solved_state
+    path = str(tmp_path / "state.pts")
+    save_state(state, path)
+
+    with load_query(path) as query:
+        lst = next(iter(query.points_to(x)))
+        assert lst in query.points_to(y)
+        assert len(list(query.objects())) == 2
+        # Decoded points-to sets are cached per interned set ID
+        assert query.points_to(x) is query.points_to(x)
+
+
+def test_field_and_call_graph(tmp_path, solved_state):
+    state, _, (x, _, _), _ = solved_state
+    path = str(tmp_path / "state.pts")
+    save_state(state, path)
+
+    with load_query(path) as query:
+        lst = next(iter(query.points_to(x)))
+        assert {o.kind for o in query.get_field(lst, elem())} == {"obj"}
+        assert query.get_field(lst, attr("missing")).is_empty()
+
+        cg = query.call_graph()
+        assert cg.get_number_of_edges() == 1
+        edge = next(iter(cg.get_edges()))
+        assert edge.get_kind() == CallKind.FUNCTION
+        assert edge.get_callsite().call_site == "f(x)"
+        assert edge.get_callee().name == "m"
+        assert query.get_statistics()["num_variables"] == 4
+
+
+def test_pointer_key_of(solved_state):
+    _, _, (x, _, _), _ = solved_state
+    key = pointer_key_of(x)
+    assert key == PointerKey("m", "[]", "[]", "x", "local")
+    assert pointer_key_of("not a variable") is None
+
+
+def test_rejects_bad_files(tmp_path):
+    path = tmp_path / "bad.pts"
+    path.write_bytes(b"NOTASNAP" + b"\x00" * 16)
+    with pytest.raises(ValueError):
+        load_query(str(path))
+
+    path.write_bytes(b"PSTNPTA\x00" + (FORMAT_VERSION + 1).to_bytes(4, "little") + b"\x00" * 4)
+    with pytest.raises(ValueError):
+        load_query(str(path))
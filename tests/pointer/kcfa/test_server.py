@@ -0,0 +1,149 @@
+"""Tests for the points-to query server."""
+
+import ast
+import json
+import socket
+import threading
+
+import pytest
+
+from pythonstan.analysis.pointer.kcfa.context import CallSite, CallStringContext, Ctx, Scope
+from pythonstan.analysis.pointer.kcfa.heap_model import Field, FieldKind, attr, elem, key
+from pythonstan.analysis.pointer.kcfa.object import AbstractObject, AllocKind, AllocSite
+from pythonstan.analysis.pointer.kcfa.points_to_set import PointsToSet
+from pythonstan.analysis.pointer.kcfa.server import (
+    PointsToServer, QueryService, parse_field, snapshot_analyzer
+)
+from pythonstan.analysis.pointer.kcfa.serialization import save_query
+from pythonstan.analysis.pointer.kcfa.solver import SolverQuery
+from pythonstan.analysis.pointer.kcfa.state import PointerAnalysisState
+from pythonstan.analysis.pointer.kcfa.unknown_tracker import UnknownTracker
+from pythonstan.analysis.pointer.kcfa.variable import FieldAccess, Variable
+from pythonstan.graph.call_graph import CallEdge, CallKind
+from pythonstan.ir import IRModule
+
+
+def make_query(extra_var: bool = False) -> SolverQuery:
+    empty_ctx = CallStringContext((), 2)
+    call_ctx = CallStringContext((CallSite("m.py:3:0:call", "m"),), 2)
+    scope = Scope(IRModule("m", ast.parse(""), "m"), None, empty_ctx, None, None)
+
+    lst = AbstractObject(empty_ctx, AllocSite("m:1:list", AllocKind.LIST))
+    obj = AbstractObject(call_ctx, AllocSite("m:2:obj", AllocKind.OBJECT))
+
+    state = PointerAnalysisState()
+    state.set_points_to(Ctx(empty_ctx, scope, Variable("x")), PointsToSet.singleton(lst))
+    state.set_points_to(Ctx(call_ctx, scope, Variable("x")), PointsToSet.singleton(obj))
+    state.set_points_to(Ctx(empty_ctx, scope, Variable("y")), PointsToSet.singleton(obj))
+    if extra_var:
+        state.set_points_to(Ctx(empty_ctx, scope, Variable("z")), PointsToSet.singleton(lst))
+    field_access = FieldAccess(lst, elem())
+    state.set_field(scope, empty_ctx, lst, elem(), field_access)
+    state.set_points_to(Ctx(empty_ctx, None, field_access), PointsToSet.singleton(obj))
+    state.call_graph.add_edge(CallEdge(CallKind.FUNCTION, Ctx(empty_ctx, scope, "f(x)"), scope))
+    return SolverQuery(state, {}, UnknownTracker())
+
+
+class Analyzer:
+    """Analyzer stub counting runs; the second run sees an extra variable."""
+
+    def __init__(self):
+        self.runs = 0
+
+    def __call__(self):
+        self.runs += 1
+        return make_query(extra_var=self.runs > 1)
+
+
+def call(service, method, **params):
+    return service.handle({"id": 7, "method": method, "params": params})
+
+
+class TestQueryService:
+
+    def test_points_to_merges_contexts(self):
+        service = QueryService(Analyzer())
+        response = call(service, "points_to", scope="m", var="x")
+        assert response["id"] == 7
+        assert len(response["result"]["objects"]) == 2
+        assert call(service, "points_to", scope="m", var="nope")["result"]["objects"] == []
+
+    def test_may_alias(self):
+        service = QueryService(Analyzer())
+        assert call(service, "may_alias", scope="m", var="x", other_var="y")["result"]["may_alias"]
+        assert not call(service, "may_alias", scope="m", var="y", other_var="nope")["result"]["may_alias"]
+
+    def test_field(self):
+        service = QueryService(Analyzer())
+        result = call(service, "field", scope="m", var="x", field="elem")["result"]
+        assert result["objects"] == call(service, "points_to", scope="m", var="y")["result"]["objects"]
+        assert call(service, "field", scope="m", var="x", field="name")["result"]["objects"] == []
+
+    def test_call_graph(self):
+        service = QueryService(Analyzer())
+        edges = call(service, "call_graph")["result"]["edges"]
+        assert edges == [{"kind": "FUNCTION", "caller": "m", "call_site": "f(x)", "callee": "m"}]
+        assert call(service, "call_graph", caller="other")["result"]["edges"] == []
+
+    def test_module_changed_reanalyzes(self):
+        analyzer = Analyzer()
+        service = QueryService(analyzer)
+        assert call(service, "points_to", scope="m", var="z")["result"]["objects"] == []
+        assert call(service, "module_changed", modules=["m"])["result"]["generation"] == 2
+        assert analyzer.runs == 2
+        assert len(call(service, "points_to", scope="m", var="z")["result"]["objects"]) == 1
+
+    def test_errors(self):
+        service = QueryService(Analyzer())
+        assert "Unknown method" in call(service, "bogus")["error"]
+        assert "Missing" in call(service, "points_to", scope="m")["error"]
+        assert "Invalid JSON" in json.loads(service.handle_line("{not json"))["error"]
+
+    def test_snapshot_analyzer(self, tmp_path):
+        path = str(tmp_path / "state.pts")
+        save_query(make_query(), path)
+        service = QueryService(snapshot_analyzer(path))
+        assert len(call(service, "points_to", scope="m", var="x")["result"]["objects"]) == 2
+        assert len(call(service, "field", scope="m", var="x", field="elem")["result"]["objects"]) == 1
+
+
+def test_parse_field():
+    assert parse_field("name") == attr("name")
+    assert parse_field(".name") == attr("name")
+    assert parse_field("elem") == elem()
+    assert parse_field("['k']") == key("k")
+    assert parse_field("[2]") == Field(FieldKind.POSITION, index=2)
+
+
+def test_socket_round_trip(tmp_path):
+    path = str(tmp_path / "pts.sock")
+    server = PointsToServer(path, QueryService(Analyzer()))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(path)
+            stream = client.makefile("rwb")
+            stream.write(b'{"id": 1, "method": "ping"}\n{"id": 2, "method": "shutdown"}\n')
+            stream.flush()
+            first = json.loads(stream.readline())
+            second = json.loads(stream.readline())
+        assert first == {"id": 1, "result": {"generation": 1}}
+        assert second["id"] == 2
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+    finally:
+        server.server_close()
+
+
+def test_server_replaces_only_stale_sockets(tmp_path):
+    path = tmp_path / "pts.sock"
+    PointsToServer(str(path), QueryService(Analyzer())).socket.close()
+    # The socket file is left behind, as after a crash
+    server = PointsToServer(str(path), QueryService(Analyzer()))
+    server.server_close()
+
+    path.write_text("data")
+    with pytest.raises(FileExistsError):
+        PointsToServer(str(path), QueryService(Analyzer()))
+    assert path.read_text() == "data"